@@ -26,7 +26,7 @@
     SystemMessage,
     UserMessage,
 )
-from autogen_core.tools import FunctionTool, Tool
+from autogen_core.tools import FunctionTool, Tool, ToolExecutor
 
 from .. import EVENT_LOGGER_NAME
 from ..base import Handoff as HandoffBase
@@ -120,6 +120,9 @@ class AssistantAgent(BaseChatAgent):
             will be returned as the response.
             Available variables: `{tool_name}`, `{arguments}`, `{result}`.
             For example, `"{tool_name}: {result}"` will create a summary like `"tool_name: result"`.
+        tool_executor (ToolExecutor | None, optional): The pool that runs the synchronous functions passed in `tools`.
+            Tools passed as :class:`~autogen_core.tools.Tool` instances keep their own configuration.
+            Defaults to None, which uses the event loop's default thread pool.
 
     Raises:
         ValueError: If tool names are not unique.
@@ -242,6 +245,7 @@ def __init__(
         ) = "You are a helpful AI assistant. Solve tasks using your tools. Reply with TERMINATE when the task has been completed.",
         reflect_on_tool_use: bool = False,
         tool_call_summary_format: str = "{result}",
+        tool_executor: ToolExecutor | None = None,
     ):
         super().__init__(name=name, description=description)
         self._model_client = model_client
@@ -261,7 +265,11 @@ def __init__(
                         description = tool.__doc__
                     else:
                         description = ""
-                    self._tools.append(FunctionTool(tool, description=description))
+                    self._tools.append(
+                        FunctionTool(
+                            tool, description=description, executor=tool_executor
+                        )
+                    )
                 else:
                     raise ValueError(f"Unsupported tool type: {type(tool)}")
         # Check if tool names are unique.
@@ -20,7 +20,7 @@
 from autogen_core.model_context import BufferedChatCompletionContext
 from autogen_core.models import LLMMessage
 from autogen_core.models._model_client import ModelFamily
-from autogen_core.tools import FunctionTool
+from autogen_core.tools import FunctionTool, ToolExecutor
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 from openai.resources.chat.completions import AsyncCompletions
 from openai.types.chat.chat_completion import ChatCompletion, Choice
@@ -186,6 +186,61 @@ async def test_run_with_tools(monkeypatch: pytest.MonkeyPatch) -> None:
     assert state == state2
 
 
+@pytest.mark.asyncio
+async def test_run_with_tool_executor(monkeypatch: pytest.MonkeyPatch) -> None:
+    model = "gpt-4o-2024-05-13"
+    chat_completions = [
+        ChatCompletion(
+            id="id1",
+            choices=[
+                Choice(
+                    finish_reason="tool_calls",
+                    index=0,
+                    message=ChatCompletionMessage(
+                        content=None,
+                        tool_calls=[
+                            ChatCompletionMessageToolCall(
+                                id="1",
+                                type="function",
+                                function=Function(
+                                    name="_pass_function",
+                                    arguments=json.dumps({"input": "task"}),
+                                ),
+                            )
+                        ],
+                        role="assistant",
+                    ),
+                )
+            ],
+            created=0,
+            model=model,
+            object="chat.completion",
+            usage=CompletionUsage(
+                prompt_tokens=10, completion_tokens=5, total_tokens=0
+            ),
+        ),
+    ]
+    mock = _MockChatCompletion(chat_completions)
+    monkeypatch.setattr(AsyncCompletions, "create", mock.mock_create)
+    tool_executor = ToolExecutor(max_workers=1, name="agent-tools")
+    agent = AssistantAgent(
+        "tool_use_agent",
+        model_client=OpenAIChatCompletionClient(model=model, api_key=""),
+        tools=[_pass_function, _fail_function],
+        tool_executor=tool_executor,
+    )
+    try:
+        result = await agent.run(task="task")
+    finally:
+        tool_executor.shutdown()
+
+    assert isinstance(result.messages[-1], ToolCallSummaryMessage)
+    assert result.messages[-1].content == "pass"
+    # The synchronous function ran on the agent's executor.
+    assert tool_executor.metrics.calls == 1
+    assert tool_executor.metrics.failed == 0
+
+
 @pytest.mark.asyncio
 async def test_run_with_tools_and_reflection(monkeypatch: pytest.MonkeyPatch) -> None:
     model = "gpt-4o-2024-05-13"
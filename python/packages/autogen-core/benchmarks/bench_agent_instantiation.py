@@ -0,0 +1,86 @@
+"""Instantiation throughput benchmark for SingleThreadedAgentRuntime.
+
+Registers a routed agent with several message handlers and reports how many
+distinct agent instances per second the runtime can create, as happens when a
+new agent is spun up for every session key.
+
+Run with::
+
+    python benchmarks/bench_agent_instantiation.py --agents 20000
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+
+from autogen_core import (
+    AgentId,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    message_handler,
+)
+
+
+@dataclass
+class Question:
+    content: str
+
+
+@dataclass
+class Answer:
+    content: str
+
+
+@dataclass
+class Reset:
+    pass
+
+
+class SessionAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Handles a single session.")
+        self.history: list[str] = []
+
+    @message_handler
+    async def on_question(self, message: Question, ctx: MessageContext) -> Answer:
+        self.history.append(message.content)
+        return Answer(message.content)
+
+    @message_handler
+    async def on_answer(self, message: Answer, ctx: MessageContext) -> None:
+        self.history.append(message.content)
+
+    @message_handler
+    async def on_reset(self, message: Reset, ctx: MessageContext) -> None:
+        self.history.clear()
+
+
+async def measure(num_agents: int) -> float:
+    runtime = SingleThreadedAgentRuntime()
+    await SessionAgent.register(runtime, "session", SessionAgent)
+
+    start = time.perf_counter()
+    for i in range(num_agents):
+        await runtime.try_get_underlying_agent_instance(
+            AgentId("session", f"session_{i}")
+        )
+    elapsed = time.perf_counter() - start
+    await runtime.close()
+    return num_agents / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for _ in range(args.repeat):
+        rate = asyncio.run(measure(args.agents))
+        print(f"agents={args.agents} {rate:,.0f} agents/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Per-message dispatch overhead benchmark for RoutedAgent.
+
+Calls ``on_message`` of a routed agent directly, without a runtime, and reports
+the average time spent routing a message to its handler. Messages of the handled
+type, of a subclass of it, and of a type routed with a match function are measured
+with and without runtime type checks.
+
+Run with::
+
+    python benchmarks/bench_routed_dispatch.py --messages 200000
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Type
+
+from autogen_core import (
+    AgentId,
+    AgentInstantiationContext,
+    CancellationToken,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    event,
+    rpc,
+)
+
+
+@dataclass
+class Request:
+    content: str
+
+
+@dataclass
+class UrgentRequest(Request):
+    pass
+
+
+@dataclass
+class Command:
+    name: str
+
+
+class CheckedAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Routes messages with runtime type checks.")
+
+    @rpc
+    async def on_request(self, message: Request, ctx: MessageContext) -> Request:
+        return message
+
+    @event(match=lambda message, ctx: message.name == "stop")  # type: ignore
+    async def on_stop(self, message: Command, ctx: MessageContext) -> None:
+        pass
+
+    @event(match=lambda message, ctx: message.name == "start")  # type: ignore
+    async def on_start(self, message: Command, ctx: MessageContext) -> None:
+        pass
+
+
+class UncheckedAgent(CheckedAgent, runtime_type_checks=False):
+    pass
+
+
+async def measure(
+    agent_class: Type[CheckedAgent], message: Any, is_rpc: bool, num_messages: int
+) -> float:
+    runtime = SingleThreadedAgentRuntime()
+    with AgentInstantiationContext.populate_context(
+        (runtime, AgentId("agent", "default"))
+    ):
+        agent = agent_class()
+    ctx = MessageContext(
+        sender=None,
+        topic_id=None,
+        is_rpc=is_rpc,
+        cancellation_token=CancellationToken(),
+        message_id="benchmark",
+    )
+    start = time.perf_counter()
+    for _ in range(num_messages):
+        await agent.on_message(message, ctx)
+    elapsed = time.perf_counter() - start
+    return elapsed / num_messages * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200_000)
+    args = parser.parse_args()
+
+    cases = [
+        ("exact type", Request("hello"), True),
+        ("subclass", UrgentRequest("hello"), True),
+        ("match function", Command("start"), False),
+    ]
+    for agent_class in [CheckedAgent, UncheckedAgent]:
+        for name, message, is_rpc in cases:
+            ns = asyncio.run(measure(agent_class, message, is_rpc, args.messages))
+            print(f"{agent_class.__name__:<15} {name:<15} {ns:,.0f} ns/message")
+
+
+if __name__ == "__main__":
+    main()
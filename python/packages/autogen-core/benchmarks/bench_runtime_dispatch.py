@@ -0,0 +1,77 @@
+"""Fan-out throughput benchmark for the SingleThreadedAgentRuntime dispatch loop.
+
+Publishes messages to a topic with one or more subscribed agents and reports the
+number of deliveries per second for different ``dispatch_batch_size`` values.
+
+Run with::
+
+    python benchmarks/bench_runtime_dispatch.py --messages 20000 --recipients 1 8
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import List
+
+from autogen_core import (
+    DefaultTopicId,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    default_subscription,
+    message_handler,
+)
+
+
+@dataclass
+class Tick:
+    index: int
+
+
+@default_subscription
+class CountingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Counts received messages.")
+        self.count = 0
+
+    @message_handler
+    async def on_tick(self, message: Tick, ctx: MessageContext) -> None:
+        self.count += 1
+
+
+async def measure(num_messages: int, num_recipients: int, batch_size: int) -> float:
+    runtime = SingleThreadedAgentRuntime(dispatch_batch_size=batch_size)
+    for i in range(num_recipients):
+        await CountingAgent.register(runtime, f"counter_{i}", CountingAgent)
+
+    runtime.start()
+    start = time.perf_counter()
+    for i in range(num_messages):
+        await runtime.publish_message(Tick(i), DefaultTopicId())
+    await runtime.stop_when_idle()
+    elapsed = time.perf_counter() - start
+    await runtime.close()
+    return num_messages * num_recipients / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--recipients", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 64, 256])
+    args = parser.parse_args()
+
+    recipients: List[int] = args.recipients
+    batch_sizes: List[int] = args.batch_sizes
+    for num_recipients in recipients:
+        for batch_size in batch_sizes:
+            rate = asyncio.run(measure(args.messages, num_recipients, batch_size))
+            print(
+                f"recipients={num_recipients:<3} dispatch_batch_size={batch_size:<4} "
+                f"{rate:,.0f} deliveries/sec"
+            )
+
+
+if __name__ == "__main__":
+    main()
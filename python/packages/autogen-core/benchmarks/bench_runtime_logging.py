@@ -0,0 +1,93 @@
+"""Throughput benchmark for SingleThreadedAgentRuntime with event logging off and on.
+
+Publishes messages to a topic with several subscribed agents and reports the
+number of delivered messages per second, first with the ``autogen_core`` loggers
+disabled and then with an INFO handler attached that formats every record.
+
+Run with::
+
+    python benchmarks/bench_runtime_logging.py --messages 20000 --recipients 4
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import time
+from dataclasses import dataclass
+
+from autogen_core import (
+    EVENT_LOGGER_NAME,
+    ROOT_LOGGER_NAME,
+    DefaultTopicId,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    default_subscription,
+    message_handler,
+    try_get_known_serializers_for_type,
+)
+
+
+@dataclass
+class ChatMessage:
+    content: str
+    source: str
+
+
+@default_subscription
+class CountingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Counts received messages.")
+        self.count = 0
+
+    @message_handler
+    async def on_chat_message(self, message: ChatMessage, ctx: MessageContext) -> None:
+        self.count += 1
+
+
+async def measure(num_messages: int, num_recipients: int) -> float:
+    runtime = SingleThreadedAgentRuntime()
+    runtime.add_message_serializer(try_get_known_serializers_for_type(ChatMessage))
+    for i in range(num_recipients):
+        await CountingAgent.register(runtime, f"counter_{i}", CountingAgent)
+    message = ChatMessage(
+        content="The quick brown fox jumps over the lazy dog. " * 8, source="user"
+    )
+
+    runtime.start()
+    start = time.perf_counter()
+    for _ in range(num_messages):
+        await runtime.publish_message(message, DefaultTopicId())
+    await runtime.stop_when_idle()
+    elapsed = time.perf_counter() - start
+    await runtime.close()
+    return num_messages * num_recipients / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--recipients", type=int, default=4)
+    args = parser.parse_args()
+
+    loggers = [
+        logging.getLogger(ROOT_LOGGER_NAME),
+        logging.getLogger(EVENT_LOGGER_NAME),
+    ]
+
+    for log in loggers:
+        log.setLevel(logging.WARNING)
+    rate = asyncio.run(measure(args.messages, args.recipients))
+    print(f"logging off: {rate:,.0f} deliveries/sec")
+
+    handler = logging.StreamHandler(io.StringIO())
+    for log in loggers:
+        log.setLevel(logging.INFO)
+        log.addHandler(handler)
+    rate = asyncio.run(measure(args.messages, args.recipients))
+    print(f"logging on:  {rate:,.0f} deliveries/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Payload size and speed benchmark for the message serializers.
+
+Serializes and deserializes messages shaped like the ones exchanged by agentchat
+agents (model messages with function calls, and dataclass messages with nested
+dataclasses) and reports the payload size in bytes and the time per message in
+microseconds for every available serializer.
+
+Run with::
+
+    python benchmarks/bench_serialization.py --iterations 20000
+"""
+
+import argparse
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from typing import Any, Callable, List, Tuple
+
+from autogen_core import FunctionCall
+from autogen_core._serialization import (
+    DataclassJsonMessageSerializer,
+    MessagePackMessageSerializer,
+    MessageSerializer,
+    PydanticJsonMessageSerializer,
+)
+from autogen_core.models import AssistantMessage, UserMessage
+from pydantic import BaseModel
+
+
+class ChatTurn(BaseModel):
+    messages: List[UserMessage | AssistantMessage]
+
+
+@dataclass
+class Usage:
+    prompt_tokens: int
+    completion_tokens: int
+
+
+@dataclass
+class TextMessage:
+    source: str
+    content: str
+    usage: Usage | None = None
+
+
+@dataclass
+class Transcript:
+    task: str
+    messages: List[TextMessage] = field(default_factory=list)
+
+
+@dataclass
+class FlatMessage:
+    source: str
+    content: str
+    prompt_tokens: int
+    completion_tokens: int
+
+
+def sample_messages() -> List[Tuple[str, Any]]:
+    text = "The quarterly report shows revenue grew 12% while costs stayed flat. " * 4
+    return [
+        ("flat dataclass", FlatMessage("assistant", text, 512, 128)),
+        (
+            "nested dataclass",
+            Transcript(
+                task="Summarize the report.",
+                messages=[
+                    TextMessage("assistant", text, Usage(512, 128)) for _ in range(5)
+                ],
+            ),
+        ),
+        (
+            "pydantic",
+            ChatTurn(
+                messages=[
+                    UserMessage(content=text, source="user"),
+                    AssistantMessage(
+                        content=[
+                            FunctionCall(
+                                id=str(i),
+                                name="search",
+                                arguments='{"query": "revenue"}',
+                            )
+                            for i in range(3)
+                        ],
+                        source="assistant",
+                    ),
+                ]
+            ),
+        ),
+    ]
+
+
+class LegacyDataclassJsonMessageSerializer:
+    """The previous dataclass serializer, kept here as a baseline."""
+
+    def __init__(self, cls: type[Any]) -> None:
+        self.cls = cls
+
+    def serialize(self, message: Any) -> bytes:
+        return json.dumps(asdict(message)).encode("utf-8")
+
+    def deserialize(self, payload: bytes) -> Any:
+        return self.cls(**json.loads(payload.decode("utf-8")))
+
+
+def serializers_for(message: Any) -> List[Tuple[str, Any]]:
+    cls = type(message)
+    serializers: List[Tuple[str, Any]] = []
+    if isinstance(message, BaseModel):
+        serializers.append(("pydantic json", PydanticJsonMessageSerializer(cls)))
+    else:
+        if cls is FlatMessage:
+            serializers.append(
+                ("stdlib json (asdict)", LegacyDataclassJsonMessageSerializer(cls))
+            )
+        serializers.append(("dataclass json", DataclassJsonMessageSerializer(cls)))
+    try:
+        serializers.append(("msgpack", MessagePackMessageSerializer(cls)))
+    except ImportError:
+        pass
+    return serializers
+
+
+def time_per_call(func: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    for name, message in sample_messages():
+        for serializer_name, serializer in serializers_for(message):
+            typed_serializer: MessageSerializer[Any] = serializer
+            payload = typed_serializer.serialize(message)
+            assert typed_serializer.deserialize(payload) == message
+            encode = time_per_call(
+                partial(typed_serializer.serialize, message), args.iterations
+            )
+            decode = time_per_call(
+                partial(typed_serializer.deserialize, payload), args.iterations
+            )
+            print(
+                f"{name:<17} {serializer_name:<21} {len(payload):>6} bytes "
+                f"encode {encode:7.2f} us  decode {decode:7.2f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Micro-benchmark for subscription registration and topic resolution.
+
+Registers many per-session :class:`~autogen_core.TypeSubscription` instances,
+resolves a large number of distinct topics and then measures the cost of adding
+and removing subscriptions once all of those topics have been seen.
+
+Run with::
+
+    python benchmarks/bench_subscription_manager.py --subscriptions 10000 --topics 100000
+"""
+
+import argparse
+import asyncio
+import time
+
+from autogen_core import TopicId, TypePrefixSubscription, TypeSubscription
+from autogen_core._runtime_impl_helpers import SubscriptionManager
+
+
+async def run(num_subscriptions: int, num_topics: int) -> None:
+    manager = SubscriptionManager()
+
+    start = time.perf_counter()
+    for i in range(num_subscriptions):
+        await manager.add_subscription(TypeSubscription(f"session_{i}", "assistant"))
+    await manager.add_subscription(TypePrefixSubscription("session_", "auditor"))
+    elapsed = time.perf_counter() - start
+    print(
+        f"add {num_subscriptions} subscriptions (no topics seen): "
+        f"{elapsed * 1e3:.1f} ms ({elapsed / num_subscriptions * 1e6:.2f} us/sub)"
+    )
+
+    topics = [
+        TopicId(type=f"session_{i % num_subscriptions}", source=f"user_{i}")
+        for i in range(num_topics)
+    ]
+    start = time.perf_counter()
+    for topic in topics:
+        await manager.get_subscribed_recipients(topic)
+    elapsed = time.perf_counter() - start
+    print(
+        f"resolve {num_topics} new topics: "
+        f"{elapsed * 1e3:.1f} ms ({elapsed / num_topics * 1e6:.2f} us/topic)"
+    )
+
+    start = time.perf_counter()
+    for topic in topics:
+        await manager.get_subscribed_recipients(topic)
+    elapsed = time.perf_counter() - start
+    print(
+        f"resolve {num_topics} seen topics: "
+        f"{elapsed * 1e3:.1f} ms ({elapsed / num_topics * 1e6:.2f} us/topic)"
+    )
+
+    rounds = 1000
+    added = [TypeSubscription(f"session_{i}", "critic") for i in range(rounds)]
+    start = time.perf_counter()
+    for subscription in added:
+        await manager.add_subscription(subscription)
+    for subscription in added:
+        await manager.remove_subscription(subscription.id)
+    elapsed = time.perf_counter() - start
+    print(
+        f"add + remove {rounds} subscriptions ({num_topics} topics seen): "
+        f"{elapsed * 1e3:.1f} ms ({elapsed / rounds * 1e6:.2f} us/pair)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscriptions", type=int, default=10_000)
+    parser.add_argument("--topics", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.subscriptions, args.topics))
+
+
+if __name__ == "__main__":
+    main()
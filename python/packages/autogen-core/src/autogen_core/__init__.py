@@ -10,7 +10,11 @@
 from ._agent_runtime import AgentRuntime
 from ._agent_type import AgentType
 from ._base_agent import BaseAgent
-from ._cancellation_token import CancellationToken
+from ._cancellation_token import (
+    AsyncioCancellationToken,
+    CancellationHandle,
+    CancellationToken,
+)
 from ._closure_agent import ClosureAgent, ClosureContext
 from ._component_config import (
     Component,
@@ -46,10 +50,14 @@
 from ._serialization import (
     JSON_DATA_CONTENT_TYPE as JSON_DATA_CONTENT_TYPE_ALIAS,
 )
+from ._serialization import (
+    MSGPACK_DATA_CONTENT_TYPE as MSGPACK_DATA_CONTENT_TYPE_ALIAS,
+)
 from ._serialization import (
     PROTOBUF_DATA_CONTENT_TYPE as PROTOBUF_DATA_CONTENT_TYPE_ALIAS,
 )
 from ._serialization import (
+    AnyMessageSerializer,
     MessageSerializer,
     UnknownPayload,
     try_get_known_serializers_for_type,
@@ -77,6 +85,9 @@
 PROTOBUF_DATA_CONTENT_TYPE = PROTOBUF_DATA_CONTENT_TYPE_ALIAS
 """The content type for Protobuf data."""
 
+MSGPACK_DATA_CONTENT_TYPE = MSGPACK_DATA_CONTENT_TYPE_ALIAS
+"""The content type for MessagePack data."""
+
 __all__ = [
     "Agent",
     "AgentId",
@@ -85,6 +96,8 @@
     "AgentRuntime",
     "BaseAgent",
     "CancellationToken",
+    "CancellationHandle",
+    "AsyncioCancellationToken",
     "AgentInstantiationContext",
     "TopicId",
     "Subscription",
@@ -93,6 +106,7 @@
     "SubscriptionInstantiationContext",
     "MessageHandlerContext",
     "MessageSerializer",
+    "AnyMessageSerializer",
     "try_get_known_serializers_for_type",
     "UnknownPayload",
     "Image",
@@ -111,6 +125,7 @@
     "TypePrefixSubscription",
     "JSON_DATA_CONTENT_TYPE",
     "PROTOBUF_DATA_CONTENT_TYPE",
+    "MSGPACK_DATA_CONTENT_TYPE",
     "SingleThreadedAgentRuntime",
     "ROOT_LOGGER_NAME",
     "EVENT_LOGGER_NAME",
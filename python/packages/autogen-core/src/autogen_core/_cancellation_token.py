@@ -1,6 +1,35 @@
 import threading
 from asyncio import Future
-from typing import Any, Callable, List
+from typing import Any, Callable, Dict
+
+
+class CancellationHandle:
+    """A callback registered on a :class:`CancellationToken`.
+
+    Disposing the handle removes the callback from the token, so tokens that outlive many
+    linked calls do not accumulate callbacks for calls that have already completed.
+    """
+
+    __slots__ = ("_token", "_callback")
+
+    def __init__(
+        self, token: "CancellationToken", callback: Callable[[], None]
+    ) -> None:
+        self._token: "CancellationToken | None" = token
+        self._callback = callback
+
+    def dispose(self) -> None:
+        """Remove the callback from the token. Disposing a handle more than once has no effect."""
+        token = self._token
+        if token is not None:
+            self._token = None
+            token._remove(self)  # pyright: ignore[reportPrivateUsage]
+
+    def __enter__(self) -> "CancellationHandle":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.dispose()
 
 
 class CancellationToken:
@@ -9,38 +38,76 @@ class CancellationToken:
     def __init__(self) -> None:
         self._cancelled: bool = False
         self._lock: threading.Lock = threading.Lock()
-        self._callbacks: List[Callable[[], None]] = []
+        # Insertion ordered, so callbacks run in the order they were added.
+        self._callbacks: Dict[CancellationHandle, None] = {}
+
+    def _cancel_unlocked(self) -> None:
+        if not self._cancelled:
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, {}
+            for handle in callbacks:
+                handle._token = None  # pyright: ignore[reportPrivateUsage]
+                handle._callback()  # pyright: ignore[reportPrivateUsage]
+
+    def _add_unlocked(self, callback: Callable[[], None]) -> CancellationHandle:
+        handle = CancellationHandle(self, callback)
+        if self._cancelled:
+            handle._token = None  # pyright: ignore[reportPrivateUsage]
+            callback()
+        else:
+            self._callbacks[handle] = None
+        return handle
+
+    def _remove(self, handle: CancellationHandle) -> None:
+        with self._lock:
+            self._callbacks.pop(handle, None)
 
     def cancel(self) -> None:
         """Cancel pending async calls linked to this cancellation token."""
         with self._lock:
-            if not self._cancelled:
-                self._cancelled = True
-                for callback in self._callbacks:
-                    callback()
+            self._cancel_unlocked()
 
     def is_cancelled(self) -> bool:
         """Check if the CancellationToken has been used"""
-        with self._lock:
-            return self._cancelled
+        return self._cancelled
+
+    def add_callback(self, callback: Callable[[], None]) -> CancellationHandle:
+        """Attach a callback that will be called when cancel is invoked.
 
-    def add_callback(self, callback: Callable[[], None]) -> None:
-        """Attach a callback that will be called when cancel is invoked"""
+        Returns a handle that removes the callback when disposed. If the token is already
+        cancelled, the callback is called immediately."""
         with self._lock:
-            if self._cancelled:
-                callback()
-            else:
-                self._callbacks.append(callback)
+            return self._add_unlocked(callback)
 
     def link_future(self, future: Future[Any]) -> Future[Any]:
-        """Link a pending async call to a token to allow its cancellation"""
-        with self._lock:
-            if self._cancelled:
-                future.cancel()
-            else:
+        """Link a pending async call to a token to allow its cancellation.
 
-                def _cancel() -> None:
-                    future.cancel()
+        The link is removed when the future completes."""
 
-                self._callbacks.append(_cancel)
+        def _cancel() -> None:
+            future.cancel()
+
+        handle = self.add_callback(_cancel)
+        if not future.done():
+            future.add_done_callback(lambda _: handle.dispose())
+        else:
+            handle.dispose()
         return future
+
+
+class AsyncioCancellationToken(CancellationToken):
+    """A :class:`CancellationToken` without locking, for use from a single event loop.
+
+    It behaves like :class:`CancellationToken` as long as it is only cancelled and linked
+    from the thread running the event loop, which is the case for tokens created and used
+    by agents of a :class:`~autogen_core.SingleThreadedAgentRuntime`.
+    """
+
+    def _remove(self, handle: CancellationHandle) -> None:
+        self._callbacks.pop(handle, None)
+
+    def cancel(self) -> None:
+        self._cancel_unlocked()
+
+    def add_callback(self, callback: Callable[[], None]) -> CancellationHandle:
+        return self._add_unlocked(callback)
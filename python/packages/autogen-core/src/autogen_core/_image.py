@@ -4,17 +4,41 @@
 import re
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, cast
+from typing import Any, Dict, Tuple, cast
 
 from PIL import Image as PILImage
 from pydantic import GetCoreSchemaHandler, ValidationInfo
 from pydantic_core import core_schema
 from typing_extensions import Literal
 
+ImageFormat = Literal["PNG", "JPEG", "WEBP"]
+"""The formats an :class:`Image` can be encoded in."""
+
+_MIME_TYPES = {
+    "PNG": "image/png",
+    "JPEG": "image/jpeg",
+    "GIF": "image/gif",
+    "WEBP": "image/webp",
+}
+
+_DATA_URI_PREFIX = r"data:image/(?:png|jpeg|gif|webp);base64,"
+
 
 class Image:
     """Represents an image.
 
+    Images loaded from encoded data (bytes, base64, a data URI or a file) keep the original
+    bytes, which are reused as is when the image is serialized or sent to a model, and only
+    decode the pixels when :attr:`image` is accessed. The base64 encoding of an image is
+    computed once and cached, so the image must not be modified in place after it is created.
+
+    Args:
+        image (PIL.Image.Image): The image.
+        format (ImageFormat | None): The format to encode the image in, for example ``"JPEG"`` or
+            ``"WEBP"`` to reduce the size of model requests. If `None`, images loaded from encoded
+            data keep their original encoding and other images are encoded as PNG.
+        quality (int | None): The quality for JPEG and WebP encoding, from 0 to 100.
+
 
     Example:
 
@@ -39,37 +63,157 @@ async def from_url(url: str) -> Image:
 
     """
 
-    def __init__(self, image: PILImage.Image):
-        self.image: PILImage.Image = image.convert("RGB")
+    def __init__(
+        self,
+        image: PILImage.Image,
+        *,
+        format: ImageFormat | None = None,
+        quality: int | None = None,
+    ) -> None:
+        self._source = image
+        self._image: PILImage.Image | None = None
+        # The encoded bytes and format the image was loaded from, if any.
+        self._original: Tuple[bytes, str] | None = None
+        self._format = format
+        self._quality = quality
+        # (format, quality) -> (base64, mime type)
+        self._encodings: Dict[Tuple[str | None, int | None], Tuple[str, str]] = {}
+
+    @property
+    def image(self) -> PILImage.Image:
+        """The image in RGB mode. The pixels are decoded on first access. An in-memory RGB
+        image is used as is, without copying it."""
+        if self._image is None:
+            if type(self._source) is PILImage.Image and self._source.mode == "RGB":
+                self._image = self._source
+            else:
+                # Also turns images opened from a file into plain in-memory images.
+                self._image = self._source.convert("RGB")
+        return self._image
+
+    @image.setter
+    def image(self, image: PILImage.Image) -> None:
+        self._source = image
+        self._image = None
+        self._original = None
+        self._encodings.clear()
 
     @classmethod
-    def from_pil(cls, pil_image: PILImage.Image) -> Image:
-        return cls(pil_image)
+    def from_pil(
+        cls,
+        pil_image: PILImage.Image,
+        *,
+        format: ImageFormat | None = None,
+        quality: int | None = None,
+    ) -> Image:
+        return cls(pil_image, format=format, quality=quality)
 
     @classmethod
-    def from_uri(cls, uri: str) -> Image:
-        if not re.match(r"data:image/(?:png|jpeg);base64,", uri):
+    def from_uri(
+        cls, uri: str, *, format: ImageFormat | None = None, quality: int | None = None
+    ) -> Image:
+        if not re.match(_DATA_URI_PREFIX, uri):
             raise ValueError(
                 "Invalid URI format. It should be a base64 encoded image URI."
             )
 
         # A URI. Remove the prefix and decode the base64 string.
-        base64_data = re.sub(r"data:image/(?:png|jpeg);base64,", "", uri)
-        return cls.from_base64(base64_data)
+        base64_data = re.sub(_DATA_URI_PREFIX, "", uri)
+        return cls.from_base64(base64_data, format=format, quality=quality)
+
+    @classmethod
+    def from_base64(
+        cls,
+        base64_str: str,
+        *,
+        format: ImageFormat | None = None,
+        quality: int | None = None,
+    ) -> Image:
+        image = cls.from_bytes(
+            base64.b64decode(base64_str), format=format, quality=quality
+        )
+        if image._original is not None:
+            # The base64 string is the encoding of the original bytes, keep it too.
+            image._encodings[(None, None)] = (
+                base64_str,
+                _MIME_TYPES[image._original[1]],
+            )
+        return image
 
     @classmethod
-    def from_base64(cls, base64_str: str) -> Image:
-        return cls(PILImage.open(BytesIO(base64.b64decode(base64_str))))
+    def from_bytes(
+        cls,
+        data: bytes,
+        *,
+        format: ImageFormat | None = None,
+        quality: int | None = None,
+    ) -> Image:
+        """Create an image from encoded bytes, such as the content of a PNG or JPEG file.
+        The bytes are kept and reused when the image is serialized, and the pixels are
+        only decoded when :attr:`image` is accessed."""
+        # Opening an image only reads its header.
+        pil_image = PILImage.open(BytesIO(data))
+        image = cls(pil_image, format=format, quality=quality)
+        if pil_image.format in _MIME_TYPES:
+            image._original = (data, pil_image.format)
+        return image
+
+    def to_base64(
+        self, format: ImageFormat | None = None, quality: int | None = None
+    ) -> str:
+        """Encode the image as a base64 string.
 
-    def to_base64(self) -> str:
-        buffered = BytesIO()
-        self.image.save(buffered, format="PNG")
-        content = buffered.getvalue()
-        return base64.b64encode(content).decode("utf-8")
+        Args:
+            format (ImageFormat | None): The format to encode the image in. Defaults to the format
+                the image was created with. If that is also `None`, the original encoded bytes are
+                used if the image was loaded from bytes, base64, a URI or a file, otherwise PNG.
+            quality (int | None): The quality for JPEG and WebP encoding, from 0 to 100.
+        """
+        return self._encode(format, quality)[0]
+
+    def _encode(
+        self, format: ImageFormat | None, quality: int | None
+    ) -> Tuple[str, str]:
+        key = (
+            format or self._format,
+            quality if quality is not None else self._quality,
+        )
+        encoding = self._encodings.get(key)
+        if encoding is not None:
+            return encoding
+
+        target_format, target_quality = key
+        if self._original is not None and (
+            target_format is None
+            or (target_format == self._original[1] and target_quality is None)
+        ):
+            content, encoded_format = self._original
+        else:
+            encoded_format = target_format or "PNG"
+            buffered = BytesIO()
+            if target_quality is None:
+                self.image.save(buffered, format=encoded_format)
+            else:
+                self.image.save(buffered, format=encoded_format, quality=target_quality)
+            content = buffered.getvalue()
+        encoding = (
+            base64.b64encode(content).decode("utf-8"),
+            _MIME_TYPES[encoded_format],
+        )
+        self._encodings[key] = encoding
+        return encoding
 
     @classmethod
-    def from_file(cls, file_path: Path) -> Image:
-        return cls(PILImage.open(file_path))
+    def from_file(
+        cls,
+        file_path: Path,
+        *,
+        format: ImageFormat | None = None,
+        quality: int | None = None,
+    ) -> Image:
+        return cls.from_bytes(
+            Path(file_path).read_bytes(), format=format, quality=quality
+        )
 
     def _repr_html_(self) -> str:
         # Show the image in Jupyter notebook
@@ -77,7 +221,8 @@ def _repr_html_(self) -> str:
 
     @property
     def data_uri(self) -> str:
-        return _convert_base64_to_data_uri(self.to_base64())
+        base64_image, mime_type = self._encode(None, None)
+        return f"data:{mime_type};base64,{base64_image}"
 
     # Returns openai.types.chat.ChatCompletionContentPartImageParam, which is a TypedDict
     # We don't use the explicit type annotation so that we can avoid a dependency on the OpenAI Python SDK in this package.
@@ -116,23 +261,3 @@ def serialize(value: Image) -> dict[str, Any]:
             core_schema.any_schema(),  # Accept any type; adjust if needed
             serialization=core_schema.plain_serializer_function_ser_schema(serialize),
         )
-
-
-def _convert_base64_to_data_uri(base64_image: str) -> str:
-    def _get_mime_type_from_data_uri(base64_image: str) -> str:
-        # Decode the base64 string
-        image_data = base64.b64decode(base64_image)
-        # Check the first few bytes for known signatures
-        if image_data.startswith(b"\xff\xd8\xff"):
-            return "image/jpeg"
-        elif image_data.startswith(b"\x89PNG\r\n\x1a\n"):
-            return "image/png"
-        elif image_data.startswith(b"GIF87a") or image_data.startswith(b"GIF89a"):
-            return "image/gif"
-        elif image_data.startswith(b"RIFF") and image_data[8:12] == b"WEBP":
-            return "image/webp"
-        return "image/jpeg"  # use jpeg for unknown formats, best guess.
-
-    mime_type = _get_mime_type_from_data_uri(base64_image)
-    data_uri = f"data:{mime_type};base64,{base64_image}"
-    return data_uri
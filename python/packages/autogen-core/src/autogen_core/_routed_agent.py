@@ -3,8 +3,10 @@
 from typing import (
     Any,
     Callable,
+    ClassVar,
     Coroutine,
     DefaultDict,
+    Dict,
     List,
     Literal,
     Protocol,
@@ -13,6 +15,7 @@
     Type,
     TypeVar,
     cast,
+    get_origin,
     get_type_hints,
     overload,
     runtime_checkable,
@@ -50,10 +53,29 @@ async def __call__(
     ) -> ProducesT: ...
 
 
-# NOTE: this works on concrete types and not inheritance
 # TODO: Use a protocol for the outer function to check checked arg names
 
 
+def _target_classes(types: Sequence[Type[Any]]) -> Tuple[Type[Any], ...]:
+    """The types that can be used with isinstance, so that instances of their
+    subclasses are accepted too."""
+    return tuple(t for t in types if isinstance(t, type) and get_origin(t) is None)
+
+
+def _set_dispatch_attributes(
+    handler: Any,
+    func: Callable[..., Coroutine[Any, Any, Any]],
+    match: None | Callable[[Any, MessageContext], bool],
+    *,
+    handles_rpc: bool | None,
+) -> None:
+    """Attach what :class:`RoutedAgent` needs to build its dispatch table without
+    going through the generic router and the runtime type checks of the wrapper."""
+    handler.internal_unchecked_call = func
+    handler.internal_match = match
+    handler.internal_handles_rpc = handles_rpc
+
+
 @overload
 def message_handler(
     func: Callable[[AgentT, ReceivesT, MessageContext], Coroutine[Any, Any, ProducesT]],
@@ -143,13 +165,18 @@ def decorator(
         if return_types is None:
             raise AssertionError("Return type not found")
 
+        target_classes = _target_classes(target_types)
+        return_classes = _target_classes(return_types)
+
         # Convert target_types to list and stash
 
         @wraps(func)
         async def wrapper(
             self: AgentT, message: ReceivesT, ctx: MessageContext
         ) -> ProducesT:
-            if type(message) not in target_types:
+            if type(message) not in target_types and not isinstance(
+                message, target_classes
+            ):
                 if strict:
                     raise CantHandleException(
                         f"Message type {type(message)} not in target types {target_types}"
@@ -161,7 +188,11 @@ async def wrapper(
 
             return_value = await func(self, message, ctx)
 
-            if AnyType not in return_types and type(return_value) not in return_types:
+            if (
+                AnyType not in return_types
+                and type(return_value) not in return_types
+                and not isinstance(return_value, return_classes)
+            ):
                 if strict:
                     raise ValueError(
                         f"Return type {type(return_value)} not in return types {return_types}"
@@ -178,6 +209,7 @@ async def wrapper(
         wrapper_handler.produces_types = list(return_types)
         wrapper_handler.is_message_handler = True
         wrapper_handler.router = match or (lambda _message, _ctx: True)
+        _set_dispatch_attributes(wrapper_handler, func, match, handles_rpc=None)
 
         return wrapper_handler
 
@@ -278,13 +310,17 @@ def decorator(
                 "Return type not found. Please use `None` as the type hint of the return type."
             )
 
+        target_classes = _target_classes(target_types)
+
         # Convert target_types to list and stash
 
         @wraps(func)
         async def wrapper(
             self: AgentT, message: ReceivesT, ctx: MessageContext
         ) -> None:
-            if type(message) not in target_types:
+            if type(message) not in target_types and not isinstance(
+                message, target_classes
+            ):
                 if strict:
                     raise CantHandleException(
                         f"Message type {type(message)} not in target types {target_types}"
@@ -314,6 +350,7 @@ async def wrapper(
         wrapper_handler.router = lambda _message, _ctx: (not _ctx.is_rpc) and (
             match(_message, _ctx) if match else True
         )
+        _set_dispatch_attributes(wrapper_handler, func, match, handles_rpc=False)
 
         return wrapper_handler
 
@@ -414,13 +451,18 @@ def decorator(
         if return_types is None:
             raise AssertionError("Return type not found")
 
+        target_classes = _target_classes(target_types)
+        return_classes = _target_classes(return_types)
+
         # Convert target_types to list and stash
 
         @wraps(func)
         async def wrapper(
             self: AgentT, message: ReceivesT, ctx: MessageContext
         ) -> ProducesT:
-            if type(message) not in target_types:
+            if type(message) not in target_types and not isinstance(
+                message, target_classes
+            ):
                 if strict:
                     raise CantHandleException(
                         f"Message type {type(message)} not in target types {target_types}"
@@ -432,7 +474,11 @@ async def wrapper(
 
             return_value = await func(self, message, ctx)
 
-            if AnyType not in return_types and type(return_value) not in return_types:
+            if (
+                AnyType not in return_types
+                and type(return_value) not in return_types
+                and not isinstance(return_value, return_classes)
+            ):
                 if strict:
                     raise ValueError(
                         f"Return type {type(return_value)} not in return types {return_types}"
@@ -451,6 +497,7 @@ async def wrapper(
         wrapper_handler.router = lambda _message, _ctx: (_ctx.is_rpc) and (
             match(_message, _ctx) if match else True
         )
+        _set_dispatch_attributes(wrapper_handler, func, match, handles_rpc=True)
 
         return wrapper_handler
 
@@ -462,6 +509,14 @@ async def wrapper(
         raise ValueError("Invalid arguments")
 
 
+_Route = Tuple[
+    Callable[[Any, MessageContext], bool] | None,
+    Callable[[Any, Any, MessageContext], Coroutine[Any, Any, Any]],
+]
+"""A match function, or ``None`` if the handler accepts every message of its type,
+and the function to call for a message."""
+
+
 class RoutedAgent(BaseAgent):
     """A base class for agents that route messages to handlers based on the type of the message
     and optional matching functions.
@@ -469,6 +524,18 @@ class RoutedAgent(BaseAgent):
     To create a routed agent, subclass this class and add message handlers as methods decorated with
     either :func:`event` or :func:`rpc` decorator.
 
+    A message is routed to the handlers of its type first, then to the handlers of its base classes
+    in method resolution order. The routes are computed once per class and message type.
+
+    By default, the handlers check the types of messages and return values on every call. Pass
+    ``runtime_type_checks=False`` as a class keyword argument to skip these checks, for example
+    in production. The handler type hints are still validated once, when the handlers are defined
+    and when the agent is registered.
+
+    .. code-block:: python
+
+        class MyFastAgent(RoutedAgent, runtime_type_checks=False): ...
+
     Example:
 
     .. code-block:: python
@@ -507,32 +574,50 @@ async def handle_special_rpc_message(self, message: MessageWithContent, ctx: Mes
                 return Response()
     """
 
-    def __init__(self, description: str) -> None:
-        # Self is already bound to the handlers
-        self._handlers: DefaultDict[
-            Type[Any],
-            List[MessageHandler[RoutedAgent, Any, Any]],
-        ] = DefaultDict(list)
-
-        handlers = self._discover_handlers()
-        for message_handler in handlers:
+    internal_message_handlers: ClassVar[Sequence[MessageHandler[Any, Any, Any]]] = []
+    """:meta private:"""
+    internal_handler_table: ClassVar[
+        Dict[Type[Any], List[MessageHandler[Any, Any, Any]]]
+    ] = {}
+    """:meta private:"""
+    internal_dispatch_table: ClassVar[Dict[Tuple[Type[Any], bool], List[_Route]]] = {}
+    """:meta private:"""
+    internal_runtime_type_checks: ClassVar[bool] = True
+    """:meta private:"""
+
+    def __init_subclass__(
+        cls, *, runtime_type_checks: bool | None = None, **kwargs: Any
+    ) -> None:
+        super().__init_subclass__(**kwargs)
+        if runtime_type_checks is not None:
+            cls.internal_runtime_type_checks = runtime_type_checks
+        # Discover the handlers once per class rather than on every instantiation.
+        cls.internal_message_handlers = cls._discover_handlers()
+        handler_table: DefaultDict[Type[Any], List[MessageHandler[Any, Any, Any]]] = (
+            DefaultDict(list)
+        )
+        for message_handler in cls.internal_message_handlers:
             for target_type in message_handler.target_types:
-                self._handlers[target_type].append(message_handler)
+                handler_table[target_type].append(message_handler)
+        cls.internal_handler_table = dict(handler_table)
+        # Filled in lazily for every message type and RPC flag the agent receives.
+        cls.internal_dispatch_table = {}
 
+    def __init__(self, description: str) -> None:
         super().__init__(description)
 
     async def on_message_impl(self, message: Any, ctx: MessageContext) -> Any | None:
         """Handle a message by routing it to the appropriate message handler.
         Do not override this method in subclasses. Instead, add message handlers as methods decorated with
         either the :func:`event` or :func:`rpc` decorator."""
-        key_type: Type[Any] = type(message)  # type: ignore
-        handlers = self._handlers.get(key_type)  # type: ignore
-        if handlers is not None:
-            # Iterate over all handlers for this matching message type.
-            # Call the first handler whose router returns True and then return the result.
-            for h in handlers:
-                if h.router(message, ctx):
-                    return await h(self, message, ctx)
+        key = (type(message), ctx.is_rpc)
+        routes = self.internal_dispatch_table.get(key)
+        if routes is None:
+            routes = self._compile_routes(*key)
+        # Call the first handler whose match function returns True and then return the result.
+        for match, call in routes:
+            if match is None or match(message, ctx):
+                return await call(self, message, ctx)
         return await self.on_unhandled_message(message, ctx)  # type: ignore
 
     async def on_unhandled_message(self, message: Any, ctx: MessageContext) -> None:
@@ -540,6 +625,32 @@ async def on_unhandled_message(self, message: Any, ctx: MessageContext) -> None:
         The default implementation logs an info message."""
         logger.info(f"Unhandled message: {message}")
 
+    @classmethod
+    def _compile_routes(cls, message_type: Type[Any], is_rpc: bool) -> List[_Route]:
+        """Build and cache the handlers that can receive a message of the given type.
+
+        Handlers of the message type come first, followed by the handlers of its base
+        classes in method resolution order, so subclasses of a handled message type
+        are routed without a miss."""
+        routes: List[_Route] = []
+        for base in message_type.__mro__:
+            for handler in cls.internal_handler_table.get(base, []):
+                if not hasattr(handler, "internal_handles_rpc"):
+                    # A handler not created by the decorators of this module.
+                    routes.append((handler.router, handler))
+                    continue
+                handles_rpc: bool | None = handler.internal_handles_rpc  # type: ignore
+                if handles_rpc is not None and handles_rpc != is_rpc:
+                    continue
+                call = (
+                    handler
+                    if cls.internal_runtime_type_checks
+                    else handler.internal_unchecked_call  # type: ignore
+                )
+                routes.append((handler.internal_match, call))  # type: ignore
+        cls.internal_dispatch_table[(message_type, is_rpc)] = routes
+        return routes
+
     @classmethod
     def _discover_handlers(cls) -> Sequence[MessageHandler[Any, Any, Any]]:
         handlers: List[MessageHandler[Any, Any, Any]] = []
@@ -554,7 +665,7 @@ def _discover_handlers(cls) -> Sequence[MessageHandler[Any, Any, Any]]:
     @classmethod
     def _handles_types(cls) -> List[Tuple[Type[Any], List[MessageSerializer[Any]]]]:
         # TODO handle deduplication
-        handlers = cls._discover_handlers()
+        handlers = cls.internal_message_handlers
         types: List[Tuple[Type[Any], List[MessageSerializer[Any]]]] = []
         types.extend(cls.internal_extra_handles_types)
         for handler in handlers:
@@ -1,11 +1,17 @@
-from collections import defaultdict
-from typing import Awaitable, Callable, DefaultDict, List, Set
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Set, Tuple
 
 from ._agent import Agent
 from ._agent_id import AgentId
 from ._agent_type import AgentType
 from ._subscription import Subscription
 from ._topic import TopicId
+from ._type_prefix_subscription import TypePrefixSubscription
+from ._type_subscription import TypeSubscription
 
 
 async def get_impl(
@@ -29,50 +35,280 @@ async def get_impl(
     return id
 
 
+class AgentMailboxes:
+    """Tracks the deliveries in progress for each agent and optionally limits how many
+    messages each agent handles concurrently.
+
+    Every agent gets its own mailbox: once ``max_concurrency`` of its deliveries are in
+    progress, further deliveries to that agent wait in arrival order while deliveries to
+    other agents proceed. Mailboxes are dropped once they are idle, so agents that are
+    created per session do not accumulate state.
+
+    Args:
+        max_concurrency (int | None): Maximum concurrent deliveries per agent. ``None``
+            disables the limit.
+    """
+
+    def __init__(self, max_concurrency: int | None) -> None:
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self._max_concurrency = max_concurrency
+        # agent id -> (semaphore, number of deliveries holding or waiting for it)
+        self._mailboxes: Dict[AgentId, Tuple[asyncio.Semaphore | None, int]] = {}
+        self._waiting = 0
+
+    @property
+    def waiting_count(self) -> int:
+        """Number of deliveries waiting for their agent to have capacity."""
+        return self._waiting
+
+    def in_use(self, agent_id: AgentId) -> bool:
+        """Whether any delivery to the agent is in progress or waiting."""
+        return agent_id in self._mailboxes
+
+    @contextlib.asynccontextmanager
+    async def slot(self, agent_id: AgentId) -> AsyncIterator[None]:
+        semaphore, users = self._mailboxes.get(agent_id, (None, 0))
+        if semaphore is None and self._max_concurrency is not None:
+            semaphore = asyncio.Semaphore(self._max_concurrency)
+        self._mailboxes[agent_id] = (semaphore, users + 1)
+        try:
+            if semaphore is None:
+                yield
+                return
+            if semaphore.locked():
+                self._waiting += 1
+                try:
+                    await semaphore.acquire()
+                finally:
+                    self._waiting -= 1
+            else:
+                await semaphore.acquire()
+            try:
+                yield
+            finally:
+                semaphore.release()
+        finally:
+            semaphore, users = self._mailboxes[agent_id]
+            if users == 1:
+                del self._mailboxes[agent_id]
+            else:
+                self._mailboxes[agent_id] = (semaphore, users - 1)
+
+
+def _is_plain_type_subscription(subscription: Subscription) -> bool:
+    # Subclasses that override the matching logic cannot be indexed by topic type.
+    cls = type(subscription)
+    return (
+        isinstance(subscription, TypeSubscription)
+        and cls.is_match is TypeSubscription.is_match
+        and cls.map_to_agent is TypeSubscription.map_to_agent
+    )
+
+
+def _is_plain_type_prefix_subscription(subscription: Subscription) -> bool:
+    cls = type(subscription)
+    return (
+        isinstance(subscription, TypePrefixSubscription)
+        and cls.is_match is TypePrefixSubscription.is_match
+        and cls.map_to_agent is TypePrefixSubscription.map_to_agent
+    )
+
+
+# A subscription paired with the order in which it was added, so that matches
+# coming from different indexes can be merged back into registration order.
+_OrderedSubscription = Tuple[int, Subscription]
+
+
+class _PrefixTrieNode:
+    __slots__ = ("children", "subscriptions")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _PrefixTrieNode] = {}
+        self.subscriptions: List[_OrderedSubscription] = []
+
+
+class _PrefixTrie:
+    """Maps topic type prefixes to the subscriptions registered for them."""
+
+    def __init__(self) -> None:
+        self._root = _PrefixTrieNode()
+
+    def add(self, prefix: str, entry: _OrderedSubscription) -> None:
+        node = self._root
+        for char in prefix:
+            node = node.children.setdefault(char, _PrefixTrieNode())
+        node.subscriptions.append(entry)
+
+    def remove(self, prefix: str, subscription_id: str) -> None:
+        path: List[Tuple[_PrefixTrieNode, str]] = []
+        node = self._root
+        for char in prefix:
+            child = node.children.get(char)
+            if child is None:
+                return
+            path.append((node, char))
+            node = child
+        node.subscriptions = [
+            entry for entry in node.subscriptions if entry[1].id != subscription_id
+        ]
+        # Prune branches that no longer lead to any subscription.
+        while path and not node.subscriptions and not node.children:
+            parent, char = path.pop()
+            del parent.children[char]
+            node = parent
+
+    def matches(self, topic_type: str) -> List[_OrderedSubscription]:
+        """Return every subscription whose prefix is a prefix of ``topic_type``."""
+        node = self._root
+        result: List[_OrderedSubscription] = list(node.subscriptions)
+        for char in topic_type:
+            child = node.children.get(char)
+            if child is None:
+                break
+            node = child
+            result.extend(node.subscriptions)
+        return result
+
+
 class SubscriptionManager:
+    """Resolves topics to the agents subscribed to them.
+
+    Subscriptions are indexed by kind so that neither registering a subscription nor
+    resolving a new topic requires testing every subscription against every topic:
+
+    - :class:`~autogen_core.TypeSubscription` is indexed by its exact topic type.
+    - :class:`~autogen_core.TypePrefixSubscription` is indexed in a prefix trie.
+    - Any other :class:`~autogen_core.Subscription` falls back to a linear scan.
+
+    Recipients of topics that have already been seen are updated when subscriptions are
+    added or removed. The lists returned by :meth:`get_subscribed_recipients` are replaced
+    rather than changed in place, so callers can iterate them while subscriptions change.
+    """
+
     def __init__(self) -> None:
-        self._subscriptions: List[Subscription] = []
-        self._seen_topics: Set[TopicId] = set()
-        self._subscribed_recipients: DefaultDict[TopicId, List[AgentId]] = defaultdict(
-            list
-        )
+        self._subscriptions_by_id: Dict[str, _OrderedSubscription] = {}
+        self._type_index: Dict[str, Dict[str, _OrderedSubscription]] = {}
+        self._type_keys: Set[Tuple[str, str]] = set()
+        self._prefix_trie = _PrefixTrie()
+        self._prefix_keys: Set[Tuple[str, str]] = set()
+        self._generic_subscriptions: Dict[str, _OrderedSubscription] = {}
+        self._seen_topics: Dict[str, Set[TopicId]] = {}
+        self._subscribed_recipients: Dict[TopicId, List[AgentId]] = {}
+        self._counter = itertools.count()
+
+    @property
+    def _subscriptions(self) -> List[Subscription]:
+        return [sub for _, sub in self._subscriptions_by_id.values()]
 
     async def add_subscription(self, subscription: Subscription) -> None:
         # Check if the subscription already exists
-        if any(sub == subscription for sub in self._subscriptions):
+        if self._contains(subscription):
             raise ValueError("Subscription already exists")
 
-        self._subscriptions.append(subscription)
-        self._rebuild_subscriptions(self._seen_topics)
+        entry = (next(self._counter), subscription)
+        self._subscriptions_by_id[subscription.id] = entry
+        if _is_plain_type_subscription(subscription):
+            assert isinstance(subscription, TypeSubscription)
+            self._type_index.setdefault(subscription.topic_type, {})[
+                subscription.id
+            ] = entry
+            self._type_keys.add((subscription.topic_type, subscription.agent_type))
+            affected = self._seen_topics.get(subscription.topic_type, set())
+        elif _is_plain_type_prefix_subscription(subscription):
+            assert isinstance(subscription, TypePrefixSubscription)
+            prefix = subscription.topic_type_prefix
+            self._prefix_trie.add(prefix, entry)
+            self._prefix_keys.add((prefix, subscription.agent_type))
+            affected = set()
+            for topic_type, topics in self._seen_topics.items():
+                if topic_type.startswith(prefix):
+                    affected |= topics
+        else:
+            self._generic_subscriptions[subscription.id] = entry
+            affected = set()
+            for topics in self._seen_topics.values():
+                affected.update(
+                    topic for topic in topics if subscription.is_match(topic)
+                )
+
+        # The new subscription is the most recent one, so appending keeps the
+        # recipients in registration order.
+        for topic in affected:
+            self._subscribed_recipients[topic] = [
+                *self._subscribed_recipients[topic],
+                subscription.map_to_agent(topic),
+            ]
 
     async def remove_subscription(self, id: str) -> None:
         # Check if the subscription exists
-        if not any(sub.id == id for sub in self._subscriptions):
+        entry = self._subscriptions_by_id.pop(id, None)
+        if entry is None:
             raise ValueError("Subscription does not exist")
 
-        def is_not_sub(x: Subscription) -> bool:
-            return x.id != id
-
-        self._subscriptions = list(filter(is_not_sub, self._subscriptions))
+        subscription = entry[1]
+        if _is_plain_type_subscription(subscription):
+            assert isinstance(subscription, TypeSubscription)
+            by_id = self._type_index[subscription.topic_type]
+            del by_id[id]
+            if not by_id:
+                del self._type_index[subscription.topic_type]
+            self._type_keys.discard((subscription.topic_type, subscription.agent_type))
+            affected = self._seen_topics.get(subscription.topic_type, set())
+        elif _is_plain_type_prefix_subscription(subscription):
+            assert isinstance(subscription, TypePrefixSubscription)
+            prefix = subscription.topic_type_prefix
+            self._prefix_trie.remove(prefix, id)
+            self._prefix_keys.discard((prefix, subscription.agent_type))
+            affected = set()
+            for topic_type, topics in self._seen_topics.items():
+                if topic_type.startswith(prefix):
+                    affected |= topics
+        else:
+            del self._generic_subscriptions[id]
+            affected = set()
+            for topics in self._seen_topics.values():
+                affected.update(
+                    topic for topic in topics if subscription.is_match(topic)
+                )
 
-        # Rebuild the subscriptions
-        self._rebuild_subscriptions(self._seen_topics)
+        for topic in affected:
+            self._subscribed_recipients[topic] = self._build_recipients(topic)
 
     async def get_subscribed_recipients(self, topic: TopicId) -> List[AgentId]:
-        if topic not in self._seen_topics:
-            self._build_for_new_topic(topic)
-        return self._subscribed_recipients[topic]
-
-    # TODO: optimize this...
-    def _rebuild_subscriptions(self, topics: Set[TopicId]) -> None:
-        self._subscribed_recipients.clear()
-        for topic in topics:
-            self._build_for_new_topic(topic)
-
-    def _build_for_new_topic(self, topic: TopicId) -> None:
-        self._seen_topics.add(topic)
-        for subscription in self._subscriptions:
-            if subscription.is_match(topic):
-                self._subscribed_recipients[topic].append(
-                    subscription.map_to_agent(topic)
-                )
+        recipients = self._subscribed_recipients.get(topic)
+        if recipients is None:
+            recipients = self._build_for_new_topic(topic)
+        return recipients
+
+    def _contains(self, subscription: Subscription) -> bool:
+        if subscription.id in self._subscriptions_by_id:
+            return True
+        # Equality is defined by the existing subscription, mirror `sub == subscription`.
+        if any(sub == subscription for _, sub in self._generic_subscriptions.values()):
+            return True
+        if isinstance(subscription, TypeSubscription):
+            return (subscription.topic_type, subscription.agent_type) in self._type_keys
+        if isinstance(subscription, TypePrefixSubscription):
+            key = (subscription.topic_type_prefix, subscription.agent_type)
+            return key in self._prefix_keys
+        return False
+
+    def _build_for_new_topic(self, topic: TopicId) -> List[AgentId]:
+        self._seen_topics.setdefault(topic.type, set()).add(topic)
+        recipients = self._build_recipients(topic)
+        self._subscribed_recipients[topic] = recipients
+        return recipients
+
+    def _build_recipients(self, topic: TopicId) -> List[AgentId]:
+        candidates: List[_OrderedSubscription] = list(
+            self._type_index.get(topic.type, {}).values()
+        )
+        candidates.extend(self._prefix_trie.matches(topic.type))
+        candidates.extend(
+            entry
+            for entry in self._generic_subscriptions.values()
+            if entry[1].is_match(topic)
+        )
+        candidates.sort(key=lambda entry: entry[0])
+        return [sub.map_to_agent(topic) for _, sub in candidates]
@@ -1,5 +1,7 @@
 import json
-from dataclasses import asdict, dataclass, fields
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, fields
 from typing import (
     Any,
     ClassVar,
@@ -7,6 +9,7 @@
     List,
     Protocol,
     Sequence,
+    Tuple,
     TypeVar,
     cast,
     get_args,
@@ -16,10 +19,20 @@
 
 from google.protobuf import any_pb2
 from google.protobuf.message import Message
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from ._type_helpers import is_union
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgpack  # type: ignore[import-untyped]
+except ImportError:
+    msgpack = None
+
 T = TypeVar("T")
 
 
@@ -35,6 +48,17 @@ def deserialize(self, payload: bytes) -> T: ...
     def serialize(self, message: T) -> bytes: ...
 
 
+@runtime_checkable
+class AnyMessageSerializer(Protocol[T]):
+    """A serializer of protobuf payloads that converts messages to and from a
+    ``google.protobuf.Any`` directly, so runtimes that carry the ``Any`` in their own
+    protobuf messages do not encode the payload to bytes and parse it back."""
+
+    def to_any(self, message: T) -> any_pb2.Any: ...
+
+    def from_any(self, payload: any_pb2.Any) -> T: ...
+
+
 @runtime_checkable
 class IsDataclass(Protocol):
     # as already noted in comments, checking for this attribute is currently
@@ -101,6 +125,50 @@ def has_nested_base_model_in_type(tp: Any) -> bool:
     return False
 
 
+def has_nested_message_type(cls: type[IsDataclass]) -> bool:
+    """Check if any field of the dataclass, or any argument of a generic field type such as
+    ``List[...]``, is a dataclass, a base model or another type with a Pydantic schema such
+    as :class:`~autogen_core.Image`, which has to be rebuilt on deserialization."""
+    return any(_is_or_contains_message_type(f.type) for f in fields(cls))
+
+
+def _is_or_contains_message_type(tp: Any) -> bool:
+    if isinstance(tp, type) and (
+        is_dataclass(tp) or hasattr(tp, "__get_pydantic_core_schema__")
+    ):
+        return True
+    return any(_is_or_contains_message_type(arg) for arg in get_args(tp))
+
+
+_type_adapters: Dict[Any, TypeAdapter[Any]] = {}
+
+
+def _type_adapter(cls: Any) -> TypeAdapter[Any]:
+    adapter = _type_adapters.get(cls)
+    if adapter is None:
+        adapter = _type_adapters[cls] = TypeAdapter(cls)
+    return adapter
+
+
+_dataclass_field_names: Dict[type[Any], Tuple[str, ...]] = {}
+
+
+def _to_builtins(obj: Any) -> Any:
+    """Convert a value that orjson or msgpack cannot encode natively. Nested dataclasses are
+    converted one level at a time, without the deep copy made by :func:`dataclasses.asdict`.
+    """
+    cls = type(obj)
+    names = _dataclass_field_names.get(cls)
+    if names is None and is_dataclass(cls):
+        names = _dataclass_field_names[cls] = tuple(f.name for f in fields(obj))
+    if names is not None:
+        return {name: getattr(obj, name) for name in names}
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    # Types that define their own pydantic schema, such as Image.
+    return _type_adapter(cls).dump_python(obj, mode="json")
+
+
 DataclassT = TypeVar("DataclassT", bound=IsDataclass)
 
 JSON_DATA_CONTENT_TYPE = "application/json"
@@ -110,20 +178,27 @@ def has_nested_base_model_in_type(tp: Any) -> bool:
 PROTOBUF_DATA_CONTENT_TYPE = "application/x-protobuf"
 """Protobuf data content type"""
 
+MSGPACK_DATA_CONTENT_TYPE = "application/msgpack"
+"""MessagePack data content type"""
+
 
 class DataclassJsonMessageSerializer(MessageSerializer[DataclassT]):
+    """Serializes dataclasses to JSON. Fields can be nested dataclasses and Pydantic models.
+
+    When `orjson <https://github.com/ijl/orjson>`_ is installed, for example with
+    ``pip install "autogen-core[fast-json]"``, it is used to encode and decode the payload.
+    Otherwise the payload is encoded with Pydantic and decoded with the standard library
+    :mod:`json` module.
+    """
+
     def __init__(self, cls: type[DataclassT]) -> None:
         if contains_a_union(cls):
             raise ValueError(
                 "Dataclass has a union type, which is not supported. To use a union, use a Pydantic model"
             )
 
-        if has_nested_dataclass(cls) or has_nested_base_model(cls):
-            raise ValueError(
-                "Dataclass has nested dataclasses or base models, which are not supported. To use nested types, use a Pydantic model"
-            )
-
         self.cls = cls
+        self._nested = has_nested_message_type(cls)
 
     @property
     def data_content_type(self) -> str:
@@ -134,11 +209,19 @@ def type_name(self) -> str:
         return _type_name(self.cls)
 
     def deserialize(self, payload: bytes) -> DataclassT:
+        if self._nested:
+            return cast(DataclassT, _type_adapter(self.cls).validate_json(payload))
+        if orjson is not None:
+            return self.cls(**orjson.loads(payload))
         message_str = payload.decode("utf-8")
         return self.cls(**json.loads(message_str))
 
     def serialize(self, message: DataclassT) -> bytes:
-        return json.dumps(asdict(message)).encode("utf-8")
+        if orjson is not None:
+            return orjson.dumps(
+                message, default=_to_builtins, option=orjson.OPT_NON_STR_KEYS
+            )
+        return _type_adapter(self.cls).dump_json(message)
 
 
 PydanticT = TypeVar("PydanticT", bound=BaseModel)
@@ -164,6 +247,56 @@ def serialize(self, message: PydanticT) -> bytes:
         return message.model_dump_json().encode("utf-8")
 
 
+MessagePackT = TypeVar("MessagePackT", bound=IsDataclass | BaseModel)
+
+
+class MessagePackMessageSerializer(MessageSerializer[MessagePackT]):
+    """Serializes dataclasses and Pydantic models to `MessagePack <https://msgpack.org>`_,
+    a binary format that is more compact and faster to encode than JSON.
+
+    Requires the ``msgpack`` package, which can be installed with ``pip install "autogen-core[msgpack]"``.
+    When it is installed, :func:`try_get_known_serializers_for_type` returns this serializer
+    alongside the JSON serializer of dataclasses and Pydantic models.
+    """
+
+    def __init__(self, cls: type[MessagePackT]) -> None:
+        if msgpack is None:
+            raise ImportError(
+                "The msgpack package is required for MessagePack serialization. "
+                "Install it with `pip install msgpack`."
+            )
+        if is_dataclass(cls) and contains_a_union(cast(type[IsDataclass], cls)):
+            raise ValueError(
+                "Dataclass has a union type, which is not supported. To use a union, use a Pydantic model"
+            )
+        self.cls = cls
+        self._is_base_model = issubclass(cls, BaseModel)
+        self._nested = not self._is_base_model and has_nested_message_type(
+            cast(type[IsDataclass], cls)
+        )
+
+    @property
+    def data_content_type(self) -> str:
+        return MSGPACK_DATA_CONTENT_TYPE
+
+    @property
+    def type_name(self) -> str:
+        return _type_name(self.cls)
+
+    def deserialize(self, payload: bytes) -> MessagePackT:
+        data = msgpack.unpackb(payload)
+        if self._is_base_model:
+            return cast(
+                MessagePackT, cast(type[BaseModel], self.cls).model_validate(data)
+            )
+        if self._nested:
+            return cast(MessagePackT, _type_adapter(self.cls).validate_python(data))
+        return cast(MessagePackT, self.cls(**data))
+
+    def serialize(self, message: MessagePackT) -> bytes:
+        return cast(bytes, msgpack.packb(message, default=_to_builtins))
+
+
 ProtobufT = TypeVar("ProtobufT", bound=Message)
 
 
@@ -184,19 +317,24 @@ def deserialize(self, payload: bytes) -> ProtobufT:
         # Parse payload into a proto any
         any_proto = any_pb2.Any()
         any_proto.ParseFromString(payload)
+        return self.from_any(any_proto)
 
+    def serialize(self, message: ProtobufT) -> bytes:
+        return self.to_any(message).SerializeToString()
+
+    def to_any(self, message: ProtobufT) -> any_pb2.Any:
+        any_proto = any_pb2.Any()
+        any_proto.Pack(message)  # type: ignore
+        return any_proto
+
+    def from_any(self, payload: any_pb2.Any) -> ProtobufT:
         destination_message = self.cls()
 
-        if not any_proto.Unpack(destination_message):  # type: ignore
+        if not payload.Unpack(destination_message):  # type: ignore
             raise ValueError(f"Failed to unpack payload into {self.cls}")
 
         return destination_message
 
-    def serialize(self, message: ProtobufT) -> bytes:
-        any_proto = any_pb2.Any()
-        any_proto.Pack(message)  # type: ignore
-        return any_proto.SerializeToString()
-
 
 @dataclass
 class UnknownPayload:
@@ -216,25 +354,95 @@ def _type_name(cls: type[Any] | Any) -> str:
 
 
 def try_get_known_serializers_for_type(cls: type[Any]) -> list[MessageSerializer[Any]]:
-    """:meta private:"""
+    """:meta private:
+
+    The result depends on the installed extras: a MessagePack serializer is only added
+    for pydantic models and dataclasses when the ``msgpack`` extra is installed, and the
+    dataclass JSON serializer uses ``orjson`` when the ``fast-json`` extra is installed.
+    The JSON serializer always comes first, so the default content type does not change.
+    """
 
     serializers: List[MessageSerializer[Any]] = []
     if issubclass(cls, BaseModel):
         serializers.append(PydanticJsonMessageSerializer(cls))
+        if msgpack is not None:
+            serializers.append(MessagePackMessageSerializer(cls))
     elif is_dataclass(cls):
         serializers.append(DataclassJsonMessageSerializer(cls))
+        if msgpack is not None:
+            serializers.append(MessagePackMessageSerializer(cls))
     elif issubclass(cls, Message):
         serializers.append(ProtobufMessageSerializer(cls))
 
     return serializers
 
 
-class SerializationRegistry:
-    """:meta private:"""
+class PayloadCache:
+    """:meta private:
+
+    The serialized payloads of the message of one envelope, so that the consumers that need
+    its bytes while it is delivered (logging, tracing, the wire) encode it once per content
+    type. Payloads are only reused while the envelope carries the same message object, so a
+    message replaced by an intervention handler is serialized again.
+    """
+
+    __slots__ = ("_message", "_payloads")
 
     def __init__(self) -> None:
+        self._message: Any = None
+        self._payloads: Dict[Tuple[str, str], bytes] = {}
+
+    def get(self, message: Any, key: Tuple[str, str]) -> bytes | None:
+        if self._message is not message:
+            return None
+        return self._payloads.get(key)
+
+    def put(self, message: Any, key: Tuple[str, str], payload: bytes) -> None:
+        if self._message is not message:
+            self._message = message
+            self._payloads = {}
+        self._payloads[key] = payload
+
+
+class SerializationRegistry:
+    """:meta private:
+
+    :meth:`serialize` reuses the payloads in the :class:`PayloadCache` of the envelope it is
+    given. Serialized payloads can also be cached across envelopes, by message identity and
+    content type for as long as the message object is alive, so a message sent or published
+    several times is encoded once. That cache does not notice changes to a message, so only
+    enable it if messages are not modified once they have been sent or published. Messages
+    that do not support weak references, such as protobuf messages, are not cached across
+    envelopes.
+
+    Args:
+        max_cached_messages (int): The maximum number of messages to keep serialized payloads for.
+            The least recently serialized messages are evicted first. Defaults to 0, which disables
+            the cache.
+    """
+
+    def __init__(self, max_cached_messages: int = 0) -> None:
         # type_name, data_content_type -> serializer
         self._serializers: dict[tuple[str, str], MessageSerializer[Any]] = {}
+        # type_name -> protobuf serializer that converts to and from Any directly
+        self._any_serializers: dict[str, AnyMessageSerializer[Any]] = {}
+        # id(message) -> (weak reference to the message, (type_name, data_content_type) -> payload)
+        self._payload_cache: OrderedDict[
+            int, Tuple[weakref.ref[Any], Dict[Tuple[str, str], bytes]]
+        ] = OrderedDict()
+        self._max_cached_messages = max_cached_messages
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    @property
+    def cache_hits(self) -> int:
+        """The number of serializations answered from a payload cache."""
+        return self._cache_hits
+
+    @property
+    def cache_misses(self) -> int:
+        """The number of serializations that had to encode the message."""
+        return self._cache_misses
 
     def add_serializer(
         self, serializer: MessageSerializer[Any] | Sequence[MessageSerializer[Any]]
@@ -247,6 +455,13 @@ def add_serializer(
         self._serializers[(serializer.type_name, serializer.data_content_type)] = (
             serializer
         )
+        if serializer.data_content_type == PROTOBUF_DATA_CONTENT_TYPE:
+            if isinstance(serializer, AnyMessageSerializer):
+                self._any_serializers[serializer.type_name] = cast(
+                    AnyMessageSerializer[Any], serializer
+                )
+            else:
+                self._any_serializers.pop(serializer.type_name, None)
 
     def deserialize(
         self, payload: bytes, *, type_name: str, data_content_type: str
@@ -258,15 +473,94 @@ def deserialize(
         return serializer.deserialize(payload)
 
     def serialize(
-        self, message: Any, *, type_name: str, data_content_type: str
+        self,
+        message: Any,
+        *,
+        type_name: str,
+        data_content_type: str,
+        payload_cache: PayloadCache | None = None,
     ) -> bytes:
-        serializer = self._serializers.get((type_name, data_content_type))
+        key = (type_name, data_content_type)
+        if payload_cache is not None:
+            payload = payload_cache.get(message, key)
+            if payload is not None:
+                self._cache_hits += 1
+                return payload
+        entry = self._payload_cache.get(id(message))
+        if entry is not None and entry[0]() is message:
+            payload = entry[1].get(key)
+            if payload is not None:
+                self._cache_hits += 1
+                if payload_cache is not None:
+                    payload_cache.put(message, key, payload)
+                return payload
+
+        serializer = self._serializers.get(key)
         if serializer is None:
             raise ValueError(
                 f"Unknown type {type_name} with content type {data_content_type}"
             )
 
-        return serializer.serialize(message)
+        payload = serializer.serialize(message)
+        self._cache_misses += 1
+        if payload_cache is not None:
+            payload_cache.put(message, key, payload)
+        if self._max_cached_messages > 0:
+            self._cache_payload(message, key, payload)
+        return payload
+
+    def serialize_to_any(self, message: Any, *, type_name: str) -> any_pb2.Any:
+        """Serialize a protobuf payload to a ``google.protobuf.Any``, without encoding it to
+        bytes if its serializer is an :class:`AnyMessageSerializer`."""
+        serializer = self._any_serializers.get(type_name)
+        if serializer is not None:
+            return serializer.to_any(message)
+        any_proto = any_pb2.Any()
+        any_proto.ParseFromString(
+            self.serialize(
+                message,
+                type_name=type_name,
+                data_content_type=PROTOBUF_DATA_CONTENT_TYPE,
+            )
+        )
+        return any_proto
+
+    def deserialize_from_any(self, payload: any_pb2.Any, *, type_name: str) -> Any:
+        """Deserialize a protobuf payload from a ``google.protobuf.Any``, without encoding it
+        to bytes if its serializer is an :class:`AnyMessageSerializer`."""
+        serializer = self._any_serializers.get(type_name)
+        if serializer is not None:
+            return serializer.from_any(payload)
+        return self.deserialize(
+            payload.SerializeToString(),
+            type_name=type_name,
+            data_content_type=PROTOBUF_DATA_CONTENT_TYPE,
+        )
+
+    def _cache_payload(
+        self, message: Any, key: Tuple[str, str], payload: bytes
+    ) -> None:
+        message_id = id(message)
+        entry = self._payload_cache.get(message_id)
+        if entry is None or entry[0]() is not message:
+            cache = self._payload_cache
+
+            def evict(ref: weakref.ref[Any]) -> None:
+                current = cache.get(message_id)
+                if current is not None and current[0] is ref:
+                    del cache[message_id]
+
+            try:
+                entry = (weakref.ref(message, evict), {})
+            except TypeError:
+                # The message does not support weak references.
+                return
+            self._payload_cache[message_id] = entry
+            while len(self._payload_cache) > self._max_cached_messages:
+                self._payload_cache.popitem(last=False)
+        else:
+            self._payload_cache.move_to_end(message_id)
+        entry[1][key] = payload
 
     def is_registered(self, type_name: str, data_content_type: str) -> bool:
         return (type_name, data_content_type) in self._serializers
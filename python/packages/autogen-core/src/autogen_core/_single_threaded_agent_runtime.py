@@ -4,15 +4,17 @@
 import inspect
 import logging
 import sys
+import time
 import uuid
 import warnings
 from asyncio import CancelledError, Future, Queue, Task
 from collections.abc import Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import (
     Any,
     Awaitable,
     Callable,
+    Coroutine,
     Dict,
     List,
     Mapping,
@@ -47,14 +49,15 @@
 from ._agent_metadata import AgentMetadata
 from ._agent_runtime import AgentRuntime
 from ._agent_type import AgentType
-from ._cancellation_token import CancellationToken
+from ._cancellation_token import AsyncioCancellationToken, CancellationToken
 from ._intervention import DropMessage, InterventionHandler
 from ._message_context import MessageContext
 from ._message_handler_context import MessageHandlerContext
-from ._runtime_impl_helpers import SubscriptionManager, get_impl
+from ._runtime_impl_helpers import AgentMailboxes, SubscriptionManager, get_impl
 from ._serialization import (
     JSON_DATA_CONTENT_TYPE,
     MessageSerializer,
+    PayloadCache,
     SerializationRegistry,
 )
 from ._subscription import Subscription
@@ -66,6 +69,7 @@
 )
 from ._topic import TopicId
 from .exceptions import MessageDroppedException
+from .state_store import AgentStateStore, InMemoryAgentStateStore
 
 logger = logging.getLogger("autogen_core")
 event_logger = logging.getLogger("autogen_core.events")
@@ -86,6 +90,7 @@ class PublishMessageEnvelope:
     topic_id: TopicId
     metadata: EnvelopeMetadata | None = None
     message_id: str
+    payloads: PayloadCache = field(default_factory=PayloadCache)
 
 
 @dataclass(kw_only=True)
@@ -100,6 +105,7 @@ class SendMessageEnvelope:
     cancellation_token: CancellationToken
     metadata: EnvelopeMetadata | None = None
     message_id: str
+    payloads: PayloadCache = field(default_factory=PayloadCache)
 
 
 @dataclass(kw_only=True)
@@ -111,6 +117,7 @@ class ResponseMessageEnvelope:
     sender: AgentId
     recipient: AgentId | None
     metadata: EnvelopeMetadata | None = None
+    payloads: PayloadCache = field(default_factory=PayloadCache)
 
 
 P = ParamSpec("P")
@@ -122,24 +129,47 @@ def __init__(self, runtime: SingleThreadedAgentRuntime) -> None:
         self._runtime = runtime
         self._run_task = asyncio.create_task(self._run())
         self._stopped = asyncio.Event()
+        self._passivation_task: Task[None] | None = None
+        idle_timeout = runtime._agent_idle_timeout  # type: ignore
+        if idle_timeout is not None:
+            self._passivation_task = asyncio.create_task(
+                self._passivate_periodically(idle_timeout)
+            )
 
     async def _run(self) -> None:
+        batch_size = self._runtime._dispatch_batch_size  # type: ignore
         while True:
             if self._stopped.is_set():
                 return
 
-            await self._runtime._process_next()  # type: ignore
+            await self._runtime._process_next(batch_size)  # type: ignore
+
+    async def _passivate_periodically(self, idle_timeout: float) -> None:
+        # Checking twice per timeout keeps agents from staying in memory much longer than it.
+        while True:
+            await asyncio.sleep(idle_timeout / 2)
+            await self._runtime._passivate_idle_agents()  # type: ignore
+
+    async def _stop_passivation(self) -> None:
+        if self._passivation_task is not None:
+            self._passivation_task.cancel()
+            try:
+                await self._passivation_task
+            except CancelledError:
+                pass
 
     async def stop(self) -> None:
         self._stopped.set()
         self._runtime._message_queue.shutdown(immediate=True)  # type: ignore
         await self._run_task
+        await self._stop_passivation()
 
     async def stop_when_idle(self) -> None:
         await self._runtime._message_queue.join()  # type: ignore
         self._stopped.set()
         self._runtime._message_queue.shutdown(immediate=True)  # type: ignore
         await self._run_task
+        await self._stop_passivation()
 
     async def stop_when(
         self, condition: Callable[[], bool], check_period: float = 1.0
@@ -170,30 +200,119 @@ def _warn_if_none(value: Any, handler_name: str) -> None:
 
 
 class SingleThreadedAgentRuntime(AgentRuntime):
+    """A single-threaded agent runtime that processes all messages using a single asyncio queue.
+
+    Args:
+        intervention_handlers (List[InterventionHandler], optional): A list of intervention
+            handlers that can intercept messages before they are sent or published. Defaults to None.
+        tracer_provider (TracerProvider, optional): The tracer provider to use for tracing. Defaults to None.
+        dispatch_batch_size (int, optional): The maximum number of queued messages the processing
+            loop takes at once. When greater than 1, every message in a batch goes through the
+            intervention handlers and has its deliveries scheduled before control is yielded to the
+            event loop, and published messages start one task per recipient directly instead of going
+            through an intermediate task. Deliveries are started in queue order, so messages to any one
+            recipient keep their ordering. Defaults to 1, which yields after every message. Small
+            batches of 4 to 16 give most of the gain, which is modest: around 15% more deliveries per
+            second in ``benchmarks/bench_runtime_dispatch.py``, varying between runs. Larger batches gain less as the
+            deliveries they schedule at once compete for the event loop, and with several recipients
+            per message they can be slower than no batching, so measure with the workload before
+            going beyond 16.
+        max_queue_size (int, optional): The maximum number of messages waiting in the queue. When the
+            queue is full, :meth:`send_message` and :meth:`publish_message` wait until there is room,
+            applying backpressure to producers that are faster than the processing loop. Messages the
+            loop has taken off the queue do not count, so handlers that send messages, however deeply
+            nested, cannot block the loop. Defaults to 0, which means unbounded.
+        max_concurrency_per_agent (int, optional): The maximum number of messages a single agent
+            instance handles at the same time. Further messages for that agent wait in its mailbox in
+            arrival order, while messages for other agents are not held up. Note that with a limit, an
+            agent that sends to itself (directly or through other agents) while all of its slots are in
+            use will wait forever. Defaults to None, which means unlimited.
+        agent_state_store (AgentStateStore, optional): Where the state of passivated agents is kept.
+            When an agent is needed that is not in memory, the runtime creates it with its factory and,
+            if the store has a state for it, restores it with :meth:`~autogen_core.Agent.load_state`.
+            Defaults to None, in which case an :class:`~autogen_core.state_store.InMemoryAgentStateStore`
+            is used if either of the passivation limits below is set.
+        max_instantiated_agents (int, optional): The maximum number of agent instances kept in memory.
+            Beyond it, the least recently used agents that are not handling a message are passivated:
+            their state is saved to the state store, :meth:`~autogen_core.Agent.close` is called and the
+            instance is dropped. Defaults to None, which means unlimited.
+        agent_idle_timeout (float, optional): Passivate agents that have not been used for this many
+            seconds while the runtime is running. Defaults to None, which means agents are never
+            passivated for being idle.
+        max_cached_messages (int, optional): The number of messages whose serialized payloads are
+            cached across envelopes, so a message object sent or published several times is serialized
+            once. The cache does not notice changes to a message, so only set it if messages are not
+            modified once they have been sent or published. A message is always serialized at most
+            once per envelope, e.g. for the event log records of all its recipients. The hits and
+            misses are counted by :attr:`serialization_cache_hits` and :attr:`serialization_cache_misses`.
+            Defaults to 0, which disables the cache across envelopes.
+
+    .. note::
+
+        A passivated agent is a new instance once it is rehydrated. Code that holds on to an agent
+        instance, e.g. obtained from :meth:`try_get_underlying_agent_instance`, will not see messages
+        handled after the agent was passivated.
+    """
+
     def __init__(
         self,
         *,
         intervention_handlers: List[InterventionHandler] | None = None,
         tracer_provider: TracerProvider | None = None,
+        dispatch_batch_size: int = 1,
+        max_queue_size: int = 0,
+        max_concurrency_per_agent: int | None = None,
+        agent_state_store: AgentStateStore | None = None,
+        max_instantiated_agents: int | None = None,
+        agent_idle_timeout: float | None = None,
+        max_cached_messages: int = 0,
     ) -> None:
+        if dispatch_batch_size < 1:
+            raise ValueError("dispatch_batch_size must be at least 1.")
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size must not be negative.")
+        if max_instantiated_agents is not None and max_instantiated_agents < 1:
+            raise ValueError("max_instantiated_agents must be at least 1.")
+        if agent_idle_timeout is not None and agent_idle_timeout <= 0:
+            raise ValueError("agent_idle_timeout must be positive.")
         self._tracer_helper = TraceHelper(
             tracer_provider, MessageRuntimeTracingConfig("SingleThreadedAgentRuntime")
         )
         self._message_queue: Queue[
             PublishMessageEnvelope | SendMessageEnvelope | ResponseMessageEnvelope
-        ] = Queue()
+        ] = Queue(maxsize=max_queue_size)
         # (namespace, type) -> List[AgentId]
         self._agent_factories: Dict[
             str,
             Callable[[], Agent | Awaitable[Agent]]
             | Callable[[AgentRuntime, AgentId], Agent | Awaitable[Agent]],
         ] = {}
+        # Number of parameters each registered agent factory takes, inspected once at
+        # registration.
+        self._agent_factory_arities: Dict[str, int] = {}
         self._instantiated_agents: Dict[AgentId, Agent] = {}
         self._intervention_handlers = intervention_handlers
         self._background_tasks: Set[Task[Any]] = set()
         self._subscription_manager = SubscriptionManager()
         self._run_context: RunContext | None = None
-        self._serialization_registry = SerializationRegistry()
+        self._serialization_registry = SerializationRegistry(
+            max_cached_messages=max_cached_messages
+        )
+        self._dispatch_batch_size = dispatch_batch_size
+        self._max_queue_size = max_queue_size
+        self._mailboxes = AgentMailboxes(max_concurrency_per_agent)
+        if agent_state_store is None and (
+            max_instantiated_agents is not None or agent_idle_timeout is not None
+        ):
+            agent_state_store = InMemoryAgentStateStore()
+        self._agent_state_store = agent_state_store
+        self._max_instantiated_agents = max_instantiated_agents
+        self._agent_idle_timeout = agent_idle_timeout
+        # Instantiated agents in least recently used order, with the time they were last used.
+        self._agent_last_used: Dict[AgentId, float] = {}
+        self._rehydrating_agents: Dict[AgentId, Future[Agent]] = {}
+        self._passivating_agents: Dict[AgentId, Future[None]] = {}
+        self._passivation_task: Task[None] | None = None
 
     @property
     def unprocessed_messages_count(
@@ -201,6 +320,26 @@ def unprocessed_messages_count(
     ) -> int:
         return self._message_queue.qsize()
 
+    @property
+    def in_flight_tasks_count(self) -> int:
+        """Number of messages taken off the queue whose processing has not finished yet."""
+        return len(self._background_tasks)
+
+    @property
+    def mailbox_waiting_count(self) -> int:
+        """Number of deliveries waiting because their agent has reached ``max_concurrency_per_agent``."""
+        return self._mailboxes.waiting_count
+
+    @property
+    def serialization_cache_hits(self) -> int:
+        """Number of message serializations answered with a payload serialized before."""
+        return self._serialization_registry.cache_hits
+
+    @property
+    def serialization_cache_misses(self) -> int:
+        """Number of message serializations that had to encode the message."""
+        return self._serialization_registry.cache_misses
+
     @property
     def _known_agent_names(self) -> Set[str]:
         return set(self._agent_factories.keys())
@@ -216,20 +355,22 @@ async def send_message(
         message_id: str | None = None,
     ) -> Any:
         if cancellation_token is None:
-            cancellation_token = CancellationToken()
+            cancellation_token = AsyncioCancellationToken()
 
         if message_id is None:
             message_id = str(uuid.uuid4())
 
-        event_logger.info(
-            MessageEvent(
-                payload=self._try_serialize(message),
-                sender=sender,
-                receiver=recipient,
-                kind=MessageKind.DIRECT,
-                delivery_stage=DeliveryStage.SEND,
+        payloads = PayloadCache()
+        if event_logger.isEnabledFor(logging.INFO):
+            event_logger.info(
+                MessageEvent(
+                    payload=self._lazy_serialize(message, payloads),
+                    sender=sender,
+                    receiver=recipient,
+                    kind=MessageKind.DIRECT,
+                    delivery_stage=DeliveryStage.SEND,
+                )
             )
-        )
 
         with self._tracer_helper.trace_block(
             "create",
@@ -241,10 +382,11 @@ async def send_message(
             if recipient.type not in self._known_agent_names:
                 future.set_exception(Exception("Recipient not found"))
 
-            content = message.__dict__ if hasattr(message, "__dict__") else message
-            logger.info(
-                f"Sending message of type {type(message).__name__} to {recipient.type}: {content}"
-            )
+            if logger.isEnabledFor(logging.INFO):
+                content = message.__dict__ if hasattr(message, "__dict__") else message
+                logger.info(
+                    f"Sending message of type {type(message).__name__} to {recipient.type}: {content}"
+                )
 
             await self._message_queue.put(
                 SendMessageEnvelope(
@@ -255,6 +397,7 @@ async def send_message(
                     sender=sender,
                     metadata=get_telemetry_envelope_metadata(),
                     message_id=message_id,
+                    payloads=payloads,
                 )
             )
 
@@ -278,24 +421,27 @@ async def publish_message(
             extraAttributes={"message_type": type(message).__name__},
         ):
             if cancellation_token is None:
-                cancellation_token = CancellationToken()
-            content = message.__dict__ if hasattr(message, "__dict__") else message
-            logger.info(
-                f"Publishing message of type {type(message).__name__} to all subscribers: {content}"
-            )
+                cancellation_token = AsyncioCancellationToken()
+            if logger.isEnabledFor(logging.INFO):
+                content = message.__dict__ if hasattr(message, "__dict__") else message
+                logger.info(
+                    f"Publishing message of type {type(message).__name__} to all subscribers: {content}"
+                )
 
             if message_id is None:
                 message_id = str(uuid.uuid4())
 
-            event_logger.info(
-                MessageEvent(
-                    payload=self._try_serialize(message),
-                    sender=sender,
-                    receiver=topic_id,
-                    kind=MessageKind.PUBLISH,
-                    delivery_stage=DeliveryStage.SEND,
+            payloads = PayloadCache()
+            if event_logger.isEnabledFor(logging.INFO):
+                event_logger.info(
+                    MessageEvent(
+                        payload=self._lazy_serialize(message, payloads),
+                        sender=sender,
+                        receiver=topic_id,
+                        kind=MessageKind.PUBLISH,
+                        delivery_stage=DeliveryStage.SEND,
+                    )
                 )
-            )
 
             await self._message_queue.put(
                 PublishMessageEnvelope(
@@ -305,15 +451,24 @@ async def publish_message(
                     topic_id=topic_id,
                     metadata=get_telemetry_envelope_metadata(),
                     message_id=message_id,
+                    payloads=payloads,
                 )
             )
 
     async def save_state(self) -> Mapping[str, Any]:
         state: Dict[str, Dict[str, Any]] = {}
-        for agent_id in self._instantiated_agents:
+        for agent_id in list(self._instantiated_agents):
             state[str(agent_id)] = dict(
                 await (await self._get_agent(agent_id)).save_state()
             )
+        if self._agent_state_store is not None:
+            # Include the agents that are passivated.
+            for agent_id in await self._agent_state_store.agent_ids():
+                if str(agent_id) in state:
+                    continue
+                stored_state = await self._agent_state_store.load(agent_id)
+                if stored_state is not None:
+                    state[str(agent_id)] = dict(stored_state)
         return state
 
     async def load_state(self, state: Mapping[str, Any]) -> None:
@@ -329,7 +484,13 @@ async def _process_send(self, message_envelope: SendMessageEnvelope) -> None:
             recipient = message_envelope.recipient
 
             if recipient.type not in self._known_agent_names:
-                raise LookupError(f"Agent type '{recipient.type}' does not exist.")
+                # The sender has normally been told already, when the message was sent.
+                if not message_envelope.future.done():
+                    message_envelope.future.set_exception(
+                        LookupError(f"Agent type '{recipient.type}' does not exist.")
+                    )
+                self._message_done()
+                return
 
             try:
                 sender_id = (
@@ -337,20 +498,22 @@ async def _process_send(self, message_envelope: SendMessageEnvelope) -> None:
                     if message_envelope.sender is not None
                     else "Unknown"
                 )
-                logger.info(
-                    f"Calling message handler for {recipient} with message type {type(message_envelope.message).__name__} sent by {sender_id}"
-                )
-                event_logger.info(
-                    MessageEvent(
-                        payload=self._try_serialize(message_envelope.message),
-                        sender=message_envelope.sender,
-                        receiver=recipient,
-                        kind=MessageKind.DIRECT,
-                        delivery_stage=DeliveryStage.DELIVER,
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        f"Calling message handler for {recipient} with message type {type(message_envelope.message).__name__} sent by {sender_id}"
+                    )
+                if event_logger.isEnabledFor(logging.INFO):
+                    event_logger.info(
+                        MessageEvent(
+                            payload=self._lazy_serialize(
+                                message_envelope.message, message_envelope.payloads
+                            ),
+                            sender=message_envelope.sender,
+                            receiver=recipient,
+                            kind=MessageKind.DIRECT,
+                            delivery_stage=DeliveryStage.DELIVER,
+                        )
                     )
-                )
-                recipient_agent = await self._get_agent(recipient)
-
                 message_context = MessageContext(
                     sender=message_envelope.sender,
                     topic_id=None,
@@ -358,44 +521,56 @@ async def _process_send(self, message_envelope: SendMessageEnvelope) -> None:
                     cancellation_token=message_envelope.cancellation_token,
                     message_id=message_envelope.message_id,
                 )
-                with MessageHandlerContext.populate_context(recipient_agent.id):
-                    response = await recipient_agent.on_message(
-                        message_envelope.message,
-                        ctx=message_context,
-                    )
+                # The agent is looked up inside its mailbox slot so it cannot be
+                # passivated before the handler finishes.
+                async with self._mailboxes.slot(recipient):
+                    recipient_agent = await self._get_agent(recipient)
+                    with MessageHandlerContext.populate_context(recipient_agent.id):
+                        response = await recipient_agent.on_message(
+                            message_envelope.message,
+                            ctx=message_context,
+                        )
             except CancelledError as e:
                 if not message_envelope.future.cancelled():
                     message_envelope.future.set_exception(e)
-                self._message_queue.task_done()
-                event_logger.info(
-                    MessageHandlerExceptionEvent(
-                        payload=self._try_serialize(message_envelope.message),
-                        handling_agent=recipient,
-                        exception=e,
+                self._message_done()
+                if event_logger.isEnabledFor(logging.INFO):
+                    event_logger.info(
+                        MessageHandlerExceptionEvent(
+                            payload=self._lazy_serialize(
+                                message_envelope.message, message_envelope.payloads
+                            ),
+                            handling_agent=recipient,
+                            exception=e,
+                        )
                     )
-                )
                 return
             except BaseException as e:
                 message_envelope.future.set_exception(e)
-                self._message_queue.task_done()
-                event_logger.info(
-                    MessageHandlerExceptionEvent(
-                        payload=self._try_serialize(message_envelope.message),
-                        handling_agent=recipient,
-                        exception=e,
+                self._message_done()
+                if event_logger.isEnabledFor(logging.INFO):
+                    event_logger.info(
+                        MessageHandlerExceptionEvent(
+                            payload=self._lazy_serialize(
+                                message_envelope.message, message_envelope.payloads
+                            ),
+                            handling_agent=recipient,
+                            exception=e,
+                        )
                     )
-                )
                 return
 
-            event_logger.info(
-                MessageEvent(
-                    payload=self._try_serialize(response),
-                    sender=message_envelope.recipient,
-                    receiver=message_envelope.sender,
-                    kind=MessageKind.RESPOND,
-                    delivery_stage=DeliveryStage.SEND,
+            response_payloads = PayloadCache()
+            if event_logger.isEnabledFor(logging.INFO):
+                event_logger.info(
+                    MessageEvent(
+                        payload=self._lazy_serialize(response, response_payloads),
+                        sender=message_envelope.recipient,
+                        receiver=message_envelope.sender,
+                        kind=MessageKind.RESPOND,
+                        delivery_stage=DeliveryStage.SEND,
+                    )
                 )
-            )
 
             await self._message_queue.put(
                 ResponseMessageEnvelope(
@@ -404,121 +579,183 @@ async def _process_send(self, message_envelope: SendMessageEnvelope) -> None:
                     sender=message_envelope.recipient,
                     recipient=message_envelope.sender,
                     metadata=get_telemetry_envelope_metadata(),
+                    payloads=response_payloads,
                 )
             )
-            self._message_queue.task_done()
+            self._message_done()
 
     async def _process_publish(self, message_envelope: PublishMessageEnvelope) -> None:
         with self._tracer_helper.trace_block(
             "publish", message_envelope.topic_id, parent=message_envelope.metadata
         ):
             try:
-                responses: List[Awaitable[Any]] = []
-                recipients = await self._subscription_manager.get_subscribed_recipients(
-                    message_envelope.topic_id
-                )
-                for agent_id in recipients:
-                    # Avoid sending the message back to the sender
-                    if (
-                        message_envelope.sender is not None
-                        and agent_id == message_envelope.sender
-                    ):
-                        continue
-
-                    sender_agent = (
-                        await self._get_agent(message_envelope.sender)
-                        if message_envelope.sender is not None
-                        else None
-                    )
-                    sender_name = (
-                        str(sender_agent.id) if sender_agent is not None else "Unknown"
-                    )
-                    logger.info(
-                        f"Calling message handler for {agent_id.type} with message type {type(message_envelope.message).__name__} published by {sender_name}"
-                    )
-                    event_logger.info(
-                        MessageEvent(
-                            payload=self._try_serialize(message_envelope.message),
-                            sender=message_envelope.sender,
-                            receiver=None,
-                            kind=MessageKind.PUBLISH,
-                            delivery_stage=DeliveryStage.DELIVER,
-                        )
-                    )
-                    message_context = MessageContext(
-                        sender=message_envelope.sender,
-                        topic_id=message_envelope.topic_id,
-                        is_rpc=False,
-                        cancellation_token=message_envelope.cancellation_token,
-                        message_id=message_envelope.message_id,
-                    )
-                    agent = await self._get_agent(agent_id)
-
-                    async def _on_message(
-                        agent: Agent, message_context: MessageContext
-                    ) -> Any:
-                        with self._tracer_helper.trace_block(
-                            "process", agent.id, parent=None
-                        ):
-                            with MessageHandlerContext.populate_context(agent.id):
-                                try:
-                                    return await agent.on_message(
-                                        message_envelope.message,
-                                        ctx=message_context,
-                                    )
-                                except BaseException as e:
-                                    logger.error(
-                                        f"Error processing publish message for {agent.id}",
-                                        exc_info=True,
-                                    )
-                                    event_logger.info(
-                                        MessageHandlerExceptionEvent(
-                                            payload=self._try_serialize(
-                                                message_envelope.message
-                                            ),
-                                            handling_agent=agent.id,
-                                            exception=e,
-                                        )
-                                    )
-                                    raise
-
-                    future = _on_message(agent, message_context)
-                    responses.append(future)
-
+                responses = await self._prepare_publish(message_envelope)
                 await asyncio.gather(*responses)
             except BaseException:
                 # Ignore exceptions raised during publishing. We've already logged them above.
                 pass
             finally:
-                self._message_queue.task_done()
+                self._message_done()
             # TODO if responses are given for a publish
 
+    async def _schedule_publish(self, message_envelope: PublishMessageEnvelope) -> None:
+        """Start a delivery task per recipient of a published message right away,
+        rather than from a separate task for the whole message, so deliveries start
+        in the order messages were queued. The message is marked as done once every
+        delivery has finished."""
+        with self._tracer_helper.trace_block(
+            "publish", message_envelope.topic_id, parent=message_envelope.metadata
+        ):
+            try:
+                # Agents are created by the delivery tasks, so a slow factory does not
+                # hold up the processing loop.
+                deliveries = await self._prepare_publish(
+                    message_envelope, instantiate_agents=False
+                )
+            except BaseException:
+                self._message_done()
+                return
+            if not deliveries:
+                self._message_done()
+                return
+
+            pending = len(deliveries)
+
+            def on_delivery_done(task: Task[Any]) -> None:
+                nonlocal pending
+                self._background_tasks.discard(task)
+                if not task.cancelled():
+                    # Retrieve the exception, it has already been logged by the delivery.
+                    task.exception()
+                pending -= 1
+                if pending == 0:
+                    self._message_done()
+
+            for delivery in deliveries:
+                task = asyncio.create_task(delivery)
+                self._background_tasks.add(task)
+                task.add_done_callback(on_delivery_done)
+
+    async def _prepare_publish(
+        self,
+        message_envelope: PublishMessageEnvelope,
+        *,
+        instantiate_agents: bool = True,
+    ) -> List[Coroutine[Any, Any, Any]]:
+        """Resolve the recipients of a published message and create a delivery
+        coroutine for each of them. Unless ``instantiate_agents`` is False, the sender
+        and the recipients are created here rather than when the deliveries run."""
+        responses: List[Coroutine[Any, Any, Any]] = []
+        recipients = await self._subscription_manager.get_subscribed_recipients(
+            message_envelope.topic_id
+        )
+        # Serialized at most once for all recipients, and only if logged.
+        payload = self._lazy_serialize(
+            message_envelope.message, message_envelope.payloads
+        )
+        for agent_id in recipients:
+            # Avoid sending the message back to the sender
+            if (
+                message_envelope.sender is not None
+                and agent_id == message_envelope.sender
+            ):
+                continue
+
+            if message_envelope.sender is not None and instantiate_agents:
+                await self._get_agent(message_envelope.sender)
+            if logger.isEnabledFor(logging.INFO):
+                sender_name = (
+                    str(message_envelope.sender)
+                    if message_envelope.sender is not None
+                    else "Unknown"
+                )
+                logger.info(
+                    f"Calling message handler for {agent_id.type} with message type {type(message_envelope.message).__name__} published by {sender_name}"
+                )
+            if event_logger.isEnabledFor(logging.INFO):
+                event_logger.info(
+                    MessageEvent(
+                        payload=payload,
+                        sender=message_envelope.sender,
+                        receiver=None,
+                        kind=MessageKind.PUBLISH,
+                        delivery_stage=DeliveryStage.DELIVER,
+                    )
+                )
+            message_context = MessageContext(
+                sender=message_envelope.sender,
+                topic_id=message_envelope.topic_id,
+                is_rpc=False,
+                cancellation_token=message_envelope.cancellation_token,
+                message_id=message_envelope.message_id,
+            )
+            if instantiate_agents:
+                await self._get_agent(agent_id)
+
+            async def _on_message(
+                agent_id: AgentId, message_context: MessageContext
+            ) -> Any:
+                with self._tracer_helper.trace_block("process", agent_id, parent=None):
+                    with MessageHandlerContext.populate_context(agent_id):
+                        try:
+                            # Look the agent up again inside its mailbox slot, it may
+                            # have been passivated since it was resolved.
+                            async with self._mailboxes.slot(agent_id):
+                                agent = await self._get_agent(agent_id)
+                                return await agent.on_message(
+                                    message_envelope.message,
+                                    ctx=message_context,
+                                )
+                        except BaseException as e:
+                            logger.error(
+                                f"Error processing publish message for {agent_id}",
+                                exc_info=True,
+                            )
+                            if event_logger.isEnabledFor(logging.INFO):
+                                event_logger.info(
+                                    MessageHandlerExceptionEvent(
+                                        payload=payload,
+                                        handling_agent=agent_id,
+                                        exception=e,
+                                    )
+                                )
+                            raise
+
+            future = _on_message(agent_id, message_context)
+            responses.append(future)
+
+        return responses
+
     async def _process_response(
         self, message_envelope: ResponseMessageEnvelope
     ) -> None:
         with self._tracer_helper.trace_block(
             "ack", message_envelope.recipient, parent=message_envelope.metadata
         ):
-            content = (
-                message_envelope.message.__dict__
-                if hasattr(message_envelope.message, "__dict__")
-                else message_envelope.message
-            )
-            logger.info(
-                f"Resolving response with message type {type(message_envelope.message).__name__} for recipient {message_envelope.recipient} from {message_envelope.sender.type}: {content}"
-            )
-            event_logger.info(
-                MessageEvent(
-                    payload=self._try_serialize(message_envelope.message),
-                    sender=message_envelope.sender,
-                    receiver=message_envelope.recipient,
-                    kind=MessageKind.RESPOND,
-                    delivery_stage=DeliveryStage.DELIVER,
+            if logger.isEnabledFor(logging.INFO):
+                content = (
+                    message_envelope.message.__dict__
+                    if hasattr(message_envelope.message, "__dict__")
+                    else message_envelope.message
+                )
+                logger.info(
+                    f"Resolving response with message type {type(message_envelope.message).__name__} for recipient {message_envelope.recipient} from {message_envelope.sender.type}: {content}"
+                )
+            if event_logger.isEnabledFor(logging.INFO):
+                event_logger.info(
+                    MessageEvent(
+                        payload=self._lazy_serialize(
+                            message_envelope.message, message_envelope.payloads
+                        ),
+                        sender=message_envelope.sender,
+                        receiver=message_envelope.recipient,
+                        kind=MessageKind.RESPOND,
+                        delivery_stage=DeliveryStage.DELIVER,
+                    )
                 )
-            )
             if not message_envelope.future.cancelled():
                 message_envelope.future.set_result(message_envelope.message)
-            self._message_queue.task_done()
+            self._message_done()
 
     @deprecated(
         "Manually stepping the runtime processing is deprecated. Use start() instead."
@@ -526,13 +763,39 @@ async def _process_response(
     async def process_next(self) -> None:
         await self._process_next()
 
-    async def _process_next(self) -> None:
-        """Process the next message in the queue."""
+    def _message_done(self) -> None:
+        self._message_queue.task_done()
+
+    async def _process_next(self, max_batch_size: int = 1) -> None:
+        """Process the next message in the queue, or up to ``max_batch_size`` messages
+        if more are already queued."""
 
         try:
-            message_envelope = await self._message_queue.get()
+            message_envelopes = [await self._message_queue.get()]
         except QueueShutDown:
             return
+        while len(message_envelopes) < max_batch_size:
+            try:
+                message_envelopes.append(self._message_queue.get_nowait())
+            except (asyncio.QueueEmpty, QueueShutDown):
+                break
+
+        for message_envelope in message_envelopes:
+            if not await self._dispatch(message_envelope):
+                # The message was dropped, there is nothing more to process.
+                self._message_done()
+
+        # Yield control to the message loop to allow other tasks to run
+        await asyncio.sleep(0)
+
+    async def _dispatch(
+        self,
+        message_envelope: (
+            PublishMessageEnvelope | SendMessageEnvelope | ResponseMessageEnvelope
+        ),
+    ) -> bool:
+        """Run the intervention handlers for a message and schedule its delivery. Returns
+        False if an intervention handler dropped the message or raised an exception."""
 
         match message_envelope:
             case SendMessageEnvelope(
@@ -561,20 +824,22 @@ async def _process_next(self) -> None:
                                 _warn_if_none(temp_message, "on_send")
                             except BaseException as e:
                                 future.set_exception(e)
-                                return
+                                return False
                             if temp_message is DropMessage or isinstance(
                                 temp_message, DropMessage
                             ):
                                 event_logger.info(
                                     MessageDroppedEvent(
-                                        payload=self._try_serialize(message),
+                                        payload=self._lazy_serialize(
+                                            message, message_envelope.payloads
+                                        ),
                                         sender=sender,
                                         receiver=recipient,
                                         kind=MessageKind.DIRECT,
                                     )
                                 )
                                 future.set_exception(MessageDroppedException())
-                                return
+                                return False
 
                         message_envelope.message = temp_message
                 task = asyncio.create_task(self._process_send(message_envelope))
@@ -610,21 +875,26 @@ async def _process_next(self) -> None:
                                     f"Exception raised in in intervention handler: {e}",
                                     exc_info=True,
                                 )
-                                return
+                                return False
                             if temp_message is DropMessage or isinstance(
                                 temp_message, DropMessage
                             ):
                                 event_logger.info(
                                     MessageDroppedEvent(
-                                        payload=self._try_serialize(message),
+                                        payload=self._lazy_serialize(
+                                            message, message_envelope.payloads
+                                        ),
                                         sender=sender,
                                         receiver=topic_id,
                                         kind=MessageKind.PUBLISH,
                                     )
                                 )
-                                return
+                                return False
 
                         message_envelope.message = temp_message
+                if self._dispatch_batch_size > 1:
+                    await self._schedule_publish(message_envelope)
+                    return True
                 task = asyncio.create_task(self._process_publish(message_envelope))
                 self._background_tasks.add(task)
                 task.add_done_callback(self._background_tasks.discard)
@@ -641,27 +911,31 @@ async def _process_next(self) -> None:
                         except BaseException as e:
                             # TODO: should we raise the exception to sender of the response instead?
                             future.set_exception(e)
-                            return
+                            return False
                         if temp_message is DropMessage or isinstance(
                             temp_message, DropMessage
                         ):
                             event_logger.info(
                                 MessageDroppedEvent(
-                                    payload=self._try_serialize(message),
+                                    payload=self._lazy_serialize(
+                                        message, message_envelope.payloads
+                                    ),
                                     sender=sender,
                                     receiver=recipient,
                                     kind=MessageKind.RESPOND,
                                 )
                             )
                             future.set_exception(MessageDroppedException())
-                            return
+                            return False
                         message_envelope.message = temp_message
+                if self._dispatch_batch_size > 1:
+                    # Resolving a response future does not suspend, no task is needed.
+                    await self._process_response(message_envelope)
+                    return True
                 task = asyncio.create_task(self._process_response(message_envelope))
                 self._background_tasks.add(task)
                 task.add_done_callback(self._background_tasks.discard)
-
-        # Yield control to the message loop to allow other tasks to run
-        await asyncio.sleep(0)
+        return True
 
     def start(self) -> None:
         """Start the runtime message processing loop. This runs in a background task.
@@ -685,8 +959,10 @@ async def close(self) -> None:
         # stop the runtime if it hasn't been stopped yet
         if self._run_context is not None:
             await self.stop()
+        if self._passivation_task is not None:
+            await self._passivation_task
         # close all the agents that have been instantiated
-        for agent_id in self._instantiated_agents:
+        for agent_id in list(self._instantiated_agents):
             agent = await self._get_agent(agent_id)
             await agent.close()
 
@@ -697,7 +973,7 @@ async def stop(self) -> None:
 
         await self._run_context.stop()
         self._run_context = None
-        self._message_queue = Queue()
+        self._message_queue = Queue(maxsize=self._max_queue_size)
 
     async def stop_when_idle(self) -> None:
         """Stop the runtime message processing loop when there is
@@ -708,7 +984,7 @@ async def stop_when_idle(self) -> None:
         await self._run_context.stop_when_idle()
 
         self._run_context = None
-        self._message_queue = Queue()
+        self._message_queue = Queue(maxsize=self._max_queue_size)
 
     async def stop_when(self, condition: Callable[[], bool]) -> None:
         """Stop the runtime message processing loop when the condition is met.
@@ -729,7 +1005,7 @@ async def stop_when(self, condition: Callable[[], bool]) -> None:
         await self._run_context.stop_when(condition)
 
         self._run_context = None
-        self._message_queue = Queue()
+        self._message_queue = Queue(maxsize=self._max_queue_size)
 
     async def agent_metadata(self, agent: AgentId) -> AgentMetadata:
         return (await self._get_agent(agent)).metadata
@@ -753,8 +1029,9 @@ async def register_factory(
         if type.type in self._agent_factories:
             raise ValueError(f"Agent with type {type} already exists.")
 
-        async def factory_wrapper() -> T:
-            maybe_agent_instance = agent_factory()
+        # The wrapper passes on the arguments of the factory, whose arity is recorded below.
+        async def factory_wrapper(*args: Any) -> T:
+            maybe_agent_instance = agent_factory(*args)
             if inspect.isawaitable(maybe_agent_instance):
                 agent_instance = await maybe_agent_instance
             else:
@@ -766,6 +1043,9 @@ async def factory_wrapper() -> T:
             return agent_instance
 
         self._agent_factories[type.type] = factory_wrapper
+        self._agent_factory_arities[type.type] = len(
+            inspect.signature(agent_factory).parameters
+        )
 
         return type
 
@@ -779,10 +1059,13 @@ async def _invoke_agent_factory(
     ) -> T:
         with AgentInstantiationContext.populate_context((self, agent_id)):
             try:
-                if len(inspect.signature(agent_factory).parameters) == 0:
+                arity = self._agent_factory_arities.get(agent_id.type)
+                if arity is None:
+                    arity = len(inspect.signature(agent_factory).parameters)
+                if arity == 0:
                     factory_one = cast(Callable[[], T], agent_factory)
                     agent = factory_one()
-                elif len(inspect.signature(agent_factory).parameters) == 2:
+                elif arity == 2:
                     warnings.warn(
                         "Agent factories that take two arguments are deprecated. Use AgentInstantiationContext instead. Two arg factories will be removed in a future version.",
                         stacklevel=2,
@@ -811,16 +1094,141 @@ async def _invoke_agent_factory(
 
     async def _get_agent(self, agent_id: AgentId) -> Agent:
         if agent_id in self._instantiated_agents:
+            if self._agent_state_store is not None:
+                # Move the agent to the most recently used end.
+                del self._agent_last_used[agent_id]
+                self._agent_last_used[agent_id] = time.monotonic()
             return self._instantiated_agents[agent_id]
 
         if agent_id.type not in self._agent_factories:
             raise LookupError(f"Agent with name {agent_id.type} not found.")
 
+        if self._agent_state_store is not None:
+            return await self._rehydrate_agent(agent_id)
+
         agent_factory = self._agent_factories[agent_id.type]
         agent = await self._invoke_agent_factory(agent_factory, agent_id)
         self._instantiated_agents[agent_id] = agent
         return agent
 
+    async def _rehydrate_agent(self, agent_id: AgentId) -> Agent:
+        """Instantiate an agent and restore its state from the state store, making sure
+        concurrent callers share a single instance."""
+        pending = self._rehydrating_agents.get(agent_id)
+        if pending is None:
+            pending = asyncio.ensure_future(self._instantiate_from_store(agent_id))
+            self._rehydrating_agents[agent_id] = pending
+            pending.add_done_callback(
+                lambda _: self._rehydrating_agents.pop(agent_id, None)
+            )
+        return await asyncio.shield(pending)
+
+    async def _instantiate_from_store(self, agent_id: AgentId) -> Agent:
+        assert self._agent_state_store is not None
+        passivating = self._passivating_agents.get(agent_id)
+        if passivating is not None:
+            await passivating
+            # Passivation is abandoned if the state could not be saved.
+            if agent_id in self._instantiated_agents:
+                return await self._get_agent(agent_id)
+
+        agent_factory = self._agent_factories[agent_id.type]
+        agent = await self._invoke_agent_factory(agent_factory, agent_id)
+        state = await self._agent_state_store.load(agent_id)
+        if state is not None:
+            await agent.load_state(state)
+            await self._agent_state_store.delete(agent_id)
+        self._instantiated_agents[agent_id] = agent
+        self._agent_last_used[agent_id] = time.monotonic()
+
+        if (
+            self._max_instantiated_agents is not None
+            and len(self._instantiated_agents) > self._max_instantiated_agents
+            and self._passivation_task is None
+        ):
+            self._passivation_task = asyncio.create_task(self._passivate_idle_agents())
+            self._passivation_task.add_done_callback(self._on_passivation_done)
+        return agent
+
+    def _on_passivation_done(self, task: Task[None]) -> None:
+        self._passivation_task = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Error passivating agents", exc_info=task.exception())
+
+    def _passivation_candidates(self) -> List[AgentId]:
+        """Agents that are not handling a message and are either beyond
+        ``max_instantiated_agents`` or idle for longer than ``agent_idle_timeout``,
+        least recently used first."""
+        now = time.monotonic()
+        excess = (
+            len(self._instantiated_agents) - self._max_instantiated_agents
+            if self._max_instantiated_agents is not None
+            else 0
+        )
+        candidates: List[AgentId] = []
+        for agent_id, last_used in self._agent_last_used.items():
+            idle = (
+                self._agent_idle_timeout is not None
+                and now - last_used >= self._agent_idle_timeout
+            )
+            if excess <= 0 and not idle:
+                # Agents are ordered by last use, the remaining ones are more recent.
+                break
+            if self._mailboxes.in_use(agent_id):
+                continue
+            candidates.append(agent_id)
+            excess -= 1
+        return candidates
+
+    async def _passivate_idle_agents(self) -> None:
+        while True:
+            passivated = False
+            for agent_id in self._passivation_candidates():
+                # Re-check, the agent may have been used while others were passivated.
+                if (
+                    agent_id in self._instantiated_agents
+                    and not self._mailboxes.in_use(agent_id)
+                ):
+                    passivated |= await self._passivate_agent(agent_id)
+            if not passivated:
+                return
+
+    async def _passivate_agent(self, agent_id: AgentId) -> bool:
+        """Save the state of an agent to the state store and drop it from memory.
+        Returns False if the state could not be saved and the agent was kept."""
+        assert self._agent_state_store is not None
+        agent = self._instantiated_agents.pop(agent_id)
+        last_used = self._agent_last_used.pop(agent_id)
+        done: Future[None] = asyncio.get_running_loop().create_future()
+        self._passivating_agents[agent_id] = done
+        try:
+            try:
+                state = await agent.save_state()
+                await self._agent_state_store.save(agent_id, state)
+            except BaseException as e:
+                self._instantiated_agents[agent_id] = agent
+                self._agent_last_used[agent_id] = time.monotonic()
+                if not isinstance(e, Exception):
+                    raise
+                logger.error(
+                    f"Error saving the state of agent {agent_id}, keeping it in memory",
+                    exc_info=True,
+                )
+                return False
+            logger.debug(
+                f"Passivated agent {agent_id} after {time.monotonic() - last_used:.1f}s idle"
+            )
+            try:
+                await agent.close()
+            except Exception:
+                logger.error(
+                    f"Error closing passivated agent {agent_id}", exc_info=True
+                )
+            return True
+        finally:
+            del self._passivating_agents[agent_id]
+            done.set_result(None)
+
     # TODO: uncomment out the following type ignore when this is fixed in mypy: https://github.com/python/mypy/issues/3737
     async def try_get_underlying_agent_instance(self, id: AgentId, type: Type[T] = Agent) -> T:  # type: ignore[assignment]
         if id.type not in self._agent_factories:
@@ -862,11 +1270,31 @@ def add_message_serializer(
     ) -> None:
         self._serialization_registry.add_serializer(serializer)
 
-    def _try_serialize(self, message: Any) -> str:
+    def _lazy_serialize(
+        self, message: Any, payloads: PayloadCache
+    ) -> Callable[[], str]:
+        """Defer serializing ``message`` for an event log record until the record is
+        formatted. The result is computed at most once per returned callable, and the
+        payload is shared through ``payloads`` with the other records of the envelope.
+        """
+        payload: str | None = None
+
+        def serialize() -> str:
+            nonlocal payload
+            if payload is None:
+                payload = self._try_serialize(message, payloads)
+            return payload
+
+        return serialize
+
+    def _try_serialize(self, message: Any, payloads: PayloadCache) -> str:
         try:
             type_name = self._serialization_registry.type_name(message)
             return self._serialization_registry.serialize(
-                message, type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE
+                message,
+                type_name=type_name,
+                data_content_type=JSON_DATA_CONTENT_TYPE,
+                payload_cache=payloads,
             ).decode("utf-8")
         except ValueError:
             return "Message could not be serialized"
@@ -1,6 +1,6 @@
 import json
 from enum import Enum
-from typing import Any, Dict, cast
+from typing import Any, Callable, Dict, cast
 
 from ._agent_id import AgentId
 from ._topic import TopicId
@@ -59,6 +59,13 @@ def __str__(self) -> str:
         return json.dumps(self.kwargs)
 
 
+def _resolve_payload(
+    kwargs: Dict[str, Any], payload: str | Callable[[], str]
+) -> Dict[str, Any]:
+    """Place the payload first in the event fields, computing it if it was deferred."""
+    return {"payload": payload() if callable(payload) else payload, **kwargs}
+
+
 class MessageKind(Enum):
     DIRECT = 1
     PUBLISH = 2
@@ -74,20 +81,26 @@ class MessageEvent:
     def __init__(
         self,
         *,
-        payload: str,
+        payload: str | Callable[[], str],
         sender: AgentId | None,
         receiver: AgentId | TopicId | None,
         kind: MessageKind,
         delivery_stage: DeliveryStage,
         **kwargs: Any,
     ) -> None:
-        self.kwargs = kwargs
-        self.kwargs["payload"] = payload
-        self.kwargs["sender"] = None if sender is None else str(sender)
-        self.kwargs["receiver"] = None if receiver is None else str(receiver)
-        self.kwargs["kind"] = str(kind)
-        self.kwargs["delivery_stage"] = str(delivery_stage)
-        self.kwargs["type"] = "Message"
+        self._payload = payload
+        self._kwargs = kwargs
+        self._kwargs["sender"] = None if sender is None else str(sender)
+        self._kwargs["receiver"] = None if receiver is None else str(receiver)
+        self._kwargs["kind"] = str(kind)
+        self._kwargs["delivery_stage"] = str(delivery_stage)
+        self._kwargs["type"] = "Message"
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
+        if "payload" not in self._kwargs:
+            self._kwargs = _resolve_payload(self._kwargs, self._payload)
+        return self._kwargs
 
     # This must output the event in a json serializable format
     def __str__(self) -> str:
@@ -98,18 +111,24 @@ class MessageDroppedEvent:
     def __init__(
         self,
         *,
-        payload: str,
+        payload: str | Callable[[], str],
         sender: AgentId | None,
         receiver: AgentId | TopicId | None,
         kind: MessageKind,
         **kwargs: Any,
     ) -> None:
-        self.kwargs = kwargs
-        self.kwargs["payload"] = payload
-        self.kwargs["sender"] = None if sender is None else str(sender)
-        self.kwargs["receiver"] = None if receiver is None else str(receiver)
-        self.kwargs["kind"] = str(kind)
-        self.kwargs["type"] = "MessageDropped"
+        self._payload = payload
+        self._kwargs = kwargs
+        self._kwargs["sender"] = None if sender is None else str(sender)
+        self._kwargs["receiver"] = None if receiver is None else str(receiver)
+        self._kwargs["kind"] = str(kind)
+        self._kwargs["type"] = "MessageDropped"
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
+        if "payload" not in self._kwargs:
+            self._kwargs = _resolve_payload(self._kwargs, self._payload)
+        return self._kwargs
 
     # This must output the event in a json serializable format
     def __str__(self) -> str:
@@ -120,16 +139,22 @@ class MessageHandlerExceptionEvent:
     def __init__(
         self,
         *,
-        payload: str,
+        payload: str | Callable[[], str],
         handling_agent: AgentId,
         exception: BaseException,
         **kwargs: Any,
     ) -> None:
-        self.kwargs = kwargs
-        self.kwargs["payload"] = payload
-        self.kwargs["handling_agent"] = str(handling_agent)
-        self.kwargs["exception"] = str(exception)
-        self.kwargs["type"] = "MessageHandlerException"
+        self._payload = payload
+        self._kwargs = kwargs
+        self._kwargs["handling_agent"] = str(handling_agent)
+        self._kwargs["exception"] = str(exception)
+        self._kwargs["type"] = "MessageHandlerException"
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
+        if "payload" not in self._kwargs:
+            self._kwargs = _resolve_payload(self._kwargs, self._payload)
+        return self._kwargs
 
     # This must output the event in a json serializable format
     def __str__(self) -> str:
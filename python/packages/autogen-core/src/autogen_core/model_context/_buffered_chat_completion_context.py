@@ -8,22 +8,40 @@ class BufferedChatCompletionContext(ChatCompletionContext):
     """A buffered chat completion context that keeps a view of the last n messages,
     where n is the buffer size. The buffer size is set at initialization.
 
+    Setting `truncation_step` to k drops the oldest messages k at a time, so the view
+    holds from n up to n + k - 1 messages and only grows by appending between
+    truncations. This keeps the prompt prefix identical across calls, which lets model
+    providers serve it from their prompt cache.
+    See :class:`~autogen_core.model_context.HeadAndTailChatCompletionContext`.
+
     Args:
         buffer_size (int): The size of the buffer.
         initial_messages (List[LLMMessage] | None): The initial messages.
+        truncation_step (int): The number of messages dropped at a time when the buffer is full.
+            Defaults to 1.
     """
 
     def __init__(
-        self, buffer_size: int, initial_messages: List[LLMMessage] | None = None
+        self,
+        buffer_size: int,
+        initial_messages: List[LLMMessage] | None = None,
+        *,
+        truncation_step: int = 1,
     ) -> None:
         super().__init__(initial_messages)
         if buffer_size <= 0:
             raise ValueError("buffer_size must be greater than 0.")
+        if truncation_step <= 0:
+            raise ValueError("truncation_step must be greater than 0.")
         self._buffer_size = buffer_size
+        self._truncation_step = truncation_step
 
     async def get_messages(self) -> List[LLMMessage]:
-        """Get at most `buffer_size` recent messages."""
-        messages = self._messages[-self._buffer_size :]
+        """Get at most `buffer_size` recent messages, or up to `buffer_size + truncation_step - 1`
+        when truncating more than one message at a time."""
+        num_overflow = max(len(self._messages) - self._buffer_size, 0)
+        num_skipped = num_overflow // self._truncation_step * self._truncation_step
+        messages = self._messages[num_skipped:]
         # Handle the first message is a function call result message.
         if messages and isinstance(messages[0], FunctionExecutionResultMessage):
             # Remove the first message from the list.
@@ -15,10 +15,20 @@ class HeadAndTailChatCompletionContext(ChatCompletionContext):
     where n is the head size and m is the tail size. The head and tail sizes
     are set at initialization.
 
+    By default the tail slides by one message for every new message, so the messages
+    after the head change on every call. Model providers such as OpenAI only reuse a
+    cached prompt prefix when the leading tokens are identical across calls. Setting
+    `truncation_step` to k makes the context drop older messages k at a time instead:
+    the tail grows from m up to m + k - 1 messages and the view only grows by appending
+    between truncations, so the head, the placeholder and the start of the tail stay
+    identical and can be served from the provider's prompt cache.
+
     Args:
         head_size (int): The size of the head.
         tail_size (int): The size of the tail.
         initial_messages (List[LLMMessage] | None): The initial messages.
+        truncation_step (int): The number of messages dropped at a time when the tail is full.
+            Defaults to 1.
     """
 
     def __init__(
@@ -26,14 +36,19 @@ def __init__(
         head_size: int,
         tail_size: int,
         initial_messages: List[LLMMessage] | None = None,
+        *,
+        truncation_step: int = 1,
     ) -> None:
         super().__init__(initial_messages)
         if head_size <= 0:
             raise ValueError("head_size must be greater than 0.")
         if tail_size <= 0:
             raise ValueError("tail_size must be greater than 0.")
+        if truncation_step <= 0:
+            raise ValueError("truncation_step must be greater than 0.")
         self._head_size = head_size
         self._tail_size = tail_size
+        self._truncation_step = truncation_step
 
     async def get_messages(self) -> List[LLMMessage]:
         """Get at most `head_size` recent messages and `tail_size` oldest messages."""
@@ -50,7 +65,15 @@ async def get_messages(self) -> List[LLMMessage]:
             # Remove the last message from the head.
             head_messages = head_messages[:-1]
 
-        tail_messages = self._messages[-self._tail_size :]
+        # Skip messages a whole truncation step at a time.
+        num_overflow = len(self._messages) - self._head_size - self._tail_size
+        num_skipped = num_overflow // self._truncation_step * self._truncation_step
+        if num_skipped <= 0:
+            # If there are not enough messages to fill the head and tail,
+            # return all messages.
+            return self._messages
+
+        tail_messages = self._messages[self._head_size + num_skipped :]
         # Handle the first message is a function call result message.
         if tail_messages and isinstance(
             tail_messages[0], FunctionExecutionResultMessage
@@ -58,12 +81,6 @@ async def get_messages(self) -> List[LLMMessage]:
             # Remove the first message from the tail.
             tail_messages = tail_messages[1:]
 
-        num_skipped = len(self._messages) - self._head_size - self._tail_size
-        if num_skipped <= 0:
-            # If there are not enough messages to fill the head and tail,
-            # return all messages.
-            return self._messages
-
         placeholder_messages = [
             UserMessage(content=f"Skipped {num_skipped} messages.", source="System")
         ]
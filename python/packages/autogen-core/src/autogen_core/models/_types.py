@@ -51,6 +51,8 @@ class FunctionExecutionResultMessage(BaseModel):
 class RequestUsage:
     prompt_tokens: int
     completion_tokens: int
+    cached_prompt_tokens: int = 0
+    """The number of prompt tokens served from the provider's prompt cache, if reported."""
 
 
 FinishReasons = Literal["stop", "length", "function_calls", "content_filter"]
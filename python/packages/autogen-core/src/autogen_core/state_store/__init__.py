@@ -0,0 +1,11 @@
+from ._agent_state_store import AgentStateStore
+from ._file_system_agent_state_store import FileSystemAgentStateStore
+from ._in_memory_agent_state_store import InMemoryAgentStateStore
+from ._sqlite_agent_state_store import SqliteAgentStateStore
+
+__all__ = [
+    "AgentStateStore",
+    "InMemoryAgentStateStore",
+    "FileSystemAgentStateStore",
+    "SqliteAgentStateStore",
+]
@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import Any, List, Mapping
+
+from .._agent_id import AgentId
+
+
+class AgentStateStore(ABC):
+    """An abstract base class for storing the saved state of agents that are not in memory.
+
+    The runtime writes the result of :meth:`~autogen_core.Agent.save_state` to the store when it
+    passivates an idle agent, and reads it back to call :meth:`~autogen_core.Agent.load_state` when
+    the agent is instantiated again. States must be JSON serializable.
+    """
+
+    @abstractmethod
+    async def save(self, agent_id: AgentId, state: Mapping[str, Any]) -> None:
+        """Store the state of an agent, replacing any previously stored state."""
+        ...
+
+    @abstractmethod
+    async def load(self, agent_id: AgentId) -> Mapping[str, Any] | None:
+        """Return the stored state of an agent, or None if there is none."""
+        ...
+
+    @abstractmethod
+    async def delete(self, agent_id: AgentId) -> None:
+        """Remove the stored state of an agent. Does nothing if there is none."""
+        ...
+
+    @abstractmethod
+    async def agent_ids(self) -> List[AgentId]:
+        """Return the ids of all agents with a stored state."""
+        ...
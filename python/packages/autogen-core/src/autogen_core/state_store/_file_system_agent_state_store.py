@@ -0,0 +1,52 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any, List, Mapping
+from urllib.parse import quote, unquote
+
+from .._agent_id import AgentId
+from ._agent_state_store import AgentStateStore
+
+
+class FileSystemAgentStateStore(AgentStateStore):
+    """An agent state store that writes each agent's state to a JSON file in a directory.
+
+    Files are named after the URL-quoted agent id and replaced atomically on save.
+
+    Args:
+        directory (str | Path): The directory to store states in. Created if it does not exist.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, agent_id: AgentId) -> Path:
+        return self._directory / f"{quote(str(agent_id), safe='')}.json"
+
+    def _write(self, agent_id: AgentId, data: str) -> None:
+        path = self._path(agent_id)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(data, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def _read(self, agent_id: AgentId) -> str | None:
+        try:
+            return self._path(agent_id).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    async def save(self, agent_id: AgentId, state: Mapping[str, Any]) -> None:
+        await asyncio.to_thread(self._write, agent_id, json.dumps(state))
+
+    async def load(self, agent_id: AgentId) -> Mapping[str, Any] | None:
+        data = await asyncio.to_thread(self._read, agent_id)
+        return None if data is None else json.loads(data)
+
+    async def delete(self, agent_id: AgentId) -> None:
+        await asyncio.to_thread(self._path(agent_id).unlink, missing_ok=True)
+
+    async def agent_ids(self) -> List[AgentId]:
+        paths = await asyncio.to_thread(lambda: list(self._directory.glob("*.json")))
+        return [AgentId.from_str(unquote(path.stem)) for path in paths]
@@ -0,0 +1,29 @@
+import json
+from typing import Any, Dict, List, Mapping
+
+from .._agent_id import AgentId
+from ._agent_state_store import AgentStateStore
+
+
+class InMemoryAgentStateStore(AgentStateStore):
+    """An agent state store that keeps states in a dictionary.
+
+    States are kept as JSON strings, so the memory of passivated agents only holds
+    their serialized state rather than the objects they referenced.
+    """
+
+    def __init__(self) -> None:
+        self._states: Dict[AgentId, str] = {}
+
+    async def save(self, agent_id: AgentId, state: Mapping[str, Any]) -> None:
+        self._states[agent_id] = json.dumps(state)
+
+    async def load(self, agent_id: AgentId) -> Mapping[str, Any] | None:
+        state = self._states.get(agent_id)
+        return None if state is None else json.loads(state)
+
+    async def delete(self, agent_id: AgentId) -> None:
+        self._states.pop(agent_id, None)
+
+    async def agent_ids(self) -> List[AgentId]:
+        return list(self._states)
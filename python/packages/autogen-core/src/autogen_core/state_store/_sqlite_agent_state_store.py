@@ -0,0 +1,68 @@
+import asyncio
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, List, Mapping
+
+from .._agent_id import AgentId
+from ._agent_state_store import AgentStateStore
+
+
+class SqliteAgentStateStore(AgentStateStore):
+    """An agent state store backed by a SQLite database.
+
+    Database calls run in a worker thread so they do not block the event loop.
+
+    Args:
+        path (str | Path): Path of the database file. Use ``":memory:"`` for a temporary database.
+        table (str): Name of the table to store states in. Defaults to ``"agent_state"``.
+    """
+
+    def __init__(self, path: str | Path, table: str = "agent_state") -> None:
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self._table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (agent_id TEXT PRIMARY KEY, state TEXT NOT NULL)"
+            )
+
+    def _execute(self, sql: str, parameters: tuple[Any, ...] = ()) -> List[Any]:
+        with self._lock, self._connection:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    async def save(self, agent_id: AgentId, state: Mapping[str, Any]) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            f"INSERT OR REPLACE INTO {self._table} (agent_id, state) VALUES (?, ?)",
+            (str(agent_id), json.dumps(state)),
+        )
+
+    async def load(self, agent_id: AgentId) -> Mapping[str, Any] | None:
+        rows = await asyncio.to_thread(
+            self._execute,
+            f"SELECT state FROM {self._table} WHERE agent_id = ?",
+            (str(agent_id),),
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    async def delete(self, agent_id: AgentId) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            f"DELETE FROM {self._table} WHERE agent_id = ?",
+            (str(agent_id),),
+        )
+
+    async def agent_ids(self) -> List[AgentId]:
+        rows = await asyncio.to_thread(
+            self._execute, f"SELECT agent_id FROM {self._table}"
+        )
+        return [AgentId.from_str(row[0]) for row in rows]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
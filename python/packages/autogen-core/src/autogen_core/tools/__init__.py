@@ -1,5 +1,6 @@
 from ._base import BaseTool, BaseToolWithState, ParametersSchema, Tool, ToolSchema
 from ._function_tool import FunctionTool
+from ._tool_executor import ToolExecutionMetrics, ToolExecutor
 
 __all__ = [
     "Tool",
@@ -8,4 +9,6 @@
     "BaseTool",
     "BaseToolWithState",
     "FunctionTool",
+    "ToolExecutor",
+    "ToolExecutionMetrics",
 ]
@@ -7,6 +7,7 @@
     Generic,
     Mapping,
     Protocol,
+    Tuple,
     Type,
     TypedDict,
     TypeVar,
@@ -82,9 +83,19 @@ def __init__(
         self._return_type = normalize_annotated_type(return_type)
         self._name = name
         self._description = description
+        self._schema_cache: Tuple[Tuple[Any, ...], ToolSchema] | None = None
 
     @property
     def schema(self) -> ToolSchema:
+        """The schema of the tool. It is computed once and shared between accesses until
+        the name, description or argument type of the tool changes, so it must not be modified.
+        """
+        key = (self._args_type, self._name, self._description)
+        if self._schema_cache is None or self._schema_cache[0] != key:
+            self._schema_cache = (key, self._build_schema())
+        return self._schema_cache[1]
+
+    def _build_schema(self) -> ToolSchema:
         model_schema: Dict[str, Any] = self._args_type.model_json_schema()
 
         if "$defs" in model_schema:
@@ -1,6 +1,9 @@
 import asyncio
-import functools
-from typing import Any, Callable
+import inspect
+import time
+import weakref
+from dataclasses import replace
+from typing import Any, Callable, Dict, Tuple, Type
 
 from pydantic import BaseModel
 
@@ -10,6 +13,33 @@
     get_typed_signature,
 )
 from ._base import BaseTool
+from ._tool_executor import ToolExecutionMetrics, ToolExecutor, _timed_call
+
+# The typed signature and argument model of each wrapped function, by tool name, so that
+# wrapping the same function again, e.g. when agents are created per request, reuses them.
+_ArgsModels = Dict[str, Tuple[inspect.Signature, Type[BaseModel]]]
+_args_model_cache: "weakref.WeakKeyDictionary[Callable[..., Any], _ArgsModels]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_args_model(
+    func: Callable[..., Any], func_name: str
+) -> Tuple[inspect.Signature, Type[BaseModel]]:
+    try:
+        models = _args_model_cache.get(func)
+    except TypeError:
+        # The function cannot be weakly referenced.
+        models = None
+    if models is not None and func_name in models:
+        return models[func_name]
+    signature = get_typed_signature(func)
+    args_model = args_base_model_from_signature(func_name + "args", signature)
+    try:
+        _args_model_cache.setdefault(func, {})[func_name] = (signature, args_model)
+    except TypeError:
+        pass
+    return signature, args_model
 
 
 class FunctionTool(BaseTool[BaseModel, BaseModel]):
@@ -32,6 +62,14 @@ class FunctionTool(BaseTool[BaseModel, BaseModel]):
             it does and the context in which it should be called.
         name (str, optional): An optional custom name for the tool. Defaults to
             the function's original name if not provided.
+        executor (ToolExecutor | None, optional): The pool that runs the function if it is synchronous.
+            Defaults to None, which uses the event loop's default thread pool.
+        max_concurrency (int | None, optional): The maximum number of concurrent calls of the tool.
+            Further calls wait for a running call to complete. Defaults to None, meaning no limit.
+        timeout (float | None, optional): The maximum time, in seconds, that a call may take,
+            including the time spent waiting to run, after which it raises :class:`asyncio.TimeoutError`.
+            A synchronous function that has started keeps running in its worker after the timeout.
+            Defaults to None, meaning no timeout.
 
     Example:
 
@@ -65,40 +103,103 @@ async def example():
     """
 
     def __init__(
-        self, func: Callable[..., Any], description: str, name: str | None = None
+        self,
+        func: Callable[..., Any],
+        description: str,
+        name: str | None = None,
+        *,
+        executor: ToolExecutor | None = None,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
     ) -> None:
         self._func = func
-        signature = get_typed_signature(func)
         func_name = name or func.__name__
-        args_model = args_base_model_from_signature(func_name + "args", signature)
+        signature, args_model = _get_args_model(func, func_name)
         return_type = signature.return_annotation
         self._has_cancellation_support = "cancellation_token" in signature.parameters
+        if (
+            executor is not None
+            and executor.use_processes
+            and self._has_cancellation_support
+        ):
+            raise ValueError(
+                "Functions that take a cancellation token cannot run in a process pool."
+            )
+        if max_concurrency is not None and max_concurrency <= 0:
+            raise ValueError("max_concurrency must be greater than 0.")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be greater than 0.")
+        self._executor = executor
+        self._semaphore = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+        )
+        self._timeout = timeout
+        self._metrics = ToolExecutionMetrics()
 
         super().__init__(args_model, return_type, func_name, description)
 
+    @property
+    def metrics(self) -> ToolExecutionMetrics:
+        """A snapshot of the tool's counters. The wait time of a call includes waiting for
+        the concurrency limit of the tool and for a worker of its executor."""
+        return replace(self._metrics)
+
     async def run(self, args: BaseModel, cancellation_token: CancellationToken) -> Any:
+        kwargs = args.model_dump()
+        if self._has_cancellation_support:
+            kwargs["cancellation_token"] = cancellation_token
+        if self._timeout is None:
+            return await self._run(kwargs, cancellation_token)
+        try:
+            return await asyncio.wait_for(
+                self._run(kwargs, cancellation_token), self._timeout
+            )
+        except asyncio.TimeoutError:
+            self._metrics.timed_out += 1
+            raise
+
+    async def _run(
+        self, kwargs: Dict[str, Any], cancellation_token: CancellationToken
+    ) -> Any:
+        enqueued = time.monotonic()
+        if self._semaphore is None:
+            return await self._call(kwargs, cancellation_token, enqueued)
+        async with self._semaphore:
+            return await self._call(kwargs, cancellation_token, enqueued)
+
+    async def _call(
+        self,
+        kwargs: Dict[str, Any],
+        cancellation_token: CancellationToken,
+        enqueued: float,
+    ) -> Any:
         if asyncio.iscoroutinefunction(self._func):
-            if self._has_cancellation_support:
-                result = await self._func(
-                    **args.model_dump(), cancellation_token=cancellation_token
+            self._metrics._record_start(  # pyright: ignore[reportPrivateUsage]
+                time.monotonic() - enqueued
+            )
+            try:
+                return await self._func(**kwargs)
+            except Exception:
+                self._metrics.failed += 1
+                raise
+
+        if self._executor is not None:
+            future: asyncio.Future[Any] = asyncio.ensure_future(
+                self._executor._submit(  # pyright: ignore[reportPrivateUsage]
+                    self._func, (), kwargs
                 )
-            else:
-                result = await self._func(**args.model_dump())
+            )
         else:
-            if self._has_cancellation_support:
-                result = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    functools.partial(
-                        self._func,
-                        **args.model_dump(),
-                        cancellation_token=cancellation_token,
-                    ),
-                )
-            else:
-                future = asyncio.get_event_loop().run_in_executor(
-                    None, functools.partial(self._func, **args.model_dump())
-                )
-                cancellation_token.link_future(future)
-                result = await future
-
+            future = asyncio.get_running_loop().run_in_executor(
+                None, _timed_call, self._func, (), kwargs
+            )
+        if not self._has_cancellation_support:
+            cancellation_token.link_future(future)
+        started, result, error = await future
+        self._metrics._record_start(  # pyright: ignore[reportPrivateUsage]
+            started - enqueued
+        )
+        if error is not None:
+            self._metrics.failed += 1
+            raise error
         return result
@@ -0,0 +1,168 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+
+@dataclass
+class ToolExecutionMetrics:
+    """Counters collected by a :class:`ToolExecutor` or a :class:`~autogen_core.tools.FunctionTool`."""
+
+    calls: int = 0
+    """The number of calls that started running."""
+    failed: int = 0
+    """The number of calls that raised an exception."""
+    timed_out: int = 0
+    """The number of calls that did not complete within their timeout."""
+    total_wait_time: float = 0.0
+    """The total time, in seconds, that calls waited before they started running."""
+    max_wait_time: float = 0.0
+    """The longest time, in seconds, that a call waited before it started running."""
+
+    def _record_start(self, wait_time: float) -> None:
+        self.calls += 1
+        self.total_wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+
+
+# The result of a call in a worker: the time it started, and its return value or exception.
+_TimedResult = Tuple[float, Any, Optional[BaseException]]
+
+
+def _timed_call(
+    func: Callable[..., Any], args: Sequence[Any], kwargs: Dict[str, Any]
+) -> _TimedResult:
+    # A module-level function, so that it can be pickled for process pools.
+    started = time.monotonic()
+    try:
+        return started, func(*args, **kwargs), None
+    except Exception as e:
+        return started, None, e
+
+
+class ToolExecutor:
+    """A bounded pool of workers for running synchronous tool functions.
+
+    By default, :class:`~autogen_core.tools.FunctionTool` runs synchronous functions in the
+    event loop's default thread pool, which is shared with everything else that uses it, so
+    CPU-heavy tools can delay I/O tools. A tool executor gives a tool, or the tools of an
+    agent, their own pool of at most `max_workers` threads, or processes for CPU-bound
+    functions. Calls beyond the number of workers wait in the pool's queue, and the time
+    they wait is reported in :attr:`metrics`.
+
+    A process pool requires the tool functions, their arguments and their return values to
+    be picklable, so the functions must be defined at module level and cannot take a
+    cancellation token.
+
+    Args:
+        max_workers (int): The maximum number of threads or processes.
+        name (str): The name of the executor, used as the prefix of its thread names.
+            Defaults to "tool-executor".
+        use_processes (bool): Whether to run functions in a process pool instead of a thread pool.
+            Defaults to False.
+
+    Examples:
+
+        Run a CPU-bound tool in processes and limit it to two calls at a time:
+
+        .. code-block:: python
+
+            from autogen_core.tools import FunctionTool, ToolExecutor
+
+
+            def factorize(n: int) -> list[int]:
+                factors: list[int] = []
+                d = 2
+                while d * d <= n:
+                    while n % d == 0:
+                        factors.append(d)
+                        n //= d
+                    d += 1
+                if n > 1:
+                    factors.append(n)
+                return factors
+
+
+            cpu_executor = ToolExecutor(max_workers=4, name="cpu-tools", use_processes=True)
+            factorize_tool = FunctionTool(
+                factorize, description="Factorize an integer.", executor=cpu_executor, max_concurrency=2, timeout=30
+            )
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        *,
+        name: str = "tool-executor",
+        use_processes: bool = False,
+    ) -> None:
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0.")
+        self._max_workers = max_workers
+        self._name = name
+        self._use_processes = use_processes
+        self._executor: Executor
+        if use_processes:
+            self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix=name
+            )
+        self._pending = 0
+        self._metrics = ToolExecutionMetrics()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @property
+    def use_processes(self) -> bool:
+        return self._use_processes
+
+    @property
+    def pending(self) -> int:
+        """The number of calls submitted to the pool that have not completed, running or queued."""
+        return self._pending
+
+    @property
+    def metrics(self) -> ToolExecutionMetrics:
+        """A snapshot of the executor's counters."""
+        return replace(self._metrics)
+
+    async def run(self, func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        """Run a function in the pool and return its result.
+
+        Cancelling the call removes it from the queue if it has not started yet. A call that
+        has started runs to completion in its worker, but its result is discarded."""
+        _, result, error = await self._submit(func, args, kwargs)
+        if error is not None:
+            raise error
+        return result
+
+    async def _submit(
+        self, func: Callable[..., Any], args: Sequence[Any], kwargs: Dict[str, Any]
+    ) -> _TimedResult:
+        loop = asyncio.get_running_loop()
+        submitted = time.monotonic()
+        self._pending += 1
+        try:
+            started, result, error = await loop.run_in_executor(
+                self._executor, _timed_call, func, args, kwargs
+            )
+        finally:
+            self._pending -= 1
+        self._metrics._record_start(  # pyright: ignore[reportPrivateUsage]
+            started - submitted
+        )
+        if error is not None:
+            self._metrics.failed += 1
+        return started, result, error
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the pool. Queued calls that have not started are cancelled."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -1,10 +1,12 @@
 import asyncio
 from dataclasses import dataclass
+from typing import List, Type
 
 import pytest
 from autogen_core import (
     AgentId,
     AgentInstantiationContext,
+    AsyncioCancellationToken,
     CancellationToken,
     MessageContext,
     RoutedAgent,
@@ -190,3 +192,43 @@ async def test_nested_cancellation_inner_called() -> None:
     )
     assert long_running_agent.called
     assert long_running_agent.cancelled
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("token_type", [CancellationToken, AsyncioCancellationToken])
+async def test_link_future_unlinks_when_done(
+    token_type: Type[CancellationToken],
+) -> None:
+    token = token_type()
+    for _ in range(100):
+        await token.link_future(asyncio.ensure_future(asyncio.sleep(0)))
+    assert len(token._callbacks) == 0  # type: ignore[reportPrivateUsage]
+
+    pending = token.link_future(asyncio.ensure_future(asyncio.sleep(100)))
+    assert len(token._callbacks) == 1  # type: ignore[reportPrivateUsage]
+    token.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    assert len(token._callbacks) == 0  # type: ignore[reportPrivateUsage]
+
+
+@pytest.mark.parametrize("token_type", [CancellationToken, AsyncioCancellationToken])
+def test_callback_handle(token_type: Type[CancellationToken]) -> None:
+    token = token_type()
+    calls: List[str] = []
+    first = token.add_callback(lambda: calls.append("first"))
+    with token.add_callback(lambda: calls.append("disposed")):
+        pass
+    token.add_callback(lambda: calls.append("second"))
+    first.dispose()
+    first.dispose()
+    token.add_callback(lambda: calls.append("third"))
+
+    token.cancel()
+    token.cancel()
+    assert calls == ["second", "third"]
+    assert token.is_cancelled()
+
+    # Callbacks added after cancellation are called immediately.
+    token.add_callback(lambda: calls.append("late")).dispose()
+    assert calls == ["second", "third", "late"]
@@ -0,0 +1,66 @@
+import base64
+from io import BytesIO
+from pathlib import Path
+
+from autogen_core import Image
+from PIL import Image as PILImage
+from pytest_mock import MockerFixture
+
+
+def _encode(pil_image: PILImage.Image, format: str) -> bytes:
+    buffered = BytesIO()
+    pil_image.save(buffered, format=format)
+    return buffered.getvalue()
+
+
+def test_image_keeps_original_encoding(tmp_path: Path) -> None:
+    pil_image = PILImage.new("RGB", (64, 64), color="red")
+    jpeg_bytes = _encode(pil_image, "JPEG")
+    jpeg_base64 = base64.b64encode(jpeg_bytes).decode("utf-8")
+
+    image = Image.from_base64(jpeg_base64)
+    assert image.to_base64() == jpeg_base64
+    assert image.data_uri == f"data:image/jpeg;base64,{jpeg_base64}"
+    # The pixels have not been decoded.
+    assert image._image is None  # type: ignore[reportPrivateUsage]
+    assert image.image.mode == "RGB"
+    assert image.image.size == (64, 64)
+
+    assert Image.from_uri(image.data_uri).to_base64() == jpeg_base64
+
+    file_path = tmp_path / "image.jpg"
+    file_path.write_bytes(jpeg_bytes)
+    assert Image.from_file(file_path).to_base64() == jpeg_base64
+
+    # Re-encoded when another format is requested.
+    png_base64 = image.to_base64(format="PNG")
+    assert base64.b64decode(png_base64).startswith(b"\x89PNG")
+
+
+def test_image_encoding_is_memoized(mocker: MockerFixture) -> None:
+    image = Image.from_pil(PILImage.new("RGBA", (64, 64)))
+    assert image.image.mode == "RGB"
+    save = mocker.spy(PILImage.Image, "save")
+
+    assert image.data_uri.startswith("data:image/png;base64,")
+    image.to_base64()
+    image.to_openai_format()
+    assert save.call_count == 1
+
+    # Replacing the image discards the cached encoding.
+    image.image = PILImage.new("RGB", (32, 32))
+    assert image.to_base64() != image.to_base64(format="JPEG")
+    assert save.call_count == 3
+
+
+def test_image_lossy_formats() -> None:
+    pil_image = PILImage.effect_noise((256, 256), 64).convert("RGB")
+    png_size = len(Image.from_pil(pil_image).to_base64())
+
+    jpeg = Image.from_pil(pil_image, format="JPEG", quality=50)
+    assert jpeg.data_uri.startswith("data:image/jpeg;base64,")
+    assert len(jpeg.to_base64()) < png_size
+
+    webp = Image.from_pil(pil_image, format="WEBP", quality=50)
+    assert webp.data_uri.startswith("data:image/webp;base64,")
+    assert len(webp.to_base64()) < png_size
@@ -82,6 +82,53 @@ async def test_head_and_tail_model_context() -> None:
     assert retrived[2] == messages[-1]
 
 
+@pytest.mark.asyncio
+async def test_truncation_step_keeps_prefix_stable() -> None:
+    messages: List[LLMMessage] = [
+        UserMessage(content=f"Message {i}", source="user") for i in range(12)
+    ]
+    buffered = BufferedChatCompletionContext(buffer_size=3, truncation_step=4)
+    head_and_tail = HeadAndTailChatCompletionContext(
+        head_size=1, tail_size=3, truncation_step=4
+    )
+    buffered_views: List[List[LLMMessage]] = []
+    head_and_tail_views: List[List[LLMMessage]] = []
+    for msg in messages:
+        await buffered.add_message(msg)
+        await head_and_tail.add_message(msg)
+        buffered_views.append(await buffered.get_messages())
+        head_and_tail_views.append(await head_and_tail.get_messages())
+
+    # Messages are dropped 4 at a time, so the view holds 3 to 6 messages.
+    assert [len(view) for view in buffered_views] == [
+        1, 2, 3, 4, 5, 6, 3, 4, 5, 6, 3, 4
+    ]  # fmt: skip
+    assert buffered_views[-1] == messages[-4:]
+    # Between truncations, each view extends the previous one.
+    for previous, current in zip(
+        head_and_tail_views[8:10], head_and_tail_views[9:11], strict=True
+    ):
+        assert current[: len(previous)] == previous
+    assert head_and_tail_views[10] == [
+        messages[0],
+        UserMessage(content="Skipped 4 messages.", source="System"),
+        *messages[5:11],
+    ]
+
+    # The default step slides the view by one message.
+    assert (
+        len(
+            await BufferedChatCompletionContext(
+                buffer_size=3, initial_messages=messages
+            ).get_messages()
+        )
+        == 3
+    )
+
+    with pytest.raises(ValueError):
+        BufferedChatCompletionContext(buffer_size=3, truncation_step=0)
+
+
 @pytest.mark.asyncio
 async def test_unbounded_model_context() -> None:
     model_context = UnboundedChatCompletionContext()
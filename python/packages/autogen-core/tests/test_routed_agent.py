@@ -15,6 +15,7 @@
     rpc,
 )
 from autogen_test_utils import LoopbackAgent
+from pytest_mock import MockerFixture
 
 
 @dataclass
@@ -239,3 +240,113 @@ async def test_rpc() -> None:
     agent = await runtime.try_get_underlying_agent_instance(agent_id, type=RPCAgent)
     assert agent.num_calls[0] == 1
     assert agent.num_calls[1] == 1
+
+
+@dataclass
+class ResetMessageType: ...
+
+
+class ResettingCounterAgent(CounterAgent):
+    def __init__(self) -> None:
+        super().__init__()
+        self.num_resets = 0
+
+    @message_handler
+    async def on_reset(self, message: ResetMessageType, ctx: MessageContext) -> None:
+        self.num_resets += 1
+
+
+@pytest.mark.asyncio
+async def test_handler_table_computed_once_per_class(mocker: MockerFixture) -> None:
+    # A plain mock rather than a spy, so that calls through instances are counted too.
+    spy = mocker.patch.object(
+        ResettingCounterAgent,
+        "_discover_handlers",
+        wraps=ResettingCounterAgent._discover_handlers,  # type: ignore[reportPrivateUsage]
+    )
+    runtime = SingleThreadedAgentRuntime()
+    await ResettingCounterAgent.register(runtime, "counter", ResettingCounterAgent)
+
+    runtime.start()
+    for key in ["a", "b", "c"]:
+        agent_id = AgentId("counter", key)
+        assert (
+            await runtime.send_message(MessageType(), recipient=agent_id)
+            == MessageType()
+        )
+        await runtime.send_message(ResetMessageType(), recipient=agent_id)
+    await runtime.stop_when_idle()
+
+    # Handlers are discovered when the class is defined, not when instances are created.
+    assert spy.call_count == 0
+    agents = [
+        await runtime.try_get_underlying_agent_instance(
+            AgentId("counter", key), type=ResettingCounterAgent
+        )
+        for key in ["a", "b", "c"]
+    ]
+    assert all(agent.num_calls_rpc == 1 and agent.num_resets == 1 for agent in agents)
+    # Subclasses inherit the handlers of their base class, without affecting it.
+    assert set(ResettingCounterAgent.internal_handler_table) == {
+        MessageType,
+        ResetMessageType,
+    }
+    assert set(CounterAgent.internal_handler_table) == {MessageType}
+
+
+@dataclass
+class SpecialMessageType(MessageType): ...
+
+
+@pytest.mark.asyncio
+async def test_message_subclass_routing() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    await CounterAgent.register(runtime, "counter", CounterAgent)
+    await runtime.add_subscription(TypeSubscription("default", "counter"))
+    agent_id = AgentId(type="counter", key="default")
+
+    runtime.start()
+    await runtime.publish_message(
+        SpecialMessageType(), topic_id=TopicId("default", "default")
+    )
+    response = await runtime.send_message(SpecialMessageType(), recipient=agent_id)
+    await runtime.stop_when_idle()
+
+    assert response == SpecialMessageType()
+    agent = await runtime.try_get_underlying_agent_instance(agent_id, type=CounterAgent)
+    assert agent.num_calls_broadcast == 1
+    assert agent.num_calls_rpc == 1
+    assert (SpecialMessageType, True) in CounterAgent.internal_dispatch_table
+
+
+class UncheckedAgent(RoutedAgent, runtime_type_checks=False):
+    def __init__(self) -> None:
+        super().__init__("An agent without runtime type checks.")
+
+    @rpc
+    async def on_message_type(
+        self, message: MessageType, ctx: MessageContext
+    ) -> MessageType:
+        return cast(MessageType, UnhandledMessageType())
+
+
+class CheckedAgent(UncheckedAgent, runtime_type_checks=True): ...
+
+
+@pytest.mark.asyncio
+async def test_runtime_type_checks() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    await UncheckedAgent.register(runtime, "unchecked", UncheckedAgent)
+    await CheckedAgent.register(runtime, "checked", CheckedAgent)
+
+    runtime.start()
+    # The wrong return type is not caught without runtime type checks.
+    response = await runtime.send_message(
+        MessageType(), recipient=AgentId("unchecked", "default")
+    )
+    assert response == UnhandledMessageType()
+    with pytest.raises(ValueError):
+        await runtime.send_message(
+            MessageType(), recipient=AgentId("checked", "default")
+        )
+    await runtime.stop_when_idle()
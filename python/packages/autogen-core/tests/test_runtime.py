@@ -1,20 +1,31 @@
+import asyncio
+import inspect
 import logging
+from typing import List
 
 import pytest
 from autogen_core import (
+    EVENT_LOGGER_NAME,
     AgentId,
     AgentInstantiationContext,
+    AgentRuntime,
     AgentType,
     DefaultTopicId,
+    MessageContext,
+    RoutedAgent,
     SingleThreadedAgentRuntime,
     TopicId,
     TypeSubscription,
+    default_subscription,
+    message_handler,
     try_get_known_serializers_for_type,
     type_subscription,
 )
+from autogen_core.logging import DeliveryStage, MessageEvent
 from autogen_test_utils import (
     CascadingAgent,
     CascadingMessageType,
+    ContentMessage,
     LoopbackAgent,
     LoopbackAgentWithDefaultSubscription,
     MessageType,
@@ -25,6 +36,7 @@
     get_test_tracer_provider,
 )
 from opentelemetry.sdk.trace import TracerProvider
+from pytest_mock import MockerFixture
 
 test_exporter = MyTestExporter()
 
@@ -202,6 +214,37 @@ async def test_register_factory_explicit_name() -> None:
     await runtime.close()
 
 
+@pytest.mark.asyncio
+async def test_register_factory_inspects_arity_once(mocker: MockerFixture) -> None:
+    runtime = SingleThreadedAgentRuntime()
+    signature = mocker.spy(inspect, "signature")
+    created: List[AgentId] = []
+
+    def two_arg_factory(runtime: AgentRuntime, agent_id: AgentId) -> LoopbackAgent:
+        created.append(agent_id)
+        return LoopbackAgent()
+
+    await runtime.register_factory(
+        "zero", lambda: LoopbackAgent(), expected_class=LoopbackAgent
+    )
+    await runtime.register_factory(
+        "two", two_arg_factory, expected_class=LoopbackAgent  # type: ignore[arg-type]
+    )
+    assert signature.call_count == 2
+
+    runtime.start()
+    for key in ["a", "b", "c"]:
+        await runtime.send_message(MessageType(), AgentId("zero", key))
+    with pytest.warns(UserWarning, match="two arguments are deprecated"):
+        await runtime.send_message(MessageType(), AgentId("two", "a"))
+    await runtime.stop_when_idle()
+
+    # The factories are called with the arguments they take, and are not inspected again
+    # when agents are instantiated.
+    assert created == [AgentId("two", "a")]
+    assert signature.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_default_subscription() -> None:
     runtime = SingleThreadedAgentRuntime()
@@ -284,3 +327,274 @@ async def test_default_subscription_publish_to_other_source() -> None:
     assert other_long_running_agent.num_calls == 1
 
     await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_event_logging_serializes_lazily(
+    caplog: pytest.LogCaptureFixture, mocker: MockerFixture
+) -> None:
+    runtime = SingleThreadedAgentRuntime()
+    runtime.add_message_serializer(try_get_known_serializers_for_type(ContentMessage))
+    await LoopbackAgentWithDefaultSubscription.register(
+        runtime, "name1", LoopbackAgentWithDefaultSubscription
+    )
+    await LoopbackAgentWithDefaultSubscription.register(
+        runtime, "name2", LoopbackAgentWithDefaultSubscription
+    )
+    try_serialize = mocker.spy(runtime, "_try_serialize")
+
+    # Event logging is disabled, nothing is serialized.
+    with caplog.at_level(logging.WARNING, logger=EVENT_LOGGER_NAME):
+        runtime.start()
+        await runtime.publish_message(ContentMessage("hello"), DefaultTopicId())
+        await runtime.stop_when_idle()
+    assert try_serialize.call_count == 0
+
+    # Once on send and once for all recipients of the published envelope.
+    with caplog.at_level(logging.INFO, logger=EVENT_LOGGER_NAME):
+        runtime.start()
+        await runtime.publish_message(ContentMessage("hello"), DefaultTopicId())
+        await runtime.stop_when_idle()
+    assert try_serialize.call_count == 2
+    # The envelope's payload is encoded once for both records.
+    assert runtime.serialization_cache_misses == 1
+    assert runtime.serialization_cache_hits == 1
+    deliver_events = [
+        record.msg
+        for record in caplog.records
+        if isinstance(record.msg, MessageEvent)
+        and record.msg.kwargs["delivery_stage"] == str(DeliveryStage.DELIVER)
+    ]
+    assert len(deliver_events) == 2
+    assert all("hello" in event.kwargs["payload"] for event in deliver_events)
+
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_event_logging_serialization_cache(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    runtime = SingleThreadedAgentRuntime(max_cached_messages=4)
+    runtime.add_message_serializer(try_get_known_serializers_for_type(ContentMessage))
+    await LoopbackAgentWithDefaultSubscription.register(
+        runtime, "name", LoopbackAgentWithDefaultSubscription
+    )
+
+    # A message published twice is serialized once.
+    message = ContentMessage("hello")
+    with caplog.at_level(logging.INFO, logger=EVENT_LOGGER_NAME):
+        runtime.start()
+        await runtime.publish_message(message, DefaultTopicId())
+        await runtime.publish_message(message, DefaultTopicId())
+        await runtime.stop_when_idle()
+    assert runtime.serialization_cache_misses == 1
+    assert runtime.serialization_cache_hits == 3
+
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_batched_dispatch_preserves_order() -> None:
+    with pytest.raises(ValueError):
+        SingleThreadedAgentRuntime(dispatch_batch_size=0)
+
+    runtime = SingleThreadedAgentRuntime(dispatch_batch_size=16)
+    await LoopbackAgentWithDefaultSubscription.register(
+        runtime, "name", LoopbackAgentWithDefaultSubscription
+    )
+
+    runtime.start()
+    messages = [ContentMessage(content=str(i)) for i in range(100)]
+    for message in messages:
+        await runtime.publish_message(message, DefaultTopicId())
+    await runtime.stop_when_idle()
+
+    agent = await runtime.try_get_underlying_agent_instance(
+        AgentId("name", "default"), type=LoopbackAgentWithDefaultSubscription
+    )
+    assert agent.received_messages == messages
+
+    # Responses to direct messages are resolved by the batched loop as well.
+    runtime.start()
+    response = await runtime.send_message(
+        ContentMessage(content="direct"), AgentId("name", "default")
+    )
+    assert response == ContentMessage(content="direct")
+    await runtime.stop()
+
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_batched_dispatch_slow_factory_does_not_block() -> None:
+    runtime = SingleThreadedAgentRuntime(dispatch_batch_size=16)
+    release = asyncio.Event()
+
+    async def slow_factory() -> LoopbackAgent:
+        await release.wait()
+        return LoopbackAgent()
+
+    await runtime.register_factory(
+        AgentType("slow"), slow_factory, expected_class=LoopbackAgent
+    )
+    await runtime.add_subscription(TypeSubscription("slow_topic", "slow"))
+    await LoopbackAgent.register(runtime, "fast", LoopbackAgent)
+    await runtime.add_subscription(TypeSubscription("fast_topic", "fast"))
+
+    runtime.start()
+    await runtime.publish_message(MessageType(), TopicId("slow_topic", "default"))
+    await runtime.publish_message(MessageType(), TopicId("fast_topic", "default"))
+    # The fast agent gets its message while the slow agent is still being created.
+    fast_agent = await asyncio.wait_for(
+        runtime.try_get_underlying_agent_instance(
+            AgentId("fast", "default"), type=LoopbackAgent
+        ),
+        timeout=1,
+    )
+    while fast_agent.num_calls == 0:
+        await asyncio.sleep(0.01)
+    assert not release.is_set()
+
+    release.set()
+    await runtime.stop_when_idle()
+    slow_agent = await runtime.try_get_underlying_agent_instance(
+        AgentId("slow", "default"), type=LoopbackAgent
+    )
+    assert slow_agent.num_calls == 1
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_applies_backpressure() -> None:
+    runtime = SingleThreadedAgentRuntime(max_queue_size=2)
+    await LoopbackAgentWithDefaultSubscription.register(
+        runtime, "name", LoopbackAgentWithDefaultSubscription
+    )
+
+    await runtime.publish_message(MessageType(), DefaultTopicId())
+    await runtime.publish_message(MessageType(), DefaultTopicId())
+    assert runtime.unprocessed_messages_count == 2
+
+    # The queue is full, publishing waits until the runtime makes room.
+    blocked = asyncio.create_task(
+        runtime.publish_message(MessageType(), DefaultTopicId())
+    )
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    runtime.start()
+    await blocked
+    await runtime.stop_when_idle()
+    assert runtime.in_flight_tasks_count == 0
+
+    agent = await runtime.try_get_underlying_agent_instance(
+        AgentId("name", "default"), type=LoopbackAgentWithDefaultSubscription
+    )
+    assert agent.num_calls == 3
+
+    await runtime.close()
+
+
+class ForwardingAgent(RoutedAgent):
+    def __init__(self, recipient: AgentId) -> None:
+        super().__init__("An agent that forwards messages and returns the response.")
+        self.recipient = recipient
+
+    @message_handler
+    async def on_message_type(
+        self, message: MessageType, ctx: MessageContext
+    ) -> MessageType:
+        response = await self.send_message(message, self.recipient)
+        assert isinstance(response, MessageType)
+        return response
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("dispatch_batch_size", [1, 16])
+async def test_bounded_queue_nested_rpc(dispatch_batch_size: int) -> None:
+    runtime = SingleThreadedAgentRuntime(
+        max_queue_size=1, dispatch_batch_size=dispatch_batch_size
+    )
+    await LoopbackAgent.register(runtime, "echo", LoopbackAgent)
+    # A chain of RPCs deeper than the queue.
+    await ForwardingAgent.register(
+        runtime, "middle", lambda: ForwardingAgent(AgentId("echo", "default"))
+    )
+    await ForwardingAgent.register(
+        runtime, "caller", lambda: ForwardingAgent(AgentId("middle", "default"))
+    )
+    runtime.start()
+
+    responses = await asyncio.wait_for(
+        asyncio.gather(
+            *[
+                runtime.send_message(MessageType(), AgentId("caller", "default"))
+                for _ in range(10)
+            ]
+        ),
+        timeout=5,
+    )
+    assert len(responses) == 10
+    await asyncio.wait_for(runtime.stop_when_idle(), timeout=5)
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_send_to_unknown_agent_type() -> None:
+    runtime = SingleThreadedAgentRuntime(max_queue_size=2)
+    await LoopbackAgent.register(runtime, "echo", LoopbackAgent)
+    runtime.start()
+
+    for _ in range(3):
+        with pytest.raises(Exception, match="Recipient not found"):
+            await asyncio.wait_for(
+                runtime.send_message(MessageType(), AgentId("unknown", "default")),
+                timeout=5,
+            )
+    # Failed sends are done with, the runtime keeps processing messages.
+    response = await asyncio.wait_for(
+        runtime.send_message(MessageType(), AgentId("echo", "default")), timeout=5
+    )
+    assert isinstance(response, MessageType)
+    await asyncio.wait_for(runtime.stop_when_idle(), timeout=5)
+    await runtime.close()
+
+
+@default_subscription
+class SlowAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that takes a while to handle messages.")
+        self.active = 0
+        self.max_active = 0
+
+    @message_handler
+    async def on_message_type(self, message: MessageType, ctx: MessageContext) -> None:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_per_agent() -> None:
+    runtime = SingleThreadedAgentRuntime(max_concurrency_per_agent=1)
+    await SlowAgent.register(runtime, "slow", SlowAgent)
+
+    runtime.start()
+    for _ in range(5):
+        await runtime.publish_message(MessageType(), DefaultTopicId())
+        await runtime.publish_message(MessageType(), DefaultTopicId(source="other"))
+    await asyncio.sleep(0.005)
+    # One message per agent instance is being handled, the rest wait in the mailboxes.
+    assert runtime.mailbox_waiting_count == 8
+    await runtime.stop_when_idle()
+    assert runtime.mailbox_waiting_count == 0
+
+    for key in ["default", "other"]:
+        agent = await runtime.try_get_underlying_agent_instance(
+            AgentId("slow", key), type=SlowAgent
+        )
+        assert agent.max_active == 1
+
+    await runtime.close()
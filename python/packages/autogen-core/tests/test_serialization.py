@@ -1,13 +1,17 @@
-from dataclasses import dataclass
-from typing import Union
+from dataclasses import dataclass, field
+from typing import Any, List, Union
 
 import pytest
 from autogen_core import Image
 from autogen_core._serialization import (
     JSON_DATA_CONTENT_TYPE,
+    MSGPACK_DATA_CONTENT_TYPE,
     PROTOBUF_DATA_CONTENT_TYPE,
     DataclassJsonMessageSerializer,
+    MessagePackMessageSerializer,
     MessageSerializer,
+    PayloadCache,
+    ProtobufMessageSerializer,
     PydanticJsonMessageSerializer,
     SerializationRegistry,
     try_get_known_serializers_for_type,
@@ -15,6 +19,7 @@
 from PIL import Image as PILImage
 from protos.serialization_test_pb2 import NestingProtoMessage, ProtoMessage
 from pydantic import BaseModel
+from pytest_mock import MockerFixture
 
 
 class PydanticMessage(BaseModel):
@@ -87,7 +92,7 @@ def test_dataclass() -> None:
     json = serde.serialize(
         message, type_name=name, data_content_type=JSON_DATA_CONTENT_TYPE
     )
-    assert json == b'{"message": "hello"}'
+    assert json == b'{"message":"hello"}'
     deserialized = serde.deserialize(
         json, type_name=name, data_content_type=JSON_DATA_CONTENT_TYPE
     )
@@ -96,10 +101,20 @@ def test_dataclass() -> None:
 
 def test_nesting_dataclass_dataclass() -> None:
     serde = SerializationRegistry()
-    with pytest.raises(ValueError):
-        serde.add_serializer(
-            try_get_known_serializers_for_type(NestingDataclassMessage)
-        )
+    serde.add_serializer(try_get_known_serializers_for_type(NestingDataclassMessage))
+
+    message = NestingDataclassMessage(
+        message="hello", nested=DataclassMessage(message="world")
+    )
+    name = serde.type_name(message)
+    json = serde.serialize(
+        message, type_name=name, data_content_type=JSON_DATA_CONTENT_TYPE
+    )
+    assert json == b'{"message":"hello","nested":{"message":"world"}}'
+    deserialized = serde.deserialize(
+        json, type_name=name, data_content_type=JSON_DATA_CONTENT_TYPE
+    )
+    assert deserialized == message
 
 
 def test_proto() -> None:
@@ -134,6 +149,47 @@ def test_nested_proto() -> None:
     assert deserialized.nested.message == message.nested.message
 
 
+class BytesOnlyProtoSerializer:
+    """A protobuf serializer that does not convert to and from Any directly."""
+
+    def __init__(self) -> None:
+        self._serializer = ProtobufMessageSerializer(ProtoMessage)
+
+    @property
+    def data_content_type(self) -> str:
+        return PROTOBUF_DATA_CONTENT_TYPE
+
+    @property
+    def type_name(self) -> str:
+        return "ProtoMessage"
+
+    def deserialize(self, payload: bytes) -> ProtoMessage:
+        return self._serializer.deserialize(payload)
+
+    def serialize(self, message: ProtoMessage) -> bytes:
+        return self._serializer.serialize(message)
+
+
+@pytest.mark.parametrize("direct", [True, False])
+def test_proto_any(direct: bool, mocker: MockerFixture) -> None:
+    serde = SerializationRegistry()
+    serde.add_serializer(
+        try_get_known_serializers_for_type(ProtoMessage)
+        if direct
+        else BytesOnlyProtoSerializer()
+    )
+    serialize = mocker.spy(ProtobufMessageSerializer, "serialize")
+    deserialize = mocker.spy(ProtobufMessageSerializer, "deserialize")
+
+    message = ProtoMessage(message="hello")
+    any_proto = serde.serialize_to_any(message, type_name="ProtoMessage")
+    assert any_proto.Is(ProtoMessage.DESCRIPTOR)
+    deserialized = serde.deserialize_from_any(any_proto, type_name="ProtoMessage")
+    assert deserialized == message
+    # Only serializers without a direct Any conversion encode and parse the payload.
+    assert serialize.call_count == deserialize.call_count == (0 if direct else 1)
+
+
 @dataclass
 class DataclassNestedUnionSyntaxOldMessage:
     message: Union[str, int]
@@ -158,10 +214,22 @@ def test_nesting_union_old_syntax_dataclass(
 
 def test_nesting_dataclass_pydantic() -> None:
     serde = SerializationRegistry()
-    with pytest.raises(ValueError):
-        serde.add_serializer(
-            try_get_known_serializers_for_type(NestingPydanticDataclassMessage)
-        )
+    serde.add_serializer(
+        try_get_known_serializers_for_type(NestingPydanticDataclassMessage)
+    )
+
+    message = NestingPydanticDataclassMessage(
+        message="hello", nested=PydanticMessage(message="world")
+    )
+    name = serde.type_name(message)
+    json = serde.serialize(
+        message, type_name=name, data_content_type=JSON_DATA_CONTENT_TYPE
+    )
+    assert json == b'{"message":"hello","nested":{"message":"world"}}'
+    deserialized = serde.deserialize(
+        json, type_name=name, data_content_type=JSON_DATA_CONTENT_TYPE
+    )
+    assert deserialized == message
 
 
 def test_invalid_type() -> None:
@@ -218,3 +286,181 @@ class PydanticImageMessage(BaseModel):
     assert deserialized.image.image.size == (100, 100)
     assert deserialized.image.image.mode == "RGB"
     assert deserialized.image.image == image.image
+
+
+def test_serialized_payload_cache() -> None:
+    serde = SerializationRegistry(max_cached_messages=2)
+    serde.add_serializer(try_get_known_serializers_for_type(DataclassMessage))
+    serde.add_serializer(try_get_known_serializers_for_type(ProtoMessage))
+    type_name = serde.type_name(DataclassMessage(message="hello"))
+
+    message = DataclassMessage(message="hello")
+    payload = serde.serialize(
+        message, type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE
+    )
+    assert (
+        serde.serialize(
+            message, type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE
+        )
+        is payload
+    )
+    assert (serde.cache_hits, serde.cache_misses) == (1, 1)
+
+    # An equal but distinct message object is serialized again.
+    other = DataclassMessage(message="hello")
+    assert (
+        serde.serialize(
+            other, type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE
+        )
+        == payload
+    )
+    assert (serde.cache_hits, serde.cache_misses) == (1, 2)
+
+    # Entries are dropped with the message and when the cache is full.
+    del other
+    assert len(serde._payload_cache) == 1  # type: ignore[reportPrivateUsage]
+    newer = [DataclassMessage(message=str(i)) for i in range(2)]
+    for m in newer:
+        serde.serialize(
+            m, type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE
+        )
+    serde.serialize(
+        message, type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE
+    )
+    assert (serde.cache_hits, serde.cache_misses) == (1, 5)
+
+    # Protobuf messages cannot be weakly referenced and are never cached.
+    proto_message = ProtoMessage(message="hello")
+    proto_type_name = serde.type_name(proto_message)
+    for _ in range(2):
+        serde.serialize(
+            proto_message,
+            type_name=proto_type_name,
+            data_content_type=PROTOBUF_DATA_CONTENT_TYPE,
+        )
+    assert (serde.cache_hits, serde.cache_misses) == (1, 7)
+
+
+def test_serialized_payload_cache_disabled_by_default() -> None:
+    serde = SerializationRegistry()
+    serde.add_serializer(try_get_known_serializers_for_type(DataclassMessage))
+    message = DataclassMessage(message="hello")
+    type_name = serde.type_name(message)
+
+    serde.serialize(
+        message, type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE
+    )
+    # A message changed after it was serialized is serialized again.
+    message.message = "changed"
+    payload = serde.serialize(
+        message, type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE
+    )
+    assert serde.deserialize(
+        payload, type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE
+    ) == DataclassMessage(message="changed")
+    assert serde.cache_hits == 0
+
+
+def test_serialized_payload_cache_per_envelope() -> None:
+    serde = SerializationRegistry()
+    serde.add_serializer(try_get_known_serializers_for_type(DataclassMessage))
+    message = DataclassMessage(message="hello")
+    type_name = serde.type_name(message)
+    payloads = PayloadCache()
+
+    payload = serde.serialize(
+        message,
+        type_name=type_name,
+        data_content_type=JSON_DATA_CONTENT_TYPE,
+        payload_cache=payloads,
+    )
+    assert (
+        serde.serialize(
+            message,
+            type_name=type_name,
+            data_content_type=JSON_DATA_CONTENT_TYPE,
+            payload_cache=payloads,
+        )
+        is payload
+    )
+    assert (serde.cache_hits, serde.cache_misses) == (1, 1)
+
+    # A message replaced in the envelope is serialized again.
+    replacement = DataclassMessage(message="replaced")
+    payload = serde.serialize(
+        replacement,
+        type_name=type_name,
+        data_content_type=JSON_DATA_CONTENT_TYPE,
+        payload_cache=payloads,
+    )
+    assert serde.deserialize(
+        payload, type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE
+    ) == DataclassMessage(message="replaced")
+    assert (serde.cache_hits, serde.cache_misses) == (1, 2)
+
+
+@dataclass
+class ListNestingDataclassMessage:
+    message: str
+    nested: List[DataclassMessage] = field(default_factory=list)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dataclass_generic_nesting(use_orjson: bool, mocker: MockerFixture) -> None:
+    if not use_orjson:
+        mocker.patch("autogen_core._serialization.orjson", None)
+    serializer = DataclassJsonMessageSerializer(ListNestingDataclassMessage)
+
+    message = ListNestingDataclassMessage(
+        message="hello", nested=[DataclassMessage("a"), DataclassMessage("b")]
+    )
+    payload = serializer.serialize(message)
+    assert payload == b'{"message":"hello","nested":[{"message":"a"},{"message":"b"}]}'
+    assert serializer.deserialize(payload) == message
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        DataclassMessage(message="hello"),
+        NestingDataclassMessage(message="hello", nested=DataclassMessage("world")),
+        ListNestingDataclassMessage(message="hello", nested=[DataclassMessage("a")]),
+        NestingPydanticMessage(
+            message="hello", nested=PydanticMessage(message="world")
+        ),
+    ],
+)
+def test_msgpack(message: Any) -> None:
+    pytest.importorskip("msgpack")
+    serde = SerializationRegistry()
+    serde.add_serializer(try_get_known_serializers_for_type(type(message)))
+
+    name = serde.type_name(message)
+    data = serde.serialize(
+        message, type_name=name, data_content_type=MSGPACK_DATA_CONTENT_TYPE
+    )
+    json = serde.serialize(
+        message, type_name=name, data_content_type=JSON_DATA_CONTENT_TYPE
+    )
+    assert len(data) < len(json)
+    deserialized = serde.deserialize(
+        data, type_name=name, data_content_type=MSGPACK_DATA_CONTENT_TYPE
+    )
+    assert deserialized == message
+
+
+def test_msgpack_image_type() -> None:
+    pytest.importorskip("msgpack")
+
+    @dataclass
+    class DataclassImageMessage:
+        image: Image
+
+    serializer = MessagePackMessageSerializer(DataclassImageMessage)
+    image = Image(PILImage.new("RGB", (100, 100)))
+
+    deserialized = serializer.deserialize(
+        serializer.serialize(DataclassImageMessage(image=image))
+    )
+
+    assert deserialized.image.image == image.image
@@ -1,7 +1,15 @@
+import asyncio
+from pathlib import Path
 from typing import Any, Mapping
 
 import pytest
 from autogen_core import AgentId, BaseAgent, MessageContext, SingleThreadedAgentRuntime
+from autogen_core.state_store import (
+    AgentStateStore,
+    FileSystemAgentStateStore,
+    InMemoryAgentStateStore,
+    SqliteAgentStateStore,
+)
 
 
 class StatefulAgent(BaseAgent):
@@ -65,3 +73,99 @@ async def test_runtime_can_save_state() -> None:
 
     await runtime2.load_state(runtime_state)
     assert agent2.state == 1
+
+
+class CountingAgent(BaseAgent):
+    def __init__(self) -> None:
+        super().__init__("A stateful agent that counts messages")
+        self.count = 0
+
+    async def on_message_impl(self, message: Any, ctx: MessageContext) -> int:
+        self.count += 1
+        return self.count
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return {"count": self.count}
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        self.count = state["count"]
+
+
+@pytest.fixture(params=["memory", "file_system", "sqlite"])
+def state_store(request: pytest.FixtureRequest, tmp_path: Path) -> AgentStateStore:
+    if request.param == "memory":
+        return InMemoryAgentStateStore()
+    if request.param == "file_system":
+        return FileSystemAgentStateStore(tmp_path / "states")
+    return SqliteAgentStateStore(tmp_path / "states.db")
+
+
+@pytest.mark.asyncio
+async def test_agent_state_store(state_store: AgentStateStore) -> None:
+    agent_id = AgentId("name1", "session/1")
+    assert await state_store.load(agent_id) is None
+
+    await state_store.save(agent_id, {"count": 1})
+    await state_store.save(agent_id, {"count": 2})
+    await state_store.save(AgentId("name1", "other"), {"count": 3})
+    assert await state_store.load(agent_id) == {"count": 2}
+    assert set(await state_store.agent_ids()) == {agent_id, AgentId("name1", "other")}
+
+    await state_store.delete(agent_id)
+    await state_store.delete(agent_id)
+    assert await state_store.load(agent_id) is None
+    assert await state_store.agent_ids() == [AgentId("name1", "other")]
+
+
+@pytest.mark.asyncio
+async def test_runtime_passivates_least_recently_used_agents(
+    state_store: AgentStateStore,
+) -> None:
+    runtime = SingleThreadedAgentRuntime(
+        agent_state_store=state_store, max_instantiated_agents=2
+    )
+    await CountingAgent.register(runtime, "counter", CountingAgent)
+    runtime.start()
+
+    for key in ["a", "b", "a", "c"]:
+        await runtime.send_message("hello", AgentId("counter", key))
+    await runtime.stop_when_idle()
+    while runtime._passivation_task is not None:  # type: ignore[reportPrivateUsage]
+        await asyncio.sleep(0.01)
+
+    # "b" was the least recently used agent.
+    assert set(runtime._instantiated_agents) == {  # type: ignore[reportPrivateUsage]
+        AgentId("counter", "a"),
+        AgentId("counter", "c"),
+    }
+    assert await state_store.load(AgentId("counter", "b")) == {"count": 1}
+
+    state = await runtime.save_state()
+    assert state == {
+        "counter/a": {"count": 2},
+        "counter/b": {"count": 1},
+        "counter/c": {"count": 1},
+    }
+
+    # The passivated agent is rehydrated with its state.
+    runtime.start()
+    assert await runtime.send_message("hello", AgentId("counter", "b")) == 2
+    await runtime.stop_when_idle()
+    assert await state_store.load(AgentId("counter", "b")) is None
+
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_runtime_passivates_idle_agents() -> None:
+    runtime = SingleThreadedAgentRuntime(agent_idle_timeout=0.05)
+    await CountingAgent.register(runtime, "counter", CountingAgent)
+    runtime.start()
+
+    await runtime.send_message("hello", AgentId("counter", "a"))
+    await asyncio.sleep(0.2)
+    assert runtime._instantiated_agents == {}  # type: ignore[reportPrivateUsage]
+
+    assert await runtime.send_message("hello", AgentId("counter", "a")) == 2
+    await runtime.stop()
+    await runtime.close()
@@ -1,12 +1,17 @@
+import uuid
+
 import pytest
 from autogen_core import (
     AgentId,
     DefaultSubscription,
     DefaultTopicId,
     SingleThreadedAgentRuntime,
+    Subscription,
     TopicId,
+    TypePrefixSubscription,
     TypeSubscription,
 )
+from autogen_core._runtime_impl_helpers import SubscriptionManager
 from autogen_core.exceptions import CantHandleException
 from autogen_test_utils import LoopbackAgent, MessageType
 
@@ -126,3 +131,100 @@ async def test_subscription_deduplication() -> None:
     default_subscription = DefaultSubscription(agent_type=agent_type)
     with pytest.raises(ValueError, match="Subscription already exists"):
         await runtime.add_subscription(default_subscription)
+
+
+class _SourceSubscription(Subscription):
+    """A custom subscription that is not indexed by topic type."""
+
+    def __init__(self, source: str, agent_type: str) -> None:
+        self._source = source
+        self._agent_type = agent_type
+        self._id = str(uuid.uuid4())
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    def is_match(self, topic_id: TopicId) -> bool:
+        return topic_id.source == self._source
+
+    def map_to_agent(self, topic_id: TopicId) -> AgentId:
+        return AgentId(type=self._agent_type, key=topic_id.source)
+
+
+@pytest.mark.asyncio
+async def test_subscription_manager_incremental_updates() -> None:
+    manager = SubscriptionManager()
+    topic = TopicId(type="chat.session", source="s1")
+    other_topic = TopicId(type="other", source="s1")
+
+    # Resolve the topics before any subscription exists.
+    assert await manager.get_subscribed_recipients(topic) == []
+    assert await manager.get_subscribed_recipients(other_topic) == []
+
+    type_sub = TypeSubscription("chat.session", "a1")
+    prefix_sub = TypePrefixSubscription("chat.", "a2")
+    custom_sub = _SourceSubscription("s1", "a3")
+    await manager.add_subscription(type_sub)
+    await manager.add_subscription(prefix_sub)
+    await manager.add_subscription(custom_sub)
+
+    assert await manager.get_subscribed_recipients(topic) == [
+        AgentId("a1", "s1"),
+        AgentId("a2", "s1"),
+        AgentId("a3", "s1"),
+    ]
+    assert await manager.get_subscribed_recipients(other_topic) == [AgentId("a3", "s1")]
+    # A topic seen for the first time resolves in registration order as well.
+    assert await manager.get_subscribed_recipients(
+        TopicId(type="chat.session", source="s2")
+    ) == [AgentId("a1", "s2"), AgentId("a2", "s2")]
+
+    await manager.remove_subscription(prefix_sub.id)
+    assert await manager.get_subscribed_recipients(topic) == [
+        AgentId("a1", "s1"),
+        AgentId("a3", "s1"),
+    ]
+
+    await manager.remove_subscription(type_sub.id)
+    await manager.remove_subscription(custom_sub.id)
+    assert await manager.get_subscribed_recipients(topic) == []
+    assert manager._subscriptions == []  # type: ignore[reportPrivateUsage]
+
+    with pytest.raises(ValueError, match="Subscription does not exist"):
+        await manager.remove_subscription(type_sub.id)
+
+
+@pytest.mark.asyncio
+async def test_subscription_manager_prefix_deduplication() -> None:
+    manager = SubscriptionManager()
+    await manager.add_subscription(TypePrefixSubscription("t", "a1"))
+    with pytest.raises(ValueError, match="Subscription already exists"):
+        await manager.add_subscription(TypePrefixSubscription("t", "a1"))
+    await manager.add_subscription(TypePrefixSubscription("t", "a2"))
+    await manager.add_subscription(TypePrefixSubscription("t1", "a1"))
+
+    assert await manager.get_subscribed_recipients(TopicId("t1", "s")) == [
+        AgentId("a1", "s"),
+        AgentId("a2", "s"),
+        AgentId("a1", "s"),
+    ]
+    assert await manager.get_subscribed_recipients(TopicId("t2", "s")) == [
+        AgentId("a1", "s"),
+        AgentId("a2", "s"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_subscription_manager_recipients_not_changed_in_place() -> None:
+    manager = SubscriptionManager()
+    first = TypeSubscription("t", "a1")
+    await manager.add_subscription(first)
+    topic = TopicId("t", "s")
+    recipients = await manager.get_subscribed_recipients(topic)
+
+    # A list handed out stays the same while subscriptions change, e.g. during a publish.
+    await manager.add_subscription(TypeSubscription("t", "a2"))
+    await manager.remove_subscription(first.id)
+    assert recipients == [AgentId("a1", "s")]
+    assert await manager.get_subscribed_recipients(topic) == [AgentId("a2", "s")]
@@ -1,10 +1,13 @@
+import asyncio
 import inspect
+import threading
+import time
 from typing import Annotated, List
 
 import pytest
 from autogen_core import CancellationToken
 from autogen_core._function_utils import get_typed_signature
-from autogen_core.tools import BaseTool, FunctionTool
+from autogen_core.tools import BaseTool, FunctionTool, ToolExecutor
 from autogen_core.tools._base import ToolSchema
 from pydantic import BaseModel, Field, model_serializer
 from pydantic_core import PydanticUndefined
@@ -120,6 +123,29 @@ def my_function(arg: str = "default") -> MyResult:
     assert "required" not in schema["parameters"]
 
 
+def test_tool_schema_is_cached() -> None:
+    tool = MyTool()
+    schema = tool.schema
+    assert tool.schema is schema
+
+    # Changing the tool rebuilds the schema.
+    tool._description = "Changed description."  # pyright: ignore[reportPrivateUsage]
+    assert tool.schema is not schema
+    assert tool.schema["description"] == "Changed description."
+
+
+def test_func_tool_args_model_is_cached() -> None:
+    def my_function(arg: str) -> str:
+        return arg
+
+    tool = FunctionTool(my_function, description="Function tool.")
+    assert (
+        FunctionTool(my_function, description="Other.").args_type() is tool.args_type()
+    )
+    renamed = FunctionTool(my_function, description="Function tool.", name="renamed")
+    assert renamed.args_type() is not tool.args_type()
+
+
 @pytest.mark.asyncio
 async def test_tool_run() -> None:
     tool = MyTool()
@@ -444,3 +470,87 @@ def test_nested_tool_properties() -> None:
     assert tool.args_type() == MyNestedArgs
     assert tool.return_type() == MyResult
     assert tool.state_type() is None
+
+
+def square(x: int) -> int:
+    return x * x
+
+
+@pytest.mark.asyncio
+async def test_func_tool_thread_executor() -> None:
+    thread_names: List[str] = []
+
+    def slow(x: int) -> int:
+        thread_names.append(threading.current_thread().name)
+        time.sleep(0.05)
+        return x
+
+    executor = ToolExecutor(max_workers=1, name="slow-tools")
+    tool = FunctionTool(slow, description="Slow tool.", executor=executor)
+    results = await asyncio.gather(
+        *[tool.run_json({"x": i}, CancellationToken()) for i in range(3)]
+    )
+    assert results == [0, 1, 2]
+    assert all(name.startswith("slow-tools") for name in thread_names)
+    # With a single worker, the calls queue behind each other.
+    metrics = executor.metrics
+    assert metrics.calls == 3
+    assert metrics.max_wait_time >= 0.09
+    assert tool.metrics.calls == 3
+    assert executor.pending == 0
+
+    def failing(x: int) -> int:
+        raise ValueError("bad input")
+
+    failing_tool = FunctionTool(failing, description="Failing tool.", executor=executor)
+    with pytest.raises(ValueError, match="bad input"):
+        await failing_tool.run_json({"x": 1}, CancellationToken())
+    assert failing_tool.metrics.failed == 1
+    assert executor.metrics.failed == 1
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_func_tool_process_executor() -> None:
+    executor = ToolExecutor(max_workers=1, use_processes=True)
+    tool = FunctionTool(square, description="Square a number.", executor=executor)
+    assert await tool.run_json({"x": 7}, CancellationToken()) == 49
+    assert executor.metrics.calls == 1
+    executor.shutdown()
+
+    def with_token(x: int, cancellation_token: CancellationToken) -> int:
+        return x
+
+    with pytest.raises(ValueError):
+        FunctionTool(with_token, description="Tool.", executor=executor)
+
+
+@pytest.mark.asyncio
+async def test_func_tool_concurrency_limit_and_timeout() -> None:
+    running = 0
+    max_running = 0
+
+    async def limited(x: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return x
+
+    tool = FunctionTool(limited, description="Limited tool.", max_concurrency=2)
+    await asyncio.gather(
+        *[tool.run_json({"x": i}, CancellationToken()) for i in range(6)]
+    )
+    assert max_running == 2
+    assert tool.metrics.calls == 6
+    assert tool.metrics.max_wait_time > 0
+
+    async def stuck(x: int) -> int:
+        await asyncio.sleep(10)
+        return x
+
+    tool = FunctionTool(stuck, description="Stuck tool.", timeout=0.05)
+    with pytest.raises(asyncio.TimeoutError):
+        await tool.run_json({"x": 1}, CancellationToken())
+    assert tool.metrics.timed_out == 1
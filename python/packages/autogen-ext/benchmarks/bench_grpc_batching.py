@@ -0,0 +1,106 @@
+"""Event throughput benchmark for batched frames on the gRPC channel.
+
+Starts a host runtime and two worker runtimes over localhost, publishes a burst of events
+from one worker to an agent on the other, and reports the events per second until all of
+them are handled, with message batching enabled and disabled on the host and workers.
+
+Run with::
+
+    python benchmarks/bench_grpc_batching.py --events 5000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+from autogen_core import (
+    MessageContext,
+    RoutedAgent,
+    TopicId,
+    TypeSubscription,
+    message_handler,
+    try_get_known_serializers_for_type,
+)
+from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime, GrpcWorkerAgentRuntimeHost
+
+
+@dataclass
+class Tick:
+    index: int
+
+
+class CountingAgent(RoutedAgent):
+    def __init__(self, expected: int, done: asyncio.Event) -> None:
+        super().__init__("An agent that counts events.")
+        self._expected = expected
+        self._done = done
+        self.count = 0
+
+    @message_handler
+    async def on_tick(self, message: Tick, ctx: MessageContext) -> None:
+        self.count += 1
+        if self.count == self._expected:
+            self._done.set()
+
+
+async def measure(host_address: str, events: int, message_batching: bool) -> float:
+    host = GrpcWorkerAgentRuntimeHost(
+        address=host_address, message_batching=message_batching
+    )
+    host.start()
+    publisher = GrpcWorkerAgentRuntime(
+        host_address=host_address, message_batching=message_batching
+    )
+    subscriber = GrpcWorkerAgentRuntime(
+        host_address=host_address, message_batching=message_batching
+    )
+    done = asyncio.Event()
+    for runtime in (publisher, subscriber):
+        runtime.start()
+        runtime.add_message_serializer(try_get_known_serializers_for_type(Tick))
+    await subscriber.register_factory(
+        "counter", lambda: CountingAgent(events, done), expected_class=CountingAgent
+    )
+    await subscriber.add_subscription(TypeSubscription("ticks", "counter"))
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[
+            publisher.publish_message(
+                Tick(index=i), topic_id=TopicId("ticks", "default")
+            )
+            for i in range(events)
+        ]
+    )
+    await done.wait()
+    elapsed = time.perf_counter() - start
+
+    await publisher.stop()
+    await subscriber.stop()
+    await host.stop()
+    return events / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--port", type=int, default=50095)
+    args = parser.parse_args()
+    # The runtimes log every message at INFO level, which would dominate the measurement.
+    logging.getLogger("autogen_core").setLevel(logging.WARNING)
+
+    for index, message_batching in enumerate((False, True)):
+        host_address = f"localhost:{args.port + index}"
+        throughput = asyncio.run(measure(host_address, args.events, message_batching))
+        print(f"message_batching={message_batching!s:<5} {throughput:10.1f} events/s")
+    # The gRPC channels can keep the interpreter alive after the runtimes stop.
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
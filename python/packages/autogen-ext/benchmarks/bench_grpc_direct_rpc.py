@@ -0,0 +1,112 @@
+"""Benchmark for RPCs sent directly between gRPC worker runtimes.
+
+Starts a host runtime and two worker runtimes, one with an echo agent, and sends requests
+to the echo agent from the other worker, first through the host and then with both workers
+started with ``direct_rpc_address``, so requests go from worker to worker. Reports the
+requests per second and the mean latency of sequential requests in each mode.
+
+Run with::
+
+    python benchmarks/bench_grpc_direct_rpc.py --requests 2000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Tuple
+
+from autogen_core import (
+    AgentId,
+    MessageContext,
+    RoutedAgent,
+    message_handler,
+    try_get_known_serializers_for_type,
+)
+from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime, GrpcWorkerAgentRuntimeHost
+
+
+@dataclass
+class Ping:
+    sequence: int
+
+
+class EchoAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that echoes requests.")
+
+    @message_handler
+    async def on_ping(self, message: Ping, ctx: MessageContext) -> Ping:
+        return message
+
+
+async def measure(
+    port: int, direct: bool, requests: int, concurrency: int
+) -> Tuple[float, float]:
+    host_address = f"localhost:{port}"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+    receiver = GrpcWorkerAgentRuntime(
+        host_address=host_address,
+        direct_rpc_address=f"localhost:{port + 1}" if direct else None,
+    )
+    sender = GrpcWorkerAgentRuntime(
+        host_address=host_address,
+        direct_rpc_address=f"localhost:{port + 2}" if direct else None,
+    )
+    for worker in (receiver, sender):
+        worker.start()
+        worker.add_message_serializer(try_get_known_serializers_for_type(Ping))
+    await EchoAgent.register(receiver, "echo", lambda: EchoAgent())
+    recipient = AgentId("echo", "default")
+
+    # Warm up: create the agent, look up its placement and open the channels.
+    for i in range(10):
+        await sender.send_message(Ping(sequence=i), recipient)
+
+    start = time.perf_counter()
+    for i in range(requests // 10):
+        await sender.send_message(Ping(sequence=i), recipient)
+    latency = (time.perf_counter() - start) / (requests // 10)
+
+    async def send_requests(count: int) -> None:
+        for i in range(count):
+            await sender.send_message(Ping(sequence=i), recipient)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[send_requests(requests // concurrency) for _ in range(concurrency)]
+    )
+    throughput = (requests // concurrency * concurrency) / (time.perf_counter() - start)
+
+    await sender.stop()
+    await receiver.stop()
+    await host.stop()
+    return throughput, latency
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="The requests in flight at once."
+    )
+    parser.add_argument("--port", type=int, default=50110)
+    args = parser.parse_args()
+
+    for index, direct in enumerate([False, True]):
+        throughput, latency = asyncio.run(
+            measure(args.port + 3 * index, direct, args.requests, args.concurrency)
+        )
+        mode = "direct" if direct else "via host"
+        print(
+            f"{mode:<9s} {throughput:10.1f} requests/s  latency={latency * 1e6:8.1f} us"
+        )
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
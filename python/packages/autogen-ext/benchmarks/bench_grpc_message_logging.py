@@ -0,0 +1,169 @@
+"""Per-message logging overhead benchmark for the gRPC host.
+
+Times the logging done by the host for each message it sends and receives, using a
+cloud event with a binary payload: first the previous eager form, which rendered the
+whole protobuf in an f-string even when INFO was disabled, then the lazy debug logs and
+the message trace sampler. Then publishes events between two workers through a host in
+this process and reports the process CPU time per event.
+
+Run with::
+
+    python benchmarks/bench_grpc_message_logging.py --messages 20000 --payload-size 4096
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+from autogen_core import (
+    MessageContext,
+    RoutedAgent,
+    TopicId,
+    TypeSubscription,
+    message_handler,
+    try_get_known_serializers_for_type,
+)
+from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime, GrpcWorkerAgentRuntimeHost
+from autogen_ext.runtimes.grpc._message_logging import (
+    ChannelMessageLog,
+    MessageTraceSampler,
+)
+from autogen_ext.runtimes.grpc.protos import agent_worker_pb2, cloudevent_pb2
+
+logger = logging.getLogger("autogen_core")
+
+
+def make_message(payload_size: int) -> agent_worker_pb2.Message:
+    return agent_worker_pb2.Message(
+        cloudEvent=cloudevent_pb2.CloudEvent(
+            id="0b7c6a1e-5f0e-4a57-9d2e-3b1f0a9c8d7e",
+            source="default",
+            spec_version="1.0",
+            type="ticks",
+            attributes={
+                "datacontenttype": cloudevent_pb2.CloudEvent.CloudEventAttributeValue(
+                    ce_string="application/json"
+                ),
+                "dataschema": cloudevent_pb2.CloudEvent.CloudEventAttributeValue(
+                    ce_string="Tick"
+                ),
+            },
+            binary_data=os.urandom(payload_size),
+        )
+    )
+
+
+def bench_eager(message: agent_worker_pb2.Message, messages: int) -> float:
+    start = time.process_time()
+    for client_id in range(messages):
+        logger.info(f"Received message from client {client_id}: {message}")
+        logger.info(f"Sent message to client {client_id}: {message}")
+    return (time.process_time() - start) / messages
+
+
+def bench_lazy(
+    message: agent_worker_pb2.Message, messages: int, sample_rate: float
+) -> float:
+    sampler = MessageTraceSampler(sample_rate)
+    start = time.process_time()
+    for client_id in range(messages):
+        logger.debug(
+            "Received message from client %s: %s",
+            client_id,
+            ChannelMessageLog("receive", message, client_id=client_id),
+        )
+        sampler.trace("receive", message, client_id=client_id)
+        logger.debug(
+            "Sent message to client %s: %s",
+            client_id,
+            ChannelMessageLog("send", message, client_id=client_id),
+        )
+        sampler.trace("send", message, client_id=client_id)
+    return (time.process_time() - start) / messages
+
+
+@dataclass
+class Tick:
+    data: str
+
+
+class CountingAgent(RoutedAgent):
+    def __init__(self, expected: int, done: asyncio.Event) -> None:
+        super().__init__("An agent that counts events.")
+        self._expected = expected
+        self._done = done
+        self.count = 0
+
+    @message_handler
+    async def on_tick(self, message: Tick, ctx: MessageContext) -> None:
+        self.count += 1
+        if self.count == self._expected:
+            self._done.set()
+
+
+async def bench_runtime(host_address: str, events: int, payload_size: int) -> float:
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+    publisher = GrpcWorkerAgentRuntime(host_address=host_address)
+    subscriber = GrpcWorkerAgentRuntime(host_address=host_address)
+    done = asyncio.Event()
+    for runtime in (publisher, subscriber):
+        runtime.start()
+        runtime.add_message_serializer(try_get_known_serializers_for_type(Tick))
+    await subscriber.register_factory(
+        "counter", lambda: CountingAgent(events, done), expected_class=CountingAgent
+    )
+    await subscriber.add_subscription(TypeSubscription("ticks", "counter"))
+
+    tick = Tick(data="." * payload_size)
+    start = time.process_time()
+    await asyncio.gather(
+        *[
+            publisher.publish_message(tick, topic_id=TopicId("ticks", "default"))
+            for _ in range(events)
+        ]
+    )
+    await done.wait()
+    cpu_time = time.process_time() - start
+
+    await publisher.stop()
+    await subscriber.stop()
+    await host.stop()
+    return cpu_time / events
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--payload-size", type=int, default=4096)
+    parser.add_argument("--events", type=int, default=3000)
+    parser.add_argument("--port", type=int, default=50097)
+    args = parser.parse_args()
+    # INFO is disabled, as in production: the eager form still renders every message.
+    logging.basicConfig(level=logging.WARNING)
+
+    message = make_message(args.payload_size)
+    eager = bench_eager(message, args.messages)
+    print(f"eager f-string logs:        {eager * 1e6:8.2f} us CPU/message")
+    for sample_rate in (0.0, 0.001):
+        lazy = bench_lazy(message, args.messages, sample_rate)
+        print(
+            f"lazy logs, sample={sample_rate:<6}  {lazy * 1e6:8.2f} us CPU/message"
+            f"  ({eager / lazy:.0f}x less)"
+        )
+
+    per_event = asyncio.run(
+        bench_runtime(f"localhost:{args.port}", args.events, args.payload_size)
+    )
+    print(f"host and workers, end to end: {per_event * 1e6:8.2f} us CPU/event")
+    # The gRPC channels can keep the interpreter alive after the runtimes stop.
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Scale-out benchmark for agent types shared by several gRPC worker runtimes.
+
+Starts a host runtime with ``allow_shared_agent_types=True`` and N worker processes that
+all register the same CPU-bound agent type, then sends requests to many agent keys from
+a client runtime and reports the throughput for each number of workers. Agents are placed
+on the workers by consistent hashing of their keys.
+
+Run with::
+
+    python benchmarks/bench_grpc_scale_out.py --workers 1 2 4 --requests 400 --work 200000
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass
+from multiprocessing.synchronize import Event
+from typing import List
+
+from autogen_core import (
+    AgentId,
+    MessageContext,
+    RoutedAgent,
+    message_handler,
+    try_get_known_serializers_for_type,
+)
+from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime, GrpcWorkerAgentRuntimeHost
+
+
+@dataclass
+class Work:
+    iterations: int
+
+
+@dataclass
+class Result:
+    value: int
+
+
+class ComputeAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("A CPU-bound agent.")
+
+    @message_handler
+    async def on_work(self, message: Work, ctx: MessageContext) -> Result:
+        value = 0
+        for i in range(message.iterations):
+            value = (value + i * i) % 1_000_003
+        return Result(value=value)
+
+
+def add_serializers(runtime: GrpcWorkerAgentRuntime) -> None:
+    runtime.add_message_serializer(try_get_known_serializers_for_type(Work))
+    runtime.add_message_serializer(try_get_known_serializers_for_type(Result))
+
+
+async def run_worker(host_address: str, ready: Event, stop: Event) -> None:
+    worker = GrpcWorkerAgentRuntime(host_address=host_address)
+    worker.start()
+    add_serializers(worker)
+    await ComputeAgent.register(worker, "compute", lambda: ComputeAgent())
+    ready.set()
+    while not stop.is_set():
+        await asyncio.sleep(0.1)
+    await worker.drain()
+    await worker.stop()
+
+
+def worker_main(host_address: str, ready: Event, stop: Event) -> None:
+    asyncio.run(run_worker(host_address, ready, stop))
+    # The gRPC channel can keep the interpreter alive after the runtime stops.
+    os._exit(0)
+
+
+async def measure(
+    host_address: str, num_workers: int, requests: int, keys: int, work: int
+) -> float:
+    host = GrpcWorkerAgentRuntimeHost(
+        address=host_address, allow_shared_agent_types=True
+    )
+    host.start()
+
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    processes: List[multiprocessing.process.BaseProcess] = []
+    ready_events = []
+    for _ in range(num_workers):
+        ready = context.Event()
+        process = context.Process(target=worker_main, args=(host_address, ready, stop))
+        process.start()
+        processes.append(process)
+        ready_events.append(ready)
+    while not all(ready.is_set() for ready in ready_events):
+        await asyncio.sleep(0.1)
+
+    client = GrpcWorkerAgentRuntime(host_address=host_address)
+    client.start()
+    add_serializers(client)
+
+    # Warm up: create the agents on their workers.
+    await asyncio.gather(
+        *[
+            client.send_message(Work(iterations=1), AgentId("compute", f"key{i}"))
+            for i in range(keys)
+        ]
+    )
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[
+            client.send_message(
+                Work(iterations=work), AgentId("compute", f"key{i % keys}")
+            )
+            for i in range(requests)
+        ]
+    )
+    elapsed = time.perf_counter() - start
+
+    # Join without blocking the event loop, which runs the host the workers drain through.
+    stop.set()
+    for worker_process in processes:
+        await asyncio.to_thread(worker_process.join)
+    await client.stop()
+    await host.stop()
+    return requests / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument(
+        "--keys", type=int, default=64, help="The number of distinct agent keys."
+    )
+    parser.add_argument(
+        "--work", type=int, default=200_000, help="The loop iterations per request."
+    )
+    parser.add_argument("--port", type=int, default=50090)
+    args = parser.parse_args()
+
+    baseline = None
+    for index, num_workers in enumerate(args.workers):
+        host_address = f"localhost:{args.port + index}"
+        throughput = asyncio.run(
+            measure(host_address, num_workers, args.requests, args.keys, args.work)
+        )
+        baseline = baseline or throughput
+        print(
+            f"workers={num_workers:<3d} {throughput:10.1f} requests/s  speedup={throughput / baseline:5.2f}x"
+        )
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
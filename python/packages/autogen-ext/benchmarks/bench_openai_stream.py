@@ -0,0 +1,106 @@
+"""Streaming throughput benchmark for the OpenAI chat completion client.
+
+Replays a long stream of content chunks through ``OpenAIChatCompletionClient.create_stream``
+with a cancellation token, without any network access, and reports the chunks per second,
+the peak memory allocated while streaming and the number of callbacks left on the token.
+
+Run with::
+
+    python benchmarks/bench_openai_stream.py --chunks 10000
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import Any, AsyncGenerator
+
+from autogen_core import CancellationToken
+from autogen_core.models import UserMessage
+from autogen_ext.models.openai import OpenAIChatCompletionClient
+from openai.resources.chat.completions import AsyncCompletions
+from openai.types.chat.chat_completion_chunk import (
+    ChatCompletionChunk,
+    Choice,
+    ChoiceDelta,
+)
+
+
+def make_chunks(num_chunks: int) -> list[ChatCompletionChunk]:
+    chunks = [
+        ChatCompletionChunk(
+            id="id",
+            choices=[
+                Choice(
+                    index=0,
+                    finish_reason=None,
+                    delta=ChoiceDelta(content=f" token{i}", role="assistant"),
+                )
+            ],
+            created=0,
+            model="gpt-4o-2024-08-06",
+            object="chat.completion.chunk",
+        )
+        for i in range(num_chunks)
+    ]
+    chunks.append(
+        ChatCompletionChunk(
+            id="id",
+            choices=[
+                Choice(index=0, finish_reason="stop", delta=ChoiceDelta(content=None))
+            ],
+            created=0,
+            model="gpt-4o-2024-08-06",
+            object="chat.completion.chunk",
+        )
+    )
+    return chunks
+
+
+async def measure(num_chunks: int) -> None:
+    chunks = make_chunks(num_chunks)
+
+    async def replay() -> AsyncGenerator[ChatCompletionChunk, None]:
+        for chunk in chunks:
+            yield chunk
+
+    async def create(
+        *args: Any, **kwargs: Any
+    ) -> AsyncGenerator[ChatCompletionChunk, None]:
+        return replay()
+
+    AsyncCompletions.create = create  # type: ignore[assignment, method-assign]
+    client = OpenAIChatCompletionClient(model="gpt-4o", api_key="api_key")
+    cancellation_token = CancellationToken()
+    messages = [UserMessage(content="Tell me a long story.", source="user")]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    received = 0
+    async for _ in client.create_stream(
+        messages, cancellation_token=cancellation_token
+    ):
+        received += 1
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"chunks={received - 1} {(received - 1) / elapsed:,.0f} chunks/sec "
+        f"peak memory {peak / 1024:,.0f} KiB "
+        f"token callbacks {len(cancellation_token._callbacks)}"  # pyright: ignore[reportPrivateUsage]
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for _ in range(args.repeat):
+        asyncio.run(measure(args.chunks))
+
+
+if __name__ == "__main__":
+    main()
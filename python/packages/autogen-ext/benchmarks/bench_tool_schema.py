@@ -0,0 +1,91 @@
+"""Per-turn tool schema overhead benchmark for the OpenAI chat completion client.
+
+Builds an agent-sized set of function tools and measures, per turn, the time to produce
+the tool parameters sent with a request, both by rebuilding every schema and conversion
+as before and through the per-tool caches of ``BaseTool.schema`` and ``convert_tools``.
+Also measures wrapping the same functions in new ``FunctionTool`` instances, as agents
+created per request do.
+
+Run with::
+
+    python benchmarks/bench_tool_schema.py --tools 30
+"""
+
+import argparse
+import time
+from typing import Any, Callable, List
+
+from autogen_core.tools import FunctionTool
+from autogen_ext.models.openai._openai_client import (
+    _convert_tool_schema,  # pyright: ignore[reportPrivateUsage]
+    convert_tools,
+)
+from pydantic import BaseModel, Field
+from typing_extensions import Annotated
+
+
+class Address(BaseModel):
+    street: str = Field(description="The street and number.")
+    city: str = Field(description="The city.")
+    country: str = Field(default="US", description="The ISO country code.")
+
+
+def make_function(index: int) -> Callable[..., Any]:
+    def tool_function(
+        query: Annotated[str, "The query to run."],
+        address: Annotated[Address, "The address to search near."],
+        limit: Annotated[int, "The maximum number of results."] = 10,
+        include_closed: Annotated[bool, "Whether to include closed places."] = False,
+    ) -> str:
+        return query
+
+    tool_function.__name__ = f"search_{index}"
+    return tool_function
+
+
+def uncached_tool_param(tool: FunctionTool) -> Any:
+    schema = tool._build_schema()  # pyright: ignore[reportPrivateUsage]
+    return _convert_tool_schema(schema)
+
+
+def per_turn(name: str, turns: int, produce: Callable[[], Any]) -> None:
+    # The first turn fills the caches.
+    produce()
+    start = time.perf_counter()
+    for _ in range(turns):
+        produce()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {elapsed / turns * 1e6:>10,.1f} us/turn")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tools", type=int, default=30)
+    parser.add_argument("--turns", type=int, default=200)
+    args = parser.parse_args()
+
+    functions = [make_function(i) for i in range(args.tools)]
+    tools: List[FunctionTool] = [
+        FunctionTool(func, description=f"Search tool {i}.")
+        for i, func in enumerate(functions)
+    ]
+    print(f"tools={args.tools} turns={args.turns}")
+
+    per_turn(
+        "uncached schema + convert",
+        args.turns,
+        lambda: [uncached_tool_param(tool) for tool in tools],
+    )
+    per_turn("cached schema + convert", args.turns, lambda: convert_tools(tools))
+    per_turn(
+        "wrap functions in new tools",
+        args.turns,
+        lambda: [
+            FunctionTool(func, description=f"Search tool {i}.")
+            for i, func in enumerate(functions)
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -427,6 +427,9 @@ async def on_messages_stream(
             final_usage = RequestUsage(
                 prompt_tokens=sum([u.prompt_tokens for u in self.model_usage]),
                 completion_tokens=sum([u.completion_tokens for u in self.model_usage]),
+                cached_prompt_tokens=sum(
+                    [u.cached_prompt_tokens for u in self.model_usage]
+                ),
             )
             if isinstance(content, str):
                 yield Response(
@@ -831,7 +834,7 @@ async def _execute_tool(
 
         return [
             message_content,
-            AGImage.from_pil(PIL.Image.open(io.BytesIO(new_screenshot))),
+            AGImage.from_bytes(new_screenshot),
         ]
 
     def _target_name(
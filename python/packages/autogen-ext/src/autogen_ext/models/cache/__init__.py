@@ -0,0 +1,11 @@
+from ._cache_store import CacheStore, InMemoryCacheStore, SqliteCacheStore
+from ._chat_completion_cache import ChatCompletionCache
+from ._coalescing_chat_completion_client import CoalescingChatCompletionClient
+
+__all__ = [
+    "ChatCompletionCache",
+    "CoalescingChatCompletionClient",
+    "CacheStore",
+    "InMemoryCacheStore",
+    "SqliteCacheStore",
+]
@@ -0,0 +1,100 @@
+import asyncio
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, List
+
+
+class CacheStore(ABC):
+    """An abstract base class for the stores used by :class:`ChatCompletionCache`.
+
+    Keys are hex digests of the request and values are JSON strings of the response,
+    so a store does not need to know about model messages or results.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> str | None:
+        """Return the value stored for a key, or None if there is none."""
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str) -> None:
+        """Store a value for a key, replacing any previously stored value."""
+        ...
+
+
+class InMemoryCacheStore(CacheStore):
+    """A cache store that keeps the most recently used values in a dictionary.
+
+    Args:
+        max_entries (int | None): The maximum number of values to keep. When the store is full,
+            the least recently used value is evicted. None means no limit. Defaults to 1024.
+    """
+
+    def __init__(self, max_entries: int | None = 1024) -> None:
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError("max_entries must be a positive integer or None")
+        self._max_entries = max_entries
+        self._values: OrderedDict[str, str] = OrderedDict()
+
+    async def get(self, key: str) -> str | None:
+        value = self._values.get(key)
+        if value is not None:
+            self._values.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        self._values[key] = value
+        self._values.move_to_end(key)
+        if self._max_entries is not None and len(self._values) > self._max_entries:
+            self._values.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class SqliteCacheStore(CacheStore):
+    """A cache store backed by a SQLite database on local disk, so cached responses
+    survive across processes and runs.
+
+    Database calls run in a worker thread so they do not block the event loop.
+
+    Args:
+        path (str | Path): Path of the database file. Use ``":memory:"`` for a temporary database.
+        table (str): Name of the table to store values in. Defaults to ``"chat_completion_cache"``.
+    """
+
+    def __init__(self, path: str | Path, table: str = "chat_completion_cache") -> None:
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self._table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+    def _execute(self, sql: str, parameters: tuple[Any, ...] = ()) -> List[Any]:
+        with self._lock, self._connection:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    async def get(self, key: str) -> str | None:
+        rows = await asyncio.to_thread(
+            self._execute, f"SELECT value FROM {self._table} WHERE key = ?", (key,)
+        )
+        return rows[0][0] if rows else None
+
+    async def set(self, key: str, value: str) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            f"INSERT OR REPLACE INTO {self._table} (key, value) VALUES (?, ?)",
+            (key, value),
+        )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import json
+import warnings
+from typing import Any, AsyncGenerator, List, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelCapabilities,  # type: ignore
+    ModelInfo,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+
+from ._cache_store import CacheStore, InMemoryCacheStore
+from ._request_key import client_model, request_key
+
+
+class ChatCompletionCache(ChatCompletionClient):
+    """
+    A chat completion client that wraps another client and caches its responses.
+
+    The cache key is a SHA-256 digest of the messages, the tool schemas, ``json_output``,
+    ``extra_create_args`` and the model name, so only requests that would be sent
+    identically to the model share a response. Responses are stored as JSON in a
+    :class:`CacheStore`, by default an :class:`InMemoryCacheStore`; use a
+    :class:`SqliteCacheStore` to keep them on local disk across runs.
+
+    Responses served from the cache have :attr:`~autogen_core.models.CreateResult.cached`
+    set to True. Their ``usage`` is the usage of the original request, but they are not
+    added to :meth:`actual_usage` or :meth:`total_usage`, which only account for requests
+    sent to the wrapped client. The usage saved by cache hits is reported by
+    :meth:`cached_usage`.
+
+    :meth:`create_stream` records the chunks of a streamed response and replays them
+    on a cache hit. A response cached by :meth:`create` is replayed by :meth:`create_stream`
+    as the final result only. Failed or cancelled requests are not cached, nor are requests
+    with ``extra_create_args`` that cannot be serialized to JSON deterministically.
+
+    Args:
+        client (ChatCompletionClient): The client to wrap.
+        store (CacheStore | None): The store for cached responses. Defaults to an
+            :class:`InMemoryCacheStore`.
+        model (str | None): The model name to include in the cache key. If not given, the
+            ``model`` in the component configuration of the wrapped client is used if it has one. A ``model``
+            in ``extra_create_args`` always takes precedence.
+
+    Examples:
+
+        Cache the responses of an OpenAI client in a SQLite database:
+
+        .. code-block:: python
+
+            import asyncio
+
+            from autogen_core.models import UserMessage
+            from autogen_ext.models.cache import ChatCompletionCache, SqliteCacheStore
+            from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+
+            async def main() -> None:
+                client = ChatCompletionCache(
+                    OpenAIChatCompletionClient(model="gpt-4o"),
+                    store=SqliteCacheStore("llm_cache.db"),
+                )
+                messages = [UserMessage(content="What is the capital of France?", source="user")]
+                response = await client.create(messages)
+                print(response.cached)  # False
+                response = await client.create(messages)
+                print(response.cached)  # True
+
+
+            asyncio.run(main())
+    """
+
+    def __init__(
+        self,
+        client: ChatCompletionClient,
+        store: Optional[CacheStore] = None,
+        *,
+        model: Optional[str] = None,
+    ) -> None:
+        self._client = client
+        self._store = store if store is not None else InMemoryCacheStore()
+        self._model = model if model is not None else client_model(client)
+        self._cached_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def client(self) -> ChatCompletionClient:
+        """The wrapped client."""
+        return self._client
+
+    @property
+    def store(self) -> CacheStore:
+        """The store for cached responses."""
+        return self._store
+
+    @property
+    def hits(self) -> int:
+        """The number of requests served from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """The number of requests sent to the wrapped client."""
+        return self._misses
+
+    def cache_key(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+    ) -> Optional[str]:
+        """Return the cache key of a request, or None if the request cannot be cached
+        because some of its arguments cannot be serialized deterministically."""
+        return request_key(self._model, messages, tools, json_output, extra_create_args)
+
+    async def _lookup(self, key: str) -> tuple[List[str], CreateResult] | None:
+        value = await self._store.get(key)
+        if value is None:
+            self._misses += 1
+            return None
+        entry = json.loads(value)
+        result = CreateResult.model_validate(entry["result"])
+        result.cached = True
+        self._hits += 1
+        self._cached_usage.prompt_tokens += result.usage.prompt_tokens
+        self._cached_usage.completion_tokens += result.usage.completion_tokens
+        self._cached_usage.cached_prompt_tokens += result.usage.cached_prompt_tokens
+        return entry["chunks"], result
+
+    async def _save(self, key: str, chunks: List[str], result: CreateResult) -> None:
+        entry = {"chunks": chunks, "result": result.model_dump(mode="json")}
+        await self._store.set(key, json.dumps(entry))
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        key = self.cache_key(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+        )
+        if key is not None:
+            cached = await self._lookup(key)
+            if cached is not None:
+                return cached[1]
+        result = await self._client.create(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        if key is not None:
+            await self._save(key, [], result)
+        return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        key = self.cache_key(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+        )
+        cached = await self._lookup(key) if key is not None else None
+        if cached is not None:
+            chunks, result = cached
+            for chunk in chunks:
+                yield chunk
+            yield result
+            return
+        recorded: List[str] = []
+        async for item in self._client.create_stream(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        ):
+            if isinstance(item, CreateResult):
+                if key is not None:
+                    await self._save(key, recorded, item)
+            else:
+                recorded.append(item)
+            yield item
+
+    def actual_usage(self) -> RequestUsage:
+        return self._client.actual_usage()
+
+    def total_usage(self) -> RequestUsage:
+        return self._client.total_usage()
+
+    def cached_usage(self) -> RequestUsage:
+        """Return the total usage of the responses served from the cache, i.e. the usage saved by the cache."""
+        return RequestUsage(
+            prompt_tokens=self._cached_usage.prompt_tokens,
+            completion_tokens=self._cached_usage.completion_tokens,
+            cached_prompt_tokens=self._cached_usage.cached_prompt_tokens,
+        )
+
+    def count_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._client.count_tokens(messages, tools=tools)
+
+    def remaining_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._client.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore
+        warnings.warn(
+            "capabilities is deprecated, use model_info instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._client.capabilities
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self._client.model_info
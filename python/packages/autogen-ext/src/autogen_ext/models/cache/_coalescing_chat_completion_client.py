@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import warnings
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Dict, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelCapabilities,  # type: ignore
+    ModelInfo,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+
+from ._request_key import client_model, request_key
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task[CreateResult]
+    cancellation_token: CancellationToken
+    waiters: int = 0
+
+
+class CoalescingChatCompletionClient(ChatCompletionClient):
+    """
+    A chat completion client that wraps another client and coalesces concurrent
+    identical :meth:`create` requests into a single request to the wrapped client.
+
+    Requests are identical when they have the same messages, tool schemas, ``json_output``,
+    ``extra_create_args`` and model name. The first request starts the call to the wrapped
+    client, and every identical request made before it completes waits for the same
+    result. Each caller gets its own copy of the result, or the exception raised by the
+    wrapped client. Unlike :class:`ChatCompletionCache`, nothing is kept once the request
+    completes; the two can be combined by wrapping this client in a cache.
+
+    Each caller's cancellation token only cancels that caller's wait. The request to the
+    wrapped client is cancelled once all of its callers have cancelled.
+
+    :meth:`create_stream` requests are passed through to the wrapped client unchanged.
+
+    Args:
+        client (ChatCompletionClient): The client to wrap.
+        model (str | None): The model name used to identify requests. If not given, the
+            ``model`` in the component configuration of the wrapped client is used if it has one.
+
+    Examples:
+
+        Share one client between the agents of several teams:
+
+        .. code-block:: python
+
+            from autogen_ext.models.cache import CoalescingChatCompletionClient
+            from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+            model_client = CoalescingChatCompletionClient(OpenAIChatCompletionClient(model="gpt-4o"))
+    """
+
+    def __init__(
+        self, client: ChatCompletionClient, *, model: Optional[str] = None
+    ) -> None:
+        self._client = client
+        self._model = model if model is not None else client_model(client)
+        self._in_flight: Dict[str, _Flight] = {}
+        self._coalesced = 0
+
+    @property
+    def client(self) -> ChatCompletionClient:
+        """The wrapped client."""
+        return self._client
+
+    @property
+    def coalesced(self) -> int:
+        """The number of requests that were served by a request already in flight."""
+        return self._coalesced
+
+    @property
+    def in_flight(self) -> int:
+        """The number of distinct requests currently in flight."""
+        return len(self._in_flight)
+
+    def _start(
+        self,
+        key: str,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[Tool | ToolSchema],
+        json_output: Optional[bool],
+        extra_create_args: Mapping[str, Any],
+    ) -> _Flight:
+        cancellation_token = CancellationToken()
+        task = asyncio.ensure_future(
+            self._client.create(
+                messages,
+                tools=tools,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+        )
+        flight = _Flight(task=task, cancellation_token=cancellation_token)
+
+        def _done(task: asyncio.Task[CreateResult]) -> None:
+            if self._in_flight.get(key) is flight:
+                del self._in_flight[key]
+            # Retrieve the exception so it is not reported when all callers have left.
+            if not task.cancelled():
+                task.exception()
+
+        task.add_done_callback(_done)
+        self._in_flight[key] = flight
+        return flight
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        key = request_key(self._model, messages, tools, json_output, extra_create_args)
+        if key is None:
+            # Requests that cannot be identified are not coalesced.
+            return await self._client.create(
+                messages,
+                tools=tools,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+        flight = self._in_flight.get(key)
+        if flight is None:
+            flight = self._start(key, messages, tools, json_output, extra_create_args)
+        else:
+            self._coalesced += 1
+        flight.waiters += 1
+        waiter = asyncio.shield(flight.task)
+        if cancellation_token is not None:
+            cancellation_token.link_future(waiter)
+        try:
+            result = await waiter
+        except asyncio.CancelledError:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # The last caller has left, so nobody is waiting for the result.
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
+                flight.cancellation_token.cancel()
+                flight.task.cancel()
+            raise
+        flight.waiters -= 1
+        return result.model_copy(deep=True)
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        return self._client.create_stream(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+
+    def actual_usage(self) -> RequestUsage:
+        return self._client.actual_usage()
+
+    def total_usage(self) -> RequestUsage:
+        return self._client.total_usage()
+
+    def count_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._client.count_tokens(messages, tools=tools)
+
+    def remaining_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._client.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore
+        warnings.warn(
+            "capabilities is deprecated, use model_info instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._client.capabilities
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self._client.model_info
@@ -0,0 +1,57 @@
+import hashlib
+import json
+from typing import Any, Mapping, Optional, Sequence
+
+from autogen_core import Component
+from autogen_core.models import ChatCompletionClient, LLMMessage
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, type):
+        return f"{value.__module__}.{value.__qualname__}"
+    # A repr may differ between runs, e.g. when it includes an address, so it is not used.
+    raise TypeError(
+        f"Object of type {type(value).__name__} cannot be part of a request key"
+    )
+
+
+def client_model(client: ChatCompletionClient) -> Optional[str]:
+    """Return the ``model`` in the component configuration of a client, if it has one."""
+    if not isinstance(client, Component):
+        return None
+    try:
+        config = client.dump_component().config
+    except (AttributeError, NotImplementedError, TypeError):
+        # The client cannot be dumped, e.g. because it is a local class.
+        return None
+    model = config.get("model")
+    return model if isinstance(model, str) else None
+
+
+def request_key(
+    model: Optional[str],
+    messages: Sequence[LLMMessage],
+    tools: Sequence[Tool | ToolSchema],
+    json_output: Optional[bool],
+    extra_create_args: Mapping[str, Any],
+) -> Optional[str]:
+    """Return a SHA-256 digest identifying a create request, or None if the request has
+    arguments that cannot be serialized deterministically."""
+    request = {
+        "model": extra_create_args.get("model", model),
+        "messages": [message.model_dump(mode="json") for message in messages],
+        "tools": [tool.schema if isinstance(tool, Tool) else tool for tool in tools],
+        "json_output": json_output,
+        "extra_create_args": dict(extra_create_args),
+    }
+    try:
+        serialized = json.dumps(
+            request, sort_keys=True, separators=(",", ":"), default=_json_default
+        )
+    except TypeError:
+        return None
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
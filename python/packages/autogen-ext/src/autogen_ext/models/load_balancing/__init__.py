@@ -0,0 +1,9 @@
+from ._load_balancing_chat_completion_client import (
+    BackendStatus,
+    LoadBalancingChatCompletionClient,
+)
+
+__all__ = [
+    "LoadBalancingChatCompletionClient",
+    "BackendStatus",
+]
@@ -0,0 +1,463 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+import warnings
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncGenerator,
+    Deque,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+)
+
+from autogen_core import EVENT_LOGGER_NAME, CancellationToken
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelCapabilities,  # type: ignore
+    ModelInfo,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+
+logger = logging.getLogger(EVENT_LOGGER_NAME)
+
+# Number of latency samples a backend needs before its requests are hedged.
+_MIN_HEDGE_SAMPLES = 10
+
+# Errors without a status code that HTTP clients raise when a request does not reach the
+# server or gets no response: openai.APIConnectionError (and APITimeoutError),
+# httpx.TransportError and the Azure SDK's ServiceRequestError and ServiceResponseError.
+_TRANSPORT_ERROR_NAMES = frozenset(
+    {
+        "APIConnectionError",
+        "TransportError",
+        "ServiceRequestError",
+        "ServiceResponseError",
+    }
+)
+
+
+def _is_backend_failure(error: BaseException) -> bool:
+    """Whether an error is a failure of the backend rather than of the request: a transport
+    error, a timeout, a server error or a rate limit."""
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in (408, 429) or status_code >= 500
+    return any(cls.__name__ in _TRANSPORT_ERROR_NAMES for cls in type(error).__mro__)
+
+
+@dataclass
+class BackendStatus:
+    """A snapshot of the state of one backend of a :class:`LoadBalancingChatCompletionClient`."""
+
+    index: int
+    """The position of the backend in the list of clients."""
+    outstanding: int
+    """The number of requests currently sent to the backend."""
+    latency: Optional[float]
+    """The exponentially weighted moving average of the backend's latency in seconds, if known."""
+    healthy: bool
+    """False while the backend is ejected after a failure."""
+    requests: int
+    """The number of requests sent to the backend."""
+    failures: int
+    """The number of requests to the backend that failed or timed out."""
+
+
+@dataclass(eq=False)
+class _Backend:
+    index: int
+    client: ChatCompletionClient
+    outstanding: int = 0
+    latency: Optional[float] = None
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=100))
+    ejected_until: float = 0.0
+    requests: int = 0
+    failures: int = 0
+
+
+class LoadBalancingChatCompletionClient(ChatCompletionClient):
+    """
+    A chat completion client that spreads requests across several clients of the same
+    model, such as several Azure OpenAI deployments.
+
+    Each request goes to the healthy backend selected by the ``strategy``:
+
+    * ``"least_outstanding"``: the backend with the fewest requests in flight, ties broken
+      in turn.
+    * ``"latency_ewma"``: the backend with the lowest moving average of latency, weighted
+      by its requests in flight. Backends without a latency measurement are tried first.
+
+    A backend that raises a transport error, a server error (5xx) or a rate limit error (429),
+    or does not respond within ``request_timeout``, is ejected for ``ejection_duration`` seconds
+    and the request fails over to another backend, up to ``max_attempts`` backends. If all
+    backends are ejected, they are all used again. Other errors, such as invalid requests or
+    requests over the context length, are raised to the caller right away without ejecting the
+    backend. Streams fail over only until their first chunk; after that, errors are raised to
+    the caller.
+
+    With ``hedge_percentile``, a :meth:`create` request that takes longer than that percentile
+    of its backend's recent latencies is also sent to a second backend, and the first
+    response wins. The other request is cancelled.
+
+    :meth:`total_usage` and :meth:`actual_usage` add up the usage of all backends.
+    :meth:`count_tokens`, :meth:`remaining_tokens` and :attr:`model_info` use the first client.
+
+    Args:
+        clients (Sequence[ChatCompletionClient]): The backends. They should serve the same model.
+        strategy (Literal["least_outstanding", "latency_ewma"]): How to select a backend.
+            Defaults to ``"least_outstanding"``.
+        max_attempts (int | None): The maximum number of backends to try per request, at least 1.
+            Defaults to the number of clients.
+        request_timeout (float | None): Seconds after which a request, or the first chunk of a
+            stream, counts as failed. None means no timeout.
+        ejection_duration (float): Seconds a failed backend is left out of selection. Defaults to 30.
+        hedge_percentile (float | None): The latency percentile, between 0 and 100, after which a
+            request is hedged. None disables hedging.
+        latency_smoothing (float): The weight of the newest sample in the latency moving average.
+            Defaults to 0.3.
+
+    Examples:
+
+        Spread requests across two Azure OpenAI deployments:
+
+        .. code-block:: python
+
+            from autogen_ext.models.load_balancing import LoadBalancingChatCompletionClient
+            from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
+
+            client = LoadBalancingChatCompletionClient(
+                [
+                    AzureOpenAIChatCompletionClient(
+                        model="gpt-4o",
+                        azure_endpoint=endpoint,
+                        azure_deployment="gpt-4o",
+                        api_version="2024-06-01",
+                    )
+                    for endpoint in ["https://east.openai.azure.com/", "https://west.openai.azure.com/"]
+                ],
+                strategy="latency_ewma",
+                request_timeout=60,
+                hedge_percentile=95,
+            )
+    """
+
+    def __init__(
+        self,
+        clients: Sequence[ChatCompletionClient],
+        *,
+        strategy: Literal["least_outstanding", "latency_ewma"] = "least_outstanding",
+        max_attempts: Optional[int] = None,
+        request_timeout: Optional[float] = None,
+        ejection_duration: float = 30.0,
+        hedge_percentile: Optional[float] = None,
+        latency_smoothing: float = 0.3,
+    ) -> None:
+        if len(clients) == 0:
+            raise ValueError("At least one client is required")
+        if strategy not in ("least_outstanding", "latency_ewma"):
+            raise ValueError(f"Unknown strategy: {strategy}")
+        if max_attempts is not None and max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if hedge_percentile is not None and not 0 < hedge_percentile <= 100:
+            raise ValueError("hedge_percentile must be between 0 and 100")
+        if not 0 < latency_smoothing <= 1:
+            raise ValueError("latency_smoothing must be between 0 and 1")
+        self._backends = [
+            _Backend(index=index, client=client) for index, client in enumerate(clients)
+        ]
+        self._strategy = strategy
+        self._max_attempts = max_attempts if max_attempts is not None else len(clients)
+        self._request_timeout = request_timeout
+        self._ejection_duration = ejection_duration
+        self._hedge_percentile = hedge_percentile
+        self._latency_smoothing = latency_smoothing
+        self._turn = itertools.count()
+        self._hedged = 0
+
+    @property
+    def clients(self) -> List[ChatCompletionClient]:
+        """The backends."""
+        return [backend.client for backend in self._backends]
+
+    @property
+    def hedged(self) -> int:
+        """The number of requests that were hedged to a second backend."""
+        return self._hedged
+
+    def backend_status(self) -> List[BackendStatus]:
+        """Return the state of each backend."""
+        now = time.monotonic()
+        return [
+            BackendStatus(
+                index=backend.index,
+                outstanding=backend.outstanding,
+                latency=backend.latency,
+                healthy=backend.ejected_until <= now,
+                requests=backend.requests,
+                failures=backend.failures,
+            )
+            for backend in self._backends
+        ]
+
+    def _select(self, excluded: Set[_Backend]) -> Optional[_Backend]:
+        candidates = [backend for backend in self._backends if backend not in excluded]
+        if not candidates:
+            return None
+        now = time.monotonic()
+        healthy = [backend for backend in candidates if backend.ejected_until <= now]
+        # Rotate the candidates so that ties are broken in turn.
+        pool = healthy or candidates
+        offset = next(self._turn) % len(pool)
+        pool = pool[offset:] + pool[:offset]
+        if self._strategy == "least_outstanding":
+            return min(pool, key=lambda backend: backend.outstanding)
+        return min(
+            pool,
+            key=lambda backend: (backend.latency or 0.0) * (backend.outstanding + 1),
+        )
+
+    def _hedge_delay(self, backend: _Backend) -> Optional[float]:
+        if (
+            self._hedge_percentile is None
+            or len(backend.latencies) < _MIN_HEDGE_SAMPLES
+        ):
+            return None
+        latencies = sorted(backend.latencies)
+        position = round(self._hedge_percentile / 100 * (len(latencies) - 1))
+        return latencies[position]
+
+    def _record_success(self, backend: _Backend, latency: float) -> None:
+        backend.latencies.append(latency)
+        if backend.latency is None:
+            backend.latency = latency
+        else:
+            backend.latency += self._latency_smoothing * (latency - backend.latency)
+        backend.ejected_until = 0.0
+
+    def _record_failure(self, backend: _Backend, error: BaseException) -> None:
+        backend.failures += 1
+        backend.ejected_until = time.monotonic() + self._ejection_duration
+        logger.warning(
+            "Ejecting backend %d for %.1f seconds after error: %r",
+            backend.index,
+            self._ejection_duration,
+            error,
+        )
+
+    async def _attempt(
+        self,
+        backend: _Backend,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[Tool | ToolSchema],
+        json_output: Optional[bool],
+        extra_create_args: Mapping[str, Any],
+        cancellation_token: Optional[CancellationToken],
+    ) -> CreateResult:
+        backend.outstanding += 1
+        backend.requests += 1
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(
+                backend.client.create(
+                    messages,
+                    tools=tools,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                    cancellation_token=cancellation_token,
+                ),
+                timeout=self._request_timeout,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            if _is_backend_failure(error):
+                self._record_failure(backend, error)
+            raise
+        finally:
+            backend.outstanding -= 1
+        self._record_success(backend, time.monotonic() - start)
+        return result
+
+    async def _create_hedged(
+        self,
+        backend: _Backend,
+        tried: Set[_Backend],
+        messages: Sequence[LLMMessage],
+        tools: Sequence[Tool | ToolSchema],
+        json_output: Optional[bool],
+        extra_create_args: Mapping[str, Any],
+        cancellation_token: Optional[CancellationToken],
+    ) -> CreateResult:
+        args = (messages, tools, json_output, extra_create_args, cancellation_token)
+        pending = {asyncio.ensure_future(self._attempt(backend, *args))}
+        try:
+            delay = self._hedge_delay(backend)
+            if delay is not None:
+                done, pending = await asyncio.wait(pending, timeout=delay)
+                if not done:
+                    hedge = self._select(tried)
+                    if hedge is not None:
+                        tried.add(hedge)
+                        self._hedged += 1
+                        pending.add(asyncio.ensure_future(self._attempt(hedge, *args)))
+                else:
+                    return done.pop().result()
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    task_error = task.exception()
+                    if task_error is None:
+                        return task.result()
+                    if not _is_backend_failure(task_error):
+                        # The request itself is invalid, another backend would reject it too.
+                        raise task_error
+                    error = task_error
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        tried: Set[_Backend] = set()
+        error: Optional[Exception] = None
+        for _ in range(self._max_attempts):
+            backend = self._select(tried)
+            if backend is None:
+                break
+            tried.add(backend)
+            try:
+                return await self._create_hedged(
+                    backend,
+                    tried,
+                    messages,
+                    tools,
+                    json_output,
+                    extra_create_args,
+                    cancellation_token,
+                )
+            except Exception as e:
+                if not _is_backend_failure(e):
+                    raise
+                error = e
+        assert error is not None
+        raise error
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        tried: Set[_Backend] = set()
+        error: Optional[Exception] = None
+        for _ in range(self._max_attempts):
+            backend = self._select(tried)
+            if backend is None:
+                break
+            tried.add(backend)
+            backend.outstanding += 1
+            backend.requests += 1
+            start = time.monotonic()
+            stream = backend.client.create_stream(
+                messages,
+                tools=tools,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+            try:
+                try:
+                    first = await asyncio.wait_for(
+                        anext(stream), timeout=self._request_timeout
+                    )
+                except StopAsyncIteration:
+                    self._record_success(backend, time.monotonic() - start)
+                    return
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if not _is_backend_failure(e):
+                        raise
+                    self._record_failure(backend, e)
+                    error = e
+                    continue
+                # The latency of a stream is the time to its first chunk.
+                self._record_success(backend, time.monotonic() - start)
+                yield first
+                async for item in stream:
+                    yield item
+                return
+            finally:
+                backend.outstanding -= 1
+                await stream.aclose()
+        assert error is not None
+        raise error
+
+    def actual_usage(self) -> RequestUsage:
+        usages = [backend.client.actual_usage() for backend in self._backends]
+        return RequestUsage(
+            prompt_tokens=sum(usage.prompt_tokens for usage in usages),
+            completion_tokens=sum(usage.completion_tokens for usage in usages),
+            cached_prompt_tokens=sum(usage.cached_prompt_tokens for usage in usages),
+        )
+
+    def total_usage(self) -> RequestUsage:
+        usages = [backend.client.total_usage() for backend in self._backends]
+        return RequestUsage(
+            prompt_tokens=sum(usage.prompt_tokens for usage in usages),
+            completion_tokens=sum(usage.completion_tokens for usage in usages),
+            cached_prompt_tokens=sum(usage.cached_prompt_tokens for usage in usages),
+        )
+
+    def count_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._backends[0].client.count_tokens(messages, tools=tools)
+
+    def remaining_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._backends[0].client.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore
+        warnings.warn(
+            "capabilities is deprecated, use model_info instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._backends[0].client.capabilities
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self._backends[0].client.model_info
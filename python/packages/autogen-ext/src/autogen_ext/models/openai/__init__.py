@@ -3,6 +3,7 @@
     BaseOpenAIChatCompletionClient,
     OpenAIChatCompletionClient,
 )
+from ._rate_limiter import RateLimiter, RateLimiterMetrics, RateLimitLease
 from .config import (
     AzureOpenAIClientConfigurationConfigModel,
     BaseOpenAIClientConfigurationConfigModel,
@@ -14,6 +15,9 @@
     "OpenAIChatCompletionClient",
     "AzureOpenAIChatCompletionClient",
     "BaseOpenAIChatCompletionClient",
+    "RateLimiter",
+    "RateLimiterMetrics",
+    "RateLimitLease",
     "AzureOpenAIClientConfigurationConfigModel",
     "OpenAIClientConfigurationConfigModel",
     "BaseOpenAIClientConfigurationConfigModel",
@@ -5,17 +5,21 @@
 import math
 import re
 import warnings
+import weakref
 from asyncio import Task
 from typing import (
     Any,
     AsyncGenerator,
+    Awaitable,
     Dict,
     List,
     Mapping,
     Optional,
     Sequence,
     Set,
+    Tuple,
     Type,
+    TypeVar,
     Union,
     cast,
 )
@@ -24,6 +28,7 @@
 from autogen_core import (
     EVENT_LOGGER_NAME,
     TRACE_LOGGER_NAME,
+    CancellationHandle,
     CancellationToken,
     Component,
     FunctionCall,
@@ -67,11 +72,13 @@
 )
 from openai.types.chat.chat_completion import Choice
 from openai.types.chat.chat_completion_chunk import Choice as ChunkChoice
+from openai.types.completion_usage import CompletionUsage
 from openai.types.shared_params import FunctionDefinition, FunctionParameters
 from pydantic import BaseModel
 from typing_extensions import Self, Unpack
 
 from . import _model_info
+from ._rate_limiter import RateLimiter, RateLimitLease
 from .config import (
     AzureOpenAIClientConfiguration,
     AzureOpenAIClientConfigurationConfigModel,
@@ -82,6 +89,8 @@
 logger = logging.getLogger(EVENT_LOGGER_NAME)
 trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
 
+T = TypeVar("T")
+
 openai_init_kwargs = set(inspect.getfullargspec(AsyncOpenAI.__init__).kwonlyargs)
 aopenai_init_kwargs = set(inspect.getfullargspec(AsyncAzureOpenAI.__init__).kwonlyargs)
 
@@ -278,11 +287,90 @@ def calculate_vision_tokens(image: Image, detail: str = "auto") -> int:
     return total_tokens
 
 
+class _StreamCancellation:
+    """Lets a cancellation token interrupt the awaits of a stream with a single callback.
+
+    Linking a new future to the token for every chunk would allocate a task per chunk and
+    leave a callback per chunk on the token. Instead, one callback cancels the task that is
+    currently awaiting the stream, if any.
+    """
+
+    def __init__(self, cancellation_token: Optional[CancellationToken]) -> None:
+        self._cancellation_token = cancellation_token
+        self._waiting_task: Optional[asyncio.Task[Any]] = None
+        self._closed = False
+        self._handle: Optional[CancellationHandle] = None
+        if cancellation_token is not None:
+            self._handle = cancellation_token.add_callback(self._cancel)
+
+    def _cancel(self) -> None:
+        if self._waiting_task is not None and not self._closed:
+            self._waiting_task.cancel()
+
+    async def wait(self, awaitable: Awaitable[T]) -> T:
+        if self._cancellation_token is not None:
+            if self._cancellation_token.is_cancelled():
+                raise asyncio.CancelledError()
+            self._waiting_task = asyncio.current_task()
+        try:
+            return await awaitable
+        finally:
+            self._waiting_task = None
+
+    def close(self) -> None:
+        """Stop interrupting the stream and remove the callback from the token."""
+        self._closed = True
+        if self._handle is not None:
+            self._handle.dispose()
+
+
+def _usage_tokens(usage: RequestUsage) -> Optional[int]:
+    """Return the total tokens of a usage, or None if the response did not report any."""
+    total = usage.prompt_tokens + usage.completion_tokens
+    return total if total > 0 else None
+
+
 def _add_usage(usage1: RequestUsage, usage2: RequestUsage) -> RequestUsage:
     return RequestUsage(
         prompt_tokens=usage1.prompt_tokens + usage2.prompt_tokens,
         completion_tokens=usage1.completion_tokens + usage2.completion_tokens,
+        cached_prompt_tokens=usage1.cached_prompt_tokens + usage2.cached_prompt_tokens,
+    )
+
+
+def _cached_prompt_tokens(usage: Optional[CompletionUsage]) -> int:
+    """Return the prompt tokens served from the prompt cache, as reported in the usage payload."""
+    if usage is None or usage.prompt_tokens_details is None:
+        return 0
+    return usage.prompt_tokens_details.cached_tokens or 0
+
+
+# The converted parameter of each tool, with the schema it was converted from. Tools such
+# as BaseTool return the same schema object until they change, so the parameter is reused
+# for as long as the schema is the same object.
+_converted_tools: (
+    "weakref.WeakKeyDictionary[Tool, Tuple[ToolSchema, ChatCompletionToolParam]]"
+) = weakref.WeakKeyDictionary()
+
+
+def _convert_tool_schema(tool_schema: ToolSchema) -> ChatCompletionToolParam:
+    tool_param = ChatCompletionToolParam(
+        type="function",
+        function=FunctionDefinition(
+            name=tool_schema["name"],
+            description=(
+                tool_schema["description"] if "description" in tool_schema else ""
+            ),
+            parameters=(
+                cast(FunctionParameters, tool_schema["parameters"])
+                if "parameters" in tool_schema
+                else {}
+            ),
+        ),
     )
+    # Check if the tool has a valid name.
+    assert_valid_name(tool_param["function"]["name"])
+    return tool_param
 
 
 def convert_tools(
@@ -290,33 +378,26 @@ def convert_tools(
 ) -> List[ChatCompletionToolParam]:
     result: List[ChatCompletionToolParam] = []
     for tool in tools:
-        if isinstance(tool, Tool):
-            tool_schema = tool.schema
-        else:
-            assert isinstance(tool, dict)
-            tool_schema = tool
-
-        result.append(
-            ChatCompletionToolParam(
-                type="function",
-                function=FunctionDefinition(
-                    name=tool_schema["name"],
-                    description=(
-                        tool_schema["description"]
-                        if "description" in tool_schema
-                        else ""
-                    ),
-                    parameters=(
-                        cast(FunctionParameters, tool_schema["parameters"])
-                        if "parameters" in tool_schema
-                        else {}
-                    ),
-                ),
-            )
-        )
-    # Check if all tools have valid names.
-    for tool_param in result:
-        assert_valid_name(tool_param["function"]["name"])
+        if isinstance(tool, dict):
+            result.append(_convert_tool_schema(tool))
+            continue
+        # Look up the cache first: isinstance checks against the Tool protocol are slow.
+        try:
+            cached = _converted_tools.get(tool)
+        except TypeError:
+            # The tool cannot be hashed or weakly referenced, it is converted every time.
+            cached = None
+        if cached is not None and cached[0] is tool.schema:
+            result.append(cached[1])
+            continue
+        assert isinstance(tool, Tool)
+        tool_schema = tool.schema
+        tool_param = _convert_tool_schema(tool_schema)
+        try:
+            _converted_tools[tool] = (tool_schema, tool_param)
+        except TypeError:
+            pass
+        result.append(tool_param)
     return result
 
 
@@ -344,6 +425,15 @@ def assert_valid_name(name: str) -> str:
     return name
 
 
+# Attributes that are rebuilt rather than pickled.
+_TOKEN_COUNTING_STATE = (
+    "_encoding",
+    "_message_token_cache",
+    "_tool_token_cache",
+    "_tool_schema_token_cache",
+)
+
+
 class BaseOpenAIChatCompletionClient(ChatCompletionClient):
     def __init__(
         self,
@@ -352,8 +442,12 @@ def __init__(
         create_args: Dict[str, Any],
         model_capabilities: Optional[ModelCapabilities] = None,  # type: ignore
         model_info: Optional[ModelInfo] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        rate_limit_priority: int = 0,
     ):
         self._client = client
+        self._rate_limiter = rate_limiter
+        self._rate_limit_priority = rate_limit_priority
         if model_capabilities is None and model_info is None:
             try:
                 self._model_info = _model_info.get_info(create_args["model"])
@@ -389,11 +483,50 @@ def __init__(
         self._create_args = create_args
         self._total_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
         self._actual_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        self._reset_token_counting_state()
+
+    def _reset_token_counting_state(self) -> None:
+        # Token counts memoized per message, keyed by id() and guarded by a weak reference
+        # so entries go away with the messages. Tool counts are kept with the schema they
+        # were counted from, like converted tools, so they are counted again once it changes.
+        self._encoding: tiktoken.Encoding | None = None
+        self._message_token_cache: Dict[
+            int, Tuple[weakref.ref[LLMMessage], int]  # type: ignore
+        ] = {}
+        self._tool_token_cache: weakref.WeakKeyDictionary[
+            Tool, Tuple[ToolSchema, int]
+        ] = weakref.WeakKeyDictionary()
+        self._tool_schema_token_cache: Dict[str, int] = {}
 
     @classmethod
     def create_from_config(cls, config: Dict[str, Any]) -> ChatCompletionClient:
         return OpenAIChatCompletionClient(**config)
 
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """The rate limiter requests are admitted through, if any."""
+        return self._rate_limiter
+
+    async def _acquire_rate_limit(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[Tool | ToolSchema],
+        create_args: Mapping[str, Any],
+        cancellation_token: Optional[CancellationToken],
+    ) -> Optional[RateLimitLease]:
+        if self._rate_limiter is None:
+            return None
+        tokens = 0
+        if self._rate_limiter.tokens_per_minute is not None:
+            # Providers count the prompt and the maximum completion against the quota.
+            tokens = self.count_tokens(messages, tools=tools)
+            tokens += create_args.get("max_tokens") or 0
+        return await self._rate_limiter.acquire(
+            tokens,
+            priority=self._rate_limit_priority,
+            cancellation_token=cancellation_token,
+        )
+
     async def create(
         self,
         messages: Sequence[LLMMessage],
@@ -463,66 +596,76 @@ async def create(
 
         if self.model_info["function_calling"] is False and len(tools) > 0:
             raise ValueError("Model does not support function calling")
-        future: Union[Task[ParsedChatCompletion[BaseModel]], Task[ChatCompletion]]
-        if len(tools) > 0:
-            converted_tools = convert_tools(tools)
-            if use_beta_client:
-                # Pass response_format_value if it's not None
-                if response_format_value is not None:
-                    future = asyncio.ensure_future(
-                        self._client.beta.chat.completions.parse(
-                            messages=oai_messages,
-                            tools=converted_tools,
-                            response_format=response_format_value,
-                            **create_args_no_response_format,
+        lease = await self._acquire_rate_limit(
+            messages, tools, create_args, cancellation_token
+        )
+        try:
+            future: Union[Task[ParsedChatCompletion[BaseModel]], Task[ChatCompletion]]
+            if len(tools) > 0:
+                converted_tools = convert_tools(tools)
+                if use_beta_client:
+                    # Pass response_format_value if it's not None
+                    if response_format_value is not None:
+                        future = asyncio.ensure_future(
+                            self._client.beta.chat.completions.parse(
+                                messages=oai_messages,
+                                tools=converted_tools,
+                                response_format=response_format_value,
+                                **create_args_no_response_format,
+                            )
+                        )
+                    else:
+                        future = asyncio.ensure_future(
+                            self._client.beta.chat.completions.parse(
+                                messages=oai_messages,
+                                tools=converted_tools,
+                                **create_args_no_response_format,
+                            )
                         )
-                    )
                 else:
                     future = asyncio.ensure_future(
-                        self._client.beta.chat.completions.parse(
+                        self._client.chat.completions.create(
                             messages=oai_messages,
+                            stream=False,
                             tools=converted_tools,
-                            **create_args_no_response_format,
+                            **create_args,
                         )
                     )
             else:
-                future = asyncio.ensure_future(
-                    self._client.chat.completions.create(
-                        messages=oai_messages,
-                        stream=False,
-                        tools=converted_tools,
-                        **create_args,
-                    )
-                )
-        else:
-            if use_beta_client:
-                if response_format_value is not None:
-                    future = asyncio.ensure_future(
-                        self._client.beta.chat.completions.parse(
-                            messages=oai_messages,
-                            response_format=response_format_value,
-                            **create_args_no_response_format,
+                if use_beta_client:
+                    if response_format_value is not None:
+                        future = asyncio.ensure_future(
+                            self._client.beta.chat.completions.parse(
+                                messages=oai_messages,
+                                response_format=response_format_value,
+                                **create_args_no_response_format,
+                            )
+                        )
+                    else:
+                        future = asyncio.ensure_future(
+                            self._client.beta.chat.completions.parse(
+                                messages=oai_messages,
+                                **create_args_no_response_format,
+                            )
                         )
-                    )
                 else:
                     future = asyncio.ensure_future(
-                        self._client.beta.chat.completions.parse(
+                        self._client.chat.completions.create(
                             messages=oai_messages,
-                            **create_args_no_response_format,
+                            stream=False,
+                            **create_args,
                         )
                     )
-            else:
-                future = asyncio.ensure_future(
-                    self._client.chat.completions.create(
-                        messages=oai_messages,
-                        stream=False,
-                        **create_args,
-                    )
-                )
 
-        if cancellation_token is not None:
-            cancellation_token.link_future(future)
-        result: Union[ParsedChatCompletion[BaseModel], ChatCompletion] = await future
+            if cancellation_token is not None:
+                cancellation_token.link_future(future)
+            result: Union[ParsedChatCompletion[BaseModel], ChatCompletion] = (
+                await future
+            )
+        except BaseException:
+            if lease is not None:
+                lease.release()
+            raise
         if use_beta_client:
             result = cast(ParsedChatCompletion[Any], result)
 
@@ -532,7 +675,10 @@ async def create(
             completion_tokens=(
                 result.usage.completion_tokens if result.usage is not None else 0
             ),
+            cached_prompt_tokens=_cached_prompt_tokens(result.usage),
         )
+        if lease is not None:
+            lease.release(_usage_tokens(usage))
 
         # If we are running in the context of a handler we can get the agent_id
         try:
@@ -681,177 +827,177 @@ async def create_stream(
             else:
                 create_args["response_format"] = {"type": "text"}
 
-        if len(tools) > 0:
-            converted_tools = convert_tools(tools)
-            stream_future = asyncio.ensure_future(
-                self._client.chat.completions.create(
-                    messages=oai_messages,
-                    stream=True,
-                    tools=converted_tools,
-                    **create_args,
-                )
-            )
-        else:
-            stream_future = asyncio.ensure_future(
+        # The lease is held until the stream is consumed, so streams count as in flight.
+        lease = await self._acquire_rate_limit(
+            messages, tools, create_args, cancellation_token
+        )
+        actual_tokens: Optional[int] = None
+        cancellation = _StreamCancellation(cancellation_token)
+        try:
+            if len(tools) > 0:
+                create_args["tools"] = convert_tools(tools)
+            stream = await cancellation.wait(
                 self._client.chat.completions.create(
                     messages=oai_messages, stream=True, **create_args
                 )
             )
-        if cancellation_token is not None:
-            cancellation_token.link_future(stream_future)
-        stream = await stream_future
-        choice: Union[ParsedChoice[Any], ParsedChoice[BaseModel], ChunkChoice] = cast(
-            ChunkChoice, None
-        )
-        chunk = None
-        stop_reason = None
-        maybe_model = None
-        content_deltas: List[str] = []
-        full_tool_calls: Dict[int, FunctionCall] = {}
-        completion_tokens = 0
-        logprobs: Optional[List[ChatCompletionTokenLogprob]] = None
-        empty_chunk_count = 0
-
-        while True:
-            try:
-                chunk_future = asyncio.ensure_future(anext(stream))
-                if cancellation_token is not None:
-                    cancellation_token.link_future(chunk_future)
-                chunk = await chunk_future
-
-                # This is to address a bug in AzureOpenAIChatCompletionClient. OpenAIChatCompletionClient works fine.
-                #  https://github.com/microsoft/autogen/issues/4213
-                if len(chunk.choices) == 0:
-                    empty_chunk_count += 1
-                    if max_consecutive_empty_chunk_tolerance == 0:
-                        raise ValueError(
-                            "Consecutive empty chunks found. Change max_empty_consecutive_chunk_tolerance to increase empty chunk tolerance"
-                        )
-                    elif empty_chunk_count >= max_consecutive_empty_chunk_tolerance:
-                        raise ValueError(
-                            "Exceeded the threshold of receiving consecutive empty chunks"
+            choice: Union[ParsedChoice[Any], ParsedChoice[BaseModel], ChunkChoice] = (
+                cast(ChunkChoice, None)
+            )
+            chunk = None
+            stop_reason = None
+            maybe_model = None
+            content_deltas: List[str] = []
+            full_tool_calls: Dict[int, FunctionCall] = {}
+            completion_tokens = 0
+            logprobs: Optional[List[ChatCompletionTokenLogprob]] = None
+            empty_chunk_count = 0
+
+            while True:
+                try:
+                    chunk = await cancellation.wait(anext(stream))
+
+                    # This is to address a bug in AzureOpenAIChatCompletionClient. OpenAIChatCompletionClient works fine.
+                    #  https://github.com/microsoft/autogen/issues/4213
+                    if len(chunk.choices) == 0:
+                        empty_chunk_count += 1
+                        if max_consecutive_empty_chunk_tolerance == 0:
+                            raise ValueError(
+                                "Consecutive empty chunks found. Change max_empty_consecutive_chunk_tolerance to increase empty chunk tolerance"
+                            )
+                        elif empty_chunk_count >= max_consecutive_empty_chunk_tolerance:
+                            raise ValueError(
+                                "Exceeded the threshold of receiving consecutive empty chunks"
+                            )
+                        continue
+                    else:
+                        empty_chunk_count = 0
+
+                    # to process usage chunk in streaming situations
+                    # add    stream_options={"include_usage": True} in the initialization of OpenAIChatCompletionClient(...)
+                    # However the different api's
+                    # OPENAI api usage chunk produces no choices so need to check if there is a choice
+                    # liteLLM api usage chunk does produce choices
+                    choice = (
+                        chunk.choices[0]
+                        if len(chunk.choices) > 0
+                        else (
+                            choice
+                            if chunk.usage is not None and stop_reason is not None
+                            else cast(ChunkChoice, None)
                         )
-                    continue
-                else:
-                    empty_chunk_count = 0
-
-                # to process usage chunk in streaming situations
-                # add    stream_options={"include_usage": True} in the initialization of OpenAIChatCompletionClient(...)
-                # However the different api's
-                # OPENAI api usage chunk produces no choices so need to check if there is a choice
-                # liteLLM api usage chunk does produce choices
-                choice = (
-                    chunk.choices[0]
-                    if len(chunk.choices) > 0
-                    else (
-                        choice
-                        if chunk.usage is not None and stop_reason is not None
-                        else cast(ChunkChoice, None)
                     )
-                )
-
-                # for liteLLM chunk usage, do the following hack keeping the pervious chunk.stop_reason (if set).
-                # set the stop_reason for the usage chunk to the prior stop_reason
-                stop_reason = (
-                    choice.finish_reason
-                    if chunk.usage is None and stop_reason is None
-                    else stop_reason
-                )
-                maybe_model = chunk.model
-                # First try get content
-                if choice.delta.content is not None:
-                    content_deltas.append(choice.delta.content)
-                    if len(choice.delta.content) > 0:
-                        yield choice.delta.content
-                    continue
 
-                # Otherwise, get tool calls
-                if choice.delta.tool_calls is not None:
-                    for tool_call_chunk in choice.delta.tool_calls:
-                        idx = tool_call_chunk.index
-                        if idx not in full_tool_calls:
-                            # We ignore the type hint here because we want to fill in type when the delta provides it
-                            full_tool_calls[idx] = FunctionCall(
-                                id="", arguments="", name=""
-                            )
-
-                        if tool_call_chunk.id is not None:
-                            full_tool_calls[idx].id += tool_call_chunk.id
-
-                        if tool_call_chunk.function is not None:
-                            if tool_call_chunk.function.name is not None:
-                                full_tool_calls[
-                                    idx
-                                ].name += tool_call_chunk.function.name
-                            if tool_call_chunk.function.arguments is not None:
-                                full_tool_calls[
-                                    idx
-                                ].arguments += tool_call_chunk.function.arguments
-                if choice.logprobs and choice.logprobs.content:
-                    logprobs = [
-                        ChatCompletionTokenLogprob(
-                            token=x.token,
-                            logprob=x.logprob,
-                            top_logprobs=[
-                                TopLogprob(logprob=y.logprob, bytes=y.bytes)
-                                for y in x.top_logprobs
-                            ],
-                            bytes=x.bytes,
-                        )
-                        for x in choice.logprobs.content
-                    ]
+                    # for liteLLM chunk usage, do the following hack keeping the pervious chunk.stop_reason (if set).
+                    # set the stop_reason for the usage chunk to the prior stop_reason
+                    stop_reason = (
+                        choice.finish_reason
+                        if chunk.usage is None and stop_reason is None
+                        else stop_reason
+                    )
+                    maybe_model = chunk.model
+                    # First try get content
+                    if choice.delta.content is not None:
+                        content_deltas.append(choice.delta.content)
+                        if len(choice.delta.content) > 0:
+                            yield choice.delta.content
+                        continue
 
-            except StopAsyncIteration:
-                break
+                    # Otherwise, get tool calls
+                    if choice.delta.tool_calls is not None:
+                        for tool_call_chunk in choice.delta.tool_calls:
+                            idx = tool_call_chunk.index
+                            if idx not in full_tool_calls:
+                                # We ignore the type hint here because we want to fill in type when the delta provides it
+                                full_tool_calls[idx] = FunctionCall(
+                                    id="", arguments="", name=""
+                                )
 
-        model = maybe_model or create_args["model"]
-        model = model.replace("gpt-35", "gpt-3.5")  # hack for Azure API
+                            if tool_call_chunk.id is not None:
+                                full_tool_calls[idx].id += tool_call_chunk.id
+
+                            if tool_call_chunk.function is not None:
+                                if tool_call_chunk.function.name is not None:
+                                    full_tool_calls[
+                                        idx
+                                    ].name += tool_call_chunk.function.name
+                                if tool_call_chunk.function.arguments is not None:
+                                    full_tool_calls[
+                                        idx
+                                    ].arguments += tool_call_chunk.function.arguments
+                    if choice.logprobs and choice.logprobs.content:
+                        logprobs = [
+                            ChatCompletionTokenLogprob(
+                                token=x.token,
+                                logprob=x.logprob,
+                                top_logprobs=[
+                                    TopLogprob(logprob=y.logprob, bytes=y.bytes)
+                                    for y in x.top_logprobs
+                                ],
+                                bytes=x.bytes,
+                            )
+                            for x in choice.logprobs.content
+                        ]
 
-        if chunk and chunk.usage:
-            prompt_tokens = chunk.usage.prompt_tokens
-        else:
-            prompt_tokens = 0
+                except StopAsyncIteration:
+                    break
 
-        if stop_reason is None:
-            raise ValueError("No stop reason found")
+            model = maybe_model or create_args["model"]
+            model = model.replace("gpt-35", "gpt-3.5")  # hack for Azure API
 
-        content: Union[str, List[FunctionCall]]
-        if len(content_deltas) > 1:
-            content = "".join(content_deltas)
             if chunk and chunk.usage:
-                completion_tokens = chunk.usage.completion_tokens
+                prompt_tokens = chunk.usage.prompt_tokens
             else:
-                completion_tokens = 0
-        else:
-            completion_tokens = 0
-            # TODO: fix assumption that dict values were added in order and actually order by int index
-            # for tool_call in full_tool_calls.values():
-            #     # value = json.dumps(tool_call)
-            #     # completion_tokens += count_token(value, model=model)
-            #     completion_tokens += 0
-            content = list(full_tool_calls.values())
+                prompt_tokens = 0
 
-        usage = RequestUsage(
-            prompt_tokens=prompt_tokens,
-            completion_tokens=completion_tokens,
-        )
-        if stop_reason == "function_call":
-            raise ValueError("Function calls are not supported in this context")
-        if stop_reason == "tool_calls":
-            stop_reason = "function_calls"
+            if stop_reason is None:
+                raise ValueError("No stop reason found")
 
-        result = CreateResult(
-            finish_reason=stop_reason,  # type: ignore
-            content=content,
-            usage=usage,
-            cached=False,
-            logprobs=logprobs,
-        )
+            content: Union[str, List[FunctionCall]]
+            if len(content_deltas) > 1:
+                content = "".join(content_deltas)
+                if chunk and chunk.usage:
+                    completion_tokens = chunk.usage.completion_tokens
+                else:
+                    completion_tokens = 0
+            else:
+                completion_tokens = 0
+                # TODO: fix assumption that dict values were added in order and actually order by int index
+                # for tool_call in full_tool_calls.values():
+                #     # value = json.dumps(tool_call)
+                #     # completion_tokens += count_token(value, model=model)
+                #     completion_tokens += 0
+                content = list(full_tool_calls.values())
+
+            usage = RequestUsage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                cached_prompt_tokens=_cached_prompt_tokens(
+                    chunk.usage if chunk else None
+                ),
+            )
+            if stop_reason == "function_call":
+                raise ValueError("Function calls are not supported in this context")
+            if stop_reason == "tool_calls":
+                stop_reason = "function_calls"
+
+            result = CreateResult(
+                finish_reason=stop_reason,  # type: ignore
+                content=content,
+                usage=usage,
+                cached=False,
+                logprobs=logprobs,
+            )
 
-        self._total_usage = _add_usage(self._total_usage, usage)
-        self._actual_usage = _add_usage(self._actual_usage, usage)
+            self._total_usage = _add_usage(self._total_usage, usage)
+            self._actual_usage = _add_usage(self._actual_usage, usage)
+            actual_tokens = _usage_tokens(usage)
 
-        yield result
+            yield result
+        finally:
+            cancellation.close()
+            if lease is not None:
+                lease.release(actual_tokens)
 
     def actual_usage(self) -> RequestUsage:
         return self._actual_usage
@@ -859,110 +1005,182 @@ def actual_usage(self) -> RequestUsage:
     def total_usage(self) -> RequestUsage:
         return self._total_usage
 
-    def count_tokens(
-        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    def _get_encoding(self) -> tiktoken.Encoding:
+        if self._encoding is None:
+            model = self._create_args["model"]
+            try:
+                self._encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                trace_logger.warning(
+                    f"Model {model} not found. Using cl100k_base encoding."
+                )
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+        return self._encoding
+
+    def _count_message_tokens(
+        self, message: LLMMessage, encoding: tiktoken.Encoding
     ) -> int:
-        model = self._create_args["model"]
-        try:
-            encoding = tiktoken.encoding_for_model(model)
-        except KeyError:
-            trace_logger.warning(
-                f"Model {model} not found. Using cl100k_base encoding."
-            )
-            encoding = tiktoken.get_encoding("cl100k_base")
         tokens_per_message = 3
         tokens_per_name = 1
-        num_tokens = 0
+        num_tokens = tokens_per_message
+        oai_message = to_oai_type(message)
+        for oai_message_part in oai_message:
+            for key, value in oai_message_part.items():
+                if value is None:
+                    continue
 
-        # Message tokens.
-        for message in messages:
-            num_tokens += tokens_per_message
-            oai_message = to_oai_type(message)
-            for oai_message_part in oai_message:
-                for key, value in oai_message_part.items():
-                    if value is None:
-                        continue
+                if isinstance(message, UserMessage) and isinstance(value, list):
+                    typed_message_value = cast(
+                        List[ChatCompletionContentPartParam], value
+                    )
 
-                    if isinstance(message, UserMessage) and isinstance(value, list):
-                        typed_message_value = cast(
-                            List[ChatCompletionContentPartParam], value
-                        )
+                    assert len(typed_message_value) == len(
+                        message.content
+                    ), "Mismatch in message content and typed message value"
 
-                        assert len(typed_message_value) == len(
-                            message.content
-                        ), "Mismatch in message content and typed message value"
-
-                        # We need image properties that are only in the original message
-                        for part, content_part in zip(
-                            typed_message_value, message.content, strict=False
-                        ):
-                            if isinstance(content_part, Image):
-                                # TODO: add detail parameter
-                                num_tokens += calculate_vision_tokens(content_part)
-                            elif isinstance(part, str):
-                                num_tokens += len(encoding.encode(part))
-                            else:
-                                try:
-                                    serialized_part = json.dumps(part)
-                                    num_tokens += len(encoding.encode(serialized_part))
-                                except TypeError:
-                                    trace_logger.warning(
-                                        f"Could not convert {part} to string, skipping."
-                                    )
-                    else:
-                        if not isinstance(value, str):
+                    # We need image properties that are only in the original message
+                    for part, content_part in zip(
+                        typed_message_value, message.content, strict=False
+                    ):
+                        if isinstance(content_part, Image):
+                            # TODO: add detail parameter
+                            num_tokens += calculate_vision_tokens(content_part)
+                        elif isinstance(part, str):
+                            num_tokens += len(encoding.encode(part))
+                        else:
                             try:
-                                value = json.dumps(value)
+                                serialized_part = json.dumps(part)
+                                num_tokens += len(encoding.encode(serialized_part))
                             except TypeError:
                                 trace_logger.warning(
-                                    f"Could not convert {value} to string, skipping."
+                                    f"Could not convert {part} to string, skipping."
                                 )
-                                continue
-                        num_tokens += len(encoding.encode(value))
-                        if key == "name":
-                            num_tokens += tokens_per_name
-        num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
+                else:
+                    if not isinstance(value, str):
+                        try:
+                            value = json.dumps(value)
+                        except TypeError:
+                            trace_logger.warning(
+                                f"Could not convert {value} to string, skipping."
+                            )
+                            continue
+                    num_tokens += len(encoding.encode(value))
+                    if key == "name":
+                        num_tokens += tokens_per_name
+        return num_tokens
 
-        # Tool tokens.
-        oai_tools = convert_tools(tools)
-        for tool in oai_tools:
-            function = tool["function"]
-            tool_tokens = len(encoding.encode(function["name"]))
-            if "description" in function:
-                tool_tokens += len(encoding.encode(function["description"]))
-            tool_tokens -= 2
-            if "parameters" in function:
-                parameters = function["parameters"]
-                if "properties" in parameters:
-                    assert isinstance(parameters["properties"], dict)
-                    for propertiesKey in parameters["properties"]:  # pyright: ignore
-                        assert isinstance(propertiesKey, str)
-                        tool_tokens += len(encoding.encode(propertiesKey))
-                        v = parameters["properties"][propertiesKey]  # pyright: ignore
-                        for field in v:  # pyright: ignore
-                            if field == "type":
-                                tool_tokens += 2
-                                tool_tokens += len(
-                                    encoding.encode(v["type"])
-                                )  # pyright: ignore
-                            elif field == "description":
-                                tool_tokens += 2
+    def _count_tool_tokens(
+        self, tool: ChatCompletionToolParam, encoding: tiktoken.Encoding
+    ) -> int:
+        function = tool["function"]
+        tool_tokens = len(encoding.encode(function["name"]))
+        if "description" in function:
+            tool_tokens += len(encoding.encode(function["description"]))
+        tool_tokens -= 2
+        if "parameters" in function:
+            parameters = function["parameters"]
+            if "properties" in parameters:
+                assert isinstance(parameters["properties"], dict)
+                for propertiesKey in parameters["properties"]:  # pyright: ignore
+                    assert isinstance(propertiesKey, str)
+                    tool_tokens += len(encoding.encode(propertiesKey))
+                    v = parameters["properties"][propertiesKey]  # pyright: ignore
+                    for field in v:  # pyright: ignore
+                        if field == "type":
+                            tool_tokens += 2
+                            tool_tokens += len(
+                                encoding.encode(v["type"])
+                            )  # pyright: ignore
+                        elif field == "description":
+                            tool_tokens += 2
+                            tool_tokens += len(
+                                encoding.encode(v["description"])
+                            )  # pyright: ignore
+                        elif field == "enum":
+                            tool_tokens -= 3
+                            for o in v["enum"]:  # pyright: ignore
+                                tool_tokens += 3
                                 tool_tokens += len(
-                                    encoding.encode(v["description"])
+                                    encoding.encode(o)
                                 )  # pyright: ignore
-                            elif field == "enum":
-                                tool_tokens -= 3
-                                for o in v["enum"]:  # pyright: ignore
-                                    tool_tokens += 3
-                                    tool_tokens += len(
-                                        encoding.encode(o)
-                                    )  # pyright: ignore
-                            else:
-                                trace_logger.warning(f"Not supported field {field}")
-                    tool_tokens += 11
-                    if len(parameters["properties"]) == 0:  # pyright: ignore
-                        tool_tokens -= 2
+                        else:
+                            trace_logger.warning(f"Not supported field {field}")
+                tool_tokens += 11
+                if len(parameters["properties"]) == 0:  # pyright: ignore
+                    tool_tokens -= 2
+        return tool_tokens
+
+    def count_message_tokens(self, messages: Sequence[LLMMessage]) -> int:
+        """Count the tokens of the given messages alone, without the tokens that
+        prime the reply and without tool tokens.
+
+        Token counts are memoized per message object, so messages must not be modified
+        after they have been counted. Since the count is additive, a caller that keeps a
+        growing history can count only the appended messages::
+
+            total = client.count_tokens(history, tools=tools)
+            history.extend(new_messages)
+            total += client.count_message_tokens(new_messages)
+            assert total == client.count_tokens(history, tools=tools)
+        """
+        num_tokens = 0
+        encoding: tiktoken.Encoding | None = None
+        cache = self._message_token_cache
+        for message in messages:
+            key = id(message)
+            entry = cache.get(key)
+            if entry is not None and entry[0]() is message:
+                num_tokens += entry[1]
+                continue
+            if encoding is None:
+                encoding = self._get_encoding()
+            message_tokens = self._count_message_tokens(message, encoding)
+            cache[key] = (
+                weakref.ref(message, lambda _, key=key: cache.pop(key, None)),  # type: ignore
+                message_tokens,
+            )
+            num_tokens += message_tokens
+        return num_tokens
+
+    def _count_tools_tokens(self, tools: Sequence[Tool | ToolSchema]) -> int:
+        num_tokens = 0
+        for tool in tools:
+            if isinstance(tool, Tool):
+                tool_schema = tool.schema
+                try:
+                    entry = self._tool_token_cache.get(tool)
+                except TypeError:
+                    # The tool cannot be hashed, its tokens are counted every time.
+                    entry = None
+                if entry is not None and entry[0] is tool_schema:
+                    num_tokens += entry[1]
+                    continue
+                tool_tokens = self._count_tool_tokens(
+                    convert_tools([tool])[0], self._get_encoding()
+                )
+                try:
+                    self._tool_token_cache[tool] = (tool_schema, tool_tokens)
+                except TypeError:
+                    # The tool cannot be hashed or weakly referenced.
+                    pass
+            else:
+                schema_key = json.dumps(tool, sort_keys=True)
+                cached_tokens = self._tool_schema_token_cache.get(schema_key)
+                if cached_tokens is None:
+                    cached_tokens = self._count_tool_tokens(
+                        convert_tools([tool])[0], self._get_encoding()
+                    )
+                    self._tool_schema_token_cache[schema_key] = cached_tokens
+                tool_tokens = cached_tokens
             num_tokens += tool_tokens
+        return num_tokens
+
+    def count_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        num_tokens = self.count_message_tokens(messages)
+        num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
+        num_tokens += self._count_tools_tokens(tools)
         num_tokens += 12
         return num_tokens
 
@@ -1005,6 +1223,8 @@ class OpenAIChatCompletionClient(
         timeout: (optional, float): The timeout for the request in seconds.
         max_retries (optional, int): The maximum number of retries to attempt.
         model_info (optional, ModelInfo): The capabilities of the model. **Required if the model name is not a valid OpenAI model.**
+        rate_limiter (optional, RateLimiter): A limiter that requests are admitted through, which can be shared by clients of the same deployment.
+        rate_limit_priority (optional, int): The priority class of this client's requests in the rate limiter. Higher priorities are admitted first.
         frequency_penalty (optional, float):
         logit_bias: (optional, dict[str, int]):
         max_tokens (optional, int):
@@ -1093,6 +1313,11 @@ def __init__(self, **kwargs: Unpack[OpenAIClientConfiguration]):
             model_info = kwargs["model_info"]
             del copied_args["model_info"]
 
+        rate_limiter = kwargs.get("rate_limiter")
+        rate_limit_priority = kwargs.get("rate_limit_priority", 0)
+        copied_args.pop("rate_limiter", None)
+        copied_args.pop("rate_limit_priority", None)
+
         client = _openai_client_from_config(copied_args)
         create_args = _create_args_from_config(copied_args)
         self._raw_config: Dict[str, Any] = copied_args
@@ -1101,15 +1326,21 @@ def __init__(self, **kwargs: Unpack[OpenAIClientConfiguration]):
             create_args=create_args,
             model_capabilities=model_capabilities,
             model_info=model_info,
+            rate_limiter=rate_limiter,
+            rate_limit_priority=rate_limit_priority,
         )
 
     def __getstate__(self) -> Dict[str, Any]:
         state = self.__dict__.copy()
         state["_client"] = None
+        state["_rate_limiter"] = None
+        for name in _TOKEN_COUNTING_STATE:
+            del state[name]
         return state
 
     def __setstate__(self, state: Dict[str, Any]) -> None:
         self.__dict__.update(state)
+        self._reset_token_counting_state()
         self._client = _openai_client_from_config(state["_raw_config"])
 
     def _to_config(self) -> OpenAIClientConfigurationConfigModel:
@@ -1139,6 +1370,8 @@ class AzureOpenAIChatCompletionClient(
         timeout: (optional, float): The timeout for the request in seconds.
         max_retries (optional, int): The maximum number of retries to attempt.
         model_info (optional, ModelInfo): The capabilities of the model. **Required if the model name is not a valid OpenAI model.**
+        rate_limiter (optional, RateLimiter): A limiter that requests are admitted through, which can be shared by clients of the same deployment.
+        rate_limit_priority (optional, int): The priority class of this client's requests in the rate limiter. Higher priorities are admitted first.
         frequency_penalty (optional, float):
         logit_bias: (optional, dict[str, int]):
         max_tokens (optional, int):
@@ -1237,6 +1470,11 @@ def __init__(self, **kwargs: Unpack[AzureOpenAIClientConfiguration]):
             model_info = kwargs["model_info"]
             del copied_args["model_info"]
 
+        rate_limiter = kwargs.get("rate_limiter")
+        rate_limit_priority = kwargs.get("rate_limit_priority", 0)
+        copied_args.pop("rate_limiter", None)
+        copied_args.pop("rate_limit_priority", None)
+
         client = _azure_openai_client_from_config(copied_args)
         create_args = _create_args_from_config(copied_args)
         self._raw_config: Dict[str, Any] = copied_args
@@ -1245,15 +1483,21 @@ def __init__(self, **kwargs: Unpack[AzureOpenAIClientConfiguration]):
             create_args=create_args,
             model_capabilities=model_capabilities,
             model_info=model_info,
+            rate_limiter=rate_limiter,
+            rate_limit_priority=rate_limit_priority,
         )
 
     def __getstate__(self) -> Dict[str, Any]:
         state = self.__dict__.copy()
         state["_client"] = None
+        state["_rate_limiter"] = None
+        for name in _TOKEN_COUNTING_STATE:
+            del state[name]
         return state
 
     def __setstate__(self, state: Dict[str, Any]) -> None:
         self.__dict__.update(state)
+        self._reset_token_counting_state()
         self._client = _azure_openai_client_from_config(state["_raw_config"])
 
     def _to_config(self) -> AzureOpenAIClientConfigurationConfigModel:
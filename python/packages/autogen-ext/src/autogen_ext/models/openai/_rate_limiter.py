@@ -0,0 +1,289 @@
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple
+
+from autogen_core import CancellationToken
+
+
+@dataclass
+class RateLimiterMetrics:
+    """Counters collected by a :class:`RateLimiter`."""
+
+    requests: int = 0
+    """The number of requests admitted."""
+    throttled: int = 0
+    """The number of admitted requests that had to wait in the queue."""
+    total_wait_time: float = 0.0
+    """The total time, in seconds, that admitted requests spent in the queue."""
+    max_wait_time: float = 0.0
+    """The longest time, in seconds, that an admitted request spent in the queue."""
+    estimated_tokens: int = 0
+    """The total number of tokens reserved for admitted requests before they were sent."""
+    actual_tokens: int = 0
+    """The total number of tokens reported by the usage of completed requests."""
+
+
+class RateLimitLease:
+    """A reservation of request and token capacity made by :meth:`RateLimiter.acquire`.
+
+    The lease must be released when the request completes, with the actual token usage
+    if it is known, so the limiter can reconcile its estimate and admit the next request.
+    """
+
+    def __init__(self, limiter: "RateLimiter", tokens: int) -> None:
+        self._limiter = limiter
+        self._tokens = tokens
+        self._released = False
+
+    @property
+    def tokens(self) -> int:
+        """The number of tokens reserved for the request."""
+        return self._tokens
+
+    def release(self, actual_tokens: Optional[int] = None) -> None:
+        """Release the lease. Releasing a lease more than once has no effect.
+
+        Args:
+            actual_tokens (int | None): The number of tokens the request actually used. The
+                difference with the reserved tokens is returned to, or taken from, the token
+                budget. None keeps the reserved tokens as the usage of the request.
+        """
+        if self._released:
+            return
+        self._released = True
+        self._limiter._release(
+            self._tokens, actual_tokens
+        )  # pyright: ignore[reportPrivateUsage]
+
+
+# A queued request: (negated priority, sequence number, tokens, enqueue time, future).
+_Waiter = Tuple[int, int, int, float, "asyncio.Future[RateLimitLease]"]
+
+
+class RateLimiter:
+    """A client-side rate limiter and concurrency governor for model clients.
+
+    Requests are admitted against a requests-per-minute and a tokens-per-minute budget,
+    both refilled continuously as token buckets holding at most one minute of capacity,
+    and against a maximum number of requests in flight. Requests that cannot be admitted
+    wait in a queue ordered by priority, then by arrival. The tokens of a request are
+    estimated before it is sent and reconciled with the actual usage when its lease is
+    released.
+
+    A limiter can be shared by several clients that call the same deployment, so they
+    stay within its quota together. It must be used from a single event loop.
+
+    Args:
+        requests_per_minute (float | None): The maximum request rate. None means no limit.
+        tokens_per_minute (float | None): The maximum token rate. None means no limit.
+        max_concurrent_requests (int | None): The maximum number of requests in flight.
+            None means no limit.
+
+    Examples:
+
+        Share a limiter between two clients of the same deployment, giving priority to
+        interactive requests:
+
+        .. code-block:: python
+
+            from autogen_ext.models.openai import OpenAIChatCompletionClient, RateLimiter
+
+            limiter = RateLimiter(requests_per_minute=500, tokens_per_minute=80_000, max_concurrent_requests=16)
+            interactive_client = OpenAIChatCompletionClient(
+                model="gpt-4o", rate_limiter=limiter, rate_limit_priority=1
+            )
+            batch_client = OpenAIChatCompletionClient(model="gpt-4o", rate_limiter=limiter)
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrent_requests: Optional[int] = None,
+    ) -> None:
+        for name, value in [
+            ("requests_per_minute", requests_per_minute),
+            ("tokens_per_minute", tokens_per_minute),
+            ("max_concurrent_requests", max_concurrent_requests),
+        ]:
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive or None")
+        self._requests_per_minute = requests_per_minute
+        self._tokens_per_minute = tokens_per_minute
+        self._max_concurrent_requests = max_concurrent_requests
+        self._request_allowance = requests_per_minute or 0.0
+        self._token_allowance = tokens_per_minute or 0.0
+        self._last_refill = time.monotonic()
+        self._in_flight = 0
+        self._waiters: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._metrics = RateLimiterMetrics()
+
+    @property
+    def requests_per_minute(self) -> Optional[float]:
+        return self._requests_per_minute
+
+    @property
+    def tokens_per_minute(self) -> Optional[float]:
+        return self._tokens_per_minute
+
+    @property
+    def max_concurrent_requests(self) -> Optional[int]:
+        return self._max_concurrent_requests
+
+    @property
+    def in_flight(self) -> int:
+        """The number of admitted requests whose lease has not been released."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """The number of requests waiting to be admitted."""
+        return sum(1 for waiter in self._waiters if not waiter[4].done())
+
+    @property
+    def metrics(self) -> RateLimiterMetrics:
+        """A snapshot of the limiter's counters."""
+        return replace(self._metrics)
+
+    async def acquire(
+        self,
+        tokens: int = 0,
+        *,
+        priority: int = 0,
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> RateLimitLease:
+        """Wait until a request can be sent, and reserve capacity for it.
+
+        Args:
+            tokens (int): The estimated number of tokens of the request.
+            priority (int): The priority class of the request. Requests with a higher priority
+                are admitted first. Defaults to 0.
+            cancellation_token (CancellationToken | None): A token to cancel the wait.
+
+        Returns:
+            RateLimitLease: The lease to release when the request completes.
+        """
+        if not self._waiters and self._try_admit(tokens):
+            return self._admit(tokens, wait_time=0.0)
+        future: asyncio.Future[RateLimitLease] = (
+            asyncio.get_running_loop().create_future()
+        )
+        heapq.heappush(
+            self._waiters,
+            (-priority, next(self._sequence), tokens, time.monotonic(), future),
+        )
+        if cancellation_token is not None:
+            cancellation_token.link_future(future)
+        self._dispatch()
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted in the same iteration as the cancellation.
+                future.result().release()
+            # The cancelled waiter may have been blocking the ones behind it.
+            self._dispatch()
+            raise
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self._requests_per_minute is not None:
+            self._request_allowance = min(
+                self._requests_per_minute,
+                self._request_allowance + elapsed * self._requests_per_minute / 60,
+            )
+        if self._tokens_per_minute is not None:
+            self._token_allowance = min(
+                self._tokens_per_minute,
+                self._token_allowance + elapsed * self._tokens_per_minute / 60,
+            )
+
+    def _needed_tokens(self, tokens: int) -> float:
+        # A request larger than the bucket would never be admitted, so it only waits for a full bucket.
+        assert self._tokens_per_minute is not None
+        return min(float(tokens), self._tokens_per_minute)
+
+    def _try_admit(self, tokens: int) -> bool:
+        if (
+            self._max_concurrent_requests is not None
+            and self._in_flight >= self._max_concurrent_requests
+        ):
+            return False
+        self._refill()
+        if self._requests_per_minute is not None and self._request_allowance < 1:
+            return False
+        if (
+            self._tokens_per_minute is not None
+            and self._token_allowance < self._needed_tokens(tokens)
+        ):
+            return False
+        return True
+
+    def _admit(self, tokens: int, wait_time: float) -> RateLimitLease:
+        if self._requests_per_minute is not None:
+            self._request_allowance -= 1
+        if self._tokens_per_minute is not None:
+            self._token_allowance -= tokens
+        self._in_flight += 1
+        self._metrics.requests += 1
+        self._metrics.estimated_tokens += tokens
+        if wait_time > 0:
+            self._metrics.throttled += 1
+            self._metrics.total_wait_time += wait_time
+            self._metrics.max_wait_time = max(self._metrics.max_wait_time, wait_time)
+        return RateLimitLease(self, tokens)
+
+    def _dispatch(self) -> None:
+        while self._waiters:
+            _, _, tokens, enqueued, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._try_admit(tokens):
+                self._schedule(tokens)
+                return
+            heapq.heappop(self._waiters)
+            future.set_result(self._admit(tokens, time.monotonic() - enqueued))
+
+    def _schedule(self, tokens: int) -> None:
+        """Schedule a dispatch for when the buckets hold enough for the head of the queue."""
+        delay = 0.0
+        if self._requests_per_minute is not None:
+            delay = max(
+                delay, (1 - self._request_allowance) * 60 / self._requests_per_minute
+            )
+        if self._tokens_per_minute is not None:
+            delay = max(
+                delay,
+                (self._needed_tokens(tokens) - self._token_allowance)
+                * 60
+                / self._tokens_per_minute,
+            )
+        if delay <= 0:
+            # Only the concurrency limit is reached; a release will dispatch again.
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def _release(self, tokens: int, actual_tokens: Optional[int]) -> None:
+        self._in_flight -= 1
+        if actual_tokens is not None:
+            self._metrics.actual_tokens += actual_tokens
+            if self._tokens_per_minute is not None:
+                self._token_allowance += tokens - actual_tokens
+        else:
+            self._metrics.actual_tokens += tokens
+        self._dispatch()
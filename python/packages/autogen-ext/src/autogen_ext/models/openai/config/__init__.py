@@ -5,6 +5,8 @@
 from pydantic import BaseModel
 from typing_extensions import Required, TypedDict
 
+from .._rate_limiter import RateLimiter
+
 
 class ResponseFormat(TypedDict):
     type: Literal["text", "json_object"]
@@ -35,6 +37,10 @@ class BaseOpenAIClientConfiguration(CreateArguments, total=False):
     model_capabilities: ModelCapabilities  # type: ignore
     model_info: ModelInfo
     """What functionality the model supports, determined by default from model name but is overriden if value passed."""
+    rate_limiter: RateLimiter
+    """A limiter that requests must be admitted through, which can be shared with other clients. It is not part of the component configuration and is not pickled."""
+    rate_limit_priority: int
+    """The priority class of this client's requests in the rate limiter. Higher priorities are admitted first. Defaults to 0."""
 
 
 # See OpenAI docs for explanation of these parameters
@@ -163,6 +163,7 @@ async def create(
             self._cur_usage = RequestUsage(
                 prompt_tokens=prompt_token_count,
                 completion_tokens=response.usage.completion_tokens,
+                cached_prompt_tokens=response.usage.cached_prompt_tokens,
             )
 
         self._update_total_usage()
@@ -200,6 +201,7 @@ async def create_stream(
             self._cur_usage = RequestUsage(
                 prompt_tokens=prompt_token_count,
                 completion_tokens=response.usage.completion_tokens,
+                cached_prompt_tokens=response.usage.cached_prompt_tokens,
             )
             yield response
             self._update_total_usage()
@@ -262,6 +264,7 @@ def _tokenize(
     def _update_total_usage(self) -> None:
         self._total_usage.completion_tokens += self._cur_usage.completion_tokens
         self._total_usage.prompt_tokens += self._cur_usage.prompt_tokens
+        self._total_usage.cached_prompt_tokens += self._cur_usage.cached_prompt_tokens
 
     @property
     def capabilities(self) -> ModelCapabilities:  # type: ignore
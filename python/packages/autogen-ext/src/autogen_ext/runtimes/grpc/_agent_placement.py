@@ -0,0 +1,75 @@
+import bisect
+import hashlib
+from typing import Dict, List, Set
+
+
+def _hash(value: str) -> int:
+    # A stable hash, unlike hash(), so placements do not depend on the process.
+    return int.from_bytes(
+        hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+class ConsistentHashRing:
+    """Places keys on a set of members with consistent hashing.
+
+    Each member is hashed onto the ring at `virtual_nodes` points, and a key belongs to
+    the member at the first point after the key's hash. Adding or removing a member only
+    moves the keys between that member and its neighbours, about 1/n of all keys, so the
+    other keys stay on the member they were placed on.
+
+    Args:
+        virtual_nodes (int): The number of points per member. More points spread the keys
+            more evenly between members. Defaults to 64.
+    """
+
+    def __init__(self, virtual_nodes: int = 64) -> None:
+        if virtual_nodes <= 0:
+            raise ValueError("virtual_nodes must be greater than 0.")
+        self._virtual_nodes = virtual_nodes
+        self._members: Set[int] = set()
+        self._points: List[int] = []
+        self._point_members: Dict[int, int] = {}
+
+    @property
+    def members(self) -> Set[int]:
+        return set(self._members)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, member: int) -> bool:
+        return member in self._members
+
+    def add(self, member: int) -> None:
+        if member in self._members:
+            return
+        self._members.add(member)
+        for i in range(self._virtual_nodes):
+            point = _hash(f"{member}:{i}")
+            # 64-bit collisions are vanishingly rare; the member placed first keeps the point.
+            if point not in self._point_members:
+                self._point_members[point] = member
+                bisect.insort(self._points, point)
+
+    def remove(self, member: int) -> None:
+        if member not in self._members:
+            return
+        self._members.discard(member)
+        self._points = [
+            point for point in self._points if self._point_members[point] != member
+        ]
+        self._point_members = {
+            point: owner
+            for point, owner in self._point_members.items()
+            if owner != member
+        }
+
+    def get(self, key: str) -> int | None:
+        """Return the member that the key is placed on, or None if the ring is empty."""
+        if len(self._members) == 1:
+            return next(iter(self._members))
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._point_members[self._points[index]]
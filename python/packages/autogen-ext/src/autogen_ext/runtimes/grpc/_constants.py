@@ -9,3 +9,6 @@
 MESSAGE_KIND_VALUE_RPC_REQUEST = "rpc_request"
 MESSAGE_KIND_VALUE_RPC_RESPONSE = "rpc_response"
 MESSAGE_KIND_VALUE_RPC_ERROR = "error"
+AGENT_RECIPIENTS_ATTR = "agrecipients"
+MESSAGE_BATCH_METADATA_KEY = "agent-message-batch"
+PEER_ADDRESS_METADATA_KEY = "agent-peer-address"
@@ -0,0 +1,109 @@
+import asyncio
+from typing import AsyncIterator, List, Sequence
+
+from ._type_helpers import ChannelArgumentType
+from .protos import agent_worker_pb2
+
+# Defaults for combining the messages sent on a channel into batch frames.
+DEFAULT_MAX_BATCH_MESSAGES = 256
+DEFAULT_MAX_BATCH_BYTES = 1024 * 1024
+DEFAULT_MAX_BATCH_DELAY = 0.002
+
+# The most bytes a frame adds around a message: a field tag and a length of up to 5 bytes.
+_ENVELOPE_BYTES = 6
+
+_MESSAGE_LENGTH_OPTIONS = (
+    "grpc.max_send_message_length",
+    "grpc.max_receive_message_length",
+)
+
+
+def batch_bytes_limit(options: ChannelArgumentType | None) -> int:
+    """Return the `max_bytes` of the batch frames sent on a channel or server with the given
+    options: :data:`DEFAULT_MAX_BATCH_BYTES`, or less if the options limit the length of the
+    messages sent or received, so that frames stay within the limits with their envelope.
+    """
+    limit: int = DEFAULT_MAX_BATCH_BYTES
+    for key, value in options or ():
+        if key in _MESSAGE_LENGTH_OPTIONS and int(value) >= 0:
+            limit = min(limit, int(value))
+    return limit - _ENVELOPE_BYTES
+
+
+def unbatch(
+    message: agent_worker_pb2.Message,
+) -> Sequence[agent_worker_pb2.Message]:
+    """Return the messages of a batch frame, or the message itself if it is not a batch."""
+    if message.WhichOneof("message") == "batch":
+        return message.batch.messages
+    return (message,)
+
+
+class MessageBatcher(AsyncIterator[agent_worker_pb2.Message]):
+    """Yields the messages put in a queue, combining them into batch frames once
+    :attr:`enabled` is set.
+
+    A frame holds the messages that are already queued when it is sent, up to `max_messages`
+    messages and `max_bytes` bytes including their envelopes in the frame, so a message sent
+    on its own is not delayed. When more than one message is queued, the frame waits up to
+    `max_delay` seconds for more messages to fill it. Messages larger than `max_bytes` are
+    sent in frames of their own.
+
+    Batching is disabled until the peer announces that it can read batch frames.
+    """
+
+    def __init__(
+        self,
+        queue: asyncio.Queue[agent_worker_pb2.Message],
+        *,
+        max_messages: int = DEFAULT_MAX_BATCH_MESSAGES,
+        max_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        max_delay: float = DEFAULT_MAX_BATCH_DELAY,
+    ) -> None:
+        self._queue = queue
+        self._max_messages = max_messages
+        self._max_bytes = max_bytes
+        self._max_delay = max_delay
+        # A message taken from the queue that did not fit in the previous frame.
+        self._next: agent_worker_pb2.Message | None = None
+        self.enabled = False
+
+    def __aiter__(self) -> AsyncIterator[agent_worker_pb2.Message]:
+        return self
+
+    async def __anext__(self) -> agent_worker_pb2.Message:
+        if self._next is not None:
+            message, self._next = self._next, None
+        else:
+            message = await self._queue.get()
+        if not self.enabled or self._queue.empty():
+            return message
+        size = message.ByteSize() + _ENVELOPE_BYTES
+        if size >= self._max_bytes:
+            return message
+        messages = [message]
+        size = self._fill(messages, size)
+        if (
+            self._next is None
+            and len(messages) < self._max_messages
+            and self._max_delay > 0
+        ):
+            await asyncio.sleep(self._max_delay)
+            self._fill(messages, size)
+        if len(messages) == 1:
+            return message
+        return agent_worker_pb2.Message(
+            batch=agent_worker_pb2.MessageBatch(messages=messages)
+        )
+
+    def _fill(self, messages: List[agent_worker_pb2.Message], size: int) -> int:
+        # Add the queued messages to the frame without waiting.
+        while len(messages) < self._max_messages and not self._queue.empty():
+            message = self._queue.get_nowait()
+            message_size = message.ByteSize() + _ENVELOPE_BYTES
+            if size + message_size > self._max_bytes:
+                self._next = message
+                break
+            messages.append(message)
+            size += message_size
+        return size
@@ -0,0 +1,111 @@
+import json
+import logging
+from typing import Any, Dict
+
+from autogen_core import TRACE_LOGGER_NAME
+from google.protobuf import text_format
+
+from .protos import agent_worker_pb2
+
+trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+
+
+class ChannelMessageLog:
+    """A log record argument that describes a message sent or received on a channel.
+
+    The description is only built when a handler formats the record, so passing it to a
+    disabled logger costs nothing. It holds the kind, ids and size of the message but not
+    its payload, unless `include_payload` is set.
+    """
+
+    __slots__ = ("_direction", "_message", "_client_id", "_include_payload")
+
+    def __init__(
+        self,
+        direction: str,
+        message: agent_worker_pb2.Message,
+        *,
+        client_id: int | None = None,
+        include_payload: bool = False,
+    ) -> None:
+        self._direction = direction
+        self._message = message
+        self._client_id = client_id
+        self._include_payload = include_payload
+
+    def fields(self) -> Dict[str, Any]:
+        message = self._message
+        kind = message.WhichOneof("message")
+        fields: Dict[str, Any] = {"direction": self._direction, "kind": kind}
+        if self._client_id is not None:
+            fields["client_id"] = self._client_id
+        match kind:
+            case "request":
+                fields["request_id"] = message.request.request_id
+                fields["target"] = (
+                    f"{message.request.target.type}/{message.request.target.key}"
+                )
+                fields["data_type"] = message.request.payload.data_type
+            case "response":
+                fields["request_id"] = message.response.request_id
+                if message.response.error:
+                    fields["error"] = message.response.error
+            case "cloudEvent":
+                fields["id"] = message.cloudEvent.id
+                fields["topic"] = (
+                    f"{message.cloudEvent.type}/{message.cloudEvent.source}"
+                )
+            case "batch":
+                fields["messages"] = len(message.batch.messages)
+            case "placementChanged":
+                fields["agent_type"] = message.placementChanged.agent_type
+            case None:
+                pass
+            case _:
+                # Other messages are identified by their request id, if they have one.
+                request_id = getattr(getattr(message, kind), "request_id", None)
+                if request_id is not None:
+                    fields["request_id"] = request_id
+        fields["size"] = message.ByteSize()
+        if self._include_payload:
+            fields["message"] = text_format.MessageToString(message, as_one_line=True)
+        return fields
+
+    def __str__(self) -> str:
+        return json.dumps(self.fields())
+
+
+class MessageTraceSampler:
+    """Logs a sample of the messages on a channel, with their payloads, to the trace logger.
+
+    Args:
+        sample_rate (float): The fraction of messages to log, between 0 and 1. Messages are
+            sampled at regular intervals, e.g. every tenth message for 0.1. Defaults to 0,
+            which logs no messages.
+    """
+
+    def __init__(self, sample_rate: float = 0.0) -> None:
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1.")
+        self._sample_rate = sample_rate
+        self._credit = 0.0
+
+    def trace(
+        self,
+        direction: str,
+        message: agent_worker_pb2.Message,
+        *,
+        client_id: int | None = None,
+    ) -> None:
+        if not self._sample_rate:
+            return
+        self._credit += self._sample_rate
+        if self._credit < 1.0:
+            return
+        self._credit -= 1.0
+        trace_logger.debug(
+            "%s",
+            ChannelMessageLog(
+                direction, message, client_id=client_id, include_payload=True
+            ),
+        )
@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import inspect
 import json
 import logging
@@ -23,6 +24,7 @@
     ParamSpec,
     Sequence,
     Set,
+    Tuple,
     Type,
     TypeVar,
     cast,
@@ -30,6 +32,7 @@
 
 from autogen_core import (
     JSON_DATA_CONTENT_TYPE,
+    MSGPACK_DATA_CONTENT_TYPE,
     PROTOBUF_DATA_CONTENT_TYPE,
     Agent,
     AgentId,
@@ -55,12 +58,18 @@
     TraceHelper,
     get_telemetry_grpc_metadata,
 )
-from google.protobuf import any_pb2
 from opentelemetry.trace import TracerProvider
 from typing_extensions import Self
 
 from . import _constants
 from ._constants import GRPC_IMPORT_ERROR_STR
+from ._message_batching import (
+    DEFAULT_MAX_BATCH_BYTES,
+    MessageBatcher,
+    batch_bytes_limit,
+    unbatch,
+)
+from ._message_logging import ChannelMessageLog, MessageTraceSampler
 from ._type_helpers import ChannelArgumentType
 from .protos import agent_worker_pb2, agent_worker_pb2_grpc, cloudevent_pb2
 
@@ -78,19 +87,40 @@
 P = ParamSpec("P")
 T = TypeVar("T", bound=Agent)
 
+# Seconds to wait for the host to answer a placement lookup before sending the request
+# through the host.
+_PLACEMENT_LOOKUP_TIMEOUT = 5.0
 
-type_func_alias = type
 
+type_func_alias = type
 
-class QueueAsyncIterable(AsyncIterator[Any], AsyncIterable[Any]):
-    def __init__(self, queue: asyncio.Queue[Any]) -> None:
-        self._queue = queue
 
-    async def __anext__(self) -> Any:
-        return await self._queue.get()
+def _stringify_attributes(
+    attributes: Mapping[str, cloudevent_pb2.CloudEvent.CloudEventAttributeValue],
+) -> Mapping[str, str]:
+    result: Dict[str, str] = {}
+    for key, value in attributes.items():
+        item = None
+        match value.WhichOneof("attr"):
+            case "ce_boolean":
+                item = str(value.ce_boolean)
+            case "ce_integer":
+                item = str(value.ce_integer)
+            case "ce_string":
+                item = value.ce_string
+            case "ce_bytes":
+                item = str(value.ce_bytes)
+            case "ce_uri":
+                item = value.ce_uri
+            case "ce_uri_ref":
+                item = value.ce_uri_ref
+            case "ce_timestamp":
+                item = str(value.ce_timestamp)
+            case _:
+                raise ValueError("Unknown attribute kind")
+        result[key] = item
 
-    def __aiter__(self) -> AsyncIterator[Any]:
-        return self
+    return result
 
 
 class HostConnection:
@@ -116,10 +146,23 @@ class HostConnection:
         )
     ]
 
-    def __init__(self, channel: grpc.aio.Channel) -> None:  # type: ignore
+    def __init__(  # type: ignore
+        self,
+        channel: grpc.aio.Channel,
+        *,
+        message_batching: bool = True,
+        message_trace_sample_rate: float = 0.0,
+        peer_address: str | None = None,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> None:
         self._channel = channel
         self._send_queue = asyncio.Queue[agent_worker_pb2.Message]()
         self._recv_queue = asyncio.Queue[agent_worker_pb2.Message]()
+        self._batcher = MessageBatcher(self._send_queue, max_bytes=max_batch_bytes)
+        self._message_batching = message_batching
+        self._trace_sampler = MessageTraceSampler(message_trace_sample_rate)
+        self._peer_address = peer_address
+        self._connected = asyncio.Event()
         self._connection_task: Task[None] | None = None
 
     @classmethod
@@ -127,6 +170,9 @@ def from_host_address(
         cls,
         host_address: str,
         extra_grpc_config: ChannelArgumentType = DEFAULT_GRPC_CONFIG,
+        message_batching: bool = True,
+        message_trace_sample_rate: float = 0.0,
+        peer_address: str | None = None,
     ) -> Self:
         logger.info("Connecting to %s", host_address)
         #  Always use DEFAULT_GRPC_CONFIG and override it with provided grpc_config
@@ -142,12 +188,45 @@ def from_host_address(
             host_address,
             options=merged_options,
         )
-        instance = cls(channel)
+        instance = cls(
+            channel,
+            message_batching=message_batching,
+            message_trace_sample_rate=message_trace_sample_rate,
+            peer_address=peer_address,
+            max_batch_bytes=batch_bytes_limit(merged_options),
+        )
         instance._connection_task = asyncio.create_task(
-            instance._connect(channel, instance._send_queue, instance._recv_queue)
+            instance._connect(
+                channel,
+                instance._batcher,
+                instance._recv_queue,
+                instance._message_batching,
+                instance._trace_sampler,
+                instance._peer_address,
+                instance._connected,
+            )
         )
         return instance
 
+    @property
+    def connected(self) -> bool:
+        """Whether the other end of the channel has accepted it."""
+        return self._connected.is_set()
+
+    def add_close_callback(self, callback: Callable[[], Any]) -> None:
+        """Call a function when the channel closes, or fails to open."""
+        if self._connection_task is None:
+            raise RuntimeError("Connection is not open.")
+
+        def on_done(task: Task[None]) -> None:
+            if not task.cancelled() and task.exception() is not None:
+                logger.warning(
+                    "Channel closed with an error", exc_info=task.exception()
+                )
+            callback()
+
+        self._connection_task.add_done_callback(on_done)
+
     async def close(self) -> None:
         if self._connection_task is None:
             raise RuntimeError("Connection is not open.")
@@ -157,38 +236,150 @@ async def close(self) -> None:
     @staticmethod
     async def _connect(  # type: ignore
         channel: grpc.aio.Channel,
-        send_queue: asyncio.Queue[agent_worker_pb2.Message],
+        batcher: MessageBatcher,
         receive_queue: asyncio.Queue[agent_worker_pb2.Message],
+        message_batching: bool,
+        trace_sampler: MessageTraceSampler,
+        peer_address: str | None,
+        connected: asyncio.Event,
     ) -> None:
         stub: AgentRpcAsyncStub = agent_worker_pb2_grpc.AgentRpcStub(channel)  # type: ignore
 
         from grpc.aio import StreamStreamCall
 
         # TODO: where do exceptions from reading the iterable go? How do we recover from those?
+        # Ask the host to send batch frames. Hosts that do not support them ignore the metadata.
+        metadata: List[tuple[str, str]] = []
+        if message_batching:
+            metadata.append((_constants.MESSAGE_BATCH_METADATA_KEY, "1"))
+        if peer_address is not None:
+            metadata.append((_constants.PEER_ADDRESS_METADATA_KEY, peer_address))
         recv_stream: StreamStreamCall[agent_worker_pb2.Message, agent_worker_pb2.Message] = stub.OpenChannel(  # type: ignore
-            QueueAsyncIterable(send_queue)
+            batcher, metadata=metadata or None
         )  # type: ignore
+        initial_metadata = await recv_stream.initial_metadata()  # type: ignore
+        # A call that failed to connect is already done when its initial metadata returns.
+        if not recv_stream.done():  # type: ignore
+            connected.set()
+        if message_batching:
+            # Send batch frames once the host announces that it can read them.
+            batcher.enabled = any(
+                key == _constants.MESSAGE_BATCH_METADATA_KEY
+                for key, _ in initial_metadata or ()  # type: ignore
+            )
 
         while True:
-            logger.info("Waiting for message from host")
-            message = await recv_stream.read()  # type: ignore
-            if message == grpc.aio.EOF:  # type: ignore
+            frame = await recv_stream.read()  # type: ignore
+            if frame == grpc.aio.EOF:  # type: ignore
                 logger.info("EOF")
                 break
-            message = cast(agent_worker_pb2.Message, message)
-            logger.info(f"Received a message from host: {message}")
-            await receive_queue.put(message)
-            logger.info("Put message in receive queue")
+            for message in unbatch(cast(agent_worker_pb2.Message, frame)):
+                # The message is only described if debug logging is enabled.
+                logger.debug(
+                    "Received a message from host: %s",
+                    ChannelMessageLog("receive", message),
+                )
+                trace_sampler.trace("receive", message)
+                await receive_queue.put(message)
 
     async def send(self, message: agent_worker_pb2.Message) -> None:
-        logger.info(f"Send message to host: {message}")
+        logger.debug("Send message to host: %s", ChannelMessageLog("send", message))
+        self._trace_sampler.trace("send", message)
         await self._send_queue.put(message)
-        logger.info("Put message in send queue")
 
     async def recv(self) -> agent_worker_pb2.Message:
-        logger.info("Getting message from queue")
         return await self._recv_queue.get()
 
+    def recv_nowait(self) -> agent_worker_pb2.Message | None:
+        """Return a received message if one is queued, or None."""
+        try:
+            return self._recv_queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+
+class _PeerRpcServicer(agent_worker_pb2_grpc.AgentRpcServicer):
+    """Receives the RPC requests that other worker runtimes send directly to this one."""
+
+    def __init__(
+        self,
+        handle_request: Callable[
+            [
+                agent_worker_pb2.RpcRequest,
+                Callable[[agent_worker_pb2.Message], Awaitable[None]],
+            ],
+            None,
+        ],
+        *,
+        message_batching: bool = True,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> None:
+        self._handle_request = handle_request
+        self._message_batching = message_batching
+        self._max_batch_bytes = max_batch_bytes
+
+    async def OpenChannel(  # type: ignore
+        self,
+        request_iterator: AsyncIterator[agent_worker_pb2.Message],
+        context: grpc.aio.ServicerContext[
+            agent_worker_pb2.Message, agent_worker_pb2.Message
+        ],
+    ) -> AsyncIterator[agent_worker_pb2.Message]:
+        send_queue: asyncio.Queue[agent_worker_pb2.Message] = asyncio.Queue()
+        batcher = MessageBatcher(send_queue, max_bytes=self._max_batch_bytes)
+        batcher.enabled = self._message_batching and any(
+            key == _constants.MESSAGE_BATCH_METADATA_KEY
+            for key, _ in context.invocation_metadata() or ()
+        )
+        # Always send the initial metadata, which tells the peer that the channel is open.
+        await context.send_initial_metadata(
+            ((_constants.MESSAGE_BATCH_METADATA_KEY, "1"),) if batcher.enabled else ()
+        )
+        receiving_task = asyncio.create_task(
+            self._receive_requests(request_iterator, send_queue)
+        )
+        try:
+            async for message in batcher:
+                yield message
+        finally:
+            receiving_task.cancel()
+
+    async def _receive_requests(
+        self,
+        request_iterator: AsyncIterator[agent_worker_pb2.Message],
+        send_queue: asyncio.Queue[agent_worker_pb2.Message],
+    ) -> None:
+        async for frame in request_iterator:
+            for message in unbatch(frame):
+                logger.debug(
+                    "Received a message from peer: %s",
+                    ChannelMessageLog("receive", message),
+                )
+                if message.WhichOneof("message") == "request":
+                    self._handle_request(message.request, send_queue.put)
+                else:
+                    logger.warning(
+                        f"Received unexpected message type from peer: {message.WhichOneof('message')}"
+                    )
+
+    async def GetState(  # type: ignore
+        self,
+        request: agent_worker_pb2.AgentId,
+        context: grpc.aio.ServicerContext[
+            agent_worker_pb2.AgentId, agent_worker_pb2.GetStateResponse
+        ],
+    ) -> agent_worker_pb2.GetStateResponse:
+        raise NotImplementedError("Method not implemented.")
+
+    async def SaveState(  # type: ignore
+        self,
+        request: agent_worker_pb2.AgentState,
+        context: grpc.aio.ServicerContext[
+            agent_worker_pb2.AgentId, agent_worker_pb2.SaveStateResponse
+        ],
+    ) -> agent_worker_pb2.SaveStateResponse:
+        raise NotImplementedError("Method not implemented.")
+
 
 # TODO: Lots of types need to have protobuf equivalents:
 # Core:
@@ -214,6 +405,30 @@ class GrpcWorkerAgentRuntime(AgentRuntime):
 
     .. _cloudevent.proto: https://github.com/microsoft/autogen/blob/main/protos/cloudevent.proto
 
+    With `message_batching` enabled, the default, messages queued together are sent to the host
+    in one frame, of up to 256 messages, if the host supports it. Frames hold up to 1 MiB of
+    messages, or less if `grpc.max_send_message_length` or `grpc.max_receive_message_length` in
+    `extra_grpc_config` is smaller.
+
+    Messages sent and received are logged at debug level without their payloads. To inspect
+    payloads, set `message_trace_sample_rate` to the fraction of messages to log in full to the
+    :data:`~autogen_core.TRACE_LOGGER_NAME` logger at debug level.
+
+    With `direct_rpc_address` set, the runtime accepts RPC requests from other worker runtimes on
+    that address, and sends its own RPC requests directly to the worker runtime the host placed
+    the recipient on, instead of through the host. The host answers the placement lookups, which
+    are cached until the placement of the agent type changes, and still handles registrations,
+    subscriptions and published messages. Requests go through the host when the recipient's
+    runtime does not accept direct requests, the channel to it cannot be opened, or the host
+    does not answer the placement lookup within 5 seconds. Requests waiting for a response on
+    a direct channel that closes fail, as the recipient may have handled them.
+
+    With `max_cached_messages` set, the serialized payloads of that many of the most recently
+    sent or published messages are cached by message identity, so a message object sent to several
+    recipients or topics is serialized once. The cache does not notice changes to a message, so
+    only set it if messages are not modified once they have been sent or published. The hits and
+    misses are counted by :attr:`serialization_cache_hits` and :attr:`serialization_cache_misses`.
+
     """
 
     # TODO: Needs to handle agent close() call
@@ -223,6 +438,10 @@ def __init__(
         tracer_provider: TracerProvider | None = None,
         extra_grpc_config: ChannelArgumentType | None = None,
         payload_serialization_format: str = JSON_DATA_CONTENT_TYPE,
+        message_batching: bool = True,
+        message_trace_sample_rate: float = 0.0,
+        direct_rpc_address: str | None = None,
+        max_cached_messages: int = 0,
     ) -> None:
         self._host_address = host_address
         self._trace_helper = TraceHelper(
@@ -236,6 +455,9 @@ def __init__(
             Callable[[], Agent | Awaitable[Agent]]
             | Callable[[AgentRuntime, AgentId], Agent | Awaitable[Agent]],
         ] = {}
+        # Number of parameters each registered agent factory takes, inspected once at
+        # registration.
+        self._agent_factory_arities: Dict[str, int] = {}
         self._instantiated_agents: Dict[AgentId, Agent] = {}
         self._known_namespaces: set[str] = set()
         self._read_task: None | Task[None] = None
@@ -246,11 +468,45 @@ def __init__(
         self._host_connection: HostConnection | None = None
         self._background_tasks: Set[Task[Any]] = set()
         self._subscription_manager = SubscriptionManager()
-        self._serialization_registry = SerializationRegistry()
+        self._serialization_registry = SerializationRegistry(
+            max_cached_messages=max_cached_messages
+        )
         self._extra_grpc_config = extra_grpc_config or []
+        self._message_batching = message_batching
+        if not 0.0 <= message_trace_sample_rate <= 1.0:
+            raise ValueError("message_trace_sample_rate must be between 0 and 1.")
+        self._message_trace_sample_rate = message_trace_sample_rate
+        self._direct_rpc_address = direct_rpc_address
+        self._peer_server = (
+            grpc.aio.server(options=self._extra_grpc_config)
+            if direct_rpc_address is not None
+            else None
+        )
+        if self._peer_server is not None:
+            agent_worker_pb2_grpc.add_AgentRpcServicer_to_server(
+                _PeerRpcServicer(
+                    self._handle_peer_request,
+                    message_batching=message_batching,
+                    max_batch_bytes=batch_bytes_limit(self._extra_grpc_config),
+                ),
+                self._peer_server,
+            )
+            self._peer_server.add_insecure_port(direct_rpc_address)
+        self._peer_connections: Dict[str, HostConnection] = {}
+        self._peer_read_tasks: Dict[str, Task[None]] = {}
+        # The requests sent directly to other runtimes, with the address each was sent to.
+        self._peer_requests: Dict[str, Tuple[str, agent_worker_pb2.Message]] = {}
+        # The addresses of the runtimes that agents are placed on, or None for runtimes
+        # that do not accept direct requests.
+        self._agent_peer_addresses: Dict[AgentId, str | None] = {}
+        self._placement_lookups: Dict[AgentId, Task[str | None]] = {}
+        # Counts the placement changes of each agent type, to discard lookups that overlap one.
+        self._placement_epochs: DefaultDict[str, int] = defaultdict(int)
+        self._placement_lookup_timeout = _PLACEMENT_LOOKUP_TIMEOUT
 
         if payload_serialization_format not in {
             JSON_DATA_CONTENT_TYPE,
+            MSGPACK_DATA_CONTENT_TYPE,
             PROTOBUF_DATA_CONTENT_TYPE,
         }:
             raise ValueError(
@@ -263,9 +519,19 @@ def start(self) -> None:
         """Start the runtime in a background task."""
         if self._running:
             raise ValueError("Runtime is already running.")
+        if self._peer_server is not None:
+            task = asyncio.create_task(self._peer_server.start())
+            self._background_tasks.add(task)
+            task.add_done_callback(self._raise_on_exception)
+            task.add_done_callback(self._background_tasks.discard)
+            logger.info(f"Accepting direct RPCs at {self._direct_rpc_address}")
         logger.info(f"Connecting to host: {self._host_address}")
         self._host_connection = HostConnection.from_host_address(
-            self._host_address, extra_grpc_config=self._extra_grpc_config
+            self._host_address,
+            extra_grpc_config=self._extra_grpc_config,
+            message_batching=self._message_batching,
+            message_trace_sample_rate=self._message_trace_sample_rate,
+            peer_address=self._direct_rpc_address,
         )
         logger.info("Connection established")
         if self._read_task is None:
@@ -285,7 +551,13 @@ async def _run_read_loop(self) -> None:
                 message = await self._host_connection.recv()  # type: ignore
                 oneofcase = agent_worker_pb2.Message.WhichOneof(message, "message")
                 match oneofcase:
-                    case "registerAgentTypeRequest" | "addSubscriptionRequest":
+                    case (
+                        "registerAgentTypeRequest"
+                        | "addSubscriptionRequest"
+                        | "drainRequest"
+                        | "placementRequest"
+                        | "batch"
+                    ):
                         logger.warning(f"Cant handle {oneofcase}, skipping.")
                     case "request":
                         task = asyncio.create_task(
@@ -326,6 +598,27 @@ async def _run_read_loop(self) -> None:
                         self._background_tasks.add(task)
                         task.add_done_callback(self._raise_on_exception)
                         task.add_done_callback(self._background_tasks.discard)
+                    case "drainResponse":
+                        task = asyncio.create_task(
+                            self._process_drain_response(message.drainResponse)
+                        )
+                        self._background_tasks.add(task)
+                        task.add_done_callback(self._raise_on_exception)
+                        task.add_done_callback(self._background_tasks.discard)
+                    case "placementResponse":
+                        task = asyncio.create_task(
+                            self._process_placement_response(message.placementResponse)
+                        )
+                        self._background_tasks.add(task)
+                        task.add_done_callback(self._raise_on_exception)
+                        task.add_done_callback(self._background_tasks.discard)
+                    case "placementChanged":
+                        task = asyncio.create_task(
+                            self._process_placement_changed(message.placementChanged)
+                        )
+                        self._background_tasks.add(task)
+                        task.add_done_callback(self._raise_on_exception)
+                        task.add_done_callback(self._background_tasks.discard)
                     case None:
                         logger.warning("No message")
             except Exception as e:
@@ -343,6 +636,15 @@ async def stop(self) -> None:
         for task_result in final_tasks_results:
             if isinstance(task_result, Exception):
                 logger.error("Error in background task", exc_info=task_result)
+        # Close the direct channels to other runtimes, and stop accepting direct requests.
+        for peer_connection in list(self._peer_connections.values()):
+            try:
+                await peer_connection.close()
+            except (asyncio.CancelledError, grpc.aio.AioRpcError):
+                pass
+        await asyncio.gather(*self._peer_read_tasks.values(), return_exceptions=True)
+        if self._peer_server is not None:
+            await self._peer_server.stop(grace=None)
         # Close the host connection.
         if self._host_connection is not None:
             try:
@@ -357,6 +659,218 @@ async def stop(self) -> None:
             except asyncio.CancelledError:
                 pass
 
+    async def drain(self) -> None:
+        """Ask the host to stop placing agents on this runtime, and wait until the requests it
+        already delivered to this runtime are handled.
+
+        The agents of types shared with other workers are placed on those workers from now on.
+        Call :meth:`stop` after draining to disconnect from the host."""
+        if self._host_connection is None:
+            raise RuntimeError("Host connection is not set.")
+        future = asyncio.get_event_loop().create_future()
+        request_id = await self._get_new_request_id()
+        self._pending_requests[request_id] = future
+        await self._host_connection.send(
+            agent_worker_pb2.Message(
+                drainRequest=agent_worker_pb2.DrainRequest(request_id=request_id)
+            )
+        )
+        await future
+
+    async def _process_drain_response(
+        self, response: agent_worker_pb2.DrainResponse
+    ) -> None:
+        future = self._pending_requests.pop(response.request_id)
+        if response.HasField("error") and response.error != "":
+            future.set_exception(RuntimeError(response.error))
+        else:
+            future.set_result(None)
+
+    async def _process_placement_response(
+        self, response: agent_worker_pb2.PlacementResponse
+    ) -> None:
+        future = self._pending_requests.pop(response.request_id, None)
+        if future is None:
+            # The lookup timed out and the request was sent through the host.
+            return
+        future.set_result(response)
+
+    async def _process_placement_changed(
+        self, placement_changed: agent_worker_pb2.PlacementChanged
+    ) -> None:
+        agent_type = placement_changed.agent_type
+        self._placement_epochs[agent_type] += 1
+        for agent_id in [
+            agent_id
+            for agent_id in self._agent_peer_addresses
+            if agent_id.type == agent_type
+        ]:
+            del self._agent_peer_addresses[agent_id]
+
+    async def _get_peer_address(self, agent_id: AgentId) -> str | None:
+        """Return the address to send direct requests to the agent to, or None to send
+        them through the host."""
+        if agent_id in self._agent_peer_addresses:
+            return self._agent_peer_addresses[agent_id]
+        # Concurrent requests to the same agent share one lookup.
+        lookup = self._placement_lookups.get(agent_id)
+        if lookup is None:
+            lookup = asyncio.create_task(self._look_up_placement(agent_id))
+            self._placement_lookups[agent_id] = lookup
+            lookup.add_done_callback(
+                lambda _: self._placement_lookups.pop(agent_id, None)
+            )
+        return await asyncio.shield(lookup)
+
+    async def _look_up_placement(self, agent_id: AgentId) -> str | None:
+        assert self._host_connection is not None
+        epoch = self._placement_epochs[agent_id.type]
+        future: Future[agent_worker_pb2.PlacementResponse] = (
+            asyncio.get_event_loop().create_future()
+        )
+        request_id = await self._get_new_request_id()
+        self._pending_requests[request_id] = future
+        await self._host_connection.send(
+            agent_worker_pb2.Message(
+                placementRequest=agent_worker_pb2.PlacementRequest(
+                    request_id=request_id,
+                    agent_id=agent_worker_pb2.AgentId(
+                        type=agent_id.type, key=agent_id.key
+                    ),
+                )
+            )
+        )
+        try:
+            response = await asyncio.wait_for(future, self._placement_lookup_timeout)
+        except asyncio.TimeoutError:
+            # Do not cache the placement, so the next request looks it up again.
+            self._pending_requests.pop(request_id, None)
+            logger.warning(
+                f"Placement lookup of {agent_id} timed out, sending through the host"
+            )
+            return None
+        if not response.success:
+            # The host reports the error in response to the request.
+            return None
+        address = response.peer_address if response.HasField("peer_address") else None
+        if self._placement_epochs[agent_id.type] == epoch:
+            self._agent_peer_addresses[agent_id] = address
+        return address
+
+    def _get_peer_connection(self, address: str) -> HostConnection:
+        connection = self._peer_connections.get(address)
+        if connection is None:
+            connection = HostConnection.from_host_address(
+                address,
+                extra_grpc_config=self._extra_grpc_config,
+                message_batching=self._message_batching,
+                message_trace_sample_rate=self._message_trace_sample_rate,
+            )
+            read_task = asyncio.create_task(
+                self._run_peer_read_loop(address, connection)
+            )
+            connection.add_close_callback(read_task.cancel)
+            self._peer_connections[address] = connection
+            self._peer_read_tasks[address] = read_task
+        return connection
+
+    async def _send_to_peer(
+        self, address: str, runtime_message: agent_worker_pb2.Message
+    ) -> None:
+        connection = self._get_peer_connection(address)
+        self._peer_requests[runtime_message.request.request_id] = (
+            address,
+            runtime_message,
+        )
+        await connection.send(runtime_message)
+
+    async def _send_to_self(self, runtime_message: agent_worker_pb2.Message) -> None:
+        async def reply(response_message: agent_worker_pb2.Message) -> None:
+            await self._process_response(response_message.response)
+
+        self._handle_peer_request(runtime_message.request, reply)
+
+    def _handle_peer_request(
+        self,
+        request: agent_worker_pb2.RpcRequest,
+        reply: Callable[[agent_worker_pb2.Message], Awaitable[None]],
+    ) -> None:
+        task = asyncio.create_task(self._process_request(request, reply))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._raise_on_exception)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _run_peer_read_loop(
+        self, address: str, connection: HostConnection
+    ) -> None:
+        try:
+            while True:
+                self._process_peer_message(address, await connection.recv())
+        finally:
+            # Handle the responses received before the channel closed.
+            while (message := connection.recv_nowait()) is not None:
+                self._process_peer_message(address, message)
+            if self._peer_connections.get(address) is connection:
+                del self._peer_connections[address]
+                del self._peer_read_tasks[address]
+            for agent_id in [
+                agent_id
+                for agent_id, agent_address in self._agent_peer_addresses.items()
+                if agent_address == address
+            ]:
+                if connection.connected:
+                    del self._agent_peer_addresses[agent_id]
+                else:
+                    # Send requests to agents of an unreachable runtime through the host
+                    # until their placement changes.
+                    self._agent_peer_addresses[agent_id] = None
+            pending = [
+                (request_id, runtime_message)
+                for request_id, (
+                    request_address,
+                    runtime_message,
+                ) in self._peer_requests.items()
+                if request_address == address
+            ]
+            for request_id, _ in pending:
+                del self._peer_requests[request_id]
+            if connection.connected or not self._running:
+                # The recipient may have handled the requests, so they are not sent again.
+                for request_id, _ in pending:
+                    future = self._pending_requests.pop(request_id, None)
+                    if future is not None and not future.done():
+                        future.set_exception(
+                            RuntimeError(
+                                f"The channel to {address} closed before the response was received."
+                            )
+                        )
+            else:
+                # The channel never opened, so the requests are sent through the host instead.
+                for _, runtime_message in pending:
+                    task = asyncio.create_task(
+                        self._host_connection.send(runtime_message)  # type: ignore
+                    )
+                    self._background_tasks.add(task)
+                    task.add_done_callback(self._raise_on_exception)
+                    task.add_done_callback(self._background_tasks.discard)
+
+    def _process_peer_message(
+        self, address: str, message: agent_worker_pb2.Message
+    ) -> None:
+        oneofcase = message.WhichOneof("message")
+        if oneofcase != "response":
+            logger.warning(f"Received unexpected message type from peer: {oneofcase}")
+            return
+        if self._peer_requests.pop(message.response.request_id, None) is None:
+            logger.warning(
+                f"Received a response to an unknown request from {address}, skipping."
+            )
+            return
+        task = asyncio.create_task(self._process_response(message.response))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._raise_on_exception)
+        task.add_done_callback(self._background_tasks.discard)
+
     async def stop_when_signal(
         self, signals: Sequence[signal.Signals] = (signal.SIGTERM, signal.SIGINT)
     ) -> None:
@@ -377,6 +891,16 @@ def signal_handler() -> None:
         # Stop the runtime.
         await self.stop()
 
+    @property
+    def serialization_cache_hits(self) -> int:
+        """Number of message serializations answered with a payload serialized before."""
+        return self._serialization_registry.cache_hits
+
+    @property
+    def serialization_cache_misses(self) -> int:
+        """Number of message serializations that had to encode the message."""
+        return self._serialization_registry.cache_misses
+
     @property
     def _known_agent_names(self) -> Set[str]:
         return set(self._agent_factories.keys())
@@ -387,13 +911,14 @@ async def _send_message(
         send_type: Literal["send", "publish"],
         recipient: AgentId | TopicId,
         telemetry_metadata: Mapping[str, str],
+        send: Callable[[agent_worker_pb2.Message], Awaitable[None]] | None = None,
     ) -> None:
         if self._host_connection is None:
             raise RuntimeError("Host connection is not set.")
         with self._trace_helper.trace_block(
             send_type, recipient, parent=telemetry_metadata
         ):
-            await self._host_connection.send(runtime_message)
+            await (send or self._host_connection.send)(runtime_message)
 
     async def send_message(
         self,
@@ -444,10 +969,18 @@ async def send_message(
                 )
             )
 
+            send: Callable[[agent_worker_pb2.Message], Awaitable[None]] | None = None
+            if self._direct_rpc_address is not None:
+                address = await self._get_peer_address(recipient)
+                if address == self._direct_rpc_address:
+                    send = self._send_to_self
+                elif address is not None:
+                    send = functools.partial(self._send_to_peer, address)
+
             # TODO: Find a way to handle timeouts/errors
             task = asyncio.create_task(
                 self._send_message(
-                    runtime_message, "send", recipient, telemetry_metadata
+                    runtime_message, "send", recipient, telemetry_metadata, send
                 )
             )
             self._background_tasks.add(task)
@@ -478,12 +1011,6 @@ async def publish_message(
             parent=None,
             extraAttributes={"message_type": message_type},
         ):
-            serialized_message = self._serialization_registry.serialize(
-                message,
-                type_name=message_type,
-                data_content_type=self._payload_serialization_format,
-            )
-
             sender_id = sender or AgentId("unknown", "unknown")
             attributes = {
                 _constants.DATA_CONTENT_TYPE_ATTR: cloudevent_pb2.CloudEvent.CloudEventAttributeValue(
@@ -503,11 +1030,19 @@ async def publish_message(
                 ),
             }
 
-            # If sending JSON we fill text_data with the serialized message
+            # If sending JSON or MessagePack we fill binary_data with the serialized message
             # If sending Protobuf we fill proto_data with the serialized message
             # TODO: add an encoding field for serializer
 
-            if self._payload_serialization_format == JSON_DATA_CONTENT_TYPE:
+            if self._payload_serialization_format in (
+                JSON_DATA_CONTENT_TYPE,
+                MSGPACK_DATA_CONTENT_TYPE,
+            ):
+                serialized_message = self._serialization_registry.serialize(
+                    message,
+                    type_name=message_type,
+                    data_content_type=self._payload_serialization_format,
+                )
                 runtime_message = agent_worker_pb2.Message(
                     cloudEvent=cloudevent_pb2.CloudEvent(
                         id=message_id,
@@ -520,10 +1055,9 @@ async def publish_message(
                     )
                 )
             else:
-                # We need to unpack the serialized proto back into an Any
-                # TODO: find a way to prevent the roundtrip serialization
-                any_proto = any_pb2.Any()
-                any_proto.ParseFromString(serialized_message)
+                any_proto = self._serialization_registry.serialize_to_any(
+                    message, type_name=message_type
+                )
                 runtime_message = agent_worker_pb2.Message(
                     cloudEvent=cloudevent_pb2.CloudEvent(
                         id=message_id,
@@ -565,8 +1099,14 @@ async def _get_new_request_id(self) -> str:
             self._next_request_id += 1
             return str(self._next_request_id)
 
-    async def _process_request(self, request: agent_worker_pb2.RpcRequest) -> None:
+    async def _process_request(
+        self,
+        request: agent_worker_pb2.RpcRequest,
+        reply: Callable[[agent_worker_pb2.Message], Awaitable[None]] | None = None,
+    ) -> None:
         assert self._host_connection is not None
+        # Responses go back the way the request came, through the host unless given a reply.
+        send = reply or self._host_connection.send
         recipient = AgentId(request.target.type, request.target.key)
         sender: AgentId | None = None
         if request.HasField("source"):
@@ -612,7 +1152,7 @@ async def _process_request(self, request: agent_worker_pb2.RpcRequest) -> None:
                 ),
             )
             # Send the error response.
-            await self._host_connection.send(response_message)
+            await send(response_message)
             return
 
         # Serialize the result.
@@ -635,7 +1175,7 @@ async def _process_request(self, request: agent_worker_pb2.RpcRequest) -> None:
         )
 
         # Send the response.
-        await self._host_connection.send(response_message)
+        await send(response_message)
 
     async def _process_response(self, response: agent_worker_pb2.RpcResponse) -> None:
         with self._trace_helper.trace_block(
@@ -674,25 +1214,30 @@ async def _process_event(self, event: cloudevent_pb2.CloudEvent) -> None:
         recipients = await self._subscription_manager.get_subscribed_recipients(
             topic_id
         )
+        if _constants.AGENT_RECIPIENTS_ATTR in event_attributes:
+            # The host placed only some of the recipients on this runtime.
+            placed = {
+                AgentId(type, key)
+                for type, key in json.loads(
+                    event_attributes[_constants.AGENT_RECIPIENTS_ATTR].ce_string
+                )
+            }
+            recipients = [agent_id for agent_id in recipients if agent_id in placed]
 
         message_content_type = event_attributes[
             _constants.DATA_CONTENT_TYPE_ATTR
         ].ce_string
         message_type = event_attributes[_constants.DATA_SCHEMA_ATTR].ce_string
 
-        if message_content_type == JSON_DATA_CONTENT_TYPE:
+        if message_content_type in (JSON_DATA_CONTENT_TYPE, MSGPACK_DATA_CONTENT_TYPE):
             message = self._serialization_registry.deserialize(
                 event.binary_data,
                 type_name=message_type,
                 data_content_type=message_content_type,
             )
         elif message_content_type == PROTOBUF_DATA_CONTENT_TYPE:
-            # TODO: find a way to prevent the roundtrip serialization
-            proto_binary_data = event.proto_data.SerializeToString()
-            message = self._serialization_registry.deserialize(
-                proto_binary_data,
-                type_name=message_type,
-                data_content_type=message_content_type,
+            message = self._serialization_registry.deserialize_from_any(
+                event.proto_data, type_name=message_type
             )
         else:
             raise ValueError(
@@ -715,6 +1260,9 @@ async def _process_event(self, event: cloudevent_pb2.CloudEvent) -> None:
                 stacklevel=2,
             )
 
+        # Like the message, the trace parent is decoded once and shared by all recipients.
+        parent_attributes = _stringify_attributes(event.attributes)
+
         # Send the message to each recipient.
         responses: List[Awaitable[Any]] = []
         for agent_id in recipients:
@@ -730,42 +1278,13 @@ async def _process_event(self, event: cloudevent_pb2.CloudEvent) -> None:
             agent = await self._get_agent(agent_id)
             with MessageHandlerContext.populate_context(agent.id):
 
-                def stringify_attributes(
-                    attributes: Mapping[
-                        str, cloudevent_pb2.CloudEvent.CloudEventAttributeValue
-                    ],
-                ) -> Mapping[str, str]:
-                    result: Dict[str, str] = {}
-                    for key, value in attributes.items():
-                        item = None
-                        match value.WhichOneof("attr"):
-                            case "ce_boolean":
-                                item = str(value.ce_boolean)
-                            case "ce_integer":
-                                item = str(value.ce_integer)
-                            case "ce_string":
-                                item = value.ce_string
-                            case "ce_bytes":
-                                item = str(value.ce_bytes)
-                            case "ce_uri":
-                                item = value.ce_uri
-                            case "ce_uri_ref":
-                                item = value.ce_uri_ref
-                            case "ce_timestamp":
-                                item = str(value.ce_timestamp)
-                            case _:
-                                raise ValueError("Unknown attribute kind")
-                        result[key] = item
-
-                    return result
-
                 async def send_message(
                     agent: Agent, message_context: MessageContext
                 ) -> Any:
                     with self._trace_helper.trace_block(
                         "process",
                         agent.id,
-                        parent=stringify_attributes(event.attributes),
+                        parent=parent_attributes,
                         extraAttributes={"message_type": message_type},
                     ):
                         await agent.on_message(message, ctx=message_context)
@@ -793,8 +1312,9 @@ async def register_factory(
         if self._host_connection is None:
             raise RuntimeError("Host connection is not set.")
 
-        async def factory_wrapper() -> T:
-            maybe_agent_instance = agent_factory()
+        # The wrapper passes on the arguments of the factory, whose arity is recorded below.
+        async def factory_wrapper(*args: Any) -> T:
+            maybe_agent_instance = agent_factory(*args)
             if inspect.isawaitable(maybe_agent_instance):
                 agent_instance = await maybe_agent_instance
             else:
@@ -806,6 +1326,9 @@ async def factory_wrapper() -> T:
             return agent_instance
 
         self._agent_factories[type.type] = factory_wrapper
+        self._agent_factory_arities[type.type] = len(
+            inspect.signature(agent_factory).parameters
+        )
 
         # Create a future for the registration response.
         future = asyncio.get_event_loop().create_future()
@@ -843,10 +1366,13 @@ async def _invoke_agent_factory(
         agent_id: AgentId,
     ) -> T:
         with AgentInstantiationContext.populate_context((self, agent_id)):
-            if len(inspect.signature(agent_factory).parameters) == 0:
+            arity = self._agent_factory_arities.get(agent_id.type)
+            if arity is None:
+                arity = len(inspect.signature(agent_factory).parameters)
+            if arity == 0:
                 factory_one = cast(Callable[[], T], agent_factory)
                 agent = factory_one()
-            elif len(inspect.signature(agent_factory).parameters) == 2:
+            elif arity == 2:
                 warnings.warn(
                     "Agent factories that take two arguments are deprecated. Use AgentInstantiationContext instead. Two arg factories will be removed in a future version.",
                     stacklevel=2,
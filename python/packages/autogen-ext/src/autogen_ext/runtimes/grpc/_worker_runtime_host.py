@@ -4,6 +4,7 @@
 from typing import Optional, Sequence
 
 from ._constants import GRPC_IMPORT_ERROR_STR
+from ._message_batching import batch_bytes_limit
 from ._type_helpers import ChannelArgumentType
 from ._worker_runtime_host_servicer import GrpcWorkerAgentRuntimeHostServicer
 
@@ -17,11 +18,44 @@
 
 
 class GrpcWorkerAgentRuntimeHost:
+    """A host runtime that delivers messages between the agents of connected worker runtimes.
+
+    Worker runtimes started with a `direct_rpc_address` look up where agents are placed on the host
+    and send RPC requests to each other directly; the host tells them when the placements change.
+
+    Args:
+        address (str): The address the host listens on.
+        extra_grpc_config (ChannelArgumentType, optional): Extra options for the gRPC server.
+        allow_shared_agent_types (bool): Whether several workers may register the same agent type,
+            to spread its agents over the workers. An agent is placed on a worker by consistent
+            hashing of its key, so it stays on that worker until a worker of its type joins or
+            leaves. Agent state is not moved when an agent is placed on another worker.
+            Defaults to False.
+        message_batching (bool): Whether to send the messages queued for a worker together, up to
+            256 per frame, if the worker supports it. Frames hold up to 1 MiB of messages, or less
+            if `grpc.max_send_message_length` or `grpc.max_receive_message_length` in
+            `extra_grpc_config` is smaller. Defaults to True.
+        message_trace_sample_rate (float): The fraction of messages to log in full, with their payloads,
+            to the :data:`~autogen_core.TRACE_LOGGER_NAME` logger at debug level. Other messages are
+            logged at debug level without payloads. Defaults to 0.
+    """
+
     def __init__(
-        self, address: str, extra_grpc_config: Optional[ChannelArgumentType] = None
+        self,
+        address: str,
+        extra_grpc_config: Optional[ChannelArgumentType] = None,
+        *,
+        allow_shared_agent_types: bool = False,
+        message_batching: bool = True,
+        message_trace_sample_rate: float = 0.0,
     ) -> None:
         self._server = grpc.aio.server(options=extra_grpc_config)
-        self._servicer = GrpcWorkerAgentRuntimeHostServicer()
+        self._servicer = GrpcWorkerAgentRuntimeHostServicer(
+            allow_shared_agent_types=allow_shared_agent_types,
+            message_batching=message_batching,
+            max_batch_bytes=batch_bytes_limit(extra_grpc_config),
+            message_trace_sample_rate=message_trace_sample_rate,
+        )
         agent_worker_pb2_grpc.add_AgentRpcServicer_to_server(
             self._servicer, self._server
         )
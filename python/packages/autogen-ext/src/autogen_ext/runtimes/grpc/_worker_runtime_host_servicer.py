@@ -1,13 +1,24 @@
 import asyncio
+import json
 import logging
 from _collections_abc import AsyncIterator, Iterator
 from asyncio import Future, Task
-from typing import Any, Dict, Set, cast
+from typing import Any, Dict, List, Set, Tuple, cast
 
-from autogen_core import Subscription, TopicId, TypePrefixSubscription, TypeSubscription
+from autogen_core import (
+    AgentId,
+    Subscription,
+    TopicId,
+    TypePrefixSubscription,
+    TypeSubscription,
+)
 from autogen_core._runtime_impl_helpers import SubscriptionManager
 
+from . import _constants
+from ._agent_placement import ConsistentHashRing
 from ._constants import GRPC_IMPORT_ERROR_STR
+from ._message_batching import DEFAULT_MAX_BATCH_BYTES, MessageBatcher, unbatch
+from ._message_logging import ChannelMessageLog, MessageTraceSampler
 
 try:
     import grpc
@@ -21,18 +32,52 @@
 
 
 class GrpcWorkerAgentRuntimeHostServicer(agent_worker_pb2_grpc.AgentRpcServicer):
-    """A gRPC servicer that hosts message delivery service for agents."""
+    """A gRPC servicer that hosts message delivery service for agents.
 
-    def __init__(self) -> None:
+    Args:
+        allow_shared_agent_types (bool): Whether several clients may register the same agent type.
+            The agents of a shared type are placed on its clients by consistent hashing of their
+            keys. Defaults to False, which rejects a second registration of an agent type.
+        message_batching (bool): Whether to send clients that support it several messages per frame.
+            Defaults to True.
+        max_batch_bytes (int): The most bytes of messages in a frame. It must leave room for the
+            frame envelope within the message length limits of the server. Defaults to 1 MiB.
+        message_trace_sample_rate (float): The fraction of messages to log in full, with their payloads,
+            to the :data:`~autogen_core.TRACE_LOGGER_NAME` logger at debug level. Defaults to 0.
+    """
+
+    def __init__(
+        self,
+        *,
+        allow_shared_agent_types: bool = False,
+        message_batching: bool = True,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        message_trace_sample_rate: float = 0.0,
+    ) -> None:
         self._client_id = 0
         self._client_id_lock = asyncio.Lock()
         self._send_queues: Dict[int, asyncio.Queue[agent_worker_pb2.Message]] = {}
-        self._agent_type_to_client_id_lock = asyncio.Lock()
-        self._agent_type_to_client_id: Dict[str, int] = {}
+        self._allow_shared_agent_types = allow_shared_agent_types
+        self._message_batching = message_batching
+        self._max_batch_bytes = max_batch_bytes
+        self._trace_sampler = MessageTraceSampler(message_trace_sample_rate)
+        self._agent_type_placements_lock = asyncio.Lock()
+        # The clients of each agent type. Agents are placed on a client by their key.
+        self._agent_type_placements: Dict[str, ConsistentHashRing] = {}
+        # Clients that are draining and no longer receive new agents.
+        self._draining_client_ids: Set[int] = set()
         self._pending_responses: Dict[int, Dict[str, Future[Any]]] = {}
         self._background_tasks: Set[Task[Any]] = set()
         self._subscription_manager = SubscriptionManager()
         self._client_id_to_subscription_id_mapping: Dict[int, set[str]] = {}
+        # Clients that added each subscription, and subscriptions by kind, topic and agent type,
+        # so that clients sharing an agent type can add the same subscription.
+        self._subscription_id_to_client_ids: Dict[str, Set[int]] = {}
+        self._subscription_ids: Dict[Tuple[str, str, str], str] = {}
+        # The addresses that clients accept direct RPCs from other clients on.
+        self._client_peer_addresses: Dict[int, str] = {}
+        # Clients that looked up the placement of agents of each type.
+        self._placement_watchers: Dict[str, Set[int]] = {}
 
     async def OpenChannel(  # type: ignore
         self,
@@ -51,6 +96,21 @@ async def OpenChannel(  # type: ignore
         self._send_queues[client_id] = send_queue
         logger.info(f"Client {client_id} connected.")
 
+        # Send batch frames to clients that can read them, and tell them the host can too.
+        batcher = MessageBatcher(send_queue, max_bytes=self._max_batch_bytes)
+        if self._message_batching and any(
+            key == _constants.MESSAGE_BATCH_METADATA_KEY
+            for key, _ in context.invocation_metadata() or ()
+        ):
+            batcher.enabled = True
+            await context.send_initial_metadata(
+                ((_constants.MESSAGE_BATCH_METADATA_KEY, "1"),)
+            )
+        # Clients that accept direct RPCs announce their address for other clients to connect to.
+        for key, value in context.invocation_metadata() or ():
+            if key == _constants.PEER_ADDRESS_METADATA_KEY:
+                self._client_peer_addresses[client_id] = value
+
         try:
             # Concurrently handle receiving messages from the client and sending messages to the client.
             # This task will receive messages from the client.
@@ -59,8 +119,7 @@ async def OpenChannel(  # type: ignore
             )
 
             # Return an async generator that will yield messages from the send queue to the client.
-            while True:
-                message = await send_queue.get()
+            async for message in batcher:
                 # Yield the message to the client.
                 try:
                     yield message
@@ -70,7 +129,13 @@ async def OpenChannel(  # type: ignore
                         exc_info=True,
                     )
                     break
-                logger.info(f"Sent message to client {client_id}: {message}")
+                # The message is only described if debug logging is enabled.
+                logger.debug(
+                    "Sent message to client %s: %s",
+                    client_id,
+                    ChannelMessageLog("send", message, client_id=client_id),
+                )
+                self._trace_sampler.trace("send", message, client_id=client_id)
             # Wait for the receiving task to finish.
             await receiving_task
 
@@ -84,26 +149,68 @@ async def OpenChannel(  # type: ignore
             await self._on_client_disconnect(client_id)
 
     async def _on_client_disconnect(self, client_id: int) -> None:
-        async with self._agent_type_to_client_id_lock:
-            agent_types = [
-                agent_type
-                for agent_type, id_ in self._agent_type_to_client_id.items()
-                if id_ == client_id
-            ]
-            for agent_type in agent_types:
-                logger.info(
-                    f"Removing agent type {agent_type} from agent type to client id mapping"
-                )
-                del self._agent_type_to_client_id[agent_type]
-            for sub_id in self._client_id_to_subscription_id_mapping.get(
+        async with self._agent_type_placements_lock:
+            self._remove_client_placements(client_id)
+            self._draining_client_ids.discard(client_id)
+            self._client_peer_addresses.pop(client_id, None)
+            for watchers in self._placement_watchers.values():
+                watchers.discard(client_id)
+            for sub_id in self._client_id_to_subscription_id_mapping.pop(
                 client_id, set()
             ):
+                client_ids = self._subscription_id_to_client_ids.get(sub_id, set())
+                client_ids.discard(client_id)
+                if client_ids:
+                    # Other clients of the agent type still use the subscription.
+                    continue
                 logger.info(
-                    f"Client id {client_id} disconnected. Removing corresponding subscription with id {id}"
+                    f"Client id {client_id} disconnected. Removing corresponding subscription with id {sub_id}"
                 )
+                self._subscription_id_to_client_ids.pop(sub_id, None)
+                self._subscription_ids = {
+                    key: id_
+                    for key, id_ in self._subscription_ids.items()
+                    if id_ != sub_id
+                }
                 await self._subscription_manager.remove_subscription(sub_id)
         logger.info(f"Client {client_id} disconnected successfully")
 
+    def _remove_client_placements(self, client_id: int) -> None:
+        """Stop placing agents on a client. Its agents are placed on the other clients of their type."""
+        for agent_type, placement in list(self._agent_type_placements.items()):
+            if client_id not in placement:
+                continue
+            placement.remove(client_id)
+            if len(placement) == 0:
+                logger.info(
+                    f"Removing agent type {agent_type} from agent type to client id mapping"
+                )
+                del self._agent_type_placements[agent_type]
+            else:
+                logger.info(
+                    f"Rebalancing agent type {agent_type} from client {client_id} onto {len(placement)} clients"
+                )
+            self._notify_placement_changed(agent_type)
+
+    def _notify_placement_changed(self, agent_type: str) -> None:
+        # Clients that looked up agents of the type forget their placements and look them up again.
+        for client_id in self._placement_watchers.pop(agent_type, set()):
+            send_queue = self._send_queues.get(client_id)
+            if send_queue is not None:
+                send_queue.put_nowait(
+                    agent_worker_pb2.Message(
+                        placementChanged=agent_worker_pb2.PlacementChanged(
+                            agent_type=agent_type
+                        )
+                    )
+                )
+
+    def _get_client_id(self, agent_id: AgentId) -> int | None:
+        placement = self._agent_type_placements.get(agent_id.type)
+        if placement is None:
+            return None
+        return placement.get(agent_id.key)
+
     def _raise_on_exception(self, task: Task[Any]) -> None:
         exception = task.exception()
         if exception is not None:
@@ -113,68 +220,105 @@ async def _receive_messages(
         self, client_id: int, request_iterator: AsyncIterator[agent_worker_pb2.Message]
     ) -> None:
         # Receive messages from the client and process them.
-        async for message in request_iterator:
-            logger.info(f"Received message from client {client_id}: {message}")
-            oneofcase = message.WhichOneof("message")
-            match oneofcase:
-                case "request":
-                    request: agent_worker_pb2.RpcRequest = message.request
-                    task = asyncio.create_task(
-                        self._process_request(request, client_id)
-                    )
-                    self._background_tasks.add(task)
-                    task.add_done_callback(self._raise_on_exception)
-                    task.add_done_callback(self._background_tasks.discard)
-                case "response":
-                    response: agent_worker_pb2.RpcResponse = message.response
-                    task = asyncio.create_task(
-                        self._process_response(response, client_id)
-                    )
-                    self._background_tasks.add(task)
-                    task.add_done_callback(self._raise_on_exception)
-                    task.add_done_callback(self._background_tasks.discard)
-                case "cloudEvent":
-                    # The proto typing doesnt resolve this one
-                    event = cast(cloudevent_pb2.CloudEvent, message.cloudEvent)  # type: ignore
-                    task = asyncio.create_task(self._process_event(event))
-                    self._background_tasks.add(task)
-                    task.add_done_callback(self._raise_on_exception)
-                    task.add_done_callback(self._background_tasks.discard)
-                case "registerAgentTypeRequest":
-                    register_agent_type: agent_worker_pb2.RegisterAgentTypeRequest = (
-                        message.registerAgentTypeRequest
-                    )
-                    task = asyncio.create_task(
-                        self._process_register_agent_type_request(
-                            register_agent_type, client_id
+        async for frame in request_iterator:
+            for message in unbatch(frame):
+                logger.debug(
+                    "Received message from client %s: %s",
+                    client_id,
+                    ChannelMessageLog("receive", message, client_id=client_id),
+                )
+                self._trace_sampler.trace("receive", message, client_id=client_id)
+                oneofcase = message.WhichOneof("message")
+                match oneofcase:
+                    case "request":
+                        request: agent_worker_pb2.RpcRequest = message.request
+                        task = asyncio.create_task(
+                            self._process_request(request, client_id)
                         )
-                    )
-                    self._background_tasks.add(task)
-                    task.add_done_callback(self._raise_on_exception)
-                    task.add_done_callback(self._background_tasks.discard)
-                case "addSubscriptionRequest":
-                    add_subscription: agent_worker_pb2.AddSubscriptionRequest = (
-                        message.addSubscriptionRequest
-                    )
-                    task = asyncio.create_task(
-                        self._process_add_subscription_request(
-                            add_subscription, client_id
+                        self._background_tasks.add(task)
+                        task.add_done_callback(self._raise_on_exception)
+                        task.add_done_callback(self._background_tasks.discard)
+                    case "response":
+                        response: agent_worker_pb2.RpcResponse = message.response
+                        task = asyncio.create_task(
+                            self._process_response(response, client_id)
                         )
-                    )
-                    self._background_tasks.add(task)
-                    task.add_done_callback(self._raise_on_exception)
-                    task.add_done_callback(self._background_tasks.discard)
-                case "registerAgentTypeResponse" | "addSubscriptionResponse":
-                    logger.warning(f"Received unexpected message type: {oneofcase}")
-                case None:
-                    logger.warning("Received empty message")
+                        self._background_tasks.add(task)
+                        task.add_done_callback(self._raise_on_exception)
+                        task.add_done_callback(self._background_tasks.discard)
+                    case "cloudEvent":
+                        # The proto typing doesnt resolve this one
+                        event = cast(cloudevent_pb2.CloudEvent, message.cloudEvent)  # type: ignore
+                        task = asyncio.create_task(self._process_event(event))
+                        self._background_tasks.add(task)
+                        task.add_done_callback(self._raise_on_exception)
+                        task.add_done_callback(self._background_tasks.discard)
+                    case "registerAgentTypeRequest":
+                        register_agent_type: (
+                            agent_worker_pb2.RegisterAgentTypeRequest
+                        ) = message.registerAgentTypeRequest
+                        task = asyncio.create_task(
+                            self._process_register_agent_type_request(
+                                register_agent_type, client_id
+                            )
+                        )
+                        self._background_tasks.add(task)
+                        task.add_done_callback(self._raise_on_exception)
+                        task.add_done_callback(self._background_tasks.discard)
+                    case "addSubscriptionRequest":
+                        add_subscription: agent_worker_pb2.AddSubscriptionRequest = (
+                            message.addSubscriptionRequest
+                        )
+                        task = asyncio.create_task(
+                            self._process_add_subscription_request(
+                                add_subscription, client_id
+                            )
+                        )
+                        self._background_tasks.add(task)
+                        task.add_done_callback(self._raise_on_exception)
+                        task.add_done_callback(self._background_tasks.discard)
+                    case "placementRequest":
+                        placement_request: agent_worker_pb2.PlacementRequest = (
+                            message.placementRequest
+                        )
+                        task = asyncio.create_task(
+                            self._process_placement_request(
+                                placement_request, client_id
+                            )
+                        )
+                        self._background_tasks.add(task)
+                        task.add_done_callback(self._raise_on_exception)
+                        task.add_done_callback(self._background_tasks.discard)
+                    case "drainRequest":
+                        drain_request: agent_worker_pb2.DrainRequest = (
+                            message.drainRequest
+                        )
+                        task = asyncio.create_task(
+                            self._process_drain_request(drain_request, client_id)
+                        )
+                        self._background_tasks.add(task)
+                        task.add_done_callback(self._raise_on_exception)
+                        task.add_done_callback(self._background_tasks.discard)
+                    case (
+                        "registerAgentTypeResponse"
+                        | "addSubscriptionResponse"
+                        | "drainResponse"
+                        | "batch"
+                        | "placementResponse"
+                        | "placementChanged"
+                    ):
+                        logger.warning(f"Received unexpected message type: {oneofcase}")
+                    case None:
+                        logger.warning("Received empty message")
 
     async def _process_request(
         self, request: agent_worker_pb2.RpcRequest, client_id: int
     ) -> None:
-        # Deliver the message to a client given the target agent type.
-        async with self._agent_type_to_client_id_lock:
-            target_client_id = self._agent_type_to_client_id.get(request.target.type)
+        # Deliver the message to the client that the target agent is placed on.
+        async with self._agent_type_placements_lock:
+            target_client_id = self._get_client_id(
+                AgentId(request.target.type, request.target.key)
+            )
         if target_client_id is None:
             logger.error(
                 f"Agent {request.target.type} not found, failed to deliver message."
@@ -228,20 +372,35 @@ async def _process_event(self, event: cloudevent_pb2.CloudEvent) -> None:
             topic_id
         )
         # Get the client ids of the recipients.
-        async with self._agent_type_to_client_id_lock:
-            client_ids: Set[int] = set()
+        async with self._agent_type_placements_lock:
+            client_recipients: Dict[int, List[AgentId]] = {}
+            shared = False
             for recipient in recipients:
-                client_id = self._agent_type_to_client_id.get(recipient.type)
+                client_id = self._get_client_id(recipient)
                 if client_id is not None:
-                    client_ids.add(client_id)
+                    client_recipients.setdefault(client_id, []).append(recipient)
+                    shared = (
+                        shared or len(self._agent_type_placements[recipient.type]) > 1
+                    )
                 else:
                     logger.error(
                         f"Agent {recipient.type} and its client not found for topic {topic_id}."
                     )
         # Deliver the event to clients.
-        for client_id in client_ids:
+        for client_id, client_recipient_ids in client_recipients.items():
+            client_event = event
+            if shared:
+                # The client hosts only some of the agents of a shared type, so it is told which
+                # of its agents are recipients.
+                client_event = cloudevent_pb2.CloudEvent()
+                client_event.CopyFrom(event)
+                client_event.attributes[_constants.AGENT_RECIPIENTS_ATTR].ce_string = (
+                    json.dumps(
+                        [[agent.type, agent.key] for agent in client_recipient_ids]
+                    )
+                )
             await self._send_queues[client_id].put(
-                agent_worker_pb2.Message(cloudEvent=event)
+                agent_worker_pb2.Message(cloudEvent=client_event)
             )
 
     async def _process_register_agent_type_request(
@@ -250,18 +409,30 @@ async def _process_register_agent_type_request(
         client_id: int,
     ) -> None:
         # Register the agent type with the host runtime.
-        async with self._agent_type_to_client_id_lock:
-            if register_agent_type_req.type in self._agent_type_to_client_id:
-                existing_client_id = self._agent_type_to_client_id[
-                    register_agent_type_req.type
-                ]
+        agent_type = register_agent_type_req.type
+        async with self._agent_type_placements_lock:
+            placement = self._agent_type_placements.get(agent_type)
+            if placement is not None and (
+                client_id in placement or not self._allow_shared_agent_types
+            ):
                 logger.error(
-                    f"Agent type {register_agent_type_req.type} already registered with client {existing_client_id}."
+                    f"Agent type {agent_type} already registered with clients {sorted(placement.members)}."
                 )
                 success = False
-                error = f"Agent type {register_agent_type_req.type} already registered."
+                error = f"Agent type {agent_type} already registered."
+            elif client_id in self._draining_client_ids:
+                success = False
+                error = f"Client {client_id} is draining."
             else:
-                self._agent_type_to_client_id[register_agent_type_req.type] = client_id
+                if placement is None:
+                    placement = ConsistentHashRing()
+                    self._agent_type_placements[agent_type] = placement
+                else:
+                    logger.info(
+                        f"Rebalancing agent type {agent_type} onto client {client_id} and {len(placement)} other clients"
+                    )
+                placement.add(client_id)
+                self._notify_placement_changed(agent_type)
                 success = True
                 error = None
         # Send a response back to the client.
@@ -304,14 +475,40 @@ async def _process_add_subscription_request(
                 logger.warning("Received empty subscription message")
 
         if subscription is not None:
+            key = (
+                cast(str, oneofcase),
+                (
+                    subscription.topic_type
+                    if isinstance(subscription, TypeSubscription)
+                    else cast(TypePrefixSubscription, subscription).topic_type_prefix
+                ),
+                cast(
+                    TypeSubscription | TypePrefixSubscription, subscription
+                ).agent_type,
+            )
+            existing_id = self._subscription_ids.get(key)
             try:
-                await self._subscription_manager.add_subscription(subscription)
+                if (
+                    self._allow_shared_agent_types
+                    and existing_id is not None
+                    and client_id
+                    not in self._subscription_id_to_client_ids[existing_id]
+                ):
+                    # Another client of the agent type already added the subscription.
+                    subscription_id = existing_id
+                else:
+                    await self._subscription_manager.add_subscription(subscription)
+                    subscription_id = subscription.id
+                    self._subscription_ids[key] = subscription_id
+                self._subscription_id_to_client_ids.setdefault(
+                    subscription_id, set()
+                ).add(client_id)
                 subscription_ids = (
                     self._client_id_to_subscription_id_mapping.setdefault(
                         client_id, set()
                     )
                 )
-                subscription_ids.add(subscription.id)
+                subscription_ids.add(subscription_id)
                 success = True
                 error = None
             except ValueError as e:
@@ -328,6 +525,63 @@ async def _process_add_subscription_request(
                 )
             )
 
+    async def _process_placement_request(
+        self, placement_req: agent_worker_pb2.PlacementRequest, client_id: int
+    ) -> None:
+        agent_id = AgentId(placement_req.agent_id.type, placement_req.agent_id.key)
+        async with self._agent_type_placements_lock:
+            target_client_id = self._get_client_id(agent_id)
+            # The client is told when the placement of the agent type changes.
+            self._placement_watchers.setdefault(agent_id.type, set()).add(client_id)
+            peer_address = (
+                self._client_peer_addresses.get(target_client_id)
+                if target_client_id is not None
+                else None
+            )
+        if target_client_id is None:
+            success = False
+            error: str | None = f"Agent type {agent_id.type} not found."
+        else:
+            # Without a peer address, the client sends its RPCs to the agent through the host.
+            success = True
+            error = None
+        await self._send_queues[client_id].put(
+            agent_worker_pb2.Message(
+                placementResponse=agent_worker_pb2.PlacementResponse(
+                    request_id=placement_req.request_id,
+                    success=success,
+                    error=error,
+                    peer_address=peer_address,
+                )
+            )
+        )
+
+    async def _process_drain_request(
+        self, drain_req: agent_worker_pb2.DrainRequest, client_id: int
+    ) -> None:
+        # Place no new agents on the client; its agents move to the other clients of their types.
+        async with self._agent_type_placements_lock:
+            self._draining_client_ids.add(client_id)
+            self._remove_client_placements(client_id)
+        # Wait for the requests already delivered to the client to complete.
+        pending = list(self._pending_responses.get(client_id, {}).values())
+        if pending:
+            logger.info(
+                f"Client {client_id} is draining, waiting for {len(pending)} pending requests."
+            )
+            await asyncio.gather(*pending, return_exceptions=True)
+        logger.info(f"Client {client_id} drained.")
+        send_queue = self._send_queues.get(client_id)
+        if send_queue is None:
+            return
+        await send_queue.put(
+            agent_worker_pb2.Message(
+                drainResponse=agent_worker_pb2.DrainResponse(
+                    request_id=drain_req.request_id, success=True
+                )
+            )
+        )
+
     async def GetState(  # type: ignore
         self,
         request: agent_worker_pb2.AgentId,
@@ -524,6 +524,167 @@ class AddSubscriptionResponse(google.protobuf.message.Message):
 
 global___AddSubscriptionResponse = AddSubscriptionResponse
 
+@typing.final
+class DrainRequest(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    REQUEST_ID_FIELD_NUMBER: builtins.int
+    request_id: builtins.str
+    def __init__(
+        self,
+        *,
+        request_id: builtins.str = ...,
+    ) -> None: ...
+    def ClearField(
+        self, field_name: typing.Literal["request_id", b"request_id"]
+    ) -> None: ...
+
+global___DrainRequest = DrainRequest
+
+@typing.final
+class DrainResponse(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    REQUEST_ID_FIELD_NUMBER: builtins.int
+    SUCCESS_FIELD_NUMBER: builtins.int
+    ERROR_FIELD_NUMBER: builtins.int
+    request_id: builtins.str
+    success: builtins.bool
+    error: builtins.str
+    def __init__(
+        self,
+        *,
+        request_id: builtins.str = ...,
+        success: builtins.bool = ...,
+        error: builtins.str | None = ...,
+    ) -> None: ...
+    def HasField(
+        self, field_name: typing.Literal["_error", b"_error", "error", b"error"]
+    ) -> builtins.bool: ...
+    def ClearField(
+        self,
+        field_name: typing.Literal[
+            "_error",
+            b"_error",
+            "error",
+            b"error",
+            "request_id",
+            b"request_id",
+            "success",
+            b"success",
+        ],
+    ) -> None: ...
+    def WhichOneof(
+        self, oneof_group: typing.Literal["_error", b"_error"]
+    ) -> typing.Literal["error"] | None: ...
+
+global___DrainResponse = DrainResponse
+
+@typing.final
+class PlacementRequest(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    REQUEST_ID_FIELD_NUMBER: builtins.int
+    AGENT_ID_FIELD_NUMBER: builtins.int
+    request_id: builtins.str
+    @property
+    def agent_id(self) -> global___AgentId: ...
+    def __init__(
+        self,
+        *,
+        request_id: builtins.str = ...,
+        agent_id: global___AgentId | None = ...,
+    ) -> None: ...
+    def HasField(
+        self, field_name: typing.Literal["agent_id", b"agent_id"]
+    ) -> builtins.bool: ...
+    def ClearField(
+        self,
+        field_name: typing.Literal[
+            "agent_id", b"agent_id", "request_id", b"request_id"
+        ],
+    ) -> None: ...
+
+global___PlacementRequest = PlacementRequest
+
+@typing.final
+class PlacementResponse(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    REQUEST_ID_FIELD_NUMBER: builtins.int
+    SUCCESS_FIELD_NUMBER: builtins.int
+    ERROR_FIELD_NUMBER: builtins.int
+    PEER_ADDRESS_FIELD_NUMBER: builtins.int
+    request_id: builtins.str
+    success: builtins.bool
+    error: builtins.str
+    peer_address: builtins.str
+    def __init__(
+        self,
+        *,
+        request_id: builtins.str = ...,
+        success: builtins.bool = ...,
+        error: builtins.str | None = ...,
+        peer_address: builtins.str | None = ...,
+    ) -> None: ...
+    def HasField(
+        self,
+        field_name: typing.Literal[
+            "_error",
+            b"_error",
+            "_peer_address",
+            b"_peer_address",
+            "error",
+            b"error",
+            "peer_address",
+            b"peer_address",
+        ],
+    ) -> builtins.bool: ...
+    def ClearField(
+        self,
+        field_name: typing.Literal[
+            "_error",
+            b"_error",
+            "_peer_address",
+            b"_peer_address",
+            "error",
+            b"error",
+            "peer_address",
+            b"peer_address",
+            "request_id",
+            b"request_id",
+            "success",
+            b"success",
+        ],
+    ) -> None: ...
+    @typing.overload
+    def WhichOneof(
+        self, oneof_group: typing.Literal["_error", b"_error"]
+    ) -> typing.Literal["error"] | None: ...
+    @typing.overload
+    def WhichOneof(
+        self, oneof_group: typing.Literal["_peer_address", b"_peer_address"]
+    ) -> typing.Literal["peer_address"] | None: ...
+
+global___PlacementResponse = PlacementResponse
+
+@typing.final
+class PlacementChanged(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    AGENT_TYPE_FIELD_NUMBER: builtins.int
+    agent_type: builtins.str
+    def __init__(
+        self,
+        *,
+        agent_type: builtins.str = ...,
+    ) -> None: ...
+    def ClearField(
+        self, field_name: typing.Literal["agent_type", b"agent_type"]
+    ) -> None: ...
+
+global___PlacementChanged = PlacementChanged
+
 @typing.final
 class AgentState(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
@@ -670,6 +831,12 @@ class Message(google.protobuf.message.Message):
     REGISTERAGENTTYPERESPONSE_FIELD_NUMBER: builtins.int
     ADDSUBSCRIPTIONREQUEST_FIELD_NUMBER: builtins.int
     ADDSUBSCRIPTIONRESPONSE_FIELD_NUMBER: builtins.int
+    DRAINREQUEST_FIELD_NUMBER: builtins.int
+    DRAINRESPONSE_FIELD_NUMBER: builtins.int
+    BATCH_FIELD_NUMBER: builtins.int
+    PLACEMENTREQUEST_FIELD_NUMBER: builtins.int
+    PLACEMENTRESPONSE_FIELD_NUMBER: builtins.int
+    PLACEMENTCHANGED_FIELD_NUMBER: builtins.int
     @property
     def request(self) -> global___RpcRequest: ...
     @property
@@ -684,6 +851,18 @@ class Message(google.protobuf.message.Message):
     def addSubscriptionRequest(self) -> global___AddSubscriptionRequest: ...
     @property
     def addSubscriptionResponse(self) -> global___AddSubscriptionResponse: ...
+    @property
+    def drainRequest(self) -> global___DrainRequest: ...
+    @property
+    def drainResponse(self) -> global___DrainResponse: ...
+    @property
+    def batch(self) -> global___MessageBatch: ...
+    @property
+    def placementRequest(self) -> global___PlacementRequest: ...
+    @property
+    def placementResponse(self) -> global___PlacementResponse: ...
+    @property
+    def placementChanged(self) -> global___PlacementChanged: ...
     def __init__(
         self,
         *,
@@ -694,6 +873,12 @@ class Message(google.protobuf.message.Message):
         registerAgentTypeResponse: global___RegisterAgentTypeResponse | None = ...,
         addSubscriptionRequest: global___AddSubscriptionRequest | None = ...,
         addSubscriptionResponse: global___AddSubscriptionResponse | None = ...,
+        drainRequest: global___DrainRequest | None = ...,
+        drainResponse: global___DrainResponse | None = ...,
+        batch: global___MessageBatch | None = ...,
+        placementRequest: global___PlacementRequest | None = ...,
+        placementResponse: global___PlacementResponse | None = ...,
+        placementChanged: global___PlacementChanged | None = ...,
     ) -> None: ...
     def HasField(
         self,
@@ -702,10 +887,22 @@ class Message(google.protobuf.message.Message):
             b"addSubscriptionRequest",
             "addSubscriptionResponse",
             b"addSubscriptionResponse",
+            "batch",
+            b"batch",
             "cloudEvent",
             b"cloudEvent",
+            "drainRequest",
+            b"drainRequest",
+            "drainResponse",
+            b"drainResponse",
             "message",
             b"message",
+            "placementChanged",
+            b"placementChanged",
+            "placementRequest",
+            b"placementRequest",
+            "placementResponse",
+            b"placementResponse",
             "registerAgentTypeRequest",
             b"registerAgentTypeRequest",
             "registerAgentTypeResponse",
@@ -723,10 +920,22 @@ class Message(google.protobuf.message.Message):
             b"addSubscriptionRequest",
             "addSubscriptionResponse",
             b"addSubscriptionResponse",
+            "batch",
+            b"batch",
             "cloudEvent",
             b"cloudEvent",
+            "drainRequest",
+            b"drainRequest",
+            "drainResponse",
+            b"drainResponse",
             "message",
             b"message",
+            "placementChanged",
+            b"placementChanged",
+            "placementRequest",
+            b"placementRequest",
+            "placementResponse",
+            b"placementResponse",
             "registerAgentTypeRequest",
             b"registerAgentTypeRequest",
             "registerAgentTypeResponse",
@@ -746,8 +955,36 @@ class Message(google.protobuf.message.Message):
             "registerAgentTypeResponse",
             "addSubscriptionRequest",
             "addSubscriptionResponse",
+            "drainRequest",
+            "drainResponse",
+            "batch",
+            "placementRequest",
+            "placementResponse",
+            "placementChanged",
         ]
         | None
     ): ...
 
 global___Message = Message
+
+@typing.final
+class MessageBatch(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    MESSAGES_FIELD_NUMBER: builtins.int
+    @property
+    def messages(
+        self,
+    ) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[
+        global___Message
+    ]: ...
+    def __init__(
+        self,
+        *,
+        messages: collections.abc.Iterable[global___Message] | None = ...,
+    ) -> None: ...
+    def ClearField(
+        self, field_name: typing.Literal["messages", b"messages"]
+    ) -> None: ...
+
+global___MessageBatch = MessageBatch
@@ -0,0 +1,182 @@
+from pathlib import Path
+from typing import Any, AsyncGenerator, List, Union
+
+import pytest
+from autogen_core.models import (
+    CreateResult,
+    LLMMessage,
+    RequestUsage,
+    SystemMessage,
+    UserMessage,
+)
+from autogen_ext.models.cache import (
+    ChatCompletionCache,
+    InMemoryCacheStore,
+    SqliteCacheStore,
+)
+from autogen_ext.models.openai import OpenAIChatCompletionClient
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+
+def make_result(content: str) -> CreateResult:
+    return CreateResult(
+        finish_reason="stop",
+        content=content,
+        usage=RequestUsage(
+            prompt_tokens=10, completion_tokens=5, cached_prompt_tokens=4
+        ),
+        cached=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_cache_create() -> None:
+    replay_client = ReplayChatCompletionClient(
+        [make_result("Paris"), make_result("Rome")]
+    )
+    client = ChatCompletionCache(replay_client)
+    france = [UserMessage(content="What is the capital of France?", source="user")]
+    italy = [UserMessage(content="What is the capital of Italy?", source="user")]
+
+    first = await client.create(france)
+    assert first.content == "Paris"
+    assert not first.cached
+    second = await client.create(france)
+    assert second.content == "Paris"
+    assert second.cached
+    # Different create arguments or messages are different requests.
+    third = await client.create(italy, json_output=True)
+    assert third.content == "Rome"
+    assert not third.cached
+
+    assert (client.hits, client.misses) == (1, 2)
+    # Cache hits are not counted as usage of the wrapped client.
+    assert client.total_usage() == replay_client.total_usage()
+    assert replay_client.total_usage().cached_prompt_tokens == 8
+    assert client.cached_usage() == RequestUsage(
+        prompt_tokens=10, completion_tokens=5, cached_prompt_tokens=4
+    )
+
+
+@pytest.mark.asyncio
+async def test_cache_key() -> None:
+    client = ChatCompletionCache(ReplayChatCompletionClient([]), model="gpt-4o")
+    messages: List[LLMMessage] = [
+        SystemMessage(content="You are a helpful assistant."),
+        UserMessage(content="Hello", source="user"),
+    ]
+    key = client.cache_key(messages)
+    assert key == client.cache_key(list(messages))
+    assert key != client.cache_key(messages[1:])
+    assert key != client.cache_key(messages, json_output=False)
+    assert key != client.cache_key(messages, extra_create_args={"temperature": 0.5})
+    assert key != client.cache_key(messages, extra_create_args={"model": "gpt-4o-mini"})
+    assert key != ChatCompletionCache(
+        ReplayChatCompletionClient([]), model="gpt-4"
+    ).cache_key(messages)
+
+
+@pytest.mark.asyncio
+async def test_cache_skips_requests_without_key() -> None:
+    client = ChatCompletionCache(
+        ReplayChatCompletionClient([make_result("Paris"), make_result("Rome")])
+    )
+    messages = [UserMessage(content="What is the capital of France?", source="user")]
+    # An object's default repr includes its address, so it cannot identify a request.
+    extra_create_args = {"metadata": object()}
+    assert client.cache_key(messages, extra_create_args=extra_create_args) is None
+
+    # Both requests are sent to the wrapped client.
+    for content in ["Paris", "Rome"]:
+        result = await client.create(messages, extra_create_args=extra_create_args)
+        assert result.content == content
+        assert not result.cached
+    assert (client.hits, client.misses) == (0, 0)
+
+
+def test_cache_key_uses_client_model() -> None:
+    messages = [UserMessage(content="Hello", source="user")]
+    client = ChatCompletionCache(
+        OpenAIChatCompletionClient(model="gpt-4o", api_key="api_key")
+    )
+    assert client.cache_key(messages) == ChatCompletionCache(
+        ReplayChatCompletionClient([]), model="gpt-4o"
+    ).cache_key(messages)
+
+
+class StreamingReplayChatCompletionClient(ReplayChatCompletionClient):
+    """Ends each stream with the assembled result, like the OpenAI clients do."""
+
+    async def create_stream(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        chunks: List[str] = []
+        async for chunk in super().create_stream(*args, **kwargs):
+            assert isinstance(chunk, str)
+            chunks.append(chunk)
+            yield chunk
+        yield CreateResult(
+            finish_reason="stop",
+            content="".join(chunks),
+            usage=self.actual_usage(),
+            cached=False,
+        )
+
+
+@pytest.mark.asyncio
+async def test_cache_create_stream() -> None:
+    replay_client = StreamingReplayChatCompletionClient(["Paris is the capital."])
+    client = ChatCompletionCache(replay_client)
+    messages = [UserMessage(content="What is the capital of France?", source="user")]
+
+    streamed: List[Union[str, CreateResult]] = [
+        item async for item in client.create_stream(messages)
+    ]
+    assert streamed[:-1] == ["Paris ", "is ", "the ", "capital."]
+
+    replayed: List[Union[str, CreateResult]] = [
+        item async for item in client.create_stream(messages)
+    ]
+    assert replayed[:-1] == streamed[:-1]
+    result = replayed[-1]
+    assert isinstance(result, CreateResult)
+    assert result.cached
+    assert result.content == "Paris is the capital."
+    # A response cached by a stream also serves create.
+    assert (await client.create(messages)).cached
+    assert (client.hits, client.misses) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_store_eviction() -> None:
+    store = InMemoryCacheStore(max_entries=2)
+    await store.set("a", "1")
+    await store.set("b", "2")
+    assert await store.get("a") == "1"
+    await store.set("c", "3")
+    # "b" is the least recently used value.
+    assert await store.get("b") is None
+    assert await store.get("a") == "1"
+    assert await store.get("c") == "3"
+    assert len(store) == 2
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_store(tmp_path: Path) -> None:
+    path = tmp_path / "cache.db"
+    messages = [UserMessage(content="What is the capital of France?", source="user")]
+
+    store = SqliteCacheStore(path)
+    client = ChatCompletionCache(
+        ReplayChatCompletionClient([make_result("Paris")]), store
+    )
+    assert not (await client.create(messages)).cached
+    store.close()
+
+    # A new process with an exhausted client is served from disk.
+    store = SqliteCacheStore(path)
+    client = ChatCompletionCache(ReplayChatCompletionClient([]), store)
+    result = await client.create(messages)
+    assert result.cached
+    assert result.content == "Paris"
+    store.close()
@@ -0,0 +1,111 @@
+import asyncio
+from typing import Any, Mapping, Optional, Sequence
+
+import pytest
+from autogen_core import CancellationToken
+from autogen_core.models import CreateResult, LLMMessage, UserMessage
+from autogen_core.tools import Tool, ToolSchema
+from autogen_ext.models.cache import CoalescingChatCompletionClient
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+
+class BlockingReplayChatCompletionClient(ReplayChatCompletionClient):
+    """Holds every create call until released."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.release = asyncio.Event()
+        self.num_calls = 0
+        self.num_cancelled = 0
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        self.num_calls += 1
+        wait = asyncio.ensure_future(self.release.wait())
+        if cancellation_token is not None:
+            cancellation_token.link_future(wait)
+        try:
+            await wait
+        except asyncio.CancelledError:
+            self.num_cancelled += 1
+            raise
+        return await super().create(messages)
+
+
+@pytest.mark.asyncio
+async def test_coalesce_identical_requests() -> None:
+    replay_client = BlockingReplayChatCompletionClient(["Paris", "Rome"])
+    client = CoalescingChatCompletionClient(replay_client)
+    france = [UserMessage(content="What is the capital of France?", source="user")]
+    italy = [UserMessage(content="What is the capital of Italy?", source="user")]
+
+    tasks = [asyncio.ensure_future(client.create(france)) for _ in range(5)]
+    tasks.append(asyncio.ensure_future(client.create(italy)))
+    await asyncio.sleep(0)
+    assert client.in_flight == 2
+    replay_client.release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert [result.content for result in results] == ["Paris"] * 5 + ["Rome"]
+    assert replay_client.num_calls == 2
+    assert client.coalesced == 4
+    assert client.in_flight == 0
+    # Every caller gets its own copy of the result.
+    assert len({id(result) for result in results}) == 6
+
+
+@pytest.mark.asyncio
+async def test_coalesce_cancellation() -> None:
+    replay_client = BlockingReplayChatCompletionClient(["Paris"])
+    client = CoalescingChatCompletionClient(replay_client)
+    messages = [UserMessage(content="What is the capital of France?", source="user")]
+
+    # Cancelling one caller does not affect the others.
+    token = CancellationToken()
+    cancelled = asyncio.ensure_future(client.create(messages, cancellation_token=token))
+    waiting = asyncio.ensure_future(client.create(messages))
+    await asyncio.sleep(0)
+    token.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    replay_client.release.set()
+    assert (await waiting).content == "Paris"
+    assert replay_client.num_cancelled == 0
+
+    # The upstream request is cancelled when all callers have cancelled.
+    replay_client.release.clear()
+    tokens = [CancellationToken(), CancellationToken()]
+    tasks = [
+        asyncio.ensure_future(client.create(messages, cancellation_token=token))
+        for token in tokens
+    ]
+    await asyncio.sleep(0)
+    for token in tokens:
+        token.cancel()
+    for task in tasks:
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    await asyncio.sleep(0)
+    assert replay_client.num_cancelled == 1
+    assert client.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_coalesce_exception() -> None:
+    replay_client = BlockingReplayChatCompletionClient([])
+    client = CoalescingChatCompletionClient(replay_client)
+    messages = [UserMessage(content="What is the capital of France?", source="user")]
+
+    tasks = [asyncio.ensure_future(client.create(messages)) for _ in range(3)]
+    await asyncio.sleep(0)
+    replay_client.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert replay_client.num_calls == 1
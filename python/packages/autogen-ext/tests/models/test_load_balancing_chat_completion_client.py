@@ -0,0 +1,207 @@
+import asyncio
+from typing import Any, AsyncGenerator, List, Mapping, Optional, Sequence, Union
+
+import pytest
+from autogen_core import CancellationToken
+from autogen_core.models import CreateResult, LLMMessage, RequestUsage, UserMessage
+from autogen_core.tools import Tool, ToolSchema
+from autogen_ext.models.load_balancing import LoadBalancingChatCompletionClient
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+
+class StatusError(Exception):
+    """An error with the status code of an HTTP response."""
+
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+
+
+class StubChatCompletionClient(ReplayChatCompletionClient):
+    """Replies with its name after a delay, or fails."""
+
+    def __init__(
+        self,
+        name: str,
+        delay: float = 0.0,
+        fail: bool = False,
+        error: Optional[Exception] = None,
+    ) -> None:
+        super().__init__([])
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.error = error
+        self.num_calls = 0
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        self.num_calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise self.error or ConnectionError(f"{self.name} is down")
+        self._cur_usage = RequestUsage(prompt_tokens=1, completion_tokens=1)
+        self._update_total_usage()
+        return CreateResult(
+            finish_reason="stop", content=self.name, usage=self._cur_usage, cached=False
+        )
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        self.num_calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise self.error or ConnectionError(f"{self.name} is down")
+        yield self.name
+        yield CreateResult(
+            finish_reason="stop",
+            content=self.name,
+            usage=RequestUsage(prompt_tokens=1, completion_tokens=1),
+            cached=False,
+        )
+
+
+messages: List[LLMMessage] = [UserMessage(content="Hello", source="user")]
+
+
+def test_invalid_max_attempts() -> None:
+    with pytest.raises(ValueError, match="max_attempts"):
+        LoadBalancingChatCompletionClient(
+            [StubChatCompletionClient("up")], max_attempts=0
+        )
+
+
+@pytest.mark.asyncio
+async def test_least_outstanding_spreads_requests() -> None:
+    backends = [StubChatCompletionClient(name, delay=0.01) for name in "abc"]
+    client = LoadBalancingChatCompletionClient(backends)
+
+    results = await asyncio.gather(*[client.create(messages) for _ in range(6)])
+
+    assert sorted(result.content for result in results) == [
+        "a",
+        "a",
+        "b",
+        "b",
+        "c",
+        "c",
+    ]
+    assert [backend.num_calls for backend in backends] == [2, 2, 2]
+    assert client.total_usage() == RequestUsage(prompt_tokens=6, completion_tokens=6)
+
+
+@pytest.mark.asyncio
+async def test_latency_ewma_prefers_fast_backend() -> None:
+    slow = StubChatCompletionClient("slow", delay=0.05)
+    fast = StubChatCompletionClient("fast", delay=0.0)
+    client = LoadBalancingChatCompletionClient([slow, fast], strategy="latency_ewma")
+
+    # Both backends are tried once, then the fast one is preferred.
+    for _ in range(6):
+        await client.create(messages)
+    assert slow.num_calls == 1
+    assert fast.num_calls == 5
+
+
+@pytest.mark.asyncio
+async def test_failover_and_ejection() -> None:
+    down = StubChatCompletionClient("down", fail=True)
+    up = StubChatCompletionClient("up")
+    client = LoadBalancingChatCompletionClient([down, up])
+
+    results = [await client.create(messages) for _ in range(4)]
+    assert all(result.content == "up" for result in results)
+    # The failed backend is ejected after its first failure.
+    assert down.num_calls == 1
+    status = client.backend_status()
+    assert not status[0].healthy and status[0].failures == 1
+    assert status[1].healthy and status[1].requests == 4
+
+    # Streams fail over as well.
+    down.fail = False
+    up.fail = True
+    client = LoadBalancingChatCompletionClient([up, down])
+    chunks = [chunk async for chunk in client.create_stream(messages)]
+    assert chunks[0] == "down"
+
+    # When every backend fails, the last error is raised.
+    down.fail = True
+    with pytest.raises(ConnectionError):
+        await LoadBalancingChatCompletionClient([up, down]).create(messages)
+
+
+@pytest.mark.asyncio
+async def test_request_errors_are_not_retried() -> None:
+    invalid = StubChatCompletionClient("invalid", fail=True, error=StatusError(400))
+    up = StubChatCompletionClient("up")
+
+    # An invalid request is raised right away and does not eject the backend.
+    with pytest.raises(StatusError):
+        await LoadBalancingChatCompletionClient([invalid, up]).create(messages)
+    with pytest.raises(StatusError):
+        async for _ in LoadBalancingChatCompletionClient([invalid, up]).create_stream(
+            messages
+        ):
+            pass
+    assert up.num_calls == 0
+
+    client = LoadBalancingChatCompletionClient([invalid, up])
+    with pytest.raises(StatusError):
+        await client.create(messages)
+    status = client.backend_status()
+    assert status[0].healthy and status[0].failures == 0
+
+    # Rate limits and server errors fail over to another backend.
+    for status_code in (429, 503):
+        invalid.error = StatusError(status_code)
+        client = LoadBalancingChatCompletionClient([invalid, up])
+        assert (await client.create(messages)).content == "up"
+        assert not client.backend_status()[0].healthy
+
+
+@pytest.mark.asyncio
+async def test_request_timeout() -> None:
+    stuck = StubChatCompletionClient("stuck", delay=10)
+    up = StubChatCompletionClient("up")
+    client = LoadBalancingChatCompletionClient([stuck, up], request_timeout=0.05)
+
+    assert (await client.create(messages)).content == "up"
+    assert not client.backend_status()[0].healthy
+
+
+@pytest.mark.asyncio
+async def test_hedging() -> None:
+    first = StubChatCompletionClient("first", delay=0.01)
+    second = StubChatCompletionClient("second", delay=0.01)
+    client = LoadBalancingChatCompletionClient([first, second], hedge_percentile=90)
+    # Sequential requests alternate between the backends.
+    for _ in range(20):
+        await client.create(messages)
+    assert (first.num_calls, second.num_calls) == (10, 10)
+    assert client.hedged == 0
+
+    # A request much slower than usual is hedged to the other backend, which wins.
+    first.delay = 10
+    second.delay = 0
+    result = await asyncio.wait_for(client.create(messages), timeout=5)
+    assert result.content == "second"
+    assert client.hedged == 1
+    # The slow request was cancelled rather than counted as a failure.
+    await asyncio.sleep(0)
+    assert all(
+        status.healthy and status.outstanding == 0 for status in client.backend_status()
+    )
@@ -1,5 +1,6 @@
 import asyncio
-from typing import Annotated, Any, AsyncGenerator, List, Tuple
+from dataclasses import dataclass
+from typing import Annotated, Any, AsyncGenerator, List, Mapping, Tuple, Type
 from unittest.mock import MagicMock
 
 import pytest
@@ -15,10 +16,11 @@
     UserMessage,
 )
 from autogen_core.models._model_client import ModelFamily
-from autogen_core.tools import BaseTool, FunctionTool
+from autogen_core.tools import BaseTool, FunctionTool, Tool, ToolSchema
 from autogen_ext.models.openai import (
     AzureOpenAIChatCompletionClient,
     OpenAIChatCompletionClient,
+    RateLimiter,
 )
 from autogen_ext.models.openai._model_info import resolve_model
 from autogen_ext.models.openai._openai_client import (
@@ -30,7 +32,7 @@
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk, ChoiceDelta
 from openai.types.chat.chat_completion_chunk import Choice as ChunkChoice
 from openai.types.chat.chat_completion_message import ChatCompletionMessage
-from openai.types.completion_usage import CompletionUsage
+from openai.types.completion_usage import CompletionUsage, PromptTokensDetails
 from pydantic import BaseModel, Field
 
 
@@ -203,6 +205,42 @@ async def test_openai_chat_completion_client_create(
     assert result.content == "Hello"
 
 
+@pytest.mark.asyncio
+async def test_openai_chat_completion_client_create_cached_prompt_tokens(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def _mock_create_cached(*args: Any, **kwargs: Any) -> ChatCompletion:
+        return ChatCompletion(
+            id="id",
+            choices=[
+                Choice(
+                    finish_reason="stop",
+                    index=0,
+                    message=ChatCompletionMessage(content="Hello", role="assistant"),
+                )
+            ],
+            created=0,
+            model="gpt-4o-2024-08-06",
+            object="chat.completion",
+            usage=CompletionUsage(
+                prompt_tokens=2048,
+                completion_tokens=5,
+                total_tokens=2053,
+                prompt_tokens_details=PromptTokensDetails(cached_tokens=1920),
+            ),
+        )
+
+    monkeypatch.setattr(AsyncCompletions, "create", _mock_create_cached)
+    client = OpenAIChatCompletionClient(model="gpt-4o", api_key="api_key")
+    messages: List[LLMMessage] = [UserMessage(content="Hello", source="user")]
+    result = await client.create(messages=messages)
+    assert result.usage == RequestUsage(
+        prompt_tokens=2048, completion_tokens=5, cached_prompt_tokens=1920
+    )
+    await client.create(messages=messages)
+    assert client.total_usage().cached_prompt_tokens == 3840
+
+
 @pytest.mark.asyncio
 async def test_openai_chat_completion_client_create_stream_with_usage(
     monkeypatch: pytest.MonkeyPatch,
@@ -306,6 +344,51 @@ async def test_openai_chat_completion_client_create_stream_cancel(
             pass
 
 
+@pytest.mark.asyncio
+async def test_openai_chat_completion_client_create_stream_cancel_while_waiting(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(AsyncCompletions, "create", _mock_create)
+    client = OpenAIChatCompletionClient(model="gpt-4o", api_key="api_key")
+    cancellation_token = CancellationToken()
+    chunks: List[str | CreateResult] = []
+
+    async def consume() -> None:
+        async for chunk in client.create_stream(
+            messages=[UserMessage(content="Hello", source="user")],
+            cancellation_token=cancellation_token,
+        ):
+            chunks.append(chunk)
+
+    # Each mock chunk takes 0.1 seconds, so the stream is waiting for its second chunk.
+    task = asyncio.ensure_future(consume())
+    await asyncio.sleep(0.15)
+    cancellation_token.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert chunks == ["Hello"]
+
+
+@pytest.mark.asyncio
+async def test_openai_chat_completion_client_create_stream_links_token_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(AsyncCompletions, "create", _mock_create)
+    client = OpenAIChatCompletionClient(model="gpt-4o", api_key="api_key")
+    cancellation_token = CancellationToken()
+    chunks: List[str | CreateResult] = []
+    async for chunk in client.create_stream(
+        messages=[UserMessage(content="Hello", source="user")],
+        cancellation_token=cancellation_token,
+    ):
+        # One callback for the whole stream rather than one per chunk.
+        assert len(cancellation_token._callbacks) == 1  # type: ignore[reportPrivateUsage]
+        chunks.append(chunk)
+    assert len(chunks) == 4
+    # The callback is removed once the stream is consumed.
+    assert len(cancellation_token._callbacks) == 0  # type: ignore[reportPrivateUsage]
+
+
 @pytest.mark.asyncio
 async def test_openai_chat_completion_client_count_tokens(
     monkeypatch: pytest.MonkeyPatch,
@@ -356,6 +439,214 @@ def tool2(test1: int, test2: List[int]) -> str:
     assert remaining_tokens
 
 
+@pytest.mark.asyncio
+async def test_rate_limiter_priority_and_concurrency() -> None:
+    limiter = RateLimiter(max_concurrent_requests=1)
+    lease = await limiter.acquire()
+    admitted: List[str] = []
+
+    async def request(name: str, priority: int) -> None:
+        next_lease = await limiter.acquire(priority=priority)
+        admitted.append(name)
+        next_lease.release()
+
+    tasks = [
+        asyncio.ensure_future(request("batch", 0)),
+        asyncio.ensure_future(request("interactive", 1)),
+    ]
+    await asyncio.sleep(0)
+    assert limiter.queued == 2
+    lease.release()
+    await asyncio.gather(*tasks)
+
+    assert admitted == ["interactive", "batch"]
+    assert limiter.in_flight == 0
+    metrics = limiter.metrics
+    assert metrics.requests == 3
+    assert metrics.throttled == 2
+    assert metrics.total_wait_time > 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_token_budget() -> None:
+    # 100 tokens per second.
+    limiter = RateLimiter(tokens_per_minute=6000)
+    lease = await limiter.acquire(6000)
+
+    start = asyncio.get_running_loop().time()
+    (await limiter.acquire(10)).release(10)
+    assert asyncio.get_running_loop().time() - start >= 0.09
+
+    # Unused tokens are returned to the budget when the actual usage is known.
+    lease.release(actual_tokens=100)
+    assert (await limiter.acquire(5000)).tokens == 5000
+    assert limiter.metrics.throttled == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_cancellation() -> None:
+    limiter = RateLimiter(max_concurrent_requests=1)
+    lease = await limiter.acquire()
+    token = CancellationToken()
+    waiting = asyncio.ensure_future(limiter.acquire(cancellation_token=token))
+    await asyncio.sleep(0)
+    token.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    lease.release()
+    assert limiter.queued == 0
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_openai_chat_completion_client_rate_limiter(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(AsyncCompletions, "create", _mock_create)
+    limiter = RateLimiter(requests_per_minute=600, max_concurrent_requests=1)
+    client = OpenAIChatCompletionClient(
+        model="gpt-4o", api_key="api_key", rate_limiter=limiter
+    )
+    other_client = OpenAIChatCompletionClient(
+        model="gpt-4o", api_key="api_key", rate_limiter=limiter, rate_limit_priority=1
+    )
+    assert "rate_limiter" not in client.dump_component().config
+    messages = [UserMessage(content="Hello", source="user")]
+
+    results = await asyncio.gather(
+        client.create(messages=messages), other_client.create(messages=messages)
+    )
+    assert [result.content for result in results] == ["Hello", "Hello"]
+    chunks = [chunk async for chunk in client.create_stream(messages=messages)]
+    assert isinstance(chunks[-1], CreateResult)
+
+    # The clients share the limiter, so one of the concurrent requests was queued.
+    metrics = limiter.metrics
+    assert metrics.requests == 3
+    assert metrics.throttled == 1
+    assert limiter.in_flight == 0
+
+
+class MockEncoding:
+    def __init__(self) -> None:
+        self.num_calls = 0
+
+    def encode(self, text: str) -> List[str]:
+        self.num_calls += 1
+        return text.split()
+
+
+def test_openai_chat_completion_client_count_tokens_cached(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    encoding = MockEncoding()
+    encoding_for_model = MagicMock(return_value=encoding)
+    monkeypatch.setattr(
+        "autogen_ext.models.openai._openai_client.tiktoken.encoding_for_model",
+        encoding_for_model,
+    )
+    client = OpenAIChatCompletionClient(model="gpt-4o", api_key="api_key")
+    history: List[LLMMessage] = [
+        SystemMessage(content="You are a helpful assistant."),
+        UserMessage(content="What is the weather in Paris?", source="user"),
+    ]
+
+    def get_weather(city: str) -> str:
+        return "sunny"
+
+    tools = [FunctionTool(get_weather, description="Get the weather of a city.")]
+
+    num_tokens = client.count_tokens(history, tools=tools)
+    num_encodes = encoding.num_calls
+    assert client.count_tokens(history, tools=tools) == num_tokens
+    # The encoding is resolved once, and counted messages and tools are not encoded again.
+    assert encoding.num_calls == num_encodes
+    encoding_for_model.assert_called_once_with("gpt-4o")
+
+    new_messages: List[LLMMessage] = [
+        AssistantMessage(content="It is sunny.", source="assistant"),
+        UserMessage(content="And in Rome?", source="user"),
+    ]
+    history.extend(new_messages)
+    num_tokens += client.count_message_tokens(new_messages)
+    assert num_tokens == client.count_tokens(history, tools=tools)
+    assert client.remaining_tokens(history, tools=tools) == 128000 - num_tokens
+
+
+class SlotsTool:
+    """A tool that cannot be weakly referenced."""
+
+    __slots__ = ("_schema",)
+
+    def __init__(self, schema: ToolSchema) -> None:
+        self._schema = schema
+
+    @property
+    def name(self) -> str:
+        return self._schema["name"]
+
+    @property
+    def description(self) -> str:
+        return self._schema.get("description", "")
+
+    @property
+    def schema(self) -> ToolSchema:
+        return self._schema
+
+    def args_type(self) -> Type[BaseModel]:
+        return BaseModel
+
+    def return_type(self) -> Type[Any]:
+        return str
+
+    def state_type(self) -> Type[BaseModel] | None:
+        return None
+
+    def return_value_as_string(self, value: Any) -> str:
+        return str(value)
+
+    async def run_json(
+        self, args: Mapping[str, Any], cancellation_token: CancellationToken
+    ) -> Any:
+        return ""
+
+    def save_state_json(self) -> Mapping[str, Any]:
+        return {}
+
+    def load_state_json(self, state: Mapping[str, Any]) -> None:
+        pass
+
+
+def test_openai_chat_completion_client_count_tool_tokens_cached(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        "autogen_ext.models.openai._openai_client.tiktoken.encoding_for_model",
+        MagicMock(return_value=MockEncoding()),
+    )
+    client = OpenAIChatCompletionClient(model="gpt-4o", api_key="api_key")
+    messages: List[LLMMessage] = [UserMessage(content="Hello", source="user")]
+
+    def get_weather(city: str) -> str:
+        return "sunny"
+
+    tool = FunctionTool(get_weather, description="Get the weather.")
+    num_tokens = client.count_tokens(messages, tools=[tool])
+    assert client.count_tokens(messages, tools=[tool]) == num_tokens
+
+    # A changed tool is counted again.
+    tool._description = (
+        "Get the weather of a city in the world."  # pyright: ignore[reportPrivateUsage]
+    )
+    assert client.count_tokens(messages, tools=[tool]) == num_tokens + 6
+
+    # Tools that cannot be weakly referenced are counted without being cached.
+    slots_tool = SlotsTool(tool.schema)
+    assert isinstance(slots_tool, Tool)
+    assert client.count_tokens(messages, tools=[slots_tool]) == num_tokens + 6
+    assert client.count_tokens(messages, tools=[slots_tool]) == num_tokens + 6
+
+
 @pytest.mark.parametrize(
     "mock_size, expected_num_tokens",
     [
@@ -418,3 +709,46 @@ async def run(
 
     assert len(converted_tool_schema) == 2
     assert converted_tool_schema[0] == converted_tool_schema[1]
+
+
+def test_convert_tools_is_cached_per_tool() -> None:
+    def my_function(arg: str) -> str:
+        return arg
+
+    tool = FunctionTool(my_function, description="Function tool.")
+    converted = convert_tools([tool])[0]
+    assert convert_tools([tool])[0] is converted
+
+    # A changed tool is converted again.
+    tool._description = "Changed description."  # pyright: ignore[reportPrivateUsage]
+    reconverted = convert_tools([tool])[0]
+    assert reconverted is not converted
+    assert reconverted["function"].get("description") == "Changed description."
+
+
+def test_convert_tools_accepts_unhashable_tool() -> None:
+    @dataclass
+    class DataclassTool(BaseTool[MyArgs, MyResult]):
+        label: str
+
+        def __post_init__(self) -> None:
+            super().__init__(
+                args_type=MyArgs,
+                return_type=MyResult,
+                name="DataclassTool",
+                description=f"Tool {self.label}.",
+            )
+
+        async def run(
+            self, args: MyArgs, cancellation_token: CancellationToken
+        ) -> MyResult:
+            return MyResult(result="value")
+
+    tool = DataclassTool(label="test")
+    with pytest.raises(TypeError):
+        hash(tool)
+
+    converted_tool_schema = convert_tools([tool, tool])
+    assert len(converted_tool_schema) == 2
+    assert converted_tool_schema[0] == converted_tool_schema[1]
+    assert converted_tool_schema[0]["function"]["name"] == "DataclassTool"
@@ -0,0 +1,26 @@
+from autogen_ext.runtimes.grpc._agent_placement import ConsistentHashRing
+
+
+def test_consistent_hash_ring() -> None:
+    ring = ConsistentHashRing()
+    assert ring.get("key") is None
+    ring.add(1)
+    assert ring.get("key") == 1
+
+    keys = [f"key{i}" for i in range(1000)]
+    ring.add(2)
+    ring.add(3)
+    before = {key: ring.get(key) for key in keys}
+    assert set(before.values()) == {1, 2, 3}
+
+    # Only the keys of a removed member move.
+    ring.remove(3)
+    after = {key: ring.get(key) for key in keys}
+    assert all(after[key] == member for key, member in before.items() if member != 3)
+    assert 3 not in after.values()
+
+    # Only the keys placed on a new member move.
+    ring.add(4)
+    added = {key: ring.get(key) for key in keys}
+    assert all(added[key] in (after[key], 4) for key in keys)
+    assert 100 < sum(member == 4 for member in added.values()) < 600
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+from autogen_ext.runtimes.grpc._message_batching import (
+    DEFAULT_MAX_BATCH_BYTES,
+    MessageBatcher,
+    batch_bytes_limit,
+    unbatch,
+)
+from autogen_ext.runtimes.grpc.protos import agent_worker_pb2
+
+
+def make_message(index: int, size: int = 0) -> agent_worker_pb2.Message:
+    return agent_worker_pb2.Message(
+        request=agent_worker_pb2.RpcRequest(
+            request_id=str(index),
+            payload=agent_worker_pb2.Payload(data=b"." * size),
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_message_batcher() -> None:
+    queue: asyncio.Queue[agent_worker_pb2.Message] = asyncio.Queue()
+    batcher = MessageBatcher(queue, max_messages=4, max_bytes=1000, max_delay=0)
+
+    # Batching is disabled until the peer supports it.
+    for i in range(2):
+        queue.put_nowait(make_message(i))
+    assert (await anext(batcher)).request.request_id == "0"
+    assert (await anext(batcher)).request.request_id == "1"
+
+    batcher.enabled = True
+    # A message sent on its own is not batched.
+    queue.put_nowait(make_message(0))
+    assert (await anext(batcher)).WhichOneof("message") == "request"
+
+    # Frames hold up to max_messages messages.
+    for i in range(6):
+        queue.put_nowait(make_message(i))
+    frames = [await anext(batcher), await anext(batcher)]
+    assert [len(unbatch(frame)) for frame in frames] == [4, 2]
+    assert [m.request.request_id for f in frames for m in unbatch(f)] == [
+        str(i) for i in range(6)
+    ]
+
+    # Frames hold up to max_bytes bytes, and larger messages are sent on their own.
+    for i, size in enumerate([400, 400, 400, 2000]):
+        queue.put_nowait(make_message(i, size))
+    frames = [await anext(batcher) for _ in range(3)]
+    assert [len(unbatch(frame)) for frame in frames] == [2, 1, 1]
+    assert frames[2].request.request_id == "3"
+
+
+@pytest.mark.asyncio
+async def test_message_batcher_message_length_limit() -> None:
+    limit = 64 * 1024
+    options = [
+        ("grpc.max_send_message_length", limit),
+        ("grpc.max_receive_message_length", -1),
+    ]
+    assert batch_bytes_limit(options) < limit
+    assert batch_bytes_limit(None) < DEFAULT_MAX_BATCH_BYTES
+
+    queue: asyncio.Queue[agent_worker_pb2.Message] = asyncio.Queue()
+    batcher = MessageBatcher(queue, max_bytes=batch_bytes_limit(options), max_delay=0)
+    batcher.enabled = True
+    for i in range(40):
+        queue.put_nowait(make_message(i, 10_000))
+    frames: list[agent_worker_pb2.Message] = []
+    while sum(len(unbatch(frame)) for frame in frames) < 40:
+        frames.append(await anext(batcher))
+    # Frames, envelope included, stay within the limit.
+    assert len(frames) > 1
+    assert all(frame.ByteSize() <= limit for frame in frames)
@@ -0,0 +1,62 @@
+import json
+import logging
+
+import pytest
+from autogen_core import TRACE_LOGGER_NAME
+from autogen_ext.runtimes.grpc._message_logging import (
+    ChannelMessageLog,
+    MessageTraceSampler,
+)
+from autogen_ext.runtimes.grpc.protos import agent_worker_pb2
+
+MESSAGE = agent_worker_pb2.Message(
+    request=agent_worker_pb2.RpcRequest(
+        request_id="1",
+        target=agent_worker_pb2.AgentId(type="agent", key="default"),
+        payload=agent_worker_pb2.Payload(data_type="Message", data=b"secret"),
+    )
+)
+
+
+def test_channel_message_log() -> None:
+    fields = json.loads(str(ChannelMessageLog("send", MESSAGE, client_id=3)))
+    assert fields == {
+        "direction": "send",
+        "kind": "request",
+        "client_id": 3,
+        "request_id": "1",
+        "target": "agent/default",
+        "data_type": "Message",
+        "size": MESSAGE.ByteSize(),
+    }
+    fields = json.loads(str(ChannelMessageLog("send", MESSAGE, include_payload=True)))
+    assert "secret" in fields["message"]
+
+
+def test_channel_message_log_control_messages() -> None:
+    message = agent_worker_pb2.Message(
+        placementChanged=agent_worker_pb2.PlacementChanged(agent_type="agent")
+    )
+    assert ChannelMessageLog("recv", message).fields() == {
+        "direction": "recv",
+        "kind": "placementChanged",
+        "agent_type": "agent",
+        "size": message.ByteSize(),
+    }
+    message = agent_worker_pb2.Message(
+        placementRequest=agent_worker_pb2.PlacementRequest(request_id="2")
+    )
+    assert ChannelMessageLog("send", message).fields()["request_id"] == "2"
+
+
+def test_message_trace_sampler(caplog: pytest.LogCaptureFixture) -> None:
+    with pytest.raises(ValueError):
+        MessageTraceSampler(2.0)
+
+    with caplog.at_level(logging.DEBUG, logger=TRACE_LOGGER_NAME):
+        sampler = MessageTraceSampler(0.25)
+        for _ in range(8):
+            sampler.trace("receive", MESSAGE)
+        MessageTraceSampler().trace("receive", MESSAGE)
+    assert len(caplog.records) == 2
+    assert "secret" in caplog.records[0].getMessage()
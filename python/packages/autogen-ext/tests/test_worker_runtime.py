@@ -5,6 +5,7 @@
 
 import pytest
 from autogen_core import (
+    MSGPACK_DATA_CONTENT_TYPE,
     PROTOBUF_DATA_CONTENT_TYPE,
     AgentId,
     AgentType,
@@ -30,6 +31,7 @@
     NoopAgent,
 )
 from protos.serialization_test_pb2 import ProtoMessage
+from pytest_mock import MockerFixture
 
 
 @pytest.mark.asyncio
@@ -524,9 +526,467 @@ async def test_proto_payloads() -> None:
     await host.stop()
 
 
+@pytest.mark.asyncio
+async def test_msgpack_payloads() -> None:
+    pytest.importorskip("msgpack")
+    host_address = "localhost:50062"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+    worker = GrpcWorkerAgentRuntime(
+        host_address=host_address,
+        payload_serialization_format=MSGPACK_DATA_CONTENT_TYPE,
+    )
+    worker.start()
+    publisher = GrpcWorkerAgentRuntime(
+        host_address=host_address,
+        payload_serialization_format=MSGPACK_DATA_CONTENT_TYPE,
+    )
+    publisher.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+    publisher.start()
+
+    await LoopbackAgentWithDefaultSubscription.register(
+        worker, "name", lambda: LoopbackAgentWithDefaultSubscription()
+    )
+
+    await publisher.publish_message(MessageType(), topic_id=DefaultTopicId())
+
+    await asyncio.sleep(2)
+
+    long_running_agent = await worker.try_get_underlying_agent_instance(
+        AgentId("name", "default"), type=LoopbackAgentWithDefaultSubscription
+    )
+    assert long_running_agent.num_calls == 1
+
+    await worker.stop()
+    await publisher.stop()
+    await host.stop()
+
+
+@pytest.mark.asyncio
+async def test_shared_agent_type_placement() -> None:
+    host_address = "localhost:50070"
+    host = GrpcWorkerAgentRuntimeHost(
+        address=host_address, allow_shared_agent_types=True
+    )
+    host.start()
+
+    workers: List[GrpcWorkerAgentRuntime] = []
+    for _ in range(2):
+        worker = GrpcWorkerAgentRuntime(host_address=host_address)
+        worker.start()
+        worker.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+        await worker.register_factory(
+            type=AgentType("loopback"),
+            agent_factory=lambda: LoopbackAgent(),
+            expected_class=LoopbackAgent,
+        )
+        await worker.add_subscription(TypeSubscription("default", "loopback"))
+        workers.append(worker)
+
+    keys = [f"key{i}" for i in range(20)]
+    for _ in range(2):
+        for key in keys:
+            await workers[0].send_message(MessageType(), AgentId("loopback", key))
+
+    # Each agent is placed on exactly one worker and stays there.
+    placements = {
+        key: [
+            worker
+            for worker in workers
+            if AgentId("loopback", key) in worker._instantiated_agents  # type: ignore[reportPrivateUsage]
+        ]
+        for key in keys
+    }
+    assert all(len(placed) == 1 for placed in placements.values())
+    assert {placed[0] for placed in placements.values()} == set(workers)
+    for key, placed in placements.items():
+        agent = await placed[0].try_get_underlying_agent_instance(
+            AgentId("loopback", key), LoopbackAgent
+        )
+        assert agent.num_calls == 2
+
+    # A published message is delivered once, to the worker the recipient is placed on.
+    await workers[0].publish_message(MessageType(), topic_id=TopicId("default", "key3"))
+    await asyncio.sleep(1)
+    agent = await placements["key3"][0].try_get_underlying_agent_instance(
+        AgentId("loopback", "key3"), LoopbackAgent
+    )
+    assert agent.num_calls == 3
+    assert not any(
+        AgentId("loopback", "key3") in worker._instantiated_agents  # type: ignore[reportPrivateUsage]
+        for worker in workers
+        if worker is not placements["key3"][0]
+    )
+
+    for worker in workers:
+        await worker.stop()
+    await host.stop()
+
+
+@pytest.mark.asyncio
+async def test_shared_agent_type_drain() -> None:
+    host_address = "localhost:50071"
+    host = GrpcWorkerAgentRuntimeHost(
+        address=host_address, allow_shared_agent_types=True
+    )
+    host.start()
+
+    workers: List[GrpcWorkerAgentRuntime] = []
+    for _ in range(2):
+        worker = GrpcWorkerAgentRuntime(host_address=host_address)
+        worker.start()
+        worker.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+        await worker.register_factory(
+            type=AgentType("loopback"),
+            agent_factory=lambda: LoopbackAgent(),
+            expected_class=LoopbackAgent,
+        )
+        workers.append(worker)
+
+    keys = [f"key{i}" for i in range(20)]
+    for key in keys:
+        await workers[0].send_message(MessageType(), AgentId("loopback", key))
+    drained_keys = [
+        key
+        for key in keys
+        if AgentId("loopback", key) in workers[1]._instantiated_agents  # type: ignore[reportPrivateUsage]
+    ]
+    assert drained_keys
+
+    # After draining, the agents of the drained worker are placed on the other worker.
+    await workers[1].drain()
+    for key in keys:
+        await workers[0].send_message(MessageType(), AgentId("loopback", key))
+    for key in keys:
+        agent = await workers[0].try_get_underlying_agent_instance(
+            AgentId("loopback", key), LoopbackAgent
+        )
+        assert agent.num_calls == (1 if key in drained_keys else 2)
+
+    # A drained worker cannot register new agent types.
+    with pytest.raises(RuntimeError):
+        await workers[1].register_factory(
+            type=AgentType("other"),
+            agent_factory=lambda: LoopbackAgent(),
+            expected_class=LoopbackAgent,
+        )
+
+    for worker in workers:
+        await worker.stop()
+    await host.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("host_batching", [True, False])
+async def test_message_batching(host_batching: bool) -> None:
+    host_address = f"localhost:{50072 if host_batching else 50073}"
+    host = GrpcWorkerAgentRuntimeHost(
+        address=host_address, message_batching=host_batching
+    )
+    host.start()
+
+    # Workers with and without batching can talk through the same host.
+    workers: List[GrpcWorkerAgentRuntime] = []
+    for message_batching in (True, False):
+        worker = GrpcWorkerAgentRuntime(
+            host_address=host_address, message_batching=message_batching
+        )
+        worker.start()
+        worker.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+        await worker.register_factory(
+            type=AgentType(f"loopback{len(workers)}"),
+            agent_factory=lambda: LoopbackAgent(),
+            expected_class=LoopbackAgent,
+        )
+        await worker.add_subscription(
+            TypeSubscription("default", f"loopback{len(workers)}")
+        )
+        workers.append(worker)
+
+    for worker in workers:
+        await asyncio.gather(
+            *[
+                worker.publish_message(
+                    MessageType(), topic_id=TopicId("default", "default")
+                )
+                for _ in range(100)
+            ]
+        )
+    await asyncio.sleep(2)
+
+    for index, worker in enumerate(workers):
+        agent = await worker.try_get_underlying_agent_instance(
+            AgentId(f"loopback{index}", "default"), LoopbackAgent
+        )
+        assert agent.num_calls == 200
+
+    for worker in workers:
+        await worker.stop()
+    await host.stop()
+
+
+@pytest.mark.asyncio
+async def test_serialization_cache() -> None:
+    host_address = "localhost:50085"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    sender = GrpcWorkerAgentRuntime(host_address=host_address, max_cached_messages=4)
+    receiver = GrpcWorkerAgentRuntime(host_address=host_address)
+    try:
+        host.start()
+        sender.start()
+        receiver.start()
+        await LoopbackAgentWithDefaultSubscription.register(
+            receiver, "receiver", lambda: LoopbackAgentWithDefaultSubscription()
+        )
+        sender.add_message_serializer(
+            try_get_known_serializers_for_type(ContentMessage)
+        )
+
+        # A message published twice is serialized once.
+        message = ContentMessage(content="hello")
+        await sender.publish_message(message, DefaultTopicId())
+        await sender.publish_message(message, DefaultTopicId())
+        assert sender.serialization_cache_misses == 1
+        assert sender.serialization_cache_hits == 1
+
+        await asyncio.sleep(1)
+        agent = await receiver.try_get_underlying_agent_instance(
+            AgentId("receiver", key="default"), type=LoopbackAgent
+        )
+        assert agent.num_calls == 2
+    finally:
+        await sender.stop()
+        await receiver.stop()
+        await host.stop()
+
+
+@pytest.mark.asyncio
+async def test_message_batching_message_length_limit() -> None:
+    # Batch frames stay within the message length limits of the channels.
+    limit = 64 * 1024
+    extra_grpc_config = [
+        ("grpc.max_send_message_length", limit),
+        ("grpc.max_receive_message_length", limit),
+    ]
+    host_address = "localhost:50084"
+    host = GrpcWorkerAgentRuntimeHost(
+        address=host_address, extra_grpc_config=extra_grpc_config
+    )
+    sender = GrpcWorkerAgentRuntime(
+        host_address=host_address, extra_grpc_config=extra_grpc_config
+    )
+    receiver = GrpcWorkerAgentRuntime(
+        host_address=host_address, extra_grpc_config=extra_grpc_config
+    )
+    try:
+        host.start()
+        sender.start()
+        receiver.start()
+        await LoopbackAgentWithDefaultSubscription.register(
+            receiver, "receiver", lambda: LoopbackAgentWithDefaultSubscription()
+        )
+        sender.add_message_serializer(
+            try_get_known_serializers_for_type(ContentMessage)
+        )
+
+        await asyncio.gather(
+            *[
+                sender.publish_message(
+                    ContentMessage(content="." * 10_000), DefaultTopicId()
+                )
+                for _ in range(40)
+            ]
+        )
+        await asyncio.sleep(2)
+        agent = await receiver.try_get_underlying_agent_instance(
+            AgentId("receiver", key="default"), type=LoopbackAgent
+        )
+        assert agent.num_calls == 40
+    finally:
+        await sender.stop()
+        await receiver.stop()
+        await host.stop()
+
+
 # TODO add tests for failure to deserialize
 
 
+@pytest.mark.asyncio
+async def test_direct_rpc(mocker: MockerFixture) -> None:
+    host_address = "localhost:50074"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host_process_request = mocker.spy(host._servicer, "_process_request")  # type: ignore[reportPrivateUsage]
+    host.start()
+
+    receiver = GrpcWorkerAgentRuntime(
+        host_address=host_address, direct_rpc_address="localhost:50075"
+    )
+    sender = GrpcWorkerAgentRuntime(
+        host_address=host_address, direct_rpc_address="localhost:50076"
+    )
+    # A worker without direct RPCs sends and receives requests through the host.
+    other = GrpcWorkerAgentRuntime(host_address=host_address)
+    for worker in (receiver, sender, other):
+        worker.start()
+        worker.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+    await receiver.register_factory(
+        type=AgentType("loopback"),
+        agent_factory=lambda: LoopbackAgent(),
+        expected_class=LoopbackAgent,
+    )
+    await sender.register_factory(
+        type=AgentType("local"),
+        agent_factory=lambda: LoopbackAgent(),
+        expected_class=LoopbackAgent,
+    )
+    await other.register_factory(
+        type=AgentType("indirect"),
+        agent_factory=lambda: LoopbackAgent(),
+        expected_class=LoopbackAgent,
+    )
+
+    for _ in range(3):
+        await sender.send_message(MessageType(), AgentId("loopback", "default"))
+        await sender.send_message(MessageType(), AgentId("local", "default"))
+    assert host_process_request.call_count == 0
+    assert list(sender._peer_connections) == ["localhost:50075"]  # type: ignore[reportPrivateUsage]
+
+    await sender.send_message(MessageType(), AgentId("indirect", "default"))
+    await other.send_message(MessageType(), AgentId("loopback", "default"))
+    assert host_process_request.call_count == 2
+
+    for agent_id, worker, num_calls in (
+        (AgentId("loopback", "default"), receiver, 4),
+        (AgentId("local", "default"), sender, 3),
+        (AgentId("indirect", "default"), other, 1),
+    ):
+        agent = await worker.try_get_underlying_agent_instance(agent_id, LoopbackAgent)
+        assert agent.num_calls == num_calls
+
+    for worker in (receiver, sender, other):
+        await worker.stop()
+    await host.stop()
+
+
+@pytest.mark.asyncio
+async def test_direct_rpc_placement_changed() -> None:
+    host_address = "localhost:50077"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+
+    sender = GrpcWorkerAgentRuntime(
+        host_address=host_address, direct_rpc_address="localhost:50078"
+    )
+    sender.start()
+    sender.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+
+    receivers: List[GrpcWorkerAgentRuntime] = []
+    for address in ("localhost:50079", "localhost:50080"):
+        receiver = GrpcWorkerAgentRuntime(
+            host_address=host_address, direct_rpc_address=address
+        )
+        receiver.start()
+        receiver.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+        await receiver.register_factory(
+            type=AgentType("loopback"),
+            agent_factory=lambda: LoopbackAgent(),
+            expected_class=LoopbackAgent,
+        )
+        await sender.send_message(MessageType(), AgentId("loopback", "default"))
+        agent = await receiver.try_get_underlying_agent_instance(
+            AgentId("loopback", "default"), LoopbackAgent
+        )
+        assert agent.num_calls == 1
+        receivers.append(receiver)
+        # The sender forgets the placement when the receiver leaves.
+        await receiver.stop()
+        await asyncio.sleep(1)
+        assert sender._agent_peer_addresses == {}  # type: ignore[reportPrivateUsage]
+        assert sender._peer_connections == {}  # type: ignore[reportPrivateUsage]
+
+    await sender.stop()
+    await host.stop()
+
+
+@pytest.mark.asyncio
+async def test_direct_rpc_unreachable() -> None:
+    host_address = "localhost:50081"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+
+    receiver = GrpcWorkerAgentRuntime(
+        host_address=host_address, direct_rpc_address="localhost:50082"
+    )
+    sender = GrpcWorkerAgentRuntime(
+        host_address=host_address, direct_rpc_address="localhost:50083"
+    )
+    for worker in (receiver, sender):
+        worker.start()
+        worker.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+    await receiver.register_factory(
+        type=AgentType("loopback"),
+        agent_factory=lambda: LoopbackAgent(),
+        expected_class=LoopbackAgent,
+    )
+
+    # Requests go through the host when the channel to the receiver cannot be opened.
+    peer_server = receiver._peer_server  # type: ignore[reportPrivateUsage]
+    assert peer_server is not None
+    await peer_server.stop(grace=None)
+    for _ in range(2):
+        await sender.send_message(MessageType(), AgentId("loopback", "default"))
+    agent = await receiver.try_get_underlying_agent_instance(
+        AgentId("loopback", "default"), LoopbackAgent
+    )
+    assert agent.num_calls == 2
+    assert sender._agent_peer_addresses == {AgentId("loopback", "default"): None}  # type: ignore[reportPrivateUsage]
+
+    await sender.stop()
+    await receiver.stop()
+    await host.stop()
+
+
+@pytest.mark.asyncio
+async def test_direct_rpc_placement_lookup_timeout(mocker: MockerFixture) -> None:
+    host_address = "localhost:50086"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    # The host never answers the placement lookups.
+    mocker.patch.object(host._servicer, "_process_placement_request", new=mocker.AsyncMock())  # type: ignore[reportPrivateUsage]
+    host_process_request = mocker.spy(host._servicer, "_process_request")  # type: ignore[reportPrivateUsage]
+    host.start()
+
+    receiver = GrpcWorkerAgentRuntime(
+        host_address=host_address, direct_rpc_address="localhost:50087"
+    )
+    sender = GrpcWorkerAgentRuntime(
+        host_address=host_address, direct_rpc_address="localhost:50088"
+    )
+    sender._placement_lookup_timeout = 0.5  # type: ignore[reportPrivateUsage]
+    for worker in (receiver, sender):
+        worker.start()
+        worker.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+    await receiver.register_factory(
+        type=AgentType("loopback"),
+        agent_factory=lambda: LoopbackAgent(),
+        expected_class=LoopbackAgent,
+    )
+
+    # The requests are sent through the host once the lookups time out.
+    for _ in range(2):
+        await sender.send_message(MessageType(), AgentId("loopback", "default"))
+    assert host_process_request.call_count == 2
+    assert sender._agent_peer_addresses == {}  # type: ignore[reportPrivateUsage]
+    assert sender._pending_requests == {}  # type: ignore[reportPrivateUsage]
+    agent = await receiver.try_get_underlying_agent_instance(
+        AgentId("loopback", "default"), LoopbackAgent
+    )
+    assert agent.num_calls == 2
+
+    for worker in (receiver, sender):
+        await worker.stop()
+    await host.stop()
+
+
 @pytest.mark.asyncio
 async def test_grpc_max_message_size() -> None:
     default_max_size = 2**22